@@ -3,7 +3,7 @@ from __future__ import annotations
 import json
 import logging
 import time
-from typing import Any, Dict, List
+from typing import Any, AsyncIterator, Dict, List
 
 from azure.cosmos import exceptions
 
@@ -40,6 +40,16 @@ class AvatarChat:
         logger.info("Avatar response produced in %.2fs", time.time() - start_time)
         return response
 
+    async def stream(self, prompt_data: ChatResponse) -> AsyncIterator[str]:
+        """Yield the avatar response text as the model produces it."""
+
+        start_time = time.time()
+        case = await self._resolve_case(prompt_data.case_id)
+        context = AgentRunContext(self._agent(case, prompt_data))
+        async for delta in context.stream(self._turn_prompt(prompt_data)):
+            yield delta
+        logger.info("Avatar response streamed in %.2fs", time.time() - start_time)
+
     async def _resolve_case(self, case_id: str) -> Dict[str, Any]:
         if cached := self._case_cache.get(case_id):
             return cached
@@ -51,16 +61,21 @@ class AvatarChat:
         return case
 
     async def _evaluate(self, avatar_data: Dict[str, Any], prompt_data: ChatResponse) -> str:
-        history_messages = self._coerce_history(prompt_data.chat_history)
-        history_text = self._history_as_text(history_messages)
+        context = AgentRunContext(self._agent(avatar_data, prompt_data))
+        response = await context.run(self._turn_prompt(prompt_data))
 
+        logger.debug("Avatar service received response: %s", response)
+        return self._extract_text(response)
+
+    def _agent(self, avatar_data: Dict[str, Any], prompt_data: ChatResponse) -> Any:
+        # Instructions depend only on the case, so the registry reuses one agent per case.
         system_message = SIMULATION_PROMPT.safe_substitute(
             name=avatar_data.get("name", ""),
             profile=json.dumps(avatar_data.get("profile", {}), ensure_ascii=False),
             role=avatar_data.get("profile", {}).get("role", avatar_data.get("role", "")),
             steps=json.dumps(avatar_data.get("steps", []), ensure_ascii=False),
             case=json.dumps(avatar_data.get("role", ""), ensure_ascii=False),
-            previous_chat=history_text or "No prior conversation.",
+            previous_chat="the conversation so far is included with each message.",
         )
 
         agent_spec = AgentSpec(
@@ -70,12 +85,13 @@ class AvatarChat:
             temperature=self._settings.azure_ai.temperature,
         )
 
-        agent = self._registry.create(agent_spec)
-        context = AgentRunContext(agent)
-        response = await context.run(prompt_data.prompt)
+        return self._registry.create(agent_spec)
 
-        logger.debug("Avatar service received response: %s", response)
-        return self._extract_text(response)
+    def _turn_prompt(self, prompt_data: ChatResponse) -> str:
+        history_text = self._history_as_text(self._coerce_history(prompt_data.chat_history))
+        if not history_text:
+            return prompt_data.prompt
+        return f"Conversation so far:\n{history_text}\n\nNew message: {prompt_data.prompt}"
 
     def _coerce_history(self, history: Any) -> List[Dict[str, str]]:
         if history is None:
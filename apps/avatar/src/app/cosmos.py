@@ -1,68 +1,41 @@
-"""Shared Cosmos DB helpers for Tutor services."""
+"""Avatar Cosmos DB repository built on the shared tutor_lib CRUD."""
 
 from __future__ import annotations
 
-from collections.abc import AsyncIterator, Iterable
+from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
 from typing import Any
 
 from azure.cosmos import exceptions
-from azure.cosmos.aio import CosmosClient
-from azure.identity.aio import DefaultAzureCredential
+from tutor_lib.cosmos import CosmosClientPool, QueryCache
+from tutor_lib.cosmos import CosmosCRUD as _SharedCosmosCRUD
 
 from .config import AvatarCosmosSettings
 
 
-class CosmosCRUD:
-    """Asynchronous Cosmos DB repository backed by managed identity."""
+class CosmosCRUD(_SharedCosmosCRUD):
+    """Asynchronous Cosmos DB repository that provisions the database on first use."""
 
-    def __init__(self, container_name: str, config: AvatarCosmosSettings) -> None:
-        self._endpoint = config.endpoint
-        self._database = config.database
-        self._container = container_name
+    def __init__(
+        self,
+        container_name: str,
+        config: AvatarCosmosSettings,
+        *,
+        pool: CosmosClientPool | None = None,
+        cache: QueryCache | None = None,
+    ) -> None:
+        super().__init__(container_name, config, pool=pool, cache=cache)  # type: ignore[arg-type]
+        self._database_ready = False
 
     @asynccontextmanager
     async def _container_client(self) -> AsyncIterator[Any]:
-        async with DefaultAzureCredential() as credential:
-            async with CosmosClient(self._endpoint, credential=credential) as client:
-                database = client.get_database_client(self._database)
-                try:
-                    await database.read()
-                except exceptions.CosmosResourceNotFoundError:
-                    await client.create_database(self._database)
-                    database = client.get_database_client(self._database)
-                container = database.get_container_client(self._container)
-                yield container
-
-    async def list_items(
-        self,
-        query: str = "SELECT * FROM c",
-        parameters: Iterable[dict[str, Any]] | None = None,
-    ) -> list[Any]:
-        params = list(parameters or [])
-        async with self._container_client() as container:
-            return [item async for item in container.query_items(query=query, parameters=params)]
-
-    async def create_item(self, item: dict[str, Any]) -> Any:
-        async with self._container_client() as container:
-            return await container.upsert_item(item)
-
-    async def read_item(self, item_id: str, partition_key: str | None = None) -> Any:
-        key = partition_key or item_id
-        async with self._container_client() as container:
-            return await container.read_item(item=item_id, partition_key=key)
-
-    async def update_item(
-        self,
-        item_id: str,
-        item: dict[str, Any],
-        partition_key: str | None = None,
-    ) -> Any:
-        key = partition_key or item_id
-        async with self._container_client() as container:
-            return await container.replace_item(item=item_id, body=item, partition_key=key)
-
-    async def delete_item(self, item_id: str, partition_key: str | None = None) -> Any:
-        key = partition_key or item_id
-        async with self._container_client() as container:
-            return await container.delete_item(item=item_id, partition_key=key)
+        if not self._database_ready:
+            client = await self._pool.client(self._endpoint)
+            database = client.get_database_client(self._database)
+            try:
+                await database.read()
+            except exceptions.CosmosResourceNotFoundError:
+                await client.create_database(self._database)
+            self._database_ready = True
+        async with super()._container_client() as container:
+            yield container
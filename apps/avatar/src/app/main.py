@@ -5,21 +5,32 @@ from __future__ import annotations
 import random
 import uuid
 from functools import lru_cache
-from typing import Any, Iterable, cast
+from typing import Any, AsyncIterator, Iterable, cast
 
 from azure.cosmos import exceptions
-from fastapi import Body, FastAPI, HTTPException, Request, status
+from fastapi import Body, Depends, FastAPI, HTTPException, Request, status
 from fastapi.encoders import jsonable_encoder
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 
 from app.avatar import AvatarChat, build_avatar_chat
 from app.config import get_settings
 from app.cosmos import CosmosCRUD
 from app.speech import SpeechTokenBroker
 from app.schemas import BodyMessage, Case, ChatResponse, ErrorMessage, RESPONSES, SuccessMessage
+from tutor_lib.config import lifespan
+from tutor_lib.cosmos import patch_set, shared_query_cache
+from tutor_lib.metrics import instrument_app
 from tutor_lib.middleware import configure_entra_auth
+from tutor_lib.resilience import configure_load_shedding
+from tutor_lib.schemas import (
+    CONTINUATION_HEADER,
+    PageQuery,
+    page_query,
+    paged_success_response,
+    stream_sse_response,
+)
 
 
 settings = cast(Any, get_settings())
@@ -33,6 +44,7 @@ app = FastAPI(
         {"name": "Configuration", "description": "Case management operations"},
     ],
     openapi_url="/api/v1/openapi.json",
+    lifespan=lifespan,
     responses=RESPONSES,  # type: ignore[arg-type]
 )
 
@@ -43,8 +55,11 @@ app.add_middleware(
     allow_credentials=False,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[CONTINUATION_HEADER],
 )
 configure_entra_auth(app)
+instrument_app(app)
+configure_load_shedding(app)
 
 
 @app.get("/health", tags=["Avatar"])
@@ -64,7 +79,11 @@ def _success(title: str, message: str, content: Any) -> JSONResponse:
 
 @lru_cache(maxsize=1)
 def _case_repository() -> CosmosCRUD:
-    return CosmosCRUD(settings.cosmos.case_container, settings.cosmos)  # pylint: disable=no-member
+    return CosmosCRUD(
+        settings.cosmos.case_container,  # pylint: disable=no-member
+        settings.cosmos,
+        cache=shared_query_cache(),
+    )
 
 
 @lru_cache(maxsize=1)
@@ -106,6 +125,20 @@ async def avatar_response(params: ChatResponse) -> JSONResponse:
     return JSONResponse({"text": text})
 
 
+@app.post("/response/stream", tags=["Avatar"])
+async def avatar_response_stream(params: ChatResponse) -> StreamingResponse:
+    """Server-sent events variant of ``/response``: ``delta`` events, then ``result`` with the full text."""
+
+    async def _events() -> AsyncIterator[tuple[str, Any]]:
+        chunks: list[str] = []
+        async for delta in _avatar().stream(params):
+            chunks.append(delta)
+            yield "delta", {"text": delta}
+        yield "result", {"text": "".join(chunks)}
+
+    return await stream_sse_response(_events())
+
+
 @app.get("/profile", tags=["Avatar"])
 async def avatar_profile() -> JSONResponse:
     cases = await _case_repository().list_items()
@@ -140,9 +173,8 @@ async def create_case(case: Case) -> JSONResponse:
 
 
 @app.get("/cases", tags=["Configuration"])
-async def list_cases() -> JSONResponse:
-    items = await _case_repository().list_items()
-    return _success("Cases Retrieved", "Cases fetched", items)
+async def list_cases(page: PageQuery = Depends(page_query)) -> StreamingResponse:
+    return await paged_success_response("Cases Retrieved", "Cases fetched", _case_repository(), page)
 
 
 @app.get("/cases/{case_id}", tags=["Configuration"])
@@ -167,11 +199,9 @@ async def delete_case(case_id: str) -> JSONResponse:
 async def patch_case_steps(case_id: str, steps: Iterable[Any] = Body(...)) -> JSONResponse:
     repo = _case_repository()
     try:
-        existing = await repo.read_item(case_id)
+        updated = await repo.patch_item(case_id, [patch_set("/steps", list(steps))])
     except exceptions.CosmosResourceNotFoundError as exc:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Case not found") from exc
-    updated = {**existing, "steps": list(steps)}
-    await repo.update_item(case_id, updated)
     return _success("Case Updated", "Steps replaced", updated)
 
 
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from functools import lru_cache
 from typing import Any
 from uuid import uuid4
@@ -11,7 +12,7 @@ from fastapi import Depends, FastAPI, HTTPException, Request, status
 from fastapi.encoders import jsonable_encoder
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 
 from app.cosmos import CosmosCRUD
 from app.schemas import (
@@ -34,9 +35,13 @@ from app.schemas import (
     SuccessMessage,
     ThemeInput,
 )
-from tutor_lib.config import get_settings
+from tutor_lib.config import get_settings, lifespan
+from tutor_lib.cosmos import BulkWriteResult, patch_set, shared_query_cache
+from tutor_lib.metrics import instrument_app
 from tutor_lib.middleware import configure_entra_auth, get_authenticated_user, require_roles
 from tutor_lib.middleware.auth import AccessContext, AccessGrant, AuthenticatedUser, RelationshipScope
+from tutor_lib.resilience import configure_load_shedding
+from tutor_lib.schemas import CONTINUATION_HEADER, PageQuery, page_query, paged_success_response
 
 
 settings = get_settings()
@@ -55,6 +60,7 @@ app = FastAPI(
         {"name": "Themes", "description": "Essay theme and rubric configuration"},
     ],
     openapi_url="/api/v1/openapi.json",
+    lifespan=lifespan,
     responses=RESPONSES,  # type: ignore[arg-type]
 )
 
@@ -65,8 +71,11 @@ app.add_middleware(
     allow_credentials=False,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[CONTINUATION_HEADER],
 )
 configure_entra_auth(app)
+instrument_app(app)
+configure_load_shedding(app)
 
 
 @app.get("/health", tags=["Students"])
@@ -81,7 +90,8 @@ async def ready() -> dict[str, str]:
 
 @lru_cache(maxsize=8)
 def _crud(container: str) -> CosmosCRUD:
-    return CosmosCRUD(container, settings.cosmos)
+    # Configuration entities are reference data; cache reads when COSMOS_QUERY_CACHE_TTL_SECONDS is set.
+    return CosmosCRUD(container, settings.cosmos, cache=shared_query_cache(settings.cosmos))
 
 
 def _success(title: str, message: str, content: Any) -> JSONResponse:
@@ -113,6 +123,7 @@ async def global_exception_handler(_: Request, exc: Exception) -> JSONResponse:
 
 require_professor = require_roles("professor", "admin")
 THEME_KIND = "theme"
+_BULK_SYNC_CONCURRENCY = 32
 _BASE_FEATURE_FLAGS: tuple[str, ...] = (
     "workspace-shell",
     "learner-record-overlay",
@@ -128,11 +139,8 @@ _ROLE_FEATURE_FLAGS: dict[str, tuple[str, ...]] = {
 }
 
 
-async def _bulk_create(container: str, items: list[dict[str, Any]]) -> int:
-    crud = _crud(container)
-    for item in items:
-        await crud.create_item(item)
-    return len(items)
+async def _bulk_create(container: str, items: list[dict[str, Any]]) -> BulkWriteResult:
+    return await _crud(container).bulk_upsert(items, concurrency=_BULK_SYNC_CONCURRENCY)
 
 
 def _theme_document(payload: ThemeInput, theme_id: str) -> dict[str, Any]:
@@ -239,9 +247,11 @@ async def create_student(student: Student, _: str = Depends(require_professor))
 
 
 @app.get("/students", tags=["Students"])
-async def list_students(_: str = Depends(require_professor)) -> JSONResponse:
-    items = await _crud(settings.cosmos.student_container).list_items()
-    return _success("Students Retrieved", "Students fetched", items)
+async def list_students(
+    page: PageQuery = Depends(page_query), _: str = Depends(require_professor)
+) -> StreamingResponse:
+    crud = _crud(settings.cosmos.student_container)
+    return await paged_success_response("Students Retrieved", "Students fetched", crud, page)
 
 
 @app.post("/professors", tags=["Professors"])
@@ -251,9 +261,11 @@ async def create_professor(professor: Professor, _: str = Depends(require_profes
 
 
 @app.get("/professors", tags=["Professors"])
-async def list_professors(_: str = Depends(require_professor)) -> JSONResponse:
-    items = await _crud(settings.cosmos.professor_container).list_items()
-    return _success("Professors Retrieved", "Professors fetched", items)
+async def list_professors(
+    page: PageQuery = Depends(page_query), _: str = Depends(require_professor)
+) -> StreamingResponse:
+    crud = _crud(settings.cosmos.professor_container)
+    return await paged_success_response("Professors Retrieved", "Professors fetched", crud, page)
 
 
 @app.post("/courses", tags=["Courses"])
@@ -263,9 +275,11 @@ async def create_course(course: Course, _: str = Depends(require_professor)) ->
 
 
 @app.get("/courses", tags=["Courses"])
-async def list_courses(_: str = Depends(require_professor)) -> JSONResponse:
-    items = await _crud(settings.cosmos.course_container).list_items()
-    return _success("Courses Retrieved", "Courses fetched", items)
+async def list_courses(
+    page: PageQuery = Depends(page_query), _: str = Depends(require_professor)
+) -> StreamingResponse:
+    crud = _crud(settings.cosmos.course_container)
+    return await paged_success_response("Courses Retrieved", "Courses fetched", crud, page)
 
 
 @app.post("/classes", tags=["Classes"])
@@ -275,9 +289,11 @@ async def create_class(class_: Class, _: str = Depends(require_professor)) -> JS
 
 
 @app.get("/classes", tags=["Classes"])
-async def list_classes(_: str = Depends(require_professor)) -> JSONResponse:
-    items = await _crud(settings.cosmos.class_container).list_items()
-    return _success("Classes Retrieved", "Classes fetched", items)
+async def list_classes(
+    page: PageQuery = Depends(page_query), _: str = Depends(require_professor)
+) -> StreamingResponse:
+    crud = _crud(settings.cosmos.class_container)
+    return await paged_success_response("Classes Retrieved", "Classes fetched", crud, page)
 
 
 @app.post("/groups", tags=["Groups"])
@@ -287,9 +303,11 @@ async def create_group(group: Group, _: str = Depends(require_professor)) -> JSO
 
 
 @app.get("/groups", tags=["Groups"])
-async def list_groups(_: str = Depends(require_professor)) -> JSONResponse:
-    items = await _crud(settings.cosmos.group_container).list_items()
-    return _success("Groups Retrieved", "Groups fetched", items)
+async def list_groups(
+    page: PageQuery = Depends(page_query), _: str = Depends(require_professor)
+) -> StreamingResponse:
+    crud = _crud(settings.cosmos.group_container)
+    return await paged_success_response("Groups Retrieved", "Groups fetched", crud, page)
 
 
 @app.get("/themes", tags=["Themes"])
@@ -359,12 +377,10 @@ async def assign_cases_to_group(
 ) -> JSONResponse:
     crud = _crud(settings.cosmos.group_container)
     try:
-        group = await crud.read_item(group_id)
+        group = await crud.patch_item(group_id, [patch_set("/assigned_case_ids", assignment.case_ids)])
     except cosmos_exceptions.CosmosResourceNotFoundError as exc:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Group not found") from exc
 
-    group["assigned_case_ids"] = assignment.case_ids
-    await crud.update_item(group_id, group)
     return _success("Group Updated", "Cases assigned", group)
 
 
@@ -373,18 +389,37 @@ async def bulk_sync_roster(
     payload: BulkRosterSyncRequest,
     _: str = Depends(require_professor),
 ) -> JSONResponse:
-    students = [item.model_dump() for item in payload.students]
-    professors = [item.model_dump() for item in payload.professors]
-    courses = [item.model_dump() for item in payload.courses]
-    classes = [item.model_dump() for item in payload.classes]
-    groups = [item.model_dump() for item in payload.groups]
-
-    counts = {
-        "students": await _bulk_create(settings.cosmos.student_container, students),
-        "professors": await _bulk_create(settings.cosmos.professor_container, professors),
-        "courses": await _bulk_create(settings.cosmos.course_container, courses),
-        "classes": await _bulk_create(settings.cosmos.class_container, classes),
-        "groups": await _bulk_create(settings.cosmos.group_container, groups),
+    batches = {
+        "students": (settings.cosmos.student_container, payload.students),
+        "professors": (settings.cosmos.professor_container, payload.professors),
+        "courses": (settings.cosmos.course_container, payload.courses),
+        "classes": (settings.cosmos.class_container, payload.classes),
+        "groups": (settings.cosmos.group_container, payload.groups),
+    }
+    results = await asyncio.gather(
+        *(
+            _bulk_create(container, [item.model_dump() for item in items])
+            for container, items in batches.values()
+        )
+    )
+    outcomes = dict(zip(batches, results, strict=True))
+    counts = {name: result.succeeded for name, result in outcomes.items()}
+    failures = {
+        name: [
+            {"id": failure.item_id, "status_code": failure.status_code, "error": failure.error}
+            for failure in result.failures
+        ]
+        for name, result in outcomes.items()
+        if result.failures
     }
 
+    if failures:
+        body = ErrorMessage(
+            success=False,
+            type="partial",
+            title="Bulk Sync Partially Failed",
+            detail={"synchronized": counts, "failures": failures},
+        )
+        return JSONResponse(status_code=status.HTTP_207_MULTI_STATUS, content=jsonable_encoder(body))
+
     return _success("Bulk Sync Completed", "Roster synchronized", counts)
@@ -0,0 +1,86 @@
+"""Create and backfill the essay id → partition key index.
+
+Run once per environment after upgrading, from ``apps/essays/src``::
+
+    python -m app.backfill_essay_index [--create-container] [--dry-run]
+
+Essays written before the index existed are still served through the legacy
+cross-partition query (and indexed on first read), so the backfill can run
+while the service is live and is safe to repeat.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+
+from azure.cosmos import PartitionKey
+from tutor_lib.cosmos import CosmosCRUD as SharedCosmosCRUD
+from tutor_lib.cosmos import close_cosmos_clients, get_client_pool
+
+from app.config import get_settings
+from app.cosmos import CosmosCRUD, EssayPartitionIndex
+
+logger = logging.getLogger(__name__)
+
+
+async def create_index_container() -> None:
+    settings = get_settings()
+    client = await get_client_pool().client(settings.cosmos.endpoint)
+    database = client.get_database_client(settings.cosmos.database)
+    await database.create_container_if_not_exists(
+        id=settings.cosmos.essay_index_container,
+        partition_key=PartitionKey(path="/id"),
+    )
+
+
+async def backfill(
+    *, create_container: bool, dry_run: bool, page_size: int, concurrency: int | None
+) -> int:
+    settings = get_settings()
+    try:
+        if create_container and not dry_run:
+            await create_index_container()
+        index = EssayPartitionIndex(
+            CosmosCRUD(settings.cosmos.essay_container, settings.cosmos),
+            SharedCosmosCRUD(settings.cosmos.essay_index_container, settings.cosmos),
+        )
+        return await index.backfill(page_size=page_size, concurrency=concurrency, dry_run=dry_run)
+    finally:
+        await close_cosmos_clients()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Backfill the essay id → partition key index.")
+    parser.add_argument(
+        "--create-container",
+        action="store_true",
+        help="Create the index container (partitioned by /id) if it does not exist.",
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Count essays without writing index entries."
+    )
+    parser.add_argument(
+        "--page-size", type=int, default=500, help="Essays read and indexed per round trip."
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=None, help="Concurrent index writes per page."
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    count = asyncio.run(
+        backfill(
+            create_container=args.create_container,
+            dry_run=args.dry_run,
+            page_size=args.page_size,
+            concurrency=args.concurrency,
+        )
+    )
+    verb = "Would index" if args.dry_run else "Indexed"
+    logger.info("%s %d essays into %s", verb, count, get_settings().cosmos.essay_index_container)
+
+
+if __name__ == "__main__":
+    main()
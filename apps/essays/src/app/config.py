@@ -15,6 +15,7 @@ class CosmosConfig(BaseModel):
     endpoint: str
     database: str
     essay_container: str
+    essay_index_container: str
     resources_container: str
     assembly_container: str
 
@@ -45,6 +46,7 @@ def get_settings() -> TutorSettings:
             endpoint=shared.cosmos.endpoint,
             database=shared.cosmos.database,
             essay_container=shared.cosmos.essay_container,
+            essay_index_container=shared.cosmos.essay_index_container,
             resources_container=shared.cosmos.resources_container,
             assembly_container=shared.cosmos.assembly_container,
         ),
@@ -1,50 +1,26 @@
-"""Shared Cosmos DB helpers for Tutor services."""
+"""Essays Cosmos DB repository built on the shared tutor_lib CRUD."""
 
 from __future__ import annotations
 
-from collections.abc import AsyncIterator, Iterable
-from contextlib import asynccontextmanager
+import logging
 from typing import Any
 
-from azure.cosmos.aio import CosmosClient
-from azure.identity.aio import DefaultAzureCredential
+from azure.cosmos import exceptions as cosmos_exceptions
+from azure.cosmos.partition_key import NonePartitionKeyValue, NullPartitionKeyValue
+from tutor_lib.cosmos import CosmosCRUD as _SharedCosmosCRUD
+from tutor_lib.cosmos import PartitionKeyCache
 
-from .config import CosmosConfig
+logger = logging.getLogger(__name__)
 
+ESSAY_PARTITION_FIELD = "student_id"
 
-class CosmosCRUD:
-    """Asynchronous Cosmos DB repository backed by managed identity."""
 
-    def __init__(self, container_name: str, config: CosmosConfig) -> None:
-        self._endpoint = config.endpoint
-        self._database = config.database
-        self._container = container_name
+class CosmosCRUD(_SharedCosmosCRUD):
+    """Asynchronous Cosmos DB repository backed by the shared client pool.
 
-    @asynccontextmanager
-    async def _container_client(self) -> AsyncIterator[Any]:
-        async with DefaultAzureCredential() as credential:
-            async with CosmosClient(self._endpoint, credential=credential) as client:
-                database = client.get_database_client(self._database)
-                container = database.get_container_client(self._container)
-                yield container
-
-    async def list_items(
-        self,
-        query: str = "SELECT * FROM c",
-        parameters: Iterable[dict[str, Any]] | None = None,
-    ) -> list[Any]:
-        params = list(parameters or [])
-        async with self._container_client() as container:
-            return [item async for item in container.query_items(query=query, parameters=params)]
-
-    async def create_item(self, item: dict[str, Any]) -> Any:
-        async with self._container_client() as container:
-            return await container.upsert_item(item)
-
-    async def read_item(self, item_id: str, partition_key: str | None = None) -> Any:
-        key = partition_key or item_id
-        async with self._container_client() as container:
-            return await container.read_item(item=item_id, partition_key=key)
+    Updates are written as upserts because essays are partitioned by
+    ``/student_id`` and callers only know the document ``id``.
+    """
 
     async def update_item(
         self,
@@ -52,12 +28,123 @@ class CosmosCRUD:
         item: dict[str, Any],
         partition_key: str | None = None,
     ) -> Any:
-        async with self._container_client() as container:
-            record = item.copy()
-            record.setdefault("id", item_id)
-            return await container.upsert_item(record)
-
-    async def delete_item(self, item_id: str, partition_key: str | None = None) -> Any:
-        key = partition_key or item_id
-        async with self._container_client() as container:
-            return await container.delete_item(item=item_id, partition_key=key)
+        record = item.copy()
+        record.setdefault("id", item_id)
+        return await self.create_item(record)
+
+
+def essay_partition_key(document: dict[str, Any]) -> Any:
+    """Partition key value of an essay; essays without ``student_id`` live in the "none" partition."""
+
+    if ESSAY_PARTITION_FIELD not in document:
+        return NonePartitionKeyValue
+    value = document[ESSAY_PARTITION_FIELD]
+    return NullPartitionKeyValue if value is None else value
+
+
+class EssayPartitionIndex:
+    """``id`` → ``student_id`` lookup that turns essay reads into single-partition point reads.
+
+    Entries live in a small ``/id``-partitioned container (``essay_index``) and are cached in
+    process. Writers call :meth:`record` / :meth:`forget` to keep both in sync; essays missing
+    from the index (written before it existed) are found with the legacy cross-partition query
+    and indexed on the way out, and :meth:`backfill` indexes everything up front.
+    """
+
+    LEGACY_QUERY = "SELECT * FROM c WHERE c.id = @id"
+    BACKFILL_QUERY = "SELECT c.id, c.student_id FROM c"
+
+    def __init__(
+        self, essays: _SharedCosmosCRUD, index: _SharedCosmosCRUD, *, cache_size: int = 4096
+    ) -> None:
+        self._essays = essays
+        self._index = index
+        self._cache = PartitionKeyCache(cache_size)
+
+    @staticmethod
+    def _entry(document: dict[str, Any]) -> dict[str, Any]:
+        has_key = ESSAY_PARTITION_FIELD in document
+        return {
+            "id": str(document["id"]),
+            "student_id": document.get(ESSAY_PARTITION_FIELD) if has_key else None,
+            "has_partition_key": has_key,
+        }
+
+    @staticmethod
+    def _key_from_entry(entry: dict[str, Any]) -> Any:
+        if not entry.get("has_partition_key", True):
+            return essay_partition_key({})
+        return essay_partition_key({ESSAY_PARTITION_FIELD: entry.get("student_id")})
+
+    async def partition_key_for(self, essay_id: str) -> Any | None:
+        """Indexed partition key of ``essay_id``, or ``None`` when the essay is not indexed."""
+
+        cached = self._cache.get(essay_id)
+        if cached is not None:
+            return cached
+        try:
+            entry = await self._index.read_item(essay_id, partition_key=essay_id)
+        except cosmos_exceptions.CosmosResourceNotFoundError:
+            return None
+        partition_key = self._key_from_entry(entry)
+        self._cache.remember(essay_id, partition_key)
+        return partition_key
+
+    async def get(self, essay_id: str) -> dict[str, Any] | None:
+        partition_key = await self.partition_key_for(essay_id)
+        if partition_key is not None:
+            try:
+                return await self._essays.read_item(essay_id, partition_key=partition_key)
+            except cosmos_exceptions.CosmosResourceNotFoundError:
+                logger.info("Essay index entry for %s is stale; falling back to a query", essay_id)
+                self._cache.forget(essay_id)
+
+        results = await self._essays.list_items(
+            query=self.LEGACY_QUERY,
+            parameters=[{"name": "@id", "value": essay_id}],
+        )
+        if not results:
+            return None
+        document = results[0]
+        await self.record(document)
+        return document
+
+    async def record(self, document: dict[str, Any]) -> None:
+        entry = self._entry(document)
+        await self._index.create_item(entry)
+        self._cache.remember(entry["id"], self._key_from_entry(entry))
+
+    async def forget(self, essay_id: str) -> None:
+        self._cache.forget(essay_id)
+        try:
+            await self._index.delete_item(essay_id, partition_key=essay_id)
+        except cosmos_exceptions.CosmosResourceNotFoundError:
+            return
+
+    async def backfill(
+        self, *, page_size: int = 500, concurrency: int | None = None, dry_run: bool = False
+    ) -> int:
+        """Index every existing essay; returns the number of entries written (or that would be)."""
+
+        written = 0
+        batch: list[dict[str, Any]] = []
+
+        async def _flush() -> None:
+            nonlocal written
+            if not batch:
+                return
+            if dry_run:
+                written += len(batch)
+            else:
+                result = await self._index.bulk_upsert(batch, concurrency=concurrency)
+                written += result.succeeded
+                for failure in result.failures:
+                    logger.warning("Failed to index essay %s: %s", failure.item_id, failure.error)
+            batch.clear()
+
+        async for document in self._essays.iter_items(self.BACKFILL_QUERY, page_size=page_size):
+            batch.append(self._entry(document))
+            if len(batch) >= page_size:
+                await _flush()
+        await _flush()
+        return written
@@ -7,13 +7,12 @@ import binascii
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
-from typing import Any, Iterable, Sequence
-
-import jinja2
+from typing import Any, AsyncIterator, Iterable, Sequence
 
 from azure.cosmos import exceptions
 
 from tutor_lib.agents import AgentAttachment, FoundryAgentService
+from tutor_lib.prompts import PromptComposer, shared_prompt_composer
 from app.config import get_settings
 from app.file_processing import ALLOWED_PDF_TYPES, extract_pdf_text, extract_text_with_doc_intelligence
 from app.schemas import Essay, AgentRef, Resource, Assembly
@@ -41,18 +40,6 @@ class EssayEvaluationResult:
     improvements: list[str]
 
 
-class PromptComposer:
-    """Render Jinja prompts using the essay and its supporting resources."""
-
-    def __init__(self, template_dir: Path) -> None:
-        loader = jinja2.FileSystemLoader(str(template_dir))
-        self._env = jinja2.Environment(loader=loader, autoescape=False)
-
-    def render(self, template_name: str, essay: Essay, resources: Iterable[Resource]) -> str:
-        template = self._env.get_template(template_name)
-        return template.render(essay=essay.model_dump(), resources=[r.model_dump() for r in resources])
-
-
 class EssayEvaluationStrategy:
     """Base class for strategy implementations."""
 
@@ -68,9 +55,34 @@ class EssayEvaluationStrategy:
         essay: Essay,
         resources: Iterable[Resource],
     ) -> EssayEvaluationResult:
-        prompt = self._composer.render(self.template_name, essay, resources)
+        prompt = self._render(essay, resources)
         attachments = self._build_image_attachments(resources)
-        response_text = await self._agent_service.run_agent(agent.agent_id, prompt, attachments=attachments)
+        response_text = await self._agent_service.run_agent(
+            agent.agent_id, prompt, attachments=attachments, deployment=agent.deployment
+        )
+        return self.result_from_text(response_text)
+
+    async def stream(
+        self,
+        agent: AgentRef,
+        essay: Essay,
+        resources: Iterable[Resource],
+    ) -> AsyncIterator[str]:
+        """Yield the agent's feedback as it is generated; parse the joined text with :meth:`result_from_text`."""
+
+        prompt = self._render(essay, resources)
+        attachments = self._build_image_attachments(resources)
+        async for delta in self._agent_service.stream_agent(
+            agent.agent_id, prompt, attachments=attachments, deployment=agent.deployment
+        ):
+            yield delta
+
+    def _render(self, essay: Essay, resources: Iterable[Resource]) -> str:
+        return self._composer.render(
+            self.template_name, self._composer.context(essay=essay, resources=list(resources))
+        )
+
+    def result_from_text(self, response_text: str) -> EssayEvaluationResult:
         verdict, strengths, improvements = self._parse_response(response_text)
         return EssayEvaluationResult(
             strategy=self.strategy_type(),
@@ -189,8 +201,7 @@ class EssayOrchestrator:
     def __init__(self) -> None:
         settings = get_settings()
         self._resolver = StrategyResolver()
-        prompt_dir = Path(__file__).parent / "prompts"
-        self._composer = PromptComposer(prompt_dir)
+        self._composer = shared_prompt_composer(Path(__file__).parent / "prompts")
         self._agent_service = FoundryAgentService(settings.azure_ai.project_endpoint)  # pylint: disable=no-member
         self._assembly_repository = AssemblyRepository(settings.cosmos)
         self._strategies: dict[EssayStrategyType, EssayEvaluationStrategy] = {
@@ -209,12 +220,19 @@ class EssayOrchestrator:
         }
 
     async def invoke(self, assembly_id: str, essay: Essay, resources: Iterable[Resource]) -> EssayEvaluationResult:
+        strategy, agent, prepared_resources = await self.prepare(assembly_id, essay, resources)
+        return await strategy.evaluate(agent, essay, prepared_resources)
+
+    async def prepare(
+        self, assembly_id: str, essay: Essay, resources: Iterable[Resource]
+    ) -> tuple[EssayEvaluationStrategy, AgentRef, list[Resource]]:
+        """Resolve the strategy, agent and extracted resources for an evaluation."""
+
         prepared_resources = self._prepare_resources(list(resources))
         assembly = await self._load_assembly(assembly_id, fallback_essay_id=essay.id)
         strategy_type = self._resolver.resolve(essay, prepared_resources)
-        strategy = self._strategies[strategy_type]
         agent = self._select_agent(assembly, strategy_type)
-        return await strategy.evaluate(agent, essay, prepared_resources)
+        return self._strategies[strategy_type], agent, prepared_resources
 
     async def _load_assembly(self, assembly_id: str, fallback_essay_id: str | None = None) -> Assembly:
         try:
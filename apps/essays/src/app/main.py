@@ -4,23 +4,24 @@ from __future__ import annotations
 
 import base64
 import json
+import logging
 from datetime import datetime, timezone
 from io import BytesIO
-from typing import Any, Iterable
+from typing import Any, AsyncIterator, Iterable
 from uuid import uuid4
 
 from azure.core import exceptions as azure_exceptions
 from azure.cosmos import exceptions as cosmos_exceptions
 from pydantic import ValidationError
 
-from fastapi import File, FastAPI, Form, HTTPException, Request, UploadFile, status
+from fastapi import Depends, File, FastAPI, Form, HTTPException, Query, Request, UploadFile, status
 from fastapi.encoders import jsonable_encoder
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 
-from tutor_lib.agents import FoundryAgentService
-from app.cosmos import CosmosCRUD
+from tutor_lib.agents import FoundryAgentService, bypass_evaluation_cache
+from app.cosmos import CosmosCRUD, EssayPartitionIndex, essay_partition_key
 from app.file_processing import (
     ProcessedUpload,
     encode_base64,
@@ -28,7 +29,7 @@ from app.file_processing import (
     process_upload,
     read_upload_bytes,
 )
-from app.essays import EssayOrchestrator
+from app.essays import EssayEvaluationResult, EssayOrchestrator
 from app.schemas import (
     RESPONSES,
     BodyMessage,
@@ -44,7 +45,21 @@ from app.schemas import (
     AssemblyDefinition,
 )
 from app.config import get_settings
+from tutor_lib.config import lifespan
+from tutor_lib.cosmos import CosmosCRUD as SharedCosmosCRUD
+from tutor_lib.cosmos import patch_fields, patch_remove, shared_query_cache
+from tutor_lib.metrics import instrument_app
 from tutor_lib.middleware import configure_entra_auth
+from tutor_lib.resilience import FOUNDRY, circuit_breaker_readiness, configure_load_shedding
+from tutor_lib.schemas import (
+    CONTINUATION_HEADER,
+    PageQuery,
+    page_query,
+    paged_success_response,
+    stream_sse_response,
+)
+
+logger = logging.getLogger(__name__)
 
 
 ESSAY_FIELDS: tuple[str, ...] = (
@@ -88,6 +103,7 @@ app = FastAPI(
         {"name": "Assemblies", "description": "Agent assembly management"},
     ],
     openapi_url="/api/v1/openapi.json",
+    lifespan=lifespan,
     responses=RESPONSES,  # type: ignore[arg-type]
 )
 
@@ -98,8 +114,11 @@ app.add_middleware(
     allow_credentials=False,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[CONTINUATION_HEADER],
 )
 configure_entra_auth(app)
+instrument_app(app)
+configure_load_shedding(app)
 
 
 @app.get("/health", tags=["Evaluation"])
@@ -108,8 +127,9 @@ async def health() -> dict[str, str]:
 
 
 @app.get("/ready", tags=["Evaluation"])
-async def ready() -> dict[str, str]:
-    return {"status": "ready"}
+async def ready() -> dict[str, Any]:
+    # Open circuits mean grading answers with fallback feedback until Foundry recovers.
+    return circuit_breaker_readiness(FOUNDRY)
 
 
 @app.exception_handler(RequestValidationError)
@@ -139,7 +159,15 @@ agent_service = FoundryAgentService(settings.azure_ai.project_endpoint)
 
 
 def _crud(container: str) -> CosmosCRUD:
-    return CosmosCRUD(container, settings.cosmos)
+    # Only assemblies are reference data; essays and resources change per request.
+    cache = shared_query_cache() if container == settings.cosmos.assembly_container else None
+    return CosmosCRUD(container, settings.cosmos, cache=cache)
+
+
+essay_index = EssayPartitionIndex(
+    _crud(settings.cosmos.essay_container),
+    SharedCosmosCRUD(settings.cosmos.essay_index_container, settings.cosmos),
+)
 
 
 def _filter_payload(record: dict[str, Any], fields: Iterable[str]) -> dict[str, Any]:
@@ -200,6 +228,7 @@ async def _resources_for_essay(essay_id: str) -> list[Resource]:
     records = await _crud(settings.cosmos.resources_container).list_items(
         query="SELECT * FROM c WHERE c.essay_id = @essay_id",
         parameters=[{"name": "@essay_id", "value": essay_id}],
+        fields=RESOURCE_FIELDS,
     )
     resources: list[Resource] = []
     for entry in records:
@@ -314,18 +343,35 @@ async def _hydrate_assembly_record(raw: dict[str, Any]) -> AssemblyDefinition:
 
 
 async def _get_essay_document(essay_id: str) -> dict[str, Any] | None:
-    """Fetch an essay by ``id`` using a cross-partition query.
+    """Fetch an essay by ``id`` with a point read.
 
-    The *essays* container is partitioned by ``/student_id``, so a
-    point-read that defaults to ``partition_key=id`` will miss documents
-    whose ``student_id`` differs from their ``id`` (e.g. template essays
-    with no ``student_id``).  A query avoids this.
+    The *essays* container is partitioned by ``/student_id``, which callers
+    do not know, so the partition key comes from ``essay_index``. Essays
+    written before the index existed fall back to a cross-partition query.
     """
-    results = await _crud(settings.cosmos.essay_container).list_items(
-        query="SELECT * FROM c WHERE c.id = @id",
-        parameters=[{"name": "@id", "value": essay_id}],
-    )
-    return results[0] if results else None
+    return await essay_index.get(essay_id)
+
+
+async def _patch_essay_document(
+    essay_id: str,
+    fields: dict[str, Any],
+    *,
+    operations: list[dict[str, Any]] | None = None,
+    if_match: str | None = None,
+) -> dict[str, Any]:
+    """Apply ``fields`` (or raw patch ``operations``) server-side, without a read-modify-write."""
+    operations = operations if operations is not None else patch_fields(fields)
+    if not operations:
+        return await _require_essay_document(essay_id)
+    partition_key = await essay_index.partition_key_for(essay_id)
+    if partition_key is None:
+        partition_key = essay_partition_key(await _require_essay_document(essay_id))
+    try:
+        return await _crud(settings.cosmos.essay_container).patch_item(
+            essay_id, operations, partition_key=partition_key, if_match=if_match
+        )
+    except cosmos_exceptions.CosmosResourceNotFoundError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Essay not found") from exc
 
 
 async def _require_essay_document(essay_id: str) -> dict[str, Any]:
@@ -348,8 +394,8 @@ async def _link_essay_to_assembly(essay_document: dict[str, Any], assembly_id: s
         return
     if essay_document.get("assembly_id") == assembly_id:
         return
+    await _patch_essay_document(essay_document["id"], {"assembly_id": assembly_id})
     essay_document["assembly_id"] = assembly_id
-    await _crud(settings.cosmos.essay_container).update_item(essay_document["id"], essay_document)
 
 
 async def _unlink_essay_from_assembly(essay_id: str, assembly_id: str) -> None:
@@ -358,8 +404,13 @@ async def _unlink_essay_from_assembly(essay_id: str, assembly_id: str) -> None:
         return
     if document.get("assembly_id") != assembly_id:
         return
-    document.pop("assembly_id", None)
-    await _crud(settings.cosmos.essay_container).update_item(essay_id, document)
+    try:
+        # The ETag guard keeps a concurrent re-link to another assembly from being undone.
+        await _patch_essay_document(
+            essay_id, {}, operations=[patch_remove("/assembly_id")], if_match=document.get("_etag")
+        )
+    except cosmos_exceptions.CosmosAccessConditionFailedError:
+        return
 
 
 async def _resolve_assembly_id_from_case_id(case_id: str) -> str:
@@ -399,36 +450,83 @@ def _fallback_evaluation_payload(case_id: str) -> dict[str, Any]:
     }
 
 
+def _evaluation_payload(result: EssayEvaluationResult) -> dict[str, Any]:
+    return {
+        "strategy": result.strategy.value,
+        "verdict": result.verdict,
+        "strengths": result.strengths,
+        "improvements": result.improvements,
+    }
+
+
+def _unresolved_assembly(case_id: str, exc: ValueError) -> HTTPException | None:
+    if not str(exc).startswith("Assembly not found:"):
+        return None
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=(
+            f"Unable to resolve assembly for case_id '{case_id}'. "
+            "Provide a valid assembly id or link the essay to an assembly."
+        ),
+    )
+
+
 @app.post("/grader/interaction", tags=["Evaluation"])
-async def grader_interaction(payload: ChatResponse) -> JSONResponse:
+async def grader_interaction(
+    payload: ChatResponse,
+    refresh: bool = Query(default=False, description="Re-run the evaluation instead of reusing a cached reply"),
+) -> JSONResponse:
     assembly_id = await _resolve_assembly_id_from_case_id(payload.case_id)
     try:
-        result = await orchestrator.invoke(assembly_id, payload.essay, payload.resources)
-        return JSONResponse(
-            {
-                "strategy": result.strategy.value,
-                "verdict": result.verdict,
-                "strengths": result.strengths,
-                "improvements": result.improvements,
-            }
-        )
+        with bypass_evaluation_cache(refresh):
+            result = await orchestrator.invoke(assembly_id, payload.essay, payload.resources)
+        return JSONResponse(_evaluation_payload(result))
     except ValueError as exc:
-        detail = str(exc)
-        if detail.startswith("Assembly not found:"):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=(
-                    f"Unable to resolve assembly for case_id '{payload.case_id}'. "
-                    "Provide a valid assembly id or link the essay to an assembly."
-                ),
-            ) from exc
+        if (error := _unresolved_assembly(payload.case_id, exc)) is not None:
+            raise error from exc
         return JSONResponse(_fallback_evaluation_payload(payload.case_id))
-    except RuntimeError:
+    except (RuntimeError, TimeoutError):
         return JSONResponse(_fallback_evaluation_payload(payload.case_id))
 
 
+@app.post("/grader/interaction/stream", tags=["Evaluation"])
+async def grader_interaction_stream(payload: ChatResponse) -> StreamingResponse:
+    """Server-sent events: ``delta`` events with feedback text as it is generated, then ``result``.
+
+    ``result`` carries the same payload as ``POST /grader/interaction``, including the
+    fallback feedback when grading fails.
+    """
+
+    assembly_id = await _resolve_assembly_id_from_case_id(payload.case_id)
+
+    async def _events() -> AsyncIterator[tuple[str, Any]]:
+        try:
+            strategy, agent, resources = await orchestrator.prepare(
+                assembly_id, payload.essay, payload.resources
+            )
+        except ValueError as exc:
+            if (error := _unresolved_assembly(payload.case_id, exc)) is not None:
+                raise error from exc
+            yield "result", _fallback_evaluation_payload(payload.case_id)
+            return
+        chunks: list[str] = []
+        try:
+            async for delta in strategy.stream(agent, payload.essay, resources):
+                chunks.append(delta)
+                yield "delta", {"text": delta}
+        except (RuntimeError, TimeoutError):
+            yield "result", _fallback_evaluation_payload(payload.case_id)
+            return
+        yield "result", _evaluation_payload(strategy.result_from_text("".join(chunks)))
+
+    return await stream_sse_response(_events())
+
+
 @app.post("/essays/{essay_id}/evaluate", tags=["Evaluation"])
-async def reprocess_essay_evaluation(essay_id: str) -> JSONResponse:
+async def reprocess_essay_evaluation(
+    essay_id: str,
+    refresh: bool = Query(default=False, description="Re-run the evaluation instead of reusing a cached reply"),
+) -> JSONResponse:
     document = await _require_essay_document(essay_id)
 
     assembly_id = document.get("assembly_id")
@@ -441,7 +539,8 @@ async def reprocess_essay_evaluation(essay_id: str) -> JSONResponse:
     essay_model = _essay_from_record(document)
     resources = await _resources_for_essay(essay_model.id)
     try:
-        result = await orchestrator.invoke(assembly_id, essay_model, resources)
+        with bypass_evaluation_cache(refresh):
+            result = await orchestrator.invoke(assembly_id, essay_model, resources)
         evaluation_payload = {
             "strategy": result.strategy.value,
             "verdict": result.verdict,
@@ -459,7 +558,7 @@ async def reprocess_essay_evaluation(essay_id: str) -> JSONResponse:
                 ),
             ) from exc
         evaluation_payload = _fallback_evaluation_payload(essay_id)
-    except RuntimeError:
+    except (RuntimeError, TimeoutError):
         evaluation_payload = _fallback_evaluation_payload(essay_id)
 
     return _create_success_response(
@@ -476,9 +575,9 @@ def _create_success_response(title: str, message: str, content: Any) -> JSONResp
 
 
 @app.get("/essays", tags=["Essays"])
-async def list_essays() -> JSONResponse:
-    items = await _crud(settings.cosmos.essay_container).list_items()
-    return _create_success_response("Essays Retrieved", "Essays fetched successfully", items)
+async def list_essays(page: PageQuery = Depends(page_query)) -> StreamingResponse:
+    crud = _crud(settings.cosmos.essay_container)
+    return await paged_success_response("Essays Retrieved", "Essays fetched successfully", crud, page)
 
 
 @app.get("/essays/{essay_id}", tags=["Essays"])
@@ -489,47 +588,53 @@ async def get_essay(essay_id: str) -> JSONResponse:
 
 @app.post("/essays", tags=["Essays"])
 async def create_essay(essay: Essay) -> JSONResponse:
-    await _crud(settings.cosmos.essay_container).create_item(essay.model_dump())
+    document = essay.model_dump()
+    await _crud(settings.cosmos.essay_container).create_item(document)
+    try:
+        await essay_index.record(document)
+    except cosmos_exceptions.CosmosHttpResponseError as exc:
+        # The essay is stored; reads of an unindexed essay fall back to a query and index it.
+        logger.warning("Could not index essay %s: %s", document["id"], exc)
     return _create_success_response("Essay Created", "Essay stored", essay.model_dump())
 
 
 @app.put("/essays/{essay_id}", tags=["Essays"])
 async def update_essay(essay_id: str, essay: Essay) -> JSONResponse:
-    existing = await _require_essay_document(essay_id)
     incoming = {k: v for k, v in essay.model_dump().items() if v is not None}
-    merged = {**existing, **incoming}
-    await _crud(settings.cosmos.essay_container).update_item(essay_id, merged)
-    return _create_success_response("Essay Updated", "Essay modified", merged)
+    updated = await _patch_essay_document(essay_id, incoming)
+    return _create_success_response("Essay Updated", "Essay modified", updated)
 
 
 @app.patch("/essays/{essay_id}", tags=["Essays"])
 async def patch_essay(essay_id: str, patch: EssayPatch) -> JSONResponse:
-    existing = await _require_essay_document(essay_id)
-    incoming = patch.model_dump(exclude_unset=True)
-    merged = {**existing, **incoming}
-    await _crud(settings.cosmos.essay_container).update_item(essay_id, merged)
-    return _create_success_response("Essay Updated", "Essay patched", merged)
+    updated = await _patch_essay_document(essay_id, patch.model_dump(exclude_unset=True))
+    return _create_success_response("Essay Updated", "Essay patched", updated)
 
 
 @app.delete("/essays/{essay_id}", tags=["Essays"])
 async def delete_essay(essay_id: str) -> JSONResponse:
     document = await _require_essay_document(essay_id)
-    partition_key = document.get("student_id") or essay_id
-    await _crud(settings.cosmos.essay_container).delete_item(essay_id, partition_key=partition_key)
+    await _crud(settings.cosmos.essay_container).delete_item(
+        essay_id, partition_key=essay_partition_key(document)
+    )
+    await essay_index.forget(essay_id)
     return _create_success_response("Essay Deleted", "Essay removed", {"essay_id": essay_id})
 
 
 @app.get("/resources", tags=["Resources"])
-async def list_resources() -> JSONResponse:
-    items = await _crud(settings.cosmos.resources_container).list_items()
-    for entry in items:
+async def list_resources(page: PageQuery = Depends(page_query)) -> StreamingResponse:
+    def _with_cached_content(entry: dict[str, Any]) -> dict[str, Any]:
         resource_id = str(entry.get("id") or "")
-        if not resource_id:
-            continue
-        cached_encoded = _get_cached_resource_content(resource_id)
-        if cached_encoded is not None:
-            entry["encoded_content"] = cached_encoded
-    return _create_success_response("Resources Retrieved", "Resources fetched", items)
+        if resource_id:
+            cached_encoded = _get_cached_resource_content(resource_id)
+            if cached_encoded is not None:
+                entry["encoded_content"] = cached_encoded
+        return entry
+
+    crud = _crud(settings.cosmos.resources_container)
+    return await paged_success_response(
+        "Resources Retrieved", "Resources fetched", crud, page, transform=_with_cached_content
+    )
 
 
 @app.post("/resources", tags=["Resources"])
@@ -640,21 +745,19 @@ async def upload_resource(
 @app.put("/resources/{resource_id}", tags=["Resources"])
 async def update_resource(resource_id: str, resource: Resource) -> JSONResponse:
     crud = _crud(settings.cosmos.resources_container)
-    try:
-        existing = await crud.read_item(resource_id)
-    except cosmos_exceptions.CosmosResourceNotFoundError as exc:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Resource not found") from exc
     incoming = resource.model_dump()
     encoded = incoming.get("encoded_content")
     binary_payload: bytes | None = None
     if isinstance(encoded, str):
         binary_payload = _decode_base64_payload(encoded)
-    _cache_resource_bytes(resource_id, binary_payload)
-    merged = {**existing, **incoming}
-    document_payload = {**merged, "encoded_content": None}
+    document_payload = {**incoming, "id": resource_id, "encoded_content": None}
     _ensure_resource_document_size(document_payload)
-    await crud.update_item(resource_id, document_payload)
-    response_payload = {**merged, "encoded_content": _get_cached_resource_content(resource_id)}
+    try:
+        updated = await crud.patch_item(resource_id, patch_fields(document_payload))
+    except cosmos_exceptions.CosmosResourceNotFoundError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Resource not found") from exc
+    _cache_resource_bytes(resource_id, binary_payload)
+    response_payload = {**updated, "encoded_content": _get_cached_resource_content(resource_id)}
     resource_model = Resource.model_validate(response_payload)
     return _create_success_response("Resource Updated", "Resource modified", resource_model.model_dump())
 
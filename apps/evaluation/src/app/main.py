@@ -7,10 +7,16 @@ from functools import lru_cache
 from os import getenv
 from typing import Mapping
 
-from fastapi import HTTPException
+from fastapi import Depends, HTTPException, Response
 from pydantic import ValidationError
 from pydantic import BaseModel
 from tutor_lib.config import create_app, get_settings
+from tutor_lib.schemas import (
+    CONTINUATION_HEADER,
+    InvalidContinuationError,
+    PageQuery,
+    page_query,
+)
 
 from app.store import (
     CosmosEvaluationRepository,
@@ -28,6 +34,9 @@ app = create_app(
 )
 
 
+DEFAULT_PAGE_SIZE = 100
+
+
 class RunRequest(BaseModel):
     agent_id: str
     dataset_id: str
@@ -74,8 +83,21 @@ async def create_dataset(
 
 
 @app.get("/datasets")
-async def list_datasets() -> list[Mapping[str, object]]:
-    datasets = await _repository().list_datasets()
+async def list_datasets(
+    response: Response,
+    page: PageQuery = Depends(page_query),
+) -> list[Mapping[str, object]]:
+    if not page.requested:
+        datasets = await _repository().list_datasets()
+        return [to_dict(dataset) for dataset in datasets]
+    try:
+        datasets, continuation = await _repository().list_datasets_page(
+            page.page_size or DEFAULT_PAGE_SIZE, page.continuation
+        )
+    except InvalidContinuationError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    if continuation:
+        response.headers[CONTINUATION_HEADER] = continuation
     return [to_dict(dataset) for dataset in datasets]
 
 
@@ -8,6 +8,7 @@ from dataclasses import dataclass, field
 from azure.cosmos import exceptions as cosmos_exceptions
 from tutor_lib.config import CosmosConfig
 from tutor_lib.cosmos import CosmosCRUD
+from tutor_lib.schemas import InvalidContinuationError
 
 
 @dataclass
@@ -35,6 +36,12 @@ class EvaluationRepository(ABC):
     async def list_datasets(self) -> list[DatasetRecord]:
         raise NotImplementedError
 
+    @abstractmethod
+    async def list_datasets_page(
+        self, page_size: int, continuation: str | None = None
+    ) -> tuple[list[DatasetRecord], str | None]:
+        raise NotImplementedError
+
     @abstractmethod
     async def get_dataset(self, dataset_id: str) -> DatasetRecord | None:
         raise NotImplementedError
@@ -60,6 +67,16 @@ class InMemoryEvaluationRepository(EvaluationRepository):
     async def list_datasets(self) -> list[DatasetRecord]:
         return list(self.datasets.values())
 
+    async def list_datasets_page(
+        self, page_size: int, continuation: str | None = None
+    ) -> tuple[list[DatasetRecord], str | None]:
+        if continuation is not None and not continuation.isdigit():
+            raise InvalidContinuationError(continuation)
+        start = int(continuation or 0)
+        datasets = list(self.datasets.values())
+        end = start + page_size
+        return datasets[start:end], str(end) if end < len(datasets) else None
+
     async def get_dataset(self, dataset_id: str) -> DatasetRecord | None:
         return self.datasets.get(dataset_id)
 
@@ -86,19 +103,34 @@ class CosmosEvaluationRepository(EvaluationRepository):
         await self._dataset_store.create_item(payload)
         return dataset
 
+    _DATASET_QUERY = "SELECT c.id, c.name, c.items FROM c WHERE c.docType = @docType"
+    _DATASET_PARAMETERS = ({"name": "@docType", "value": "dataset"},)
+
+    @staticmethod
+    def _dataset_record(item: dict) -> DatasetRecord:
+        return DatasetRecord(
+            dataset_id=item["id"],
+            name=item["name"],
+            items=item.get("items", []),
+        )
+
     async def list_datasets(self) -> list[DatasetRecord]:
         rows = await self._dataset_store.list_items(
-            query="SELECT c.id, c.name, c.items FROM c WHERE c.docType = @docType",
-            parameters=[{"name": "@docType", "value": "dataset"}],
+            query=self._DATASET_QUERY,
+            parameters=self._DATASET_PARAMETERS,
+        )
+        return [self._dataset_record(item) for item in rows]
+
+    async def list_datasets_page(
+        self, page_size: int, continuation: str | None = None
+    ) -> tuple[list[DatasetRecord], str | None]:
+        page = await self._dataset_store.query_page(
+            query=self._DATASET_QUERY,
+            parameters=self._DATASET_PARAMETERS,
+            page_size=page_size,
+            continuation=continuation,
         )
-        return [
-            DatasetRecord(
-                dataset_id=item["id"],
-                name=item["name"],
-                items=item.get("items", []),
-            )
-            for item in rows
-        ]
+        return [self._dataset_record(item) for item in page.items], page.continuation
 
     async def get_dataset(self, dataset_id: str) -> DatasetRecord | None:
         try:
@@ -6,7 +6,7 @@ from dataclasses import asdict
 from datetime import UTC, datetime
 from functools import lru_cache
 from os import getenv
-from typing import Annotated, Any
+from typing import Annotated, Any, Literal
 from urllib.parse import urlparse
 from uuid import uuid4
 
@@ -518,6 +518,9 @@ async def create_briefing(
 async def list_reports(
     request: Request,
     school_id: str | None = Query(default=None),
+    view: Literal["full", "summary"] = Query(
+        default="full", description="'summary' omits the report sections served by GET /reports/{report_id}."
+    ),
     user: AuthenticatedUser = require_supervisor_dep,
 ) -> JSONResponse:
     _enforce_pilot_supervisor_scope(user)
@@ -525,7 +528,7 @@ async def list_reports(
     allowed_school_ids = _resolve_allowed_school_ids(user, request, school_id)
     allowed_school_ids = _apply_pilot_school_scope(allowed_school_ids, requested_school_id=school_id)
 
-    reports = await _repository().list_reports(allowed_school_ids)
+    reports = await _repository().list_reports(allowed_school_ids, summary=view == "summary")
     return _success(
         "Reports Retrieved",
         "Insight reports fetched.",
@@ -537,11 +540,12 @@ async def list_reports(
 async def get_report(
     report_id: str,
     request: Request,
+    school_id: str | None = Query(default=None),
     user: AuthenticatedUser = require_supervisor_dep,
 ) -> JSONResponse:
     _enforce_pilot_supervisor_scope(user)
 
-    report = await _repository().get_report(report_id)
+    report = await _repository().get_report(report_id, school_id=school_id)
     if report is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Report not found")
 
@@ -558,7 +562,7 @@ async def create_feedback(
 ) -> JSONResponse:
     _enforce_pilot_supervisor_scope(user)
 
-    report = await _repository().get_report(payload.report_id)
+    report = await _repository().get_report(payload.report_id, school_id=payload.school_id)
     if report is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Report not found")
 
@@ -577,7 +581,7 @@ async def create_feedback(
         comments=payload.comments,
         submitted_at=datetime.now(UTC).isoformat(),
     )
-    saved = await _repository().create_feedback(feedback)
+    saved = await _repository().create_feedback(feedback, report=report)
     return _created("Feedback Saved", "Supervisor feedback stored.", feedback_to_dict(saved))
 
 
@@ -585,11 +589,12 @@ async def create_feedback(
 async def list_report_feedback(
     report_id: str,
     request: Request,
+    school_id: str | None = Query(default=None),
     user: AuthenticatedUser = require_supervisor_dep,
 ) -> JSONResponse:
     _enforce_pilot_supervisor_scope(user)
 
-    report = await _repository().get_report(report_id)
+    report = await _repository().get_report(report_id, school_id=school_id)
     if report is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Report not found")
 
@@ -5,8 +5,26 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from dataclasses import asdict, dataclass, field
 
+from azure.cosmos import exceptions as cosmos_exceptions
 from tutor_lib.config import CosmosConfig
-from tutor_lib.cosmos import CosmosCRUD
+from tutor_lib.cosmos import CosmosCRUD, PartitionKeyCache, patch_incr
+
+REPORT_DOC_TYPE = "insight_report"
+
+# Report properties needed by list views; the per-section payloads (indicators, trends,
+# alerts, focus points, improvements) are only served by the single-report endpoint.
+REPORT_SUMMARY_FIELDS: tuple[str, ...] = (
+    "report_id",
+    "school_id",
+    "supervisor_id",
+    "week_of",
+    "generated_at",
+    "source",
+    "feedback_count",
+    "trust",
+    "freshness",
+    "deep_links",
+)
 
 
 @dataclass
@@ -55,15 +73,18 @@ class InsightsRepository(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    async def list_reports(self, school_ids: set[str] | None = None) -> list[ReportRecord]:
+    async def list_reports(self, school_ids: set[str] | None = None, *, summary: bool = False) -> list[ReportRecord]:
+        """List reports newest first; ``summary`` leaves the section lists empty."""
         raise NotImplementedError
 
     @abstractmethod
-    async def get_report(self, report_id: str) -> ReportRecord | None:
+    async def get_report(self, report_id: str, school_id: str | None = None) -> ReportRecord | None:
+        """Fetch a report; ``school_id`` (its partition key) enables a point read when known."""
         raise NotImplementedError
 
     @abstractmethod
-    async def create_feedback(self, feedback: FeedbackRecord) -> FeedbackRecord:
+    async def create_feedback(self, feedback: FeedbackRecord, report: ReportRecord | None = None) -> FeedbackRecord:
+        """Store feedback and bump the report counter; pass ``report`` when already loaded."""
         raise NotImplementedError
 
     @abstractmethod
@@ -84,17 +105,19 @@ class InMemoryInsightsRepository(InsightsRepository):
         self.reports[report.report_id] = report
         return report
 
-    async def list_reports(self, school_ids: set[str] | None = None) -> list[ReportRecord]:
+    async def list_reports(self, school_ids: set[str] | None = None, *, summary: bool = False) -> list[ReportRecord]:
         rows = list(self.reports.values())
         if school_ids is not None:
             rows = [row for row in rows if row.school_id in school_ids]
         rows.sort(key=lambda row: row.generated_at, reverse=True)
+        if summary:
+            return [_payload_to_report(_project(asdict(row), REPORT_SUMMARY_FIELDS)) for row in rows]
         return rows
 
-    async def get_report(self, report_id: str) -> ReportRecord | None:
+    async def get_report(self, report_id: str, school_id: str | None = None) -> ReportRecord | None:
         return self.reports.get(report_id)
 
-    async def create_feedback(self, feedback: FeedbackRecord) -> FeedbackRecord:
+    async def create_feedback(self, feedback: FeedbackRecord, report: ReportRecord | None = None) -> FeedbackRecord:
         self.feedback_entries[feedback.feedback_id] = feedback
         report = self.reports.get(feedback.report_id)
         if report is not None:
@@ -132,50 +155,62 @@ class CosmosInsightsRepository(InsightsRepository):
     def __init__(self, cosmos: CosmosConfig) -> None:
         self._report_store = CosmosCRUD(cosmos.insights_report_container, cosmos)
         self._feedback_store = CosmosCRUD(cosmos.insights_feedback_container, cosmos)
+        self._report_partitions = PartitionKeyCache()
 
     async def create_report(self, report: ReportRecord) -> ReportRecord:
         await self._report_store.create_item(_report_to_payload(report))
+        self._report_partitions.remember(report.report_id, report.school_id)
         return report
 
-    async def list_reports(self, school_ids: set[str] | None = None) -> list[ReportRecord]:
-        if school_ids is None:
-            query = "SELECT * FROM c WHERE c.docType = @docType ORDER BY c.generated_at DESC"
-            parameters = [{"name": "@docType", "value": "insight_report"}]
-        elif not school_ids:
-            return []
-        else:
-            query = (
-                "SELECT * FROM c "
-                "WHERE c.docType = @docType AND ARRAY_CONTAINS(@schoolIds, c.school_id) "
-                "ORDER BY c.generated_at DESC"
-            )
-            parameters = [
-                {"name": "@docType", "value": "insight_report"},
-                {"name": "@schoolIds", "value": sorted(school_ids)},
-            ]
-
-        rows = await self._report_store.list_items(query=query, parameters=parameters)
-        return [_payload_to_report(row) for row in rows]
-
-    async def get_report(self, report_id: str) -> ReportRecord | None:
+    async def list_reports(self, school_ids: set[str] | None = None, *, summary: bool = False) -> list[ReportRecord]:
+        rows = await self._list_report_rows(school_ids, REPORT_SUMMARY_FIELDS if summary else None)
+        reports = [_payload_to_report(row) for row in rows]
+        for report in reports:
+            self._report_partitions.remember(report.report_id, report.school_id)
+        return reports
+
+    async def get_report(self, report_id: str, school_id: str | None = None) -> ReportRecord | None:
+        for partition_key in self._report_partitions.candidates(report_id, school_id):
+            try:
+                row = await self._report_store.read_item(report_id, partition_key=partition_key)
+            except cosmos_exceptions.CosmosResourceNotFoundError:
+                continue
+            if row.get("docType") == REPORT_DOC_TYPE:
+                self._report_partitions.remember(report_id, partition_key)
+                return _payload_to_report(row)
+
+        # Legacy fallback: the partition is unknown or the caller's hint was wrong.
         rows = await self._report_store.list_items(
             query="SELECT * FROM c WHERE c.id = @id AND c.docType = @docType",
             parameters=[
                 {"name": "@id", "value": report_id},
-                {"name": "@docType", "value": "insight_report"},
+                {"name": "@docType", "value": REPORT_DOC_TYPE},
             ],
         )
         if not rows:
             return None
-        return _payload_to_report(rows[0])
+        report = _payload_to_report(rows[0])
+        self._report_partitions.remember(report.report_id, report.school_id)
+        return report
 
-    async def create_feedback(self, feedback: FeedbackRecord) -> FeedbackRecord:
+    async def create_feedback(self, feedback: FeedbackRecord, report: ReportRecord | None = None) -> FeedbackRecord:
         await self._feedback_store.create_item(_feedback_to_payload(feedback))
 
-        report = await self.get_report(feedback.report_id)
+        # Server-side increment: no read, and concurrent feedback cannot lose updates.
+        school_id = report.school_id if report is not None else feedback.school_id
+        try:
+            patched = await self._report_store.patch_item(
+                feedback.report_id, [patch_incr("/feedback_count")], partition_key=school_id
+            )
+        except cosmos_exceptions.CosmosResourceNotFoundError:
+            located = await self.get_report(feedback.report_id)
+            if located is None:
+                return feedback
+            patched = await self._report_store.patch_item(
+                feedback.report_id, [patch_incr("/feedback_count")], partition_key=located.school_id
+            )
         if report is not None:
-            report.feedback_count += 1
-            await self._report_store.create_item(_report_to_payload(report))
+            report.feedback_count = int(patched.get("feedback_count", report.feedback_count + 1))
 
         return feedback
 
@@ -194,17 +229,18 @@ class CosmosInsightsRepository(InsightsRepository):
         return [_payload_to_feedback(row) for row in rows]
 
     async def get_pilot_metrics(self, school_ids: set[str] | None = None) -> PilotMetricsRecord:
-        reports = await self.list_reports(school_ids)
-        report_ids = {report.report_id for report in reports}
+        # Aggregates only need keys and ratings, so neither container ships full documents.
+        reports = await self._list_report_rows(school_ids, ("report_id", "school_id"))
+        report_ids = {str(report["report_id"]) for report in reports}
 
-        feedback_rows = await self._list_feedback(school_ids)
-        feedback_rows = [entry for entry in feedback_rows if entry.report_id in report_ids]
-        ratings = [entry.rating for entry in feedback_rows]
-        reports_with_feedback = len({entry.report_id for entry in feedback_rows})
+        feedback_rows = await self._list_feedback_rows(school_ids, ("report_id", "rating"))
+        feedback_rows = [entry for entry in feedback_rows if str(entry.get("report_id")) in report_ids]
+        ratings = [int(entry["rating"]) for entry in feedback_rows]
+        reports_with_feedback = len({str(entry["report_id"]) for entry in feedback_rows})
 
         average_rating = round(sum(ratings) / len(ratings), 3) if ratings else None
         feedback_rate = round(reports_with_feedback / len(reports), 3) if reports else 0.0
-        school_count = len({report.school_id for report in reports})
+        school_count = len({str(report["school_id"]) for report in reports})
 
         return PilotMetricsRecord(
             total_reports=len(reports),
@@ -215,7 +251,30 @@ class CosmosInsightsRepository(InsightsRepository):
             school_count=school_count,
         )
 
-    async def _list_feedback(self, school_ids: set[str] | None = None) -> list[FeedbackRecord]:
+    async def _list_report_rows(
+        self, school_ids: set[str] | None, fields: tuple[str, ...] | None
+    ) -> list[dict[str, object]]:
+        if school_ids is None:
+            query = "SELECT * FROM c WHERE c.docType = @docType ORDER BY c.generated_at DESC"
+            parameters = [{"name": "@docType", "value": REPORT_DOC_TYPE}]
+        elif not school_ids:
+            return []
+        else:
+            query = (
+                "SELECT * FROM c "
+                "WHERE c.docType = @docType AND ARRAY_CONTAINS(@schoolIds, c.school_id) "
+                "ORDER BY c.generated_at DESC"
+            )
+            parameters = [
+                {"name": "@docType", "value": REPORT_DOC_TYPE},
+                {"name": "@schoolIds", "value": sorted(school_ids)},
+            ]
+
+        return await self._report_store.list_items(query=query, parameters=parameters, fields=fields)
+
+    async def _list_feedback_rows(
+        self, school_ids: set[str] | None, fields: tuple[str, ...] | None
+    ) -> list[dict[str, object]]:
         if school_ids is None:
             query = "SELECT * FROM c WHERE c.docType = @docType"
             parameters = [{"name": "@docType", "value": "insight_feedback"}]
@@ -231,14 +290,13 @@ class CosmosInsightsRepository(InsightsRepository):
                 {"name": "@schoolIds", "value": sorted(school_ids)},
             ]
 
-        rows = await self._feedback_store.list_items(query=query, parameters=parameters)
-        return [_payload_to_feedback(row) for row in rows]
+        return await self._feedback_store.list_items(query=query, parameters=parameters, fields=fields)
 
 
 def _report_to_payload(report: ReportRecord) -> dict[str, object]:
     payload = asdict(report)
     payload["id"] = report.report_id
-    payload["docType"] = "insight_report"
+    payload["docType"] = REPORT_DOC_TYPE
     return payload
 
 
@@ -249,6 +307,10 @@ def _feedback_to_payload(feedback: FeedbackRecord) -> dict[str, object]:
     return payload
 
 
+def _project(payload: dict[str, object], fields: tuple[str, ...]) -> dict[str, object]:
+    return {name: payload[name] for name in fields if name in payload}
+
+
 def _payload_to_report(payload: dict[str, object]) -> ReportRecord:
     raw_trust = payload.get("trust")
     raw_freshness = payload.get("freshness")
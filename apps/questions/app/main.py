@@ -5,17 +5,17 @@ from __future__ import annotations
 import logging
 from dataclasses import asdict
 from functools import lru_cache
-from typing import Any
+from typing import Any, AsyncIterator
 
 from azure.cosmos import exceptions as cosmos_exceptions
-from fastapi import FastAPI, HTTPException, Request, status
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, status
 from fastapi.encoders import jsonable_encoder
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 
 from app.cosmos_crud import CosmosCRUD
-from app.questions import evaluate_question
+from app.questions import evaluate_question, stream_question_evaluation
 from app.interfaces import DimensionEvaluation, QuestionEvaluationResult, QuestionEvaluationStatus
 from app.schemas import (
     RESPONSES,
@@ -29,9 +29,19 @@ from app.schemas import (
     Question,
     SuccessMessage,
 )
-from tutor_lib.agents import FoundryAgentService
-from tutor_lib.config import get_settings
+from tutor_lib.agents import FoundryAgentService, bypass_evaluation_cache
+from tutor_lib.config import get_settings, lifespan
+from tutor_lib.cosmos import shared_query_cache
+from tutor_lib.metrics import instrument_app
 from tutor_lib.middleware import configure_entra_auth
+from tutor_lib.resilience import FOUNDRY, circuit_breaker_readiness, configure_load_shedding
+from tutor_lib.schemas import (
+    CONTINUATION_HEADER,
+    PageQuery,
+    page_query,
+    paged_success_response,
+    stream_sse_response,
+)
 
 
 logger = logging.getLogger(__name__)
@@ -49,6 +59,7 @@ app = FastAPI(
         {"name": "Assemblies", "description": "Agent assembly management"},
     ],
     openapi_url="/api/v1/openapi.json",
+    lifespan=lifespan,
     responses=RESPONSES,  # type: ignore[arg-type]
 )
 
@@ -59,8 +70,11 @@ app.add_middleware(
     allow_credentials=False,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[CONTINUATION_HEADER],
 )
 configure_entra_auth(app)
+instrument_app(app)
+configure_load_shedding(app)
 
 agent_service = FoundryAgentService(settings.azure_ai.project_endpoint)
 
@@ -71,13 +85,18 @@ async def health() -> dict[str, str]:
 
 
 @app.get("/ready", tags=["Evaluation"])
-async def ready() -> dict[str, str]:
-    return {"status": "ready"}
+async def ready() -> dict[str, Any]:
+    # Open circuits mean grading answers with fallback feedback until Foundry recovers.
+    return circuit_breaker_readiness(FOUNDRY)
 
 
 @lru_cache(maxsize=8)
 def _crud(container: str) -> CosmosCRUD:
-    return CosmosCRUD(container, settings.cosmos)
+    # Graders and assemblies are reference data; questions and answers change per request.
+    # Assembly writes must share the cache grading reads through, so they invalidate it.
+    reference_data = (settings.cosmos.grader_container, settings.cosmos.assembly_container)
+    cache = shared_query_cache(settings.cosmos) if container in reference_data else None
+    return CosmosCRUD(container, settings.cosmos, cache=cache)
 
 
 def _success(title: str, message: str, content: Any) -> JSONResponse:
@@ -145,22 +164,57 @@ async def global_exception_handler(_: Request, exc: Exception) -> JSONResponse:
 
 
 @app.post("/grader/interaction", tags=["Evaluation"])
-async def grader_interaction(payload: ChatResponse) -> JSONResponse:
+async def grader_interaction(
+    payload: ChatResponse,
+    refresh: bool = Query(default=False, description="Re-run the evaluation instead of reusing a cached reply"),
+    batched: bool | None = Query(
+        default=None,
+        description="Grade each deployment's dimensions in one run (defaults to GRADER_BATCHING_ENABLED)",
+    ),
+) -> JSONResponse:
     try:
-        result = await evaluate_question(payload.case_id, payload.question, payload.answer)
+        with bypass_evaluation_cache(refresh):
+            result = await evaluate_question(
+                payload.case_id, payload.question, payload.answer, batched=batched
+            )
     except ValueError as exc:
         logger.warning("Question evaluation fallback triggered: %s", exc)
         result = _fallback_question_evaluation(payload, str(exc))
-    except RuntimeError as exc:
+    except (RuntimeError, TimeoutError) as exc:
         logger.warning("Question evaluation runtime fallback triggered: %s", exc)
         result = _fallback_question_evaluation(payload, "runtime failure")
     return JSONResponse(jsonable_encoder(asdict(result)))
 
 
+@app.post("/grader/interaction/stream", tags=["Evaluation"])
+async def grader_interaction_stream(payload: ChatResponse) -> StreamingResponse:
+    """Server-sent events variant of ``/grader/interaction``.
+
+    Emits ``delta`` events (``{"dimension", "text"}``) while graders write, a ``dimension`` event
+    as each grader finishes and a final ``result`` event with the same payload as the JSON route.
+    Graders always run one per dimension here, since a batched reply is only usable once complete.
+    """
+
+    async def _events() -> AsyncIterator[tuple[str, Any]]:
+        try:
+            async for event, data in stream_question_evaluation(
+                payload.case_id, payload.question, payload.answer
+            ):
+                yield event, data if event == "delta" else asdict(data)
+        except ValueError as exc:
+            logger.warning("Question evaluation fallback triggered: %s", exc)
+            yield "result", asdict(_fallback_question_evaluation(payload, str(exc)))
+        except (RuntimeError, TimeoutError) as exc:
+            logger.warning("Question evaluation runtime fallback triggered: %s", exc)
+            yield "result", asdict(_fallback_question_evaluation(payload, "runtime failure"))
+
+    return await stream_sse_response(_events())
+
+
 @app.get("/questions", tags=["Questions"])
-async def list_questions() -> JSONResponse:
-    items = await _crud(settings.cosmos.question_container).list_items()
-    return _success("Questions Retrieved", "Questions fetched successfully", items)
+async def list_questions(page: PageQuery = Depends(page_query)) -> StreamingResponse:
+    crud = _crud(settings.cosmos.question_container)
+    return await paged_success_response("Questions Retrieved", "Questions fetched successfully", crud, page)
 
 
 @app.get("/questions/{question_id}", tags=["Questions"])
@@ -207,9 +261,9 @@ async def delete_question(question_id: str) -> JSONResponse:
 
 
 @app.get("/answers", tags=["Answers"])
-async def list_answers() -> JSONResponse:
-    items = await _crud(settings.cosmos.answer_container).list_items()
-    return _success("Answers Retrieved", "Answers fetched", items)
+async def list_answers(page: PageQuery = Depends(page_query)) -> StreamingResponse:
+    crud = _crud(settings.cosmos.answer_container)
+    return await paged_success_response("Answers Retrieved", "Answers fetched", crud, page)
 
 
 @app.post("/answers", tags=["Answers"])
@@ -242,9 +296,9 @@ async def delete_answer(answer_id: str) -> JSONResponse:
 
 
 @app.get("/graders", tags=["Graders"])
-async def list_graders() -> JSONResponse:
-    items = await _crud(settings.cosmos.grader_container).list_items()
-    return _success("Graders Retrieved", "Graders fetched", items)
+async def list_graders(page: PageQuery = Depends(page_query)) -> StreamingResponse:
+    crud = _crud(settings.cosmos.grader_container)
+    return await paged_success_response("Graders Retrieved", "Graders fetched", crud, page)
 
 
 @app.post("/graders", tags=["Graders"])
@@ -277,9 +331,9 @@ async def delete_grader(grader_id: str) -> JSONResponse:
 
 
 @app.get("/assemblies", tags=["Assemblies"])
-async def list_assemblies() -> JSONResponse:
-    items = await _crud(settings.cosmos.assembly_container).list_items()
-    return _success("Assemblies Retrieved", "Assemblies fetched", items)
+async def list_assemblies(page: PageQuery = Depends(page_query)) -> StreamingResponse:
+    crud = _crud(settings.cosmos.assembly_container)
+    return await paged_success_response("Assemblies Retrieved", "Assemblies fetched", crud, page)
 
 
 @app.post("/assemblies", tags=["Assemblies"])
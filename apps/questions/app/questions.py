@@ -3,20 +3,59 @@
 from __future__ import annotations
 
 import asyncio
+import json
+import logging
+import time
 from pathlib import Path
-from typing import Iterable, Protocol
-
-import jinja2
+from typing import Any, AsyncIterator, Callable, Iterable, Protocol
 
+from azure.ai.agents.models import ResponseFormatJsonSchema, ResponseFormatJsonSchemaType
+from azure.core.exceptions import AzureError
 from azure.cosmos import exceptions
 
 from tutor_lib.agents import FoundryAgentService
 from tutor_lib.config import get_settings
 from tutor_lib.cosmos import AssemblyRepository
+from tutor_lib.prompts import PromptContext, shared_prompt_composer
 
 from app.interfaces import DimensionEvaluation, QuestionEvaluationResult, QuestionEvaluationStatus
 from app.schemas import Answer, Assembly, Grader, Question
 
+logger = logging.getLogger(__name__)
+
+BATCH_GRADER_NAME = "question-batch-grader"
+BATCH_GRADER_INSTRUCTIONS = (
+    "You are a grade evaluation assistant. Each prompt holds a question, an answer and several"
+    " evaluation dimensions, each with its own instructions. Evaluate the answer on every"
+    " dimension independently, applying a dimension's instructions to that dimension only."
+)
+BATCH_RESPONSE_FORMAT = ResponseFormatJsonSchemaType(
+    json_schema=ResponseFormatJsonSchema(
+        name="dimension_evaluations",
+        schema={
+            "type": "object",
+            "properties": {
+                "dimensions": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "dimension": {"type": "string"},
+                            "verdict": {"type": "string"},
+                            "confidence": {"type": "number"},
+                            "notes": {"type": "array", "items": {"type": "string"}},
+                        },
+                        "required": ["dimension", "verdict", "confidence", "notes"],
+                        "additionalProperties": False,
+                    },
+                }
+            },
+            "required": ["dimensions"],
+            "additionalProperties": False,
+        },
+    )
+)
+
 
 class QuestionState(Protocol):
     async def evaluate(self, context: "QuestionStateMachine") -> QuestionEvaluationResult: ...
@@ -31,26 +70,180 @@ class PendingState:
 class EvaluatingState:
     async def evaluate(self, context: "QuestionStateMachine") -> QuestionEvaluationResult:
         await context.ensure_assembly()
-        tasks = [self._run_dimension(context, grader) for grader in context.graders]
-        dimension_results = await asyncio.gather(*tasks)
+        if context.batched:
+            dimension_results = await self._run_batched(context)
+        else:
+            tasks = [self._run_dimension(context, grader) for grader in context.graders]
+            dimension_results = await asyncio.gather(*tasks)
+        return self._complete(context, list(dimension_results))
+
+    async def stream(self, context: "QuestionStateMachine") -> AsyncIterator[tuple[str, Any]]:
+        """Run every grader concurrently and yield their output as it is produced.
+
+        Yields ``("delta", {"dimension", "text"})`` while graders write,
+        ``("dimension", DimensionEvaluation)`` as each one finishes and finally
+        ``("result", QuestionEvaluationResult)``.
+        """
+
+        await context.ensure_assembly()
+        graders = context.graders
+        queue: asyncio.Queue[tuple[str, Any]] = asyncio.Queue()
+        evaluations: dict[int, DimensionEvaluation] = {}
+
+        async def _pump(index: int, grader: Grader) -> None:
+            chunks: list[str] = []
+            try:
+                async for delta in context.agent_service.stream_agent(
+                    grader.agent_id, self._prompt(context, grader), deployment=grader.deployment
+                ):
+                    chunks.append(delta)
+                    await queue.put(("delta", {"dimension": grader.dimension, "text": delta}))
+                evaluations[index] = self._dimension_from_text(grader, "".join(chunks))
+                await queue.put(("dimension", evaluations[index]))
+            except Exception as exc:  # noqa: BLE001 - re-raised by the consumer
+                await queue.put(("error", exc))
+            finally:
+                await queue.put(("finished", None))
+
+        tasks = [asyncio.create_task(_pump(index, grader)) for index, grader in enumerate(graders)]
+        remaining = len(tasks)
+        try:
+            while remaining:
+                event, payload = await queue.get()
+                if event == "finished":
+                    remaining -= 1
+                elif event == "error":
+                    raise payload
+                else:
+                    yield event, payload
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        yield "result", self._complete(context, [evaluations[index] for index in range(len(graders))])
+
+    def _complete(
+        self, context: "QuestionStateMachine", dimension_results: list[DimensionEvaluation]
+    ) -> QuestionEvaluationResult:
         overall_summary = "\n".join(d.verdict for d in dimension_results)
         result = QuestionEvaluationResult(
             question_id=context.question.id,
             status=QuestionEvaluationStatus.COMPLETED,
             overall=overall_summary,
-            dimensions=list(dimension_results),
+            dimensions=dimension_results,
         )
         context.transition(CompletedState(result))
         return result
 
+    def _prompt(self, context: "QuestionStateMachine", grader: Grader) -> str:
+        return context.prompt_composer.render(
+            "correct.jinja", context.prompt_context, dimension=grader.dimension
+        )
+
     async def _run_dimension(self, context: "QuestionStateMachine", grader: Grader) -> DimensionEvaluation:
-        prompt = context.prompt_composer.render(
-            "correct.jinja",
-            question=context.question,
-            answer=context.answer,
-            dimension=grader.dimension,
+        raw_text = await context.agent_service.run_agent(
+            grader.agent_id, self._prompt(context, grader), deployment=grader.deployment
         )
-        raw_text = await context.agent_service.run_agent(grader.agent_id, prompt)
+        return self._dimension_from_text(grader, raw_text)
+
+    async def _run_batched(self, context: "QuestionStateMachine") -> list[DimensionEvaluation]:
+        """Grade each deployment's dimensions in one run, falling back to one run per dimension.
+
+        Graders whose instructions cannot be read, or that share a dimension name, are not
+        batched; dimensions the batched reply leaves out are graded on their own.
+        """
+
+        groups: dict[str, list[Grader]] = {}
+        for grader in context.graders:
+            groups.setdefault(grader.deployment, []).append(grader)
+        batches = {
+            deployment: asyncio.create_task(self._run_batch(context, graders))
+            for deployment, graders in groups.items()
+            if len(graders) > 1
+        }
+
+        async def _evaluate(grader: Grader) -> DimensionEvaluation:
+            batch = batches.get(grader.deployment)
+            evaluation = (await batch).get(grader.dimension) if batch is not None else None
+            return evaluation or await self._run_dimension(context, grader)
+
+        try:
+            return list(await asyncio.gather(*(_evaluate(grader) for grader in context.graders)))
+        finally:
+            for task in batches.values():
+                task.cancel()
+            await asyncio.gather(*batches.values(), return_exceptions=True)
+
+    async def _run_batch(
+        self, context: "QuestionStateMachine", graders: list[Grader]
+    ) -> dict[str, DimensionEvaluation]:
+        deployment = graders[0].deployment
+        batch_graders = context.batch_graders
+        try:
+            instructions = await asyncio.gather(
+                *(batch_graders.instructions(context.agent_service, grader) for grader in graders)
+            )
+            dimensions = [grader.dimension for grader in graders]
+            compatible = [
+                (grader, text)
+                for grader, text in zip(graders, instructions, strict=True)
+                if text and dimensions.count(grader.dimension) == 1
+            ]
+            if len(compatible) < 2:
+                return {}
+            agent_id = await batch_graders.agent_id(context.agent_service, deployment)
+            prompt = context.prompt_composer.render(
+                "batch.jinja",
+                context.prompt_context,
+                graders=[
+                    {"dimension": grader.dimension, "instructions": text}
+                    for grader, text in compatible
+                ],
+            )
+            try:
+                raw_text = await context.agent_service.run_agent(
+                    agent_id, prompt, deployment=deployment
+                )
+            except (AzureError, RuntimeError, TimeoutError):
+                # The agent may have been deleted; look it up again on the next batch.
+                batch_graders.forget(deployment, agent_id)
+                raise
+            return self._dimensions_from_json([grader for grader, _ in compatible], raw_text)
+        except (AzureError, ValueError, RuntimeError, TimeoutError) as exc:
+            logger.warning(
+                "Batched grading on %s fell back to one run per dimension: %s", deployment, exc
+            )
+            return {}
+
+    def _dimensions_from_json(
+        self, graders: list[Grader], raw_text: str
+    ) -> dict[str, DimensionEvaluation]:
+        payload = json.loads(raw_text)
+        entries = payload.get("dimensions") if isinstance(payload, dict) else None
+        if not isinstance(entries, list):
+            raise ValueError("Batched grading reply has no 'dimensions' list")
+        wanted = {grader.dimension for grader in graders}
+        evaluations: dict[str, DimensionEvaluation] = {}
+        for entry in entries:
+            if not isinstance(entry, dict) or entry.get("dimension") not in wanted:
+                continue
+            verdict = str(entry.get("verdict") or "").strip()
+            if not verdict:
+                continue
+            notes = [verdict, *(str(note).strip() for note in entry.get("notes") or [])]
+            notes = [note for note in notes if note]
+            confidence = entry.get("confidence")
+            if not isinstance(confidence, (int, float)) or not 0 <= confidence <= 1:
+                confidence = self._infer_confidence(notes)
+            evaluations[entry["dimension"]] = DimensionEvaluation(
+                dimension=entry["dimension"],
+                verdict=verdict,
+                confidence=float(confidence),
+                notes=notes,
+            )
+        return evaluations
+
+    def _dimension_from_text(self, grader: Grader, raw_text: str) -> DimensionEvaluation:
         notes = [line.strip() for line in raw_text.split("\n") if line.strip()]
         verdict = notes[0] if notes else "No verdict returned"
         confidence = self._infer_confidence(notes)
@@ -78,21 +271,85 @@ class CompletedState:
         return self._result
 
 
-class PromptComposer:
-    def __init__(self, template_dir: Path) -> None:
-        self._env = jinja2.Environment(loader=jinja2.FileSystemLoader(str(template_dir)))
+class BatchGraders:
+    """Look-ups behind batched grading, shared by every request of the process.
 
-    def render(self, template: str, *, question: Question, answer: Answer, dimension: str) -> str:
-        template_obj = self._env.get_template(template)
-        return template_obj.render(
-            question=question.model_dump(),
-            answer=answer.model_dump(),
-            dimension=dimension,
-        )
+    Holds each grader agent's instructions for ``instructions_ttl`` seconds, so edits to
+    an agent reach batched prompts, and the structured-output agent that grades several
+    dimensions at once on a deployment. That agent is found by name, model and
+    instructions before one is created, so restarts reuse it.
+    """
+
+    INSTRUCTIONS_TTL_SECONDS = 300.0
+
+    def __init__(
+        self,
+        *,
+        instructions_ttl: float = INSTRUCTIONS_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._instructions_ttl = instructions_ttl
+        self._clock = clock
+        self._instructions: dict[str, tuple[float, str | None]] = {}
+        self._agents: dict[str, str] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    async def instructions(self, agent_service: FoundryAgentService, grader: Grader) -> str | None:
+        now = self._clock()
+        cached = self._instructions.get(grader.agent_id)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+        try:
+            agent = await agent_service.get_agent(grader.agent_id)
+        except AzureError as exc:
+            logger.warning("Could not read instructions of grader %s: %s", grader.agent_id, exc)
+            return None
+        instructions = getattr(agent, "instructions", None) or None
+        self._instructions[grader.agent_id] = (now + self._instructions_ttl, instructions)
+        return instructions
+
+    async def agent_id(self, agent_service: FoundryAgentService, deployment: str) -> str:
+        # One look-up per deployment at a time, so concurrent batches do not each create an agent.
+        async with self._locks.setdefault(deployment, asyncio.Lock()):
+            agent_id = self._agents.get(deployment)
+            if agent_id is None:
+                for agent in await agent_service.list_agents():
+                    if (
+                        agent.name == BATCH_GRADER_NAME
+                        and agent.model == deployment
+                        and agent.instructions == BATCH_GRADER_INSTRUCTIONS
+                    ):
+                        agent_id = agent.id
+                        break
+                else:
+                    agent = await agent_service.create_agent(
+                        name=BATCH_GRADER_NAME,
+                        instructions=BATCH_GRADER_INSTRUCTIONS,
+                        deployment=deployment,
+                        response_format=BATCH_RESPONSE_FORMAT,
+                    )
+                    agent_id = agent.id
+                self._agents[deployment] = agent_id
+            return agent_id
+
+    def forget(self, deployment: str, agent_id: str) -> None:
+        """Drop the batch agent of ``deployment`` unless another one replaced it meanwhile."""
+        if self._agents.get(deployment) == agent_id:
+            del self._agents[deployment]
+
+
+_BATCH_GRADERS = BatchGraders()
 
 
 class QuestionStateMachine:
-    def __init__(self, assembly_id: str, question: Question, answer: Answer) -> None:
+    def __init__(
+        self,
+        assembly_id: str,
+        question: Question,
+        answer: Answer,
+        *,
+        batched: bool | None = None,
+    ) -> None:
         settings = get_settings()
         self._state: QuestionState = PendingState()
         self._settings = settings
@@ -100,11 +357,23 @@ class QuestionStateMachine:
         self.question = question
         self.answer = answer
         self.agent_service = FoundryAgentService(settings.azure_ai.project_endpoint)
+        self.batched = settings.azure_ai.grader_batching if batched is None else batched
+        self.batch_graders = _BATCH_GRADERS
         self._assembly_repository = AssemblyRepository(settings.cosmos)
-        self.prompt_composer = PromptComposer(Path(__file__).parent / "prompts")
+        self.prompt_composer = shared_prompt_composer(Path(__file__).parent / "prompts")
+        self._prompt_context: PromptContext | None = None
         self.graders: list[Grader] = []
         self._result: QuestionEvaluationResult | None = None
 
+    @property
+    def prompt_context(self) -> PromptContext:
+        """Question and answer dumped once and shared by every grader's prompt."""
+        if self._prompt_context is None:
+            self._prompt_context = self.prompt_composer.context(
+                question=self.question, answer=self.answer
+            )
+        return self._prompt_context
+
     def transition(self, state: QuestionState) -> None:
         self._state = state
 
@@ -112,6 +381,20 @@ class QuestionStateMachine:
         self._result = await self._state.evaluate(self)
         return self._result
 
+    async def stream(self) -> AsyncIterator[tuple[str, Any]]:
+        """Evaluate like :meth:`evaluate`, yielding the events of :meth:`EvaluatingState.stream`."""
+        state = self._state
+        if isinstance(state, PendingState):
+            state = EvaluatingState()
+            self.transition(state)
+        if not isinstance(state, EvaluatingState):
+            yield "result", await self.evaluate()
+            return
+        async for event, payload in state.stream(self):
+            if event == "result":
+                self._result = payload
+            yield event, payload
+
     async def ensure_assembly(self) -> None:
         if self.graders:
             return
@@ -137,6 +420,16 @@ class QuestionStateMachine:
         self.graders = graders
 
 
-async def evaluate_question(assembly_id: str, question: Question, answer: Answer) -> QuestionEvaluationResult:
-    machine = QuestionStateMachine(assembly_id, question, answer)
+async def evaluate_question(
+    assembly_id: str, question: Question, answer: Answer, *, batched: bool | None = None
+) -> QuestionEvaluationResult:
+    machine = QuestionStateMachine(assembly_id, question, answer, batched=batched)
     return await machine.evaluate()
+
+
+async def stream_question_evaluation(
+    assembly_id: str, question: Question, answer: Answer
+) -> AsyncIterator[tuple[str, Any]]:
+    machine = QuestionStateMachine(assembly_id, question, answer)
+    async for event in machine.stream():
+        yield event
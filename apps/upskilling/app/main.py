@@ -5,17 +5,20 @@ from __future__ import annotations
 from datetime import UTC, datetime
 from functools import lru_cache
 from os import getenv
-from typing import Any
+from typing import Any, Literal
 from uuid import uuid4
 
-from fastapi import Depends, FastAPI, HTTPException, Request, status
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, status
 from fastapi.encoders import jsonable_encoder
 from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
-from tutor_lib.config import get_settings
+from tutor_lib.agents import bypass_evaluation_cache
+from tutor_lib.config import get_settings, lifespan
+from tutor_lib.metrics import instrument_app
 from tutor_lib.middleware import configure_entra_auth, require_roles
 from tutor_lib.middleware.auth import AuthenticatedUser
+from tutor_lib.resilience import configure_load_shedding
 
 from .orchestrator import build_orchestrator
 from .schemas import (
@@ -50,6 +53,7 @@ app = FastAPI(
         {"name": "Planning", "description": "Evaluate class plans with iterative coaching."},
     ],
     openapi_url="/api/v1/openapi.json",
+    lifespan=lifespan,
     responses=RESPONSES,  # type: ignore[arg-type]
 )
 
@@ -62,6 +66,8 @@ app.add_middleware(
     allow_headers=["*"],
 )
 configure_entra_auth(app)
+instrument_app(app)
+configure_load_shedding(app)
 
 
 @lru_cache(maxsize=1)
@@ -150,9 +156,12 @@ async def create_plan(
 
 @app.get("/plans", tags=["Planning"])
 async def list_plans(
+    view: Literal["full", "summary"] = Query(
+        default="full", description="'summary' omits the plan content served by GET /plans/{plan_id}."
+    ),
     user: AuthenticatedUser = Depends(require_professor),
 ) -> JSONResponse:
-    plans = await _repository().list_plans(professor_id=user.subject)
+    plans = await _repository().list_plans(professor_id=user.subject, summary=view == "summary")
     return _success("Plans", "Plans retrieved.", [plan_to_dict(p) for p in plans])
 
 
@@ -161,7 +170,7 @@ async def get_plan(
     plan_id: str,
     user: AuthenticatedUser = Depends(require_professor),
 ) -> JSONResponse:
-    plan = await _repository().get_plan(plan_id)
+    plan = await _repository().get_plan(plan_id, professor_id=user.subject)
     if plan is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Plan not found")
     return _success("Plan", "Plan retrieved.", plan_to_dict(plan))
@@ -173,7 +182,7 @@ async def update_plan(
     payload: UpdatePlanRequest,
     user: AuthenticatedUser = Depends(require_professor),
 ) -> JSONResponse:
-    plan = await _repository().get_plan(plan_id)
+    plan = await _repository().get_plan(plan_id, professor_id=user.subject)
     if plan is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Plan not found")
 
@@ -204,7 +213,7 @@ async def delete_plan(
     plan_id: str,
     user: AuthenticatedUser = Depends(require_professor),
 ) -> JSONResponse:
-    plan = await _repository().get_plan(plan_id)
+    plan = await _repository().get_plan(plan_id, professor_id=user.subject)
     if plan is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Plan not found")
     await _repository().delete_plan(plan_id, plan.professor_id)
@@ -218,8 +227,9 @@ async def delete_plan(
 async def evaluate_persisted_plan(
     plan_id: str,
     user: AuthenticatedUser = Depends(require_professor),
+    refresh: bool = Query(default=False, description="Re-run the evaluation instead of reusing cached replies"),
 ) -> JSONResponse:
-    plan = await _repository().get_plan(plan_id)
+    plan = await _repository().get_plan(plan_id, professor_id=user.subject)
     if plan is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Plan not found")
 
@@ -233,7 +243,8 @@ async def evaluate_persisted_plan(
 
     try:
         orchestrator = build_orchestrator()
-        evaluations = await orchestrator.evaluate(request)
+        with bypass_evaluation_cache(refresh):
+            evaluations = await orchestrator.evaluate(request)
     except Exception:
         evaluations = [
             ParagraphEvaluation(
@@ -7,10 +7,16 @@ from functools import lru_cache
 from pathlib import Path
 from typing import Iterable, List
 
-import jinja2
-
-from tutor_lib.agents import AgentRegistry, AgentRunContext, AgentSpec
+from tutor_lib.agents import (
+    AgentRegistry,
+    AgentRunContext,
+    AgentSpec,
+    EvaluationCache,
+    evaluation_cache_key,
+    shared_evaluation_cache,
+)
 from tutor_lib.config import get_settings
+from tutor_lib.prompts import PromptComposer, PromptContext, shared_prompt_composer
 
 from .schemas import AgentFeedback, ParagraphEvaluation, PlanParagraph, PlanRequest
 
@@ -32,6 +38,7 @@ class PlanParagraphElement:
     index: int
     paragraph: PlanParagraph
     context: PlanContext
+    prompt_context: PromptContext | None = None
 
     async def accept(self, visitor: "PlanAgentVisitor") -> AgentFeedback:
         return await visitor.visit(self)
@@ -45,39 +52,53 @@ class PlanAgentVisitor:
 
     def __init__(
         self,
-        composer: "PromptComposer",
+        composer: PromptComposer,
         registry: AgentRegistry,
         instructions: str,
         deployment: str,
         *,
         temperature: float | None = None,
         max_tokens: int | None = None,
+        evaluation_cache: EvaluationCache | None = None,
     ) -> None:
         self._composer = composer
-        agent = registry.create(
-            AgentSpec(
-                name=self.agent_name,
-                instructions=instructions,
-                deployment=deployment,
-                temperature=temperature,
-                max_tokens=max_tokens,
-            )
+        self._instructions = instructions
+        self._deployment = deployment
+        self._evaluation_cache = evaluation_cache
+        self._registry = registry
+        self._spec = AgentSpec(
+            name=self.agent_name,
+            instructions=instructions,
+            deployment=deployment,
+            temperature=temperature,
+            max_tokens=max_tokens,
         )
-        self._runner = AgentRunContext(agent)
+        registry.create(self._spec)
 
     async def visit(self, element: PlanParagraphElement) -> AgentFeedback:
-        prompt = self._composer.render(
-            self.template_name,
-            paragraph=element.paragraph.model_dump(),
-            context={
-                "timeframe": element.context.timeframe,
-                "topic": element.context.topic,
-                "class_id": element.context.class_id,
-            },
-            performance_history=element.context.performance_history,
-        )
-        response = await self._runner.run(prompt)
-        text = _extract_text(response)
+        if element.prompt_context is None:
+            # Dumped once per paragraph and shared by every visitor.
+            element.prompt_context = self._composer.context(
+                paragraph=element.paragraph,
+                context={
+                    "timeframe": element.context.timeframe,
+                    "topic": element.context.topic,
+                    "class_id": element.context.class_id,
+                },
+                performance_history=element.context.performance_history,
+            )
+        prompt = self._composer.render(self.template_name, element.prompt_context)
+        if self._evaluation_cache is None:
+            text = await self._run(prompt)
+        else:
+            key = evaluation_cache_key(
+                self.agent_name,
+                self._deployment,
+                prompt,
+                instructions=self._instructions,
+                template_version=self._composer.template_version(self.template_name),
+            )
+            text = await self._evaluation_cache.get_or_run(key, lambda: self._run(prompt))
         verdict, strengths, improvements = _parse_feedback(text)
         return AgentFeedback(
             agent=self.agent_name,
@@ -87,6 +108,12 @@ class PlanAgentVisitor:
         )
 
 
+    async def _run(self, prompt: str) -> str:
+        # Looked up per run: the registry may have evicted and closed the agent meanwhile.
+        response = await AgentRunContext(self._registry.create(self._spec)).run(prompt)
+        return _extract_text(response)
+
+
 class PerformanceInsightVisitor(PlanAgentVisitor):
     agent_name = "performance-analyst"
     template_name = "performance.jinja"
@@ -102,17 +129,6 @@ class GuidanceCoachVisitor(PlanAgentVisitor):
     template_name = "guidance.jinja"
 
 
-class PromptComposer:
-    """Simple Jinja template wrapper for prompt rendering."""
-
-    def __init__(self, template_dir: Path) -> None:
-        loader = jinja2.FileSystemLoader(str(template_dir))
-        self._env = jinja2.Environment(loader=loader, autoescape=False, trim_blocks=True, lstrip_blocks=True)
-
-    def render(self, template_name: str, **context) -> str:
-        return self._env.get_template(template_name).render(**context)
-
-
 class PlanEvaluationIterator:
     """Async iterator that walks through plan paragraphs and applies all visitors."""
 
@@ -216,8 +232,9 @@ def _extract_text(response: object) -> str:
 def build_orchestrator() -> PlanEvaluationOrchestrator:
     settings = get_settings()
     registry = AgentRegistry(settings.azure_ai.project_endpoint)
-    template_dir = Path(__file__).parent / "prompts"
-    composer = PromptComposer(template_dir)
+    composer = shared_prompt_composer(
+        Path(__file__).parent / "prompts", trim_blocks=True, lstrip_blocks=True
+    )
 
     performance_instructions = (
         "You coach professors by analysing historical performance data."
@@ -234,9 +251,11 @@ def build_orchestrator() -> PlanEvaluationOrchestrator:
     deployment_default = settings.azure_ai.default_deployment
     deployment_reasoning = settings.azure_ai.reasoning_deployment
 
+    cache = shared_evaluation_cache(settings)
+
     visitors = [
-        PerformanceInsightVisitor(composer, registry, performance_instructions, deployment_reasoning, temperature=0.2, max_tokens=800),
-        ContentComplexityVisitor(composer, registry, content_instructions, deployment_default, temperature=0.3, max_tokens=700),
-        GuidanceCoachVisitor(composer, registry, guidance_instructions, deployment_default, temperature=0.4, max_tokens=700),
+        PerformanceInsightVisitor(composer, registry, performance_instructions, deployment_reasoning, temperature=0.2, max_tokens=800, evaluation_cache=cache),
+        ContentComplexityVisitor(composer, registry, content_instructions, deployment_default, temperature=0.3, max_tokens=700, evaluation_cache=cache),
+        GuidanceCoachVisitor(composer, registry, guidance_instructions, deployment_default, temperature=0.4, max_tokens=700, evaluation_cache=cache),
     ]
     return PlanEvaluationOrchestrator(visitors=visitors)
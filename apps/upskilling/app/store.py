@@ -5,8 +5,25 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 
+from azure.cosmos import exceptions as cosmos_exceptions
 from tutor_lib.config import CosmosConfig
-from tutor_lib.cosmos import CosmosCRUD
+from tutor_lib.cosmos import CosmosCRUD, PartitionKeyCache
+
+PLAN_DOC_TYPE = "plan"
+
+# Plan properties needed by the plan list; paragraphs, evaluations and performance
+# history are only served when a single plan is opened.
+PLAN_SUMMARY_FIELDS: tuple[str, ...] = (
+    "id",
+    "professor_id",
+    "title",
+    "timeframe",
+    "topic",
+    "class_id",
+    "status",
+    "created_at",
+    "updated_at",
+)
 
 
 @dataclass
@@ -31,11 +48,13 @@ class UpskillingRepository(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    async def list_plans(self, professor_id: str | None = None) -> list[PlanRecord]:
+    async def list_plans(self, professor_id: str | None = None, *, summary: bool = False) -> list[PlanRecord]:
+        """List plans; ``summary`` leaves paragraphs, evaluations and history empty."""
         raise NotImplementedError
 
     @abstractmethod
-    async def get_plan(self, plan_id: str) -> PlanRecord | None:
+    async def get_plan(self, plan_id: str, professor_id: str | None = None) -> PlanRecord | None:
+        """Fetch a plan; ``professor_id`` (its partition key) enables a point read when known."""
         raise NotImplementedError
 
     @abstractmethod
@@ -55,13 +74,18 @@ class InMemoryUpskillingRepository(UpskillingRepository):
         self.plans[plan.id] = plan
         return plan
 
-    async def list_plans(self, professor_id: str | None = None) -> list[PlanRecord]:
+    async def list_plans(self, professor_id: str | None = None, *, summary: bool = False) -> list[PlanRecord]:
         plans = list(self.plans.values())
         if professor_id is not None:
             plans = [p for p in plans if p.professor_id == professor_id]
+        if summary:
+            return [
+                _row_to_plan({name: value for name, value in plan.__dict__.items() if name in PLAN_SUMMARY_FIELDS})
+                for plan in plans
+            ]
         return plans
 
-    async def get_plan(self, plan_id: str) -> PlanRecord | None:
+    async def get_plan(self, plan_id: str, professor_id: str | None = None) -> PlanRecord | None:
         return self.plans.get(plan_id)
 
     async def update_plan(self, plan: PlanRecord) -> PlanRecord:
@@ -75,55 +99,76 @@ class InMemoryUpskillingRepository(UpskillingRepository):
 class CosmosUpskillingRepository(UpskillingRepository):
     def __init__(self, container_name: str, config: CosmosConfig) -> None:
         self._store = CosmosCRUD(container_name, config)
+        self._partitions = PartitionKeyCache()
 
     async def create_plan(self, plan: PlanRecord) -> PlanRecord:
         payload = _plan_to_payload(plan)
         await self._store.create_item(payload)
+        self._partitions.remember(plan.id, plan.professor_id)
         return plan
 
-    async def list_plans(self, professor_id: str | None = None) -> list[PlanRecord]:
+    async def list_plans(self, professor_id: str | None = None, *, summary: bool = False) -> list[PlanRecord]:
         if professor_id is not None:
             query = (
                 "SELECT * FROM c "
                 "WHERE c.docType = @docType AND c.professor_id = @professorId"
             )
             parameters = [
-                {"name": "@docType", "value": "plan"},
+                {"name": "@docType", "value": PLAN_DOC_TYPE},
                 {"name": "@professorId", "value": professor_id},
             ]
         else:
             query = "SELECT * FROM c WHERE c.docType = @docType"
-            parameters = [{"name": "@docType", "value": "plan"}]
+            parameters = [{"name": "@docType", "value": PLAN_DOC_TYPE}]
 
-        rows = await self._store.list_items(query=query, parameters=parameters)
-        return [_row_to_plan(item) for item in rows]
+        rows = await self._store.list_items(
+            query=query, parameters=parameters, fields=PLAN_SUMMARY_FIELDS if summary else None
+        )
+        plans = [_row_to_plan(item) for item in rows]
+        for plan in plans:
+            self._partitions.remember(plan.id, plan.professor_id)
+        return plans
 
-    async def get_plan(self, plan_id: str) -> PlanRecord | None:
+    async def get_plan(self, plan_id: str, professor_id: str | None = None) -> PlanRecord | None:
+        for partition_key in self._partitions.candidates(plan_id, professor_id):
+            try:
+                row = await self._store.read_item(plan_id, partition_key=partition_key)
+            except cosmos_exceptions.CosmosResourceNotFoundError:
+                continue
+            if row.get("docType") == PLAN_DOC_TYPE:
+                self._partitions.remember(plan_id, partition_key)
+                return _row_to_plan(row)
+
+        # Legacy fallback: the owner is unknown, e.g. an admin opening another professor's plan.
         query = (
             "SELECT * FROM c WHERE c.id = @id AND c.docType = @docType"
         )
         parameters = [
             {"name": "@id", "value": plan_id},
-            {"name": "@docType", "value": "plan"},
+            {"name": "@docType", "value": PLAN_DOC_TYPE},
         ]
         rows = await self._store.list_items(query=query, parameters=parameters)
         if not rows:
             return None
-        return _row_to_plan(rows[0])
+        plan = _row_to_plan(rows[0])
+        self._partitions.remember(plan.id, plan.professor_id)
+        return plan
 
     async def update_plan(self, plan: PlanRecord) -> PlanRecord:
         payload = _plan_to_payload(plan)
         await self._store.create_item(payload)
+        self._partitions.remember(plan.id, plan.professor_id)
         return plan
 
     async def delete_plan(self, plan_id: str, professor_id: str) -> None:
         await self._store.delete_item(plan_id, partition_key=professor_id)
+        self._partitions.forget(plan_id)
 
 
 def _plan_to_payload(plan: PlanRecord) -> dict:
     return {
         "id": plan.id,
-        "docType": "plan",
+        "docType": PLAN_DOC_TYPE,
         "professor_id": plan.professor_id,
         "title": plan.title,
         "timeframe": plan.timeframe,
@@ -60,7 +60,7 @@ const SupervisorSchoolDetailPage = () => {
     setDetailLoading(true);
     setDetailError("");
     try {
-      const report = await getInsightReport(reportId);
+      const report = await getInsightReport(reportId, schoolId);
       setSelectedReport(report);
     } catch (err: unknown) {
       setDetailError(err instanceof Error ? err.message : "Failed to load report details.");
@@ -68,7 +68,7 @@ const SupervisorSchoolDetailPage = () => {
     } finally {
       setDetailLoading(false);
     }
-  }, []);
+  }, [schoolId]);
 
   useEffect(() => {
     const loadReports = async () => {
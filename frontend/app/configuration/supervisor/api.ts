@@ -33,15 +33,19 @@ export interface CreateBriefingInput {
 }
 
 // Facade pattern: route pages consume typed operations without coupling to HTTP details.
+// List views only render report metadata; sections are loaded per report via getInsightReport.
 export async function listInsightReports(schoolId?: string): Promise<InsightReport[]> {
   const response = await insightsApi.get<InsightReport[]>("/reports", {
-    params: schoolId ? { school_id: schoolId } : undefined,
+    params: schoolId ? { school_id: schoolId, view: "summary" } : { view: "summary" },
   });
   return response.data;
 }
 
-export async function getInsightReport(reportId: string): Promise<InsightReport> {
-  const response = await insightsApi.get<InsightReport>(`/reports/${encodeURIComponent(reportId)}`);
+// Passing the school id lets the service point-read the report from its partition.
+export async function getInsightReport(reportId: string, schoolId?: string): Promise<InsightReport> {
+  const response = await insightsApi.get<InsightReport>(`/reports/${encodeURIComponent(reportId)}`, {
+    params: schoolId ? { school_id: schoolId } : undefined,
+  });
   return response.data;
 }
 
@@ -133,7 +133,10 @@ const UpskillingConfigPage = () => {
     setListLoading(true);
     setListError("");
     try {
-      const res = await upskillingApi.get("/plans", { headers: AUTH_HEADERS });
+      const res = await upskillingApi.get("/plans", {
+        headers: AUTH_HEADERS,
+        params: { view: "summary" },
+      });
       setPlans(unwrapContent<Plan[]>(res.data));
     } catch (err: unknown) {
       setListError(err instanceof Error ? err.message : "Failed to load plans.");
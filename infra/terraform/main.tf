@@ -350,6 +350,7 @@ resource "azurerm_cosmosdb_sql_container" "containers" {
   database_name         = azurerm_cosmosdb_sql_database.main.name
   partition_key_paths   = [each.value.partition_key_path]
   partition_key_version = 2
+  default_ttl           = each.value.default_ttl
 }
 
 # ── Service Bus: learner-record distribution seam ───────────────────────────
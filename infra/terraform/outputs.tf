@@ -84,6 +84,21 @@ output "COSMOS_ESSAY_TABLE" {
   value       = "essays"
 }
 
+output "COSMOS_ESSAY_INDEX_TABLE" {
+  description = "Cosmos DB container mapping essay ids to their partition key."
+  value       = "essay_index"
+}
+
+output "COSMOS_EVALUATION_CACHE_TABLE" {
+  description = "Cosmos DB container caching grader results; items expire through their ttl."
+  value       = "evaluation_cache"
+}
+
+output "COSMOS_RATE_LIMIT_TABLE" {
+  description = "Cosmos DB container holding the per-deployment TPM/RPM buckets shared by replicas."
+  value       = "rate_limits"
+}
+
 output "COSMOS_QUESTION_TABLE" {
   description = "Cosmos DB container name for questions."
   value       = "questions"
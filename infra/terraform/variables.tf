@@ -91,14 +91,25 @@ variable "agent_principal_object_ids" {
 }
 
 variable "cosmos_containers" {
-  description = "Cosmos DB SQL containers with partition key paths."
+  description = "Cosmos DB SQL containers with partition key paths and optional default TTL (-1 enables per-item ttl)."
   type = map(object({
     partition_key_path = string
+    default_ttl        = optional(number)
   }))
   default = {
     essays = {
       partition_key_path = "/student_id"
     }
+    essay_index = {
+      partition_key_path = "/id"
+    }
+    evaluation_cache = {
+      partition_key_path = "/id"
+      default_ttl        = -1
+    }
+    rate_limits = {
+      partition_key_path = "/id"
+    }
     questions = {
       partition_key_path = "/student_id"
     }
@@ -1,3 +1,56 @@
-from .clients import AgentAttachment, AgentRegistry, AgentRunContext, AgentSpec, FoundryAgentService
+from .clients import (
+    AgentAttachment,
+    AgentRegistry,
+    AgentRunContext,
+    AgentSpec,
+    FoundryAgentService,
+    close_agent_registries,
+)
+from .evaluations import (
+    CosmosEvaluationCache,
+    EvaluationCache,
+    InMemoryEvaluationCache,
+    bypass_evaluation_cache,
+    evaluation_cache_key,
+    shared_evaluation_cache,
+)
+from .pool import ProjectClientPool, close_project_clients, get_project_client_pool
+from .ratelimit import (
+    CosmosRateLimitStore,
+    DeploymentQuota,
+    DeploymentRateLimiter,
+    InMemoryRateLimitStore,
+    RateLimitExceededError,
+    RateLimitStore,
+    estimate_tokens,
+    shared_rate_limiter,
+)
+from .uploads import AttachmentUploadCache, shared_upload_cache
 
-__all__ = ["AgentAttachment", "AgentRegistry", "AgentRunContext", "AgentSpec", "FoundryAgentService"]
+__all__ = [
+    "AgentAttachment",
+    "AgentRegistry",
+    "AgentRunContext",
+    "AgentSpec",
+    "AttachmentUploadCache",
+    "CosmosEvaluationCache",
+    "CosmosRateLimitStore",
+    "DeploymentQuota",
+    "DeploymentRateLimiter",
+    "EvaluationCache",
+    "FoundryAgentService",
+    "InMemoryEvaluationCache",
+    "InMemoryRateLimitStore",
+    "ProjectClientPool",
+    "RateLimitExceededError",
+    "RateLimitStore",
+    "bypass_evaluation_cache",
+    "close_agent_registries",
+    "close_project_clients",
+    "estimate_tokens",
+    "evaluation_cache_key",
+    "get_project_client_pool",
+    "shared_evaluation_cache",
+    "shared_rate_limiter",
+    "shared_upload_cache",
+]
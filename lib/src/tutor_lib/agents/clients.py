@@ -3,28 +3,56 @@
 from __future__ import annotations
 
 import asyncio
+import functools
+import hashlib
 import inspect
 import logging
+import time
+import weakref
 import agent_framework as _af
-from contextlib import asynccontextmanager
+from collections import OrderedDict
+from contextlib import (
+    AbstractContextManager,
+    aclosing,
+    asynccontextmanager,
+    contextmanager,
+    nullcontext,
+)
 from dataclasses import dataclass, field
 from io import BytesIO
-from typing import Any, AsyncIterator, Callable, Iterable, Sequence, cast
+from typing import Any, AsyncIterator, Callable, Iterable, Iterator, Sequence, cast
 
 _Agent = getattr(_af, "Agent", getattr(_af, "ChatAgent", None))
 from agent_framework_azure_ai import AzureAIAgentClient
-from azure.ai.agents.models import Agent, ListSortOrder, RunStatus
-from azure.ai.projects.aio import AIProjectClient
+from azure.ai.agents.models import Agent, AgentStreamEvent, ListSortOrder, RunStatus, ThreadRun
 from azure.core.credentials_async import AsyncTokenCredential
 from azure.core import exceptions as azure_exceptions
 from azure.core.exceptions import AzureError
 from azure.identity.aio import DefaultAzureCredential as AsyncDefaultAzureCredential
 
+from tutor_lib.metrics import MetricsSink, current_route, get_metrics_sink
+from tutor_lib.resilience import FOUNDRY, CircuitBreaker, RetryPolicy, get_bulkhead, get_circuit_breaker
+
+from .evaluations import EvaluationCache, evaluation_cache_key, shared_evaluation_cache
+from .pool import ProjectClientPool, get_project_client_pool
+from .ratelimit import DeploymentRateLimiter, estimate_tokens, shared_rate_limiter
 from .tooling import ToolBuilder
+from .uploads import AttachmentUploadCache, CachedUpload, shared_upload_cache
 
 
 logger = logging.getLogger(__name__)
 AgentType = Any
+AGENT_RETRY_POLICY = RetryPolicy(max_attempts=3, base_delay=0.5, max_delay=8.0, deadline=180.0)
+_TRANSITIONAL_RUN_STATUSES = frozenset(
+    status
+    for status in (
+        RunStatus.QUEUED,
+        RunStatus.IN_PROGRESS,
+        RunStatus.CANCELLING,
+        getattr(RunStatus, "STARTING", None),
+    )
+    if status is not None
+)
 
 
 @dataclass(slots=True)
@@ -50,60 +78,254 @@ class AgentAttachment:
     tool_type: str = "vision"
 
 
+@dataclass(slots=True, eq=False)
+class _CachedAgent:
+    agent: AgentType
+    client: Any
+    refs: int = 0
+    evicted: bool = False
+
+
 class AgentRegistry:
-    """Factory that creates ChatAgent instances backed by Azure AI Foundry."""
+    """Factory that creates ChatAgent instances backed by Azure AI Foundry.
+
+    Agents are cached by name, deployment, a hash of the instructions, tools and sampling
+    settings, so a conversational service that rebuilds the same spec every turn reuses one
+    ``AzureAIAgentClient`` and the Foundry agent it created. All clients share one credential.
+    Past ``max_agents`` the least recently used agent is evicted and closed in the background,
+    which deletes its Foundry agent; an agent evicted while :class:`AgentRunContext` runs it
+    is closed once those runs finish. :meth:`close` releases everything on shutdown.
+    """
 
-    def __init__(self, project_endpoint: str, credential_factory: Callable[[], Any] | None = None) -> None:
+    def __init__(
+        self,
+        project_endpoint: str,
+        credential_factory: Callable[[], Any] | None = None,
+        *,
+        max_agents: int = 32,
+    ) -> None:
+        if max_agents < 1:
+            raise ValueError("max_agents must be at least 1")
         self._project_endpoint = project_endpoint
         self._credential_factory = credential_factory or AsyncDefaultAzureCredential
+        self._credential: Any | None = None
         self._tool_builder = ToolBuilder()
+        self._max_agents = max_agents
+        self._agents: OrderedDict[tuple[Any, ...], _CachedAgent] = OrderedDict()
+        self._held: dict[int, _CachedAgent] = {}
+        self._retired: list[Any] = []
+        self._closing: set[asyncio.Task[None]] = set()
+        _REGISTRIES.add(self)
+
+    def __len__(self) -> int:
+        return len(self._agents)
+
+    @staticmethod
+    def key(spec: AgentSpec) -> tuple[Any, ...]:
+        tools = tuple(
+            f"{getattr(tool, '__module__', '')}.{getattr(tool, '__qualname__', repr(tool))}"
+            for tool in spec.tools
+        )
+        instructions = hashlib.sha256(spec.instructions.encode("utf-8")).hexdigest()
+        return spec.name, spec.deployment, instructions, tools, spec.temperature, spec.max_tokens
 
     def create(self, spec: AgentSpec) -> AgentType:
-        """Create a ChatAgent wrapping an AzureAIAgentClient."""
+        """Return the ChatAgent for ``spec``, creating it on first use."""
+        key = self.key(spec)
+        cached = self._agents.get(key)
+        if cached is not None:
+            self._agents.move_to_end(key)
+            return cached.agent
+
         if _Agent is None:
             raise RuntimeError(
                 "The installed agent-framework package does not export Agent/ChatAgent. "
                 "Install a compatible agent-framework version."
             )
+        if self._credential is None:
+            self._credential = self._credential_factory()
         client = AzureAIAgentClient(
             project_endpoint=self._project_endpoint,
             model_deployment_name=spec.deployment,
-            async_credential=self._credential_factory(),
+            async_credential=self._credential,
             agent_name=spec.name,
         )
         configured_tools = self._tool_builder.from_callbacks(spec.tools)
-        return _Agent(
+        agent = _Agent(
             chat_client=client,
             instructions=spec.instructions,
             name=spec.name,
             tools=configured_tools or None,
         )
+        entry = _CachedAgent(agent, client)
+        self._agents[key] = entry
+        self._held[id(agent)] = entry
+        while len(self._agents) > self._max_agents:
+            _, evicted = self._agents.popitem(last=False)
+            evicted.evicted = True
+            if evicted.refs == 0:
+                self._held.pop(id(evicted.agent), None)
+                self._retire(evicted.client)
+        return agent
+
+    def holds(self, agent: AgentType) -> bool:
+        entry = self._held.get(id(agent))
+        return entry is not None and entry.agent is agent
+
+    @contextmanager
+    def hold(self, agent: AgentType) -> Iterator[AgentType]:
+        """Keep ``agent``'s client open while the block runs, even if it is evicted meanwhile."""
+        entry = self._held.get(id(agent))
+        if entry is None or entry.agent is not agent:
+            yield agent
+            return
+        entry.refs += 1
+        try:
+            yield agent
+        finally:
+            entry.refs -= 1
+            if entry.evicted and entry.refs == 0 and self._held.get(id(agent)) is entry:
+                del self._held[id(agent)]
+                self._retire(entry.client)
+
+    def _retire(self, client: Any) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._retired.append(client)
+            return
+        task = loop.create_task(self._close_client(client))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    @staticmethod
+    async def _close_client(client: Any) -> None:
+        close_method = getattr(client, "close", None)
+        if not callable(close_method):
+            return
+        try:
+            result = close_method()
+            if inspect.isawaitable(result):
+                await result
+        except Exception as exc:  # noqa: BLE001 - teardown must not mask shutdown
+            logger.warning("Failed to close agent client: %s", exc)
+
+    async def close(self) -> None:
+        """Close every cached agent client, then the shared credential."""
+        clients = [entry.client for entry in self._held.values()] + self._retired
+        self._agents.clear()
+        self._held.clear()
+        self._retired = []
+        for client in clients:
+            await self._close_client(client)
+        if self._closing:
+            await asyncio.gather(*self._closing, return_exceptions=True)
+        credential, self._credential = self._credential, None
+        if credential is not None:
+            await self._close_client(credential)
+
+
+_REGISTRIES: weakref.WeakSet[AgentRegistry] = weakref.WeakSet()
+
+
+async def close_agent_registries() -> None:
+    """Close the agents of every live :class:`AgentRegistry`; called on app shutdown."""
+    for registry in list(_REGISTRIES):
+        await registry.close()
+
+
+def _hold(agent: AgentType) -> AbstractContextManager[Any]:
+    for registry in list(_REGISTRIES):
+        if registry.holds(agent):
+            return registry.hold(agent)
+    return nullcontext(agent)
 
 
 class AgentRunContext:
-    """Wrapper that executes a ChatAgent and returns the response."""
+    """Wrapper that executes a ChatAgent and returns the response.
+
+    Runs hold the agent in its :class:`AgentRegistry`, so eviction never closes a client
+    mid-run.
+    """
 
     def __init__(self, agent: AgentType) -> None:
         self._agent = agent
 
     async def run(self, prompt: str, **kwargs: Any) -> Any:
         """Run the agent with the given prompt."""
-        result = self._agent.run(prompt, **kwargs)
-        if asyncio.iscoroutine(result):
-            return await result
-        return result
+        with _hold(self._agent):
+            result = self._agent.run(prompt, **kwargs)
+            if asyncio.iscoroutine(result):
+                return await result
+            return result
+
+    async def stream(self, prompt: str, **kwargs: Any) -> AsyncIterator[str]:
+        """Yield text deltas of the agent's reply; non-streaming agents yield the full text once."""
+        with _hold(self._agent):
+            legacy = getattr(self._agent, "run_stream", None)
+            updates = legacy(prompt, **kwargs) if callable(legacy) else self._agent.run(prompt, stream=True, **kwargs)
+            if inspect.isawaitable(updates) and not hasattr(updates, "__aiter__"):
+                updates = await updates
+            if not hasattr(updates, "__aiter__"):
+                text = getattr(updates, "text", None)
+                yield str(text if text is not None else updates)
+                return
+            async for update in updates:
+                text = getattr(update, "text", None)
+                if text:
+                    yield str(text)
 
 
 class FoundryAgentService:
-    """Manage Azure AI Foundry agents: create, delete, run, list."""
+    """Manage Azure AI Foundry agents: create, delete, run, list.
+
+    Calls go through a long-lived ``AIProjectClient`` from :class:`ProjectClientPool`, which
+    the app lifespan closes on shutdown.
+    """
+
+    POLL_INITIAL_INTERVAL = 0.1
+    POLL_MAX_INTERVAL = 2.0
 
     def __init__(
         self,
         endpoint: str,
         credential_factory: Callable[[], AsyncTokenCredential] | None = None,
+        retry_policy: RetryPolicy | None = None,
+        *,
+        pool: ProjectClientPool | None = None,
+        upload_cache: AttachmentUploadCache | None = None,
+        evaluation_cache: EvaluationCache | None = None,
+        rate_limiter: DeploymentRateLimiter | None = None,
+        run_deadline: float | None = None,
+        streaming: bool | None = None,
+        metrics_sink: MetricsSink | None = None,
+        sleep: Callable[[float], Any] | None = None,
+        clock: Callable[[], float] = time.monotonic,
     ) -> None:
+        from tutor_lib.config import get_settings
+
+        azure_ai = get_settings().azure_ai
         self._endpoint = endpoint
-        self._credential_factory = credential_factory or AsyncDefaultAzureCredential
+        self._retry_policy = retry_policy or AGENT_RETRY_POLICY
+        self._run_deadline = run_deadline if run_deadline is not None else azure_ai.agent_run_deadline
+        self._streaming = streaming if streaming is not None else azure_ai.agent_run_streaming
+        self._metrics_sink = metrics_sink
+        self._sleep = sleep or asyncio.sleep
+        self._clock = clock
+        self._upload_cache = upload_cache if upload_cache is not None else shared_upload_cache(azure_ai)
+        self._evaluation_cache = (
+            evaluation_cache if evaluation_cache is not None else shared_evaluation_cache()
+        )
+        self._rate_limiter = rate_limiter if rate_limiter is not None else shared_rate_limiter()
+        self._completion_token_estimate = azure_ai.completion_token_estimate
+        # Share the process-wide project client unless the caller brings its own credential.
+        self._owns_pool = pool is None and credential_factory is not None
+        if pool is not None:
+            self._pool = pool
+        elif credential_factory is not None:
+            self._pool = ProjectClientPool(credential_factory=credential_factory)
+        else:
+            self._pool = get_project_client_pool()
 
     @staticmethod
     def _is_retryable_azure_error(exc: AzureError) -> bool:
@@ -117,58 +339,264 @@ class FoundryAgentService:
             return True
         return status_code >= 500
 
-    async def _with_retries(self, operation: str, callback: Callable[[], Any]) -> Any:
-        delay_seconds = 0.5
-        max_attempts = 3
-        last_error: Exception | None = None
+    @classmethod
+    def _should_retry(cls, exc: BaseException) -> bool:
+        return isinstance(exc, AzureError) and cls._is_retryable_azure_error(exc)
 
-        for attempt in range(1, max_attempts + 1):
-            try:
+    @classmethod
+    def _is_outage(cls, exc: BaseException) -> bool:
+        # Only transient service failures trip the breaker; bad requests and shed load do not.
+        return isinstance(exc, TimeoutError) or cls._should_retry(exc)
+
+    def _breaker(self, deployment: str | None) -> CircuitBreaker | None:
+        from tutor_lib.config import get_settings
+
+        if not get_settings().circuit_breaker.enabled:
+            return None
+        return get_circuit_breaker(FOUNDRY, deployment or self._endpoint)
+
+    async def _with_retries(
+        self,
+        operation: str,
+        callback: Callable[[], Any],
+        *,
+        deployment: str | None = None,
+        tokens: int | None = None,
+    ) -> Any:
+        # Runs for one deployment share its bulkhead; management calls share the project's.
+        bulkhead = get_bulkhead(FOUNDRY, deployment or self._endpoint)
+
+        async def _attempt() -> Any:
+            # Every attempt spends quota, and waiting for it must not hold a bulkhead slot.
+            if tokens is not None and self._rate_limiter is not None:
+                await self._rate_limiter.acquire(deployment, tokens)
+            async with bulkhead:
                 return await callback()
-            except AzureError as exc:
-                if not self._is_retryable_azure_error(exc):
-                    raise
-                last_error = exc
-                if attempt == max_attempts:
-                    break
-                await asyncio.sleep(delay_seconds)
-                delay_seconds *= 2
-
-        if last_error is not None:
-            raise last_error
-        raise RuntimeError(f"{operation} failed without an explicit exception")
 
-    @asynccontextmanager
-    async def _credential(self) -> AsyncIterator[AsyncTokenCredential]:
-        credential = self._credential_factory()
-        has_async_cm = all(
-            callable(getattr(credential, attr, None)) for attr in ("__aenter__", "__aexit__")
-        )
-        if has_async_cm:
-            token = await credential.__aenter__()
-            try:
-                yield token
-            finally:
-                await credential.__aexit__(None, None, None)
-        else:
-            try:
-                yield credential
-            finally:
-                close_method = getattr(credential, "close", None)
-                if callable(close_method):
-                    result = close_method()
-                    if inspect.isawaitable(result):
-                        await result
+        return await self._retry_policy.run(operation, _attempt, is_retryable=self._should_retry)
 
     @asynccontextmanager
     async def _client(self) -> AsyncIterator[Any]:
-        async with self._credential() as credential:
-            project_client = AIProjectClient(endpoint=self._endpoint, credential=credential)
-            await project_client.__aenter__()
+        project_client = await self._pool.client(self._endpoint)
+        yield project_client.agents
+
+    async def close(self) -> None:
+        """Close a pool this service created for its own ``credential_factory``."""
+        if self._owns_pool:
+            await self._pool.close()
+
+    async def _run_events(
+        self, client: Any, thread_id: str, agent_id: str, deployment: str | None
+    ) -> AsyncIterator[Any]:
+        """Start a run and yield its text deltas (``str``), then the terminal run.
+
+        Streams run events when the SDK supports it, so deltas and completion arrive as soon
+        as the service emits them; otherwise polls with intervals doubling from
+        ``POLL_INITIAL_INTERVAL`` to ``POLL_MAX_INTERVAL``. ``run_deadline`` bounds the whole
+        run; it is applied to each wait on the service so it never fires inside a consumer.
+        """
+        deadline = asyncio.get_running_loop().time() + self._run_deadline
+        started = self._clock()
+        stream = getattr(client.runs, "stream", None)
+        mode = "stream" if self._streaming and callable(stream) else "poll"
+        attributes = {"deployment": deployment or "unknown", "mode": mode, "route": current_route()}
+        sink = self._metrics_sink or get_metrics_sink()
+        run: Any = None
+        try:
+            if mode == "stream":
+                async with asyncio.timeout_at(deadline):
+                    opened = await stream(thread_id=thread_id, agent_id=agent_id)
+                async with opened as events:
+                    iterator = aiter(events)
+                    first_token = False
+                    while True:
+                        async with asyncio.timeout_at(deadline):
+                            event = await anext(iterator, None)
+                        if event is None:
+                            break
+                        event_type, data, _ = event
+                        if isinstance(data, ThreadRun):
+                            run = data
+                            if run.status not in _TRANSITIONAL_RUN_STATUSES:
+                                break
+                        elif event_type == AgentStreamEvent.THREAD_MESSAGE_DELTA:
+                            if not first_token:
+                                first_token = True
+                                elapsed_ms = (self._clock() - started) * 1000
+                                sink.observe("agent.run.ttft_ms", elapsed_ms, attributes)
+                            text = getattr(data, "text", "")
+                            if text:
+                                yield text
+                if run is None:
+                    raise RuntimeError("Agent run stream ended before the run was created.")
+            else:
+                async with asyncio.timeout_at(deadline):
+                    run = await client.runs.create(thread_id=thread_id, agent_id=agent_id)
+            async with asyncio.timeout_at(deadline):
+                # A stream that closes early leaves a transitional run, which is finished by polling.
+                run = await self._poll_run(client, thread_id, run)
+        except TimeoutError:
+            if run is not None:
+                await self._cancel_run(client, thread_id, run.id)
+            sink.increment("agent.run.timeouts", 1, attributes)
+            raise TimeoutError(f"Agent run did not finish within {self._run_deadline:.0f}s.") from None
+
+        status = getattr(run.status, "value", run.status)
+        sink.observe(
+            "agent.run.latency_ms", (self._clock() - started) * 1000, {**attributes, "status": str(status)}
+        )
+        yield run
+
+    async def _complete_run(
+        self, client: Any, thread_id: str, agent_id: str, deployment: str | None
+    ) -> Any:
+        run: Any = None
+        async for event in self._run_events(client, thread_id, agent_id, deployment):
+            run = event
+        return run
+
+    async def _poll_run(self, client: Any, thread_id: str, run: Any) -> Any:
+        delay = self.POLL_INITIAL_INTERVAL
+        while run.status in _TRANSITIONAL_RUN_STATUSES:
+            await self._sleep(delay)
+            delay = min(delay * 2, self.POLL_MAX_INTERVAL)
+            run = await client.runs.get(thread_id=thread_id, run_id=run.id)
+        return run
+
+    async def _cancel_run(self, client: Any, thread_id: str, run_id: str) -> None:
+        try:
+            await client.runs.cancel(thread_id=thread_id, run_id=run_id)
+        except AzureError as exc:
+            logger.warning("Failed to cancel timed-out run %s: %s", run_id, exc)
+
+    def _estimate_tokens(
+        self, prompt: str, attachments: Sequence[AgentAttachment] | None
+    ) -> int:
+        return estimate_tokens(
+            prompt, attachments, completion_tokens=self._completion_token_estimate
+        )
+
+    async def _settle_usage(self, deployment: str | None, estimated: int, run: Any) -> None:
+        used = getattr(getattr(run, "usage", None), "total_tokens", None)
+        if self._rate_limiter is not None and isinstance(used, int):
+            await self._rate_limiter.settle(deployment, estimated, used)
+
+    @staticmethod
+    def _ensure_completed(run: Any) -> None:
+        if run.status == RunStatus.REQUIRES_ACTION:
+            raise RuntimeError("Agent run requires tool outputs, which is not supported in this flow.")
+        if run.status != RunStatus.COMPLETED:
+            raise RuntimeError(f"Agent run finished with unexpected status {run.status}.")
+
+    async def _upload(self, client: Any, attachment: AgentAttachment) -> str | None:
+        file_name = attachment.file_name or "resource.bin"
+        content_type = attachment.content_type or "application/octet-stream"
+        with BytesIO(attachment.payload) as stream:
+            file_info = await client.files.upload(
+                file=(file_name, stream, content_type),
+                purpose=attachment.purpose or "vision",
+                filename=file_name,
+            )
+        file_id = getattr(file_info, "id", None)
+        return file_id if isinstance(file_id, str) else None
+
+    async def _post_prompt(
+        self,
+        client: Any,
+        thread_id: str,
+        prompt: str,
+        attachments: Sequence[AgentAttachment] | None,
+    ) -> list[str | CachedUpload]:
+        """Upload attachments and post the user message.
+
+        Returns what :meth:`_release_uploads` must release afterwards: ids of files this run
+        owns, or entries of the upload cache it holds.
+        """
+        uploads: list[str | CachedUpload] = []
+        content_blocks: list[dict[str, Any]] = [{"type": "text", "text": prompt}]
+        message_attachments: list[dict[str, Any]] = []
+
+        try:
+            for attachment in attachments or ():
+                if not attachment.payload:
+                    continue
+                file_id: str | None
+                if self._upload_cache is not None:
+                    key = self._upload_cache.key(
+                        self._endpoint, attachment.payload, attachment.purpose or "vision"
+                    )
+                    entry = await self._upload_cache.acquire(
+                        key, functools.partial(self._upload, client, attachment)
+                    )
+                    uploads.append(entry)
+                    file_id = entry.file_id
+                else:
+                    file_id = await self._upload(client, attachment)
+                    if file_id is not None:
+                        uploads.append(file_id)
+                if file_id is not None:
+                    tool_type = attachment.tool_type or "vision"
+                    message_attachments.append(
+                        {
+                            "file_id": file_id,
+                            "tools": [{"type": tool_type}],
+                        }
+                    )
+
+            await client.messages.create(
+                thread_id=thread_id,
+                role="user",
+                content=cast(Any, content_blocks),
+                attachments=cast(Any, message_attachments) if message_attachments else None,
+            )
+        except BaseException:
+            await self._release_uploads(client, uploads)
+            raise
+        return uploads
+
+    async def _release_uploads(self, client: Any, uploads: Sequence[str | CachedUpload]) -> None:
+        owned = [upload for upload in uploads if isinstance(upload, str)]
+        if self._upload_cache is not None:
+            self._upload_cache.release(upload for upload in uploads if not isinstance(upload, str))
+            owned.extend(self._upload_cache.expired(self._endpoint))
+        await self._delete_files(client, owned)
+
+    async def _delete_files(self, client: Any, file_ids: Sequence[str]) -> None:
+        for file_id in file_ids:
             try:
-                yield project_client.agents
-            finally:
-                await project_client.__aexit__(None, None, None)
+                await client.files.delete(file_id=file_id)
+            except AzureError as exc:
+                logger.warning("Failed to delete uploaded file %s: %s", file_id, exc)
+
+    async def _last_message_text(self, client: Any, thread_id: str) -> str:
+        accumulated: list[str] = []
+        async for message in client.messages.list(
+            thread_id=thread_id,
+            order=ListSortOrder.DESCENDING,
+            limit=1,
+        ):
+            for content in getattr(message, "content", []) or []:
+                raw_text: Any = None
+                if isinstance(content, dict):
+                    raw_text = content.get("text")
+                else:
+                    raw_text = getattr(content, "text", None)
+
+                text_value: str | None = None
+                if isinstance(raw_text, str):
+                    text_value = raw_text
+                elif raw_text is not None:
+                    value_attr = getattr(raw_text, "value", None)
+                    if isinstance(value_attr, str):
+                        text_value = value_attr
+                    else:
+                        text_value = str(raw_text)
+
+                if text_value:
+                    accumulated.append(text_value)
+            break
+
+        return "\n".join(accumulated).strip()
 
     async def create_agent(
         self,
@@ -177,6 +605,7 @@ class FoundryAgentService:
         instructions: str,
         deployment: str,
         temperature: float | None = None,
+        response_format: Any | None = None,
     ) -> Agent:
         payload: dict[str, Any] = {
             "name": name,
@@ -185,6 +614,8 @@ class FoundryAgentService:
         }
         if temperature is not None:
             payload["temperature"] = temperature
+        if response_format is not None:
+            payload["response_format"] = response_format
 
         async def _execute() -> Agent:
             async with self._client() as client:
@@ -199,7 +630,7 @@ class FoundryAgentService:
                 raise RuntimeError("AgentsClient does not expose create_agent/create operations.")
 
         try:
-            return await self._with_retries("create_agent", _execute)
+            return await self._with_retries("create_agent", _execute, deployment=deployment)
         except RuntimeError as exc:
             logger.error("Failed to create agent %s: %s", name, exc)
             raise
@@ -227,112 +658,109 @@ class FoundryAgentService:
         prompt: str,
         *,
         attachments: Sequence[AgentAttachment] | None = None,
+        deployment: str | None = None,
+        cache: bool = True,
     ) -> str:
+        """Run ``agent_id`` on ``prompt`` and return its reply.
+
+        Replies come from the evaluation cache when an identical run (agent, deployment,
+        prompt and attachment bytes) already succeeded; ``cache=False`` neither reads nor
+        stores, for prompts whose answer is not expected to be repeatable. Cache misses wait
+        for the deployment's rate limit, which may shed them with ``RateLimitExceededError``.
+        """
+
+        tokens = self._estimate_tokens(prompt, attachments)
+
         async def _execute() -> str:
             async with self._client() as client:
                 thread = await client.threads.create()
-                uploaded_files: list[str] = []
-                streams: list[BytesIO] = []
-                content_blocks: list[dict[str, Any]] = [{"type": "text", "text": prompt}]
-                message_attachments: list[dict[str, Any]] = []
-
+                uploads = await self._post_prompt(client, thread.id, prompt, attachments)
                 try:
-                    if attachments:
-                        for attachment in attachments:
-                            if not attachment.payload:
-                                continue
-                            stream = BytesIO(attachment.payload)
-                            streams.append(stream)
-                            file_name = attachment.file_name or "resource.bin"
-                            content_type = attachment.content_type or "application/octet-stream"
-                            purpose = attachment.purpose or "vision"
-                            file_info = await client.files.upload(
-                                file=(file_name, stream, content_type),
-                                purpose=purpose,
-                                filename=file_name,
-                            )
-                            file_id = getattr(file_info, "id", None)
-                            if isinstance(file_id, str):
-                                uploaded_files.append(file_id)
-                                tool_type = attachment.tool_type or "vision"
-                                message_attachments.append(
-                                    {
-                                        "file_id": file_id,
-                                        "tools": [{"type": tool_type}],
-                                    }
-                                )
-
-                    await client.messages.create(
-                        thread_id=thread.id,
-                        role="user",
-                        content=cast(Any, content_blocks),
-                        attachments=cast(Any, message_attachments) if message_attachments else None,
-                    )
+                    run = await self._complete_run(client, thread.id, agent_id, deployment)
+                    await self._settle_usage(deployment, tokens, run)
+                    self._ensure_completed(run)
+                    return await self._last_message_text(client, thread.id)
+                finally:
+                    await self._release_uploads(client, uploads)
 
-                    run = await client.runs.create(
-                        thread_id=thread.id,
-                        agent_id=agent_id,
-                    )
+        async def _run() -> str:
+            breaker = self._breaker(deployment)
+            attempts = functools.partial(
+                self._with_retries, "run_agent", _execute, deployment=deployment, tokens=tokens
+            )
+            if breaker is None:
+                return await attempts()
+            # The breaker wraps the retries, so an open circuit skips them entirely.
+            return await breaker.call(attempts, is_failure=self._is_outage)
 
-                    transitional_statuses = {
-                        RunStatus.QUEUED,
-                        RunStatus.IN_PROGRESS,
-                        RunStatus.CANCELLING,
-                    }
-                    starting_status = getattr(RunStatus, "STARTING", None)
-                    if starting_status is not None:
-                        transitional_statuses.add(starting_status)
-
-                    while run.status in transitional_statuses:
-                        await asyncio.sleep(0.5)
-                        run = await client.runs.get(
-                            thread_id=thread.id,
-                            run_id=run.id,
-                        )
-
-                    if run.status == RunStatus.REQUIRES_ACTION:
-                        raise RuntimeError("Agent run requires tool outputs, which is not supported in this flow.")
-                    if run.status != RunStatus.COMPLETED:
-                        raise RuntimeError(f"Agent run finished with unexpected status {run.status}.")
-
-                    accumulated: list[str] = []
-                    async for message in client.messages.list(
-                        thread_id=thread.id,
-                        order=ListSortOrder.DESCENDING,
-                        limit=1,
-                    ):
-                        for content in getattr(message, "content", []) or []:
-                            raw_text: Any = None
-                            if isinstance(content, dict):
-                                raw_text = content.get("text")
-                            else:
-                                raw_text = getattr(content, "text", None)
-
-                            text_value: str | None = None
-                            if isinstance(raw_text, str):
-                                text_value = raw_text
-                            elif raw_text is not None:
-                                value_attr = getattr(raw_text, "value", None)
-                                if isinstance(value_attr, str):
-                                    text_value = value_attr
-                                else:
-                                    text_value = str(raw_text)
-
-                            if text_value:
-                                accumulated.append(text_value)
-                        break
-
-                    return "\n".join(accumulated).strip()
-                finally:
-                    for stream in streams:
-                        stream.close()
-                    for file_id in uploaded_files:
-                        try:
-                            await client.files.delete(file_id=file_id)
-                        except AzureError as exc:
-                            logger.warning("Failed to delete uploaded file %s: %s", file_id, exc)
-
-        return await self._with_retries("run_agent", _execute)
+        if not cache or self._evaluation_cache is None:
+            return await _run()
+        key = evaluation_cache_key(agent_id, deployment, prompt, attachments)
+        return await self._evaluation_cache.get_or_run(key, _run)
+
+    async def stream_agent(
+        self,
+        agent_id: str,
+        prompt: str,
+        *,
+        attachments: Sequence[AgentAttachment] | None = None,
+        deployment: str | None = None,
+        cache: bool = True,
+    ) -> AsyncIterator[str]:
+        """Yield the agent's reply as text deltas while the run produces them.
+
+        When the SDK cannot stream, or the reply comes from the evaluation cache, the whole
+        reply arrives as one chunk. Unlike :meth:`run_agent` the call is not retried, because
+        a failed attempt may already have yielded text.
+        """
+        evaluation_cache = self._evaluation_cache if cache else None
+        key = evaluation_cache_key(agent_id, deployment, prompt, attachments)
+        if evaluation_cache is not None:
+            cached = await evaluation_cache.lookup(key)
+            if cached is not None:
+                yield cached
+                return
+
+        chunks: list[str] = []
+        breaker = self._breaker(deployment)
+        with breaker.guard(self._is_outage) if breaker is not None else nullcontext():
+            async with aclosing(self._stream_run(agent_id, prompt, attachments, deployment)) as run:
+                async for chunk in run:
+                    chunks.append(chunk)
+                    yield chunk
+        if evaluation_cache is not None:
+            await evaluation_cache.store(key, "".join(chunks))
+
+    async def _stream_run(
+        self,
+        agent_id: str,
+        prompt: str,
+        attachments: Sequence[AgentAttachment] | None,
+        deployment: str | None,
+    ) -> AsyncIterator[str]:
+        tokens = self._estimate_tokens(prompt, attachments)
+        if self._rate_limiter is not None:
+            await self._rate_limiter.acquire(deployment, tokens)
+        async with get_bulkhead(FOUNDRY, deployment or self._endpoint), self._client() as client:
+            thread = await client.threads.create()
+            uploads = await self._post_prompt(client, thread.id, prompt, attachments)
+            try:
+                run: Any = None
+                streamed = False
+                async for event in self._run_events(client, thread.id, agent_id, deployment):
+                    if isinstance(event, str):
+                        streamed = True
+                        yield event
+                    else:
+                        run = event
+                await self._settle_usage(deployment, tokens, run)
+                self._ensure_completed(run)
+                if not streamed:
+                    text = await self._last_message_text(client, thread.id)
+                    if text:
+                        yield text
+            finally:
+                await self._release_uploads(client, uploads)
 
     async def get_agent(self, agent_id: str) -> Agent:
         async def _execute() -> Agent:
@@ -0,0 +1,253 @@
+"""Response cache for deterministic agent evaluations."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import math
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterator, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING
+
+from azure.cosmos import exceptions as cosmos_exceptions
+
+from tutor_lib.metrics import MetricsSink, get_metrics_sink
+
+if TYPE_CHECKING:
+    from tutor_lib.config import TutorSettings
+    from tutor_lib.cosmos import CosmosCRUD
+
+    from .clients import AgentAttachment
+
+logger = logging.getLogger(__name__)
+
+_BYPASS: ContextVar[bool] = ContextVar("tutor_evaluation_cache_bypass", default=False)
+
+
+@contextmanager
+def bypass_evaluation_cache(enabled: bool = True) -> Iterator[None]:
+    """Skip cache lookups for evaluations run inside the block; fresh results are still stored.
+
+    Routes use it for an explicit ``?refresh=true`` so a grader can force a re-evaluation.
+    """
+
+    token = _BYPASS.set(enabled or _BYPASS.get())
+    try:
+        yield
+    finally:
+        _BYPASS.reset(token)
+
+
+def evaluation_cache_key(
+    agent_id: str,
+    deployment: str | None,
+    prompt: str,
+    attachments: Sequence[AgentAttachment] | None = None,
+    *,
+    instructions: str | None = None,
+    template_version: str | None = None,
+) -> str:
+    """Hash of everything that determines an agent's answer.
+
+    ``instructions`` is for agents built from a spec, whose name alone does not pin them down.
+    ``template_version`` (see ``tutor_lib.prompts``) retires replies when a prompt template
+    changes, even if the rendered text happens not to.
+    """
+
+    parts = [
+        agent_id,
+        deployment or "",
+        hashlib.sha256(prompt.encode("utf-8")).hexdigest(),
+        hashlib.sha256((instructions or "").encode("utf-8")).hexdigest(),
+        [
+            [
+                hashlib.sha256(attachment.payload).hexdigest(),
+                attachment.purpose,
+                attachment.tool_type,
+            ]
+            for attachment in attachments or ()
+            if attachment.payload
+        ],
+    ]
+    if template_version:
+        parts.append(template_version)
+    return hashlib.sha256(json.dumps(parts).encode("utf-8")).hexdigest()
+
+
+class EvaluationCache(ABC):
+    """Storage for agent replies keyed by :func:`evaluation_cache_key`.
+
+    Backends implement :meth:`get` and :meth:`set`; callers go through :meth:`lookup`,
+    :meth:`store` and :meth:`get_or_run`, which honour :func:`bypass_evaluation_cache`,
+    record hit/miss metrics and treat backend failures as misses.
+    """
+
+    backend = "custom"
+
+    def __init__(self, *, ttl: float, metrics_sink: MetricsSink | None = None) -> None:
+        if ttl <= 0:
+            raise ValueError("ttl must be positive")
+        self.ttl = ttl
+        self._metrics_sink = metrics_sink
+
+    @abstractmethod
+    async def get(self, key: str) -> str | None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def set(self, key: str, text: str) -> None:
+        raise NotImplementedError
+
+    async def lookup(self, key: str) -> str | None:
+        sink = self._metrics_sink or get_metrics_sink()
+        attributes = {"backend": self.backend}
+        if _BYPASS.get():
+            sink.increment("agent.evaluation_cache.bypassed", 1, attributes)
+            return None
+        try:
+            text = await self.get(key)
+        except Exception as exc:  # noqa: BLE001 - a cache outage must not fail the evaluation
+            logger.warning("Evaluation cache lookup failed: %s", exc)
+            text = None
+        name = (
+            "agent.evaluation_cache.hits" if text is not None else "agent.evaluation_cache.misses"
+        )
+        sink.increment(name, 1, attributes)
+        return text
+
+    async def store(self, key: str, text: str) -> None:
+        if not text:
+            return
+        try:
+            await self.set(key, text)
+        except Exception as exc:  # noqa: BLE001 - a cache outage must not fail the evaluation
+            logger.warning("Evaluation cache write failed: %s", exc)
+
+    async def get_or_run(self, key: str, run: Callable[[], Awaitable[str]]) -> str:
+        cached = await self.lookup(key)
+        if cached is not None:
+            return cached
+        text = await run()
+        await self.store(key, text)
+        return text
+
+
+class InMemoryEvaluationCache(EvaluationCache):
+    """Per-process LRU of replies, each kept for ``ttl`` seconds."""
+
+    backend = "memory"
+
+    def __init__(
+        self,
+        *,
+        ttl: float,
+        maxsize: int = 1024,
+        metrics_sink: MetricsSink | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        super().__init__(ttl=ttl, metrics_sink=metrics_sink)
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self._maxsize = maxsize
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: str) -> str | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= self._clock():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    async def set(self, key: str, text: str) -> None:
+        self._entries[key] = (self._clock() + self.ttl, text)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+
+class CosmosEvaluationCache(EvaluationCache):
+    """Replies shared by every replica, one document per key in a container partitioned by ``/id``.
+
+    Documents carry a Cosmos ``ttl`` so a container with time-to-live enabled purges them;
+    ``expires_at`` is checked on read so stale entries are ignored either way.
+    """
+
+    backend = "cosmos"
+
+    def __init__(
+        self,
+        crud: CosmosCRUD,
+        *,
+        ttl: float,
+        metrics_sink: MetricsSink | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        super().__init__(ttl=ttl, metrics_sink=metrics_sink)
+        self._crud = crud
+        self._clock = clock
+
+    async def get(self, key: str) -> str | None:
+        try:
+            document = await self._crud.read_item(key)
+        except cosmos_exceptions.CosmosResourceNotFoundError:
+            return None
+        if float(document.get("expires_at") or 0.0) <= self._clock():
+            return None
+        text = document.get("text")
+        return text if isinstance(text, str) else None
+
+    async def set(self, key: str, text: str) -> None:
+        await self._crud.create_item(
+            {
+                "id": key,
+                "text": text,
+                "expires_at": self._clock() + self.ttl,
+                "ttl": math.ceil(self.ttl),
+            }
+        )
+
+
+_SHARED_CACHE: EvaluationCache | None = None
+
+
+def shared_evaluation_cache(settings: TutorSettings | None = None) -> EvaluationCache | None:
+    """Process-wide cache selected by ``EVALUATION_CACHE_BACKEND`` (``memory``, ``cosmos`` or ``none``)."""
+
+    global _SHARED_CACHE
+    from tutor_lib.config import get_settings
+
+    settings = settings or get_settings()
+    config = settings.azure_ai
+    backend = config.evaluation_cache_backend.strip().lower()
+    if backend in {"", "none"} or config.evaluation_cache_ttl <= 0:
+        return None
+    if _SHARED_CACHE is None or _SHARED_CACHE.backend != backend:
+        if backend == "memory":
+            _SHARED_CACHE = InMemoryEvaluationCache(
+                ttl=config.evaluation_cache_ttl, maxsize=config.evaluation_cache_size
+            )
+        elif backend == "cosmos":
+            from tutor_lib.cosmos import CosmosCRUD
+
+            crud = CosmosCRUD(settings.cosmos.evaluation_cache_container, settings.cosmos)
+            _SHARED_CACHE = CosmosEvaluationCache(crud, ttl=config.evaluation_cache_ttl)
+        else:
+            raise ValueError(f"Unknown EVALUATION_CACHE_BACKEND '{backend}'")
+    return _SHARED_CACHE
+
+
+def reset_shared_evaluation_cache() -> None:
+    global _SHARED_CACHE
+    _SHARED_CACHE = None
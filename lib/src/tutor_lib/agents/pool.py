@@ -0,0 +1,103 @@
+"""Shared Azure AI Foundry project clients."""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import logging
+from collections.abc import Callable
+from typing import Any
+
+from azure.ai.projects.aio import AIProjectClient
+from azure.identity.aio import DefaultAzureCredential
+
+logger = logging.getLogger(__name__)
+
+
+class ProjectClientPool:
+    """Process-wide cache of entered ``AIProjectClient`` instances, one per project endpoint.
+
+    All clients share one credential, so its token cache survives across calls and only the
+    first request pays for token acquisition and connection setup. Clients are bound to the
+    event loop that created them; a lookup from a different loop builds a new client and
+    closes the stale one.
+    """
+
+    def __init__(
+        self,
+        credential_factory: Callable[[], Any] | None = None,
+        client_factory: Callable[..., Any] | None = None,
+    ) -> None:
+        self._credential_factory = credential_factory or DefaultAzureCredential
+        self._client_factory = client_factory or AIProjectClient
+        self._credential: Any | None = None
+        self._clients: dict[str, tuple[asyncio.AbstractEventLoop, Any]] = {}
+        self._lock: asyncio.Lock | None = None
+        self._lock_loop: asyncio.AbstractEventLoop | None = None
+
+    def _get_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        return self._lock
+
+    async def client(self, endpoint: str) -> Any:
+        loop = asyncio.get_running_loop()
+        cached = self._clients.get(endpoint)
+        if cached is not None and cached[0] is loop:
+            return cached[1]
+
+        async with self._get_lock():
+            cached = self._clients.get(endpoint)
+            if cached is not None and cached[0] is loop:
+                return cached[1]
+            stale = self._clients.pop(endpoint, None)
+            if self._credential is None:
+                self._credential = self._credential_factory()
+            client = self._client_factory(endpoint=endpoint, credential=self._credential)
+            enter = getattr(client, "__aenter__", None)
+            if callable(enter):
+                await enter()
+            self._clients[endpoint] = (loop, client)
+        if stale is not None:
+            await self._close_stale(stale[1])
+        return client
+
+    @staticmethod
+    async def _close_stale(client: Any) -> None:
+        # The client's transports belong to a previous event loop and may not close cleanly.
+        try:
+            await client.close()
+        except Exception as exc:  # noqa: BLE001 - a stale client must not fail the new lookup
+            logger.warning("Failed to close AI project client from a previous event loop: %s", exc)
+
+    async def close(self) -> None:
+        clients = [client for _, client in self._clients.values()]
+        credential = self._credential
+        self._clients.clear()
+        self._credential = None
+
+        for client in clients:
+            try:
+                await client.close()
+            except Exception as exc:  # noqa: BLE001 - teardown must not mask shutdown
+                logger.warning("Failed to close AI project client: %s", exc)
+
+        if credential is not None:
+            close_method = getattr(credential, "close", None)
+            if callable(close_method):
+                result = close_method()
+                if inspect.isawaitable(result):
+                    await result
+
+
+_POOL = ProjectClientPool()
+
+
+def get_project_client_pool() -> ProjectClientPool:
+    return _POOL
+
+
+async def close_project_clients() -> None:
+    await _POOL.close()
@@ -0,0 +1,377 @@
+"""Token buckets that keep agent runs inside each deployment's TPM and RPM quota."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from azure.cosmos import exceptions as cosmos_exceptions
+
+from tutor_lib.metrics import MetricsSink, get_metrics_sink
+from tutor_lib.resilience import FOUNDRY, BulkheadFullError
+
+if TYPE_CHECKING:
+    from tutor_lib.config import TutorSettings
+    from tutor_lib.cosmos import CosmosCRUD
+
+    from .clients import AgentAttachment
+
+logger = logging.getLogger(__name__)
+
+# Roughly what a high-detail image costs the vision models; other files count ~4 bytes per token.
+IMAGE_TOKEN_ESTIMATE = 765
+
+
+def estimate_tokens(
+    prompt: str,
+    attachments: Sequence[AgentAttachment] | None = None,
+    *,
+    completion_tokens: int = 0,
+) -> int:
+    """Tokens a run is expected to use: ~4 characters per prompt token, attachments and the reply.
+
+    The estimate only has to be close; :meth:`DeploymentRateLimiter.settle` corrects the
+    bucket with the usage the service reports once the run finishes.
+    """
+
+    tokens = math.ceil(len(prompt) / 4) + max(0, completion_tokens)
+    for attachment in attachments or ():
+        if not attachment.payload:
+            continue
+        if attachment.tool_type == "vision":
+            tokens += IMAGE_TOKEN_ESTIMATE
+        else:
+            tokens += math.ceil(len(attachment.payload) / 4)
+    return tokens
+
+
+@dataclass(frozen=True, slots=True)
+class DeploymentQuota:
+    """Per-minute budget of one model deployment; ``0`` leaves that dimension unlimited."""
+
+    tokens_per_minute: int = 0
+    requests_per_minute: int = 0
+
+    def cost(self, tokens: int) -> int:
+        # A run larger than the whole bucket could never be admitted, so it takes a full bucket.
+        return min(tokens, self.tokens_per_minute) if self.tokens_per_minute > 0 else tokens
+
+
+@dataclass(frozen=True, slots=True)
+class BucketState:
+    tokens: float
+    requests: float
+    updated_at: float
+
+    @classmethod
+    def full(cls, quota: DeploymentQuota, now: float) -> BucketState:
+        return cls(float(quota.tokens_per_minute), float(quota.requests_per_minute), now)
+
+    def refilled(self, quota: DeploymentQuota, now: float) -> BucketState:
+        elapsed = max(0.0, now - self.updated_at)
+        return BucketState(
+            tokens=_refill(self.tokens, quota.tokens_per_minute, elapsed),
+            requests=_refill(self.requests, quota.requests_per_minute, elapsed),
+            updated_at=max(now, self.updated_at),
+        )
+
+    def take(self, quota: DeploymentQuota, tokens: int, now: float) -> tuple[BucketState, float]:
+        """Consume one request and ``tokens``, or return the seconds until both buckets hold them."""
+
+        state = self.refilled(quota, now)
+        wait = max(
+            _shortfall(state.tokens, tokens, quota.tokens_per_minute),
+            _shortfall(state.requests, 1, quota.requests_per_minute),
+        )
+        if wait > 0:
+            return state, wait
+        return (
+            BucketState(
+                tokens=state.tokens - tokens if quota.tokens_per_minute > 0 else state.tokens,
+                requests=state.requests - 1 if quota.requests_per_minute > 0 else state.requests,
+                updated_at=state.updated_at,
+            ),
+            0.0,
+        )
+
+
+def _refill(level: float, per_minute: int, elapsed: float) -> float:
+    if per_minute <= 0:
+        return level
+    return min(float(per_minute), level + elapsed * per_minute / 60.0)
+
+
+def _shortfall(level: float, cost: float, per_minute: int) -> float:
+    if per_minute <= 0 or level >= cost:
+        return 0.0
+    return (cost - level) * 60.0 / per_minute
+
+
+class RateLimitExceededError(BulkheadFullError):
+    """Raised when a run would wait longer than the limiter allows for its deployment's quota.
+
+    It is a :class:`BulkheadFullError`, so apps with load shedding answer ``503`` and
+    ``Retry-After`` instead of sending a request the model would reject with ``429``.
+    """
+
+    def __init__(self, deployment: str, retry_after: float) -> None:
+        super().__init__(FOUNDRY, deployment, "rate_limited", retry_after)
+
+
+class RateLimitStore(ABC):
+    """Where the buckets of every deployment live."""
+
+    backend = "custom"
+
+    @abstractmethod
+    async def take(self, deployment: str, quota: DeploymentQuota, tokens: int) -> float:
+        """Consume one request and ``tokens`` and return ``0``, or return the seconds to wait."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def charge(self, deployment: str, quota: DeploymentQuota, tokens: int) -> None:
+        """Remove ``tokens`` more from the token bucket; a negative amount refunds them."""
+        raise NotImplementedError
+
+
+class InMemoryRateLimitStore(RateLimitStore):
+    """Buckets of this process only; each replica gets the whole quota."""
+
+    backend = "memory"
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._buckets: dict[str, BucketState] = {}
+        self._lock = threading.Lock()
+
+    async def take(self, deployment: str, quota: DeploymentQuota, tokens: int) -> float:
+        with self._lock:
+            now = self._clock()
+            state = self._buckets.get(deployment) or BucketState.full(quota, now)
+            state, wait = state.take(quota, tokens, now)
+            self._buckets[deployment] = state
+            return wait
+
+    async def charge(self, deployment: str, quota: DeploymentQuota, tokens: int) -> None:
+        with self._lock:
+            now = self._clock()
+            state = (self._buckets.get(deployment) or BucketState.full(quota, now)).refilled(
+                quota, now
+            )
+            self._buckets[deployment] = BucketState(
+                min(float(quota.tokens_per_minute), state.tokens - tokens),
+                state.requests,
+                state.updated_at,
+            )
+
+
+class CosmosRateLimitStore(RateLimitStore):
+    """Buckets shared by every replica, one document per deployment in a container partitioned by ``/id``.
+
+    Takes are read-modify-write with the document's ``_etag``, so concurrent replicas never
+    spend the same tokens twice; a take that keeps losing the race asks the caller to retry
+    shortly. Refill uses wall-clock time, so replica clocks should be roughly in sync.
+    """
+
+    backend = "cosmos"
+    MAX_ATTEMPTS = 5
+    CONTENTION_BACKOFF = 0.05
+
+    def __init__(self, crud: CosmosCRUD, *, clock: Callable[[], float] = time.time) -> None:
+        self._crud = crud
+        self._clock = clock
+
+    async def _document(self, deployment: str, quota: DeploymentQuota) -> dict[str, Any]:
+        try:
+            return await self._crud.read_item(deployment)
+        except cosmos_exceptions.CosmosResourceNotFoundError:
+            state = BucketState.full(quota, self._clock())
+            try:
+                result = await self._crud.create_item_strict(
+                    {
+                        "id": deployment,
+                        "tokens": state.tokens,
+                        "requests": state.requests,
+                        "updated_at": state.updated_at,
+                    },
+                    partition_key=deployment,
+                )
+            except cosmos_exceptions.CosmosResourceExistsError:
+                # Another replica created the bucket first; spend from theirs.
+                return await self._crud.read_item(deployment)
+            return result.item
+
+    async def take(self, deployment: str, quota: DeploymentQuota, tokens: int) -> float:
+        from tutor_lib.cosmos import patch_set
+
+        for _ in range(self.MAX_ATTEMPTS):
+            document = await self._document(deployment, quota)
+            state = BucketState(
+                float(document.get("tokens") or 0.0),
+                float(document.get("requests") or 0.0),
+                float(document.get("updated_at") or 0.0),
+            )
+            state, wait = state.take(quota, tokens, self._clock())
+            if wait > 0:
+                return wait
+            try:
+                await self._crud.patch_item(
+                    deployment,
+                    [
+                        patch_set("/tokens", state.tokens),
+                        patch_set("/requests", state.requests),
+                        patch_set("/updated_at", state.updated_at),
+                    ],
+                    partition_key=deployment,
+                    if_match=document.get("_etag"),
+                )
+                return 0.0
+            except (
+                cosmos_exceptions.CosmosAccessConditionFailedError,
+                cosmos_exceptions.CosmosResourceNotFoundError,
+            ):
+                continue
+        return self.CONTENTION_BACKOFF
+
+    async def charge(self, deployment: str, quota: DeploymentQuota, tokens: int) -> None:
+        from tutor_lib.cosmos import patch_incr
+
+        try:
+            await self._crud.patch_item(
+                deployment, [patch_incr("/tokens", -tokens)], partition_key=deployment
+            )
+        except cosmos_exceptions.CosmosResourceNotFoundError:
+            return
+
+
+class DeploymentRateLimiter:
+    """Queue or shed agent runs so each deployment stays inside its TPM and RPM quota.
+
+    :meth:`acquire` takes one request and the estimated tokens from the deployment's
+    buckets, sleeping while they refill for at most ``max_wait`` seconds; a run that would
+    wait longer raises :class:`RateLimitExceededError` at once. Deployments without a quota
+    are not limited. A failing store lets runs through rather than blocking grading.
+    """
+
+    def __init__(
+        self,
+        quotas: Mapping[str, DeploymentQuota],
+        *,
+        store: RateLimitStore | None = None,
+        max_wait: float = 10.0,
+        metrics_sink: MetricsSink | None = None,
+        sleep: Callable[[float], Any] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._quotas = dict(quotas)
+        self._store = store or InMemoryRateLimitStore()
+        self.max_wait = max(0.0, max_wait)
+        self._metrics_sink = metrics_sink
+        self._sleep = sleep or asyncio.sleep
+        self._clock = clock
+
+    @property
+    def backend(self) -> str:
+        return self._store.backend
+
+    def quota(self, deployment: str | None) -> DeploymentQuota | None:
+        return self._quotas.get(deployment) if deployment else None
+
+    async def acquire(self, deployment: str | None, tokens: int) -> None:
+        quota = self.quota(deployment)
+        if quota is None or deployment is None:
+            return
+        sink = self._metrics_sink or get_metrics_sink()
+        attributes = {"deployment": deployment, "backend": self.backend}
+        cost = quota.cost(tokens)
+        started = self._clock()
+        while True:
+            try:
+                wait = await self._store.take(deployment, quota, cost)
+            except Exception as exc:  # noqa: BLE001 - a limiter outage must not stop grading
+                logger.warning("Rate limit store failed for %s: %s", deployment, exc)
+                return
+            if wait <= 0:
+                break
+            if self._clock() - started + wait > self.max_wait:
+                sink.increment("agent.rate_limit.rejected", 1, attributes)
+                raise RateLimitExceededError(deployment, wait)
+            await self._sleep(wait)
+        sink.observe("agent.rate_limit.wait_ms", (self._clock() - started) * 1000, attributes)
+
+    async def settle(self, deployment: str | None, estimated: int, used: int) -> None:
+        """Correct the token bucket once the service reports what the run actually used."""
+
+        quota = self.quota(deployment)
+        if quota is None or deployment is None or quota.tokens_per_minute <= 0:
+            return
+        difference = used - quota.cost(estimated)
+        if difference == 0:
+            return
+        try:
+            await self._store.charge(deployment, quota, difference)
+        except Exception as exc:  # noqa: BLE001 - a limiter outage must not stop grading
+            logger.warning("Rate limit store failed for %s: %s", deployment, exc)
+
+
+def deployment_quotas(limits: Mapping[str, Mapping[str, int]]) -> dict[str, DeploymentQuota]:
+    """Quotas from ``AGENT_RATE_LIMITS``, e.g. ``{"gpt-5": {"tpm": 150000, "rpm": 900}}``."""
+
+    quotas: dict[str, DeploymentQuota] = {}
+    for deployment, limit in limits.items():
+        quota = DeploymentQuota(
+            tokens_per_minute=max(0, int(limit.get("tpm", 0))),
+            requests_per_minute=max(0, int(limit.get("rpm", 0))),
+        )
+        if quota.tokens_per_minute or quota.requests_per_minute:
+            quotas[deployment] = quota
+    return quotas
+
+
+_SHARED_LIMITER: DeploymentRateLimiter | None = None
+
+
+def shared_rate_limiter(settings: TutorSettings | None = None) -> DeploymentRateLimiter | None:
+    """Process-wide limiter for ``AGENT_RATE_LIMITS``; ``None`` when no deployment has a quota.
+
+    ``AGENT_RATE_LIMIT_BACKEND=cosmos`` keeps the buckets in ``COSMOS_RATE_LIMIT_TABLE`` so
+    every replica draws from one budget; ``memory`` gives each replica its own.
+    """
+
+    global _SHARED_LIMITER
+    from tutor_lib.config import get_settings
+
+    settings = settings or get_settings()
+    config = settings.azure_ai
+    quotas = deployment_quotas(config.rate_limits)
+    backend = config.rate_limit_backend.strip().lower()
+    if not quotas or backend in {"", "none"}:
+        return None
+    if _SHARED_LIMITER is None or _SHARED_LIMITER.backend != backend:
+        store: RateLimitStore
+        if backend == "memory":
+            store = InMemoryRateLimitStore()
+        elif backend == "cosmos":
+            from tutor_lib.cosmos import CosmosCRUD
+
+            store = CosmosRateLimitStore(
+                CosmosCRUD(settings.cosmos.rate_limit_container, settings.cosmos)
+            )
+        else:
+            raise ValueError(f"Unknown AGENT_RATE_LIMIT_BACKEND '{backend}'")
+        _SHARED_LIMITER = DeploymentRateLimiter(
+            quotas, store=store, max_wait=config.rate_limit_max_wait
+        )
+    return _SHARED_LIMITER
+
+
+def reset_shared_rate_limiter() -> None:
+    global _SHARED_LIMITER
+    _SHARED_LIMITER = None
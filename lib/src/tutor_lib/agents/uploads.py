@@ -0,0 +1,192 @@
+"""Content-addressed cache of files uploaded for agent runs."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from tutor_lib.config import AzureAIConfig, get_settings
+from tutor_lib.metrics import MetricsSink, get_metrics_sink
+
+if TYPE_CHECKING:
+    from .pool import ProjectClientPool
+
+logger = logging.getLogger(__name__)
+
+UploadKey = tuple[str, str, str]
+
+
+@dataclass(slots=True, eq=False)
+class CachedUpload:
+    """One uploaded file shared by every run that sends the same bytes."""
+
+    key: UploadKey
+    file_id: str | None = None
+    refs: int = 0
+    idle_since: float = 0.0
+    pending: asyncio.Future[str | None] | None = None
+
+
+class AttachmentUploadCache:
+    """Reuse Foundry file ids for attachments whose bytes were already uploaded.
+
+    Entries are keyed by project endpoint, SHA-256 of the payload and upload purpose. Each run
+    holds a reference to the files it attaches; concurrent runs sending the same bytes wait on
+    a single upload. Once the last reference is released a file stays reusable for ``ttl``
+    seconds, after which :meth:`expired` hands its id back for deletion. At most
+    ``max_entries`` files are kept; the least recently used idle ones go first.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl: float,
+        max_entries: int = 256,
+        metrics_sink: MetricsSink | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if ttl <= 0:
+            raise ValueError("ttl must be positive")
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._metrics_sink = metrics_sink
+        self._clock = clock
+        self._entries: OrderedDict[UploadKey, CachedUpload] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key(endpoint: str, payload: bytes, purpose: str) -> UploadKey:
+        return endpoint, hashlib.sha256(payload).hexdigest(), purpose
+
+    def _record(self, name: str, key: UploadKey) -> None:
+        sink = self._metrics_sink or get_metrics_sink()
+        sink.increment(name, 1, {"purpose": key[2]})
+
+    async def acquire(
+        self, key: UploadKey, upload: Callable[[], Awaitable[str | None]]
+    ) -> CachedUpload:
+        """Return a held entry for ``key``, calling ``upload`` only if no live copy exists."""
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.refs += 1
+            self._entries.move_to_end(key)
+            self._record("agent.attachments.cache_hits", key)
+            if entry.pending is not None:
+                try:
+                    await asyncio.shield(entry.pending)
+                except BaseException:
+                    self.release([entry])
+                    raise
+            return entry
+
+        self._record("agent.attachments.cache_misses", key)
+        entry = CachedUpload(key, refs=1, pending=asyncio.get_running_loop().create_future())
+        self._entries[key] = entry
+        pending = entry.pending
+        try:
+            entry.file_id = await upload()
+        except BaseException as exc:
+            self._discard(entry)
+            if isinstance(exc, asyncio.CancelledError):
+                pending.cancel()
+            else:
+                pending.set_exception(exc)
+                # Waiters, if any, see the failure; an unobserved one is not worth a warning.
+                pending.exception()
+            raise
+        entry.pending = None
+        pending.set_result(entry.file_id)
+        if entry.file_id is None:
+            self._discard(entry)
+        return entry
+
+    def release(self, entries: Iterable[CachedUpload]) -> None:
+        now = self._clock()
+        for entry in entries:
+            entry.refs -= 1
+            if entry.refs <= 0:
+                entry.idle_since = now
+
+    def expired(self, endpoint: str) -> list[str]:
+        """Drop idle entries of ``endpoint`` past their TTL or over capacity; return their file ids."""
+
+        deadline = self._clock() - self._ttl
+        idle = [
+            entry
+            for entry in self._entries.values()
+            if entry.key[0] == endpoint and entry.refs <= 0 and entry.pending is None
+        ]
+        overflow = len(self._entries) - self._max_entries
+        file_ids: list[str] = []
+        for entry in idle:
+            if entry.idle_since <= deadline or overflow > 0:
+                overflow -= 1
+                self._discard(entry)
+                if entry.file_id:
+                    file_ids.append(entry.file_id)
+        return file_ids
+
+    def drain(self) -> dict[str, list[str]]:
+        """Drop every idle entry and return their file ids grouped by endpoint."""
+
+        drained: dict[str, list[str]] = {}
+        for entry in list(self._entries.values()):
+            if entry.refs <= 0 and entry.pending is None:
+                self._discard(entry)
+                if entry.file_id:
+                    drained.setdefault(entry.key[0], []).append(entry.file_id)
+        return drained
+
+    def _discard(self, entry: CachedUpload) -> None:
+        if self._entries.get(entry.key) is entry:
+            del self._entries[entry.key]
+
+
+_SHARED_CACHE: AttachmentUploadCache | None = None
+
+
+def shared_upload_cache(config: AzureAIConfig | None = None) -> AttachmentUploadCache | None:
+    """Process-wide cache when ``AGENT_ATTACHMENT_CACHE_TTL_SECONDS`` is positive, else ``None``."""
+
+    global _SHARED_CACHE
+    config = config or get_settings().azure_ai
+    if config.attachment_cache_ttl <= 0:
+        return None
+    if _SHARED_CACHE is None:
+        _SHARED_CACHE = AttachmentUploadCache(
+            ttl=config.attachment_cache_ttl, max_entries=config.attachment_cache_size
+        )
+    return _SHARED_CACHE
+
+
+async def delete_cached_uploads(pool: ProjectClientPool | None = None) -> None:
+    """Delete every idle cached file; called on shutdown before project clients close."""
+
+    from .pool import get_project_client_pool
+
+    if _SHARED_CACHE is None:
+        return
+    pool = pool or get_project_client_pool()
+    for endpoint, file_ids in _SHARED_CACHE.drain().items():
+        agents: Any = (await pool.client(endpoint)).agents
+        for file_id in file_ids:
+            try:
+                await agents.files.delete(file_id=file_id)
+            except Exception as exc:  # noqa: BLE001 - teardown must not mask shutdown
+                logger.warning("Failed to delete cached upload %s: %s", file_id, exc)
+
+
+def reset_shared_upload_cache() -> None:
+    global _SHARED_CACHE
+    _SHARED_CACHE = None
@@ -1,8 +1,11 @@
-from .app_factory import create_app
+from .app_factory import create_app, lifespan
 from .settings import (
     AuthConfig,
     AzureAIConfig,
+    BulkheadConfig,
+    CircuitBreakerConfig,
     CosmosConfig,
+    MetricsConfig,
     ServiceBusConfig,
     StorageConfig,
     TutorSettings,
@@ -12,10 +15,14 @@ from .settings import (
 __all__ = [
     "AuthConfig",
     "AzureAIConfig",
+    "BulkheadConfig",
+    "CircuitBreakerConfig",
     "CosmosConfig",
+    "MetricsConfig",
     "ServiceBusConfig",
     "StorageConfig",
     "TutorSettings",
     "get_settings",
     "create_app",
+    "lifespan",
 ]
@@ -2,17 +2,48 @@
 
 from __future__ import annotations
 
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from tutor_lib.metrics import instrument_app
 from tutor_lib.middleware import configure_entra_auth
+from tutor_lib.resilience import configure_load_shedding
+from tutor_lib.schemas import CONTINUATION_HEADER
 
 from .settings import get_settings
 
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    """Release process-wide clients pooled by tutor_lib when the app shuts down."""
+    yield
+    from tutor_lib.agents.clients import close_agent_registries
+    from tutor_lib.agents.pool import close_project_clients
+    from tutor_lib.agents.uploads import delete_cached_uploads
+    from tutor_lib.cosmos import close_cosmos_clients
+
+    # Each step runs even if an earlier one fails, so one broken client does not leak the rest.
+    for step in (
+        close_cosmos_clients,
+        close_agent_registries,
+        delete_cached_uploads,
+        close_project_clients,
+    ):
+        try:
+            await step()
+        except Exception as exc:  # noqa: BLE001 - teardown must not mask shutdown
+            logger.warning("Shutdown step %s failed: %s", step.__name__, exc)
+
 
 def create_app(*, title: str, version: str, description: str, openapi_url: str = "/api/v1/openapi.json") -> FastAPI:
     settings = get_settings()
-    app = FastAPI(title=title, version=version, description=description, openapi_url=openapi_url)
+    app = FastAPI(title=title, version=version, description=description, openapi_url=openapi_url, lifespan=lifespan)
     app.add_middleware(
         CORSMiddleware,
         allow_origins=list(settings.cors_origins),
@@ -20,6 +51,7 @@ def create_app(*, title: str, version: str, description: str, openapi_url: str =
         allow_credentials=False,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[CONTINUATION_HEADER],
     )
     configure_entra_auth(
         app,
@@ -30,4 +62,6 @@ def create_app(*, title: str, version: str, description: str, openapi_url: str =
         issuer=settings.auth.token_issuer,
         allowed_client_app_ids=settings.auth.allowed_client_app_ids,
     )
+    instrument_app(app)
+    configure_load_shedding(app)
     return app
@@ -13,6 +13,7 @@ class CosmosConfig(BaseSettings):
     endpoint: str = Field(alias="COSMOS_ENDPOINT", default="")
     database: str = Field(alias="COSMOS_DATABASE", default="tutor")
     essay_container: str = Field(alias="COSMOS_ESSAY_TABLE", default="essays")
+    essay_index_container: str = Field(alias="COSMOS_ESSAY_INDEX_TABLE", default="essay_index")
     question_container: str = Field(alias="COSMOS_QUESTION_TABLE", default="questions")
     answer_container: str = Field(alias="COSMOS_ANSWER_TABLE", default="answers")
     configuration_container: str = Field(alias="COSMOS_CONFIGURATION_TABLE", default="configuration")
@@ -32,12 +33,36 @@ class CosmosConfig(BaseSettings):
         alias="COSMOS_LEARNER_RECORD_EVENTS_TABLE",
         default="learner_record_events",
     )
+    evaluation_cache_container: str = Field(
+        alias="COSMOS_EVALUATION_CACHE_TABLE",
+        default="evaluation_cache",
+    )
+    rate_limit_container: str = Field(alias="COSMOS_RATE_LIMIT_TABLE", default="rate_limits")
+    # Read-through cache for reference data; 0 disables it (see tutor_lib.cosmos.cache).
+    query_cache_ttl: float = Field(alias="COSMOS_QUERY_CACHE_TTL_SECONDS", default=0.0)
+    query_cache_size: int = Field(alias="COSMOS_QUERY_CACHE_SIZE", default=1024)
 
 
 class AzureAIConfig(BaseSettings):
     project_endpoint: str = Field(alias="PROJECT_ENDPOINT", default="")
     default_deployment: str = Field(alias="MODEL_DEPLOYMENT_NAME", default="gpt-5-nano")
     reasoning_deployment: str = Field(alias="MODEL_REASONING_DEPLOYMENT", default="gpt-5")
+    agent_run_deadline: float = Field(alias="AGENT_RUN_DEADLINE_SECONDS", default=120.0)
+    agent_run_streaming: bool = Field(alias="AGENT_RUN_STREAMING", default=True)
+    attachment_cache_ttl: float = Field(alias="AGENT_ATTACHMENT_CACHE_TTL_SECONDS", default=600.0)
+    attachment_cache_size: int = Field(alias="AGENT_ATTACHMENT_CACHE_SIZE", default=256)
+    # Replies of repeated evaluations; "memory", "cosmos" or "none" (see tutor_lib.agents.evaluations).
+    evaluation_cache_backend: str = Field(alias="EVALUATION_CACHE_BACKEND", default="memory")
+    evaluation_cache_ttl: float = Field(alias="EVALUATION_CACHE_TTL_SECONDS", default=3600.0)
+    evaluation_cache_size: int = Field(alias="EVALUATION_CACHE_SIZE", default=1024)
+    # TPM / RPM quota per deployment as JSON, e.g. {"gpt-5": {"tpm": 150000, "rpm": 900}};
+    # "memory" or "cosmos" buckets (see tutor_lib.agents.ratelimit).
+    rate_limits: dict[str, dict[str, int]] = Field(alias="AGENT_RATE_LIMITS", default_factory=dict)
+    rate_limit_backend: str = Field(alias="AGENT_RATE_LIMIT_BACKEND", default="memory")
+    rate_limit_max_wait: float = Field(alias="AGENT_RATE_LIMIT_MAX_WAIT_SECONDS", default=10.0)
+    completion_token_estimate: int = Field(alias="AGENT_COMPLETION_TOKEN_ESTIMATE", default=1024)
+    # Grade all dimensions of one deployment in a single structured-output run (questions service).
+    grader_batching: bool = Field(alias="GRADER_BATCHING_ENABLED", default=False)
 
 
 class StorageConfig(BaseSettings):
@@ -66,12 +91,43 @@ class ServiceBusConfig(BaseSettings):
     )
 
 
+class MetricsConfig(BaseSettings):
+    exporter: str = Field(alias="TUTOR_METRICS_EXPORTER", default="memory")
+
+
+class BulkheadConfig(BaseSettings):
+    """Concurrency caps per downstream partition (account, deployment, topic); 0 means unbounded."""
+
+    cosmos_max_concurrency: int = Field(alias="BULKHEAD_COSMOS_MAX_CONCURRENCY", default=64)
+    foundry_max_concurrency: int = Field(alias="BULKHEAD_FOUNDRY_MAX_CONCURRENCY", default=16)
+    service_bus_max_concurrency: int = Field(alias="BULKHEAD_SERVICE_BUS_MAX_CONCURRENCY", default=16)
+    default_max_concurrency: int = Field(alias="BULKHEAD_DEFAULT_MAX_CONCURRENCY", default=32)
+    max_queue: int = Field(alias="BULKHEAD_MAX_QUEUE", default=128)
+    queue_timeout: float = Field(alias="BULKHEAD_QUEUE_TIMEOUT_SECONDS", default=10.0)
+    retry_after: float = Field(alias="BULKHEAD_RETRY_AFTER_SECONDS", default=2.0)
+
+
+class CircuitBreakerConfig(BaseSettings):
+    """Thresholds for the per-deployment circuit breakers around agent runs."""
+
+    enabled: bool = Field(alias="CIRCUIT_BREAKER_ENABLED", default=True)
+    failure_threshold: int = Field(alias="CIRCUIT_BREAKER_FAILURE_THRESHOLD", default=5)
+    failure_rate: float = Field(alias="CIRCUIT_BREAKER_FAILURE_RATE", default=0.5)
+    window_size: int = Field(alias="CIRCUIT_BREAKER_WINDOW_SIZE", default=20)
+    minimum_calls: int = Field(alias="CIRCUIT_BREAKER_MINIMUM_CALLS", default=10)
+    reset_timeout: float = Field(alias="CIRCUIT_BREAKER_RESET_TIMEOUT_SECONDS", default=30.0)
+    half_open_max_calls: int = Field(alias="CIRCUIT_BREAKER_HALF_OPEN_MAX_CALLS", default=1)
+
+
 class TutorSettings(BaseSettings):
     cosmos: CosmosConfig = CosmosConfig()  # type: ignore[arg-type]
     azure_ai: AzureAIConfig = AzureAIConfig()  # type: ignore[arg-type]
     storage: StorageConfig | None = None
     auth: AuthConfig = AuthConfig()  # type: ignore[arg-type]
     service_bus: ServiceBusConfig = ServiceBusConfig()  # type: ignore[arg-type]
+    metrics: MetricsConfig = MetricsConfig()  # type: ignore[arg-type]
+    bulkhead: BulkheadConfig = BulkheadConfig()  # type: ignore[arg-type]
+    circuit_breaker: CircuitBreakerConfig = CircuitBreakerConfig()  # type: ignore[arg-type]
     cors_origins: Iterable[str] = Field(default_factory=lambda: ["*"])
 
     model_config = {
@@ -1,5 +1,62 @@
-from .client import create_cosmos_client
-from .crud import CosmosCRUD
+from .changefeed import (
+    ChangeBatch,
+    ChangeFeedProcessor,
+    ChangeFeedSource,
+    CosmosChangeFeedSource,
+    CosmosLeaseStore,
+    InMemoryLeaseStore,
+    Lease,
+    LeaseLostError,
+    LeaseStore,
+)
+from .cache import QueryCache, QueryCacheStats, reset_shared_query_cache, shared_query_cache
+from .client import CosmosClientPool, close_cosmos_clients, create_cosmos_client, get_client_pool
+from .crud import BulkItemResult, BulkWriteResult, CosmosCRUD, QueryPage
+from .partitions import PartitionKeyCache
+from .projection import projection_query
+from .patch import (
+    PatchError,
+    apply_patch_operations,
+    patch_add,
+    patch_fields,
+    patch_incr,
+    patch_remove,
+    patch_replace,
+    patch_set,
+)
 from .assemblies import AssemblyRepository
 
-__all__ = ["create_cosmos_client", "CosmosCRUD", "AssemblyRepository"]
+__all__ = [
+    "create_cosmos_client",
+    "close_cosmos_clients",
+    "get_client_pool",
+    "CosmosClientPool",
+    "CosmosCRUD",
+    "BulkItemResult",
+    "BulkWriteResult",
+    "QueryPage",
+    "QueryCache",
+    "QueryCacheStats",
+    "reset_shared_query_cache",
+    "shared_query_cache",
+    "ChangeBatch",
+    "ChangeFeedProcessor",
+    "ChangeFeedSource",
+    "CosmosChangeFeedSource",
+    "CosmosLeaseStore",
+    "InMemoryLeaseStore",
+    "Lease",
+    "LeaseLostError",
+    "LeaseStore",
+    "PartitionKeyCache",
+    "projection_query",
+    "PatchError",
+    "apply_patch_operations",
+    "patch_add",
+    "patch_fields",
+    "patch_incr",
+    "patch_remove",
+    "patch_replace",
+    "patch_set",
+    "AssemblyRepository",
+]
@@ -6,6 +6,7 @@ from typing import Any
 
 from tutor_lib.config import CosmosConfig
 
+from .cache import shared_query_cache
 from .crud import CosmosCRUD
 
 
@@ -14,7 +15,7 @@ class AssemblyRepository:
 
     def __init__(self, config: CosmosConfig, container_name: str | None = None) -> None:
         container = container_name or config.assembly_container
-        self._crud = CosmosCRUD(container, config)
+        self._crud = CosmosCRUD(container, config, cache=shared_query_cache())
 
     async def get_by_id(self, assembly_id: str) -> dict[str, Any]:
         record = await self._crud.read_item(assembly_id)
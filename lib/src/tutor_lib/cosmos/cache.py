@@ -0,0 +1,142 @@
+"""Opt-in read-through cache for reference-data queries and point reads."""
+
+from __future__ import annotations
+
+import copy
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from tutor_lib.config import CosmosConfig, get_settings
+
+
+@dataclass(frozen=True, slots=True)
+class QueryCacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    invalidations: int
+    size: int
+
+
+class QueryCache:
+    """Size-bounded LRU of Cosmos results with a TTL, shared by ``CosmosCRUD`` instances.
+
+    Keys start with the container name, so a write through any ``CosmosCRUD`` that uses this
+    cache drops every cached result of that container. A per-container generation keeps reads
+    that were in flight during a write from caching what they fetched. Writes made by other
+    processes are only picked up when entries expire, so keep ``ttl`` short and use the
+    cache for reference data that rarely changes. Values are copied on the way in and out,
+    so callers may mutate what they get back.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float = 60.0,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        if ttl <= 0:
+            raise ValueError("ttl must be positive")
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._clock = clock
+        self._entries: OrderedDict[tuple[str, str], tuple[float, Any]] = OrderedDict()
+        self._generations: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key(container: str, *parts: Any) -> tuple[str, str]:
+        """Cache key for an operation's arguments (query text, parameters, partition key, ...)."""
+
+        return container, json.dumps(parts, sort_keys=True, default=repr)
+
+    def generation(self, container: str) -> int:
+        return self._generations.get(container, 0)
+
+    def get(self, key: tuple[str, str]) -> tuple[bool, Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= self._clock():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            value = entry[1]
+        return True, copy.deepcopy(value)
+
+    def put(self, key: tuple[str, str], value: Any, generation: int) -> None:
+        """Store ``value`` unless the container was written since ``generation`` was read."""
+
+        stored = copy.deepcopy(value)
+        with self._lock:
+            if self._generations.get(key[0], 0) != generation:
+                return
+            self._entries[key] = (self._clock() + self._ttl, stored)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, container: str) -> None:
+        with self._lock:
+            self._generations[container] = self._generations.get(container, 0) + 1
+            stale = [key for key in self._entries if key[0] == container]
+            for key in stale:
+                del self._entries[key]
+            self._invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            for container in list(self._generations):
+                self._generations[container] += 1
+            self._entries.clear()
+
+    def stats(self) -> QueryCacheStats:
+        return QueryCacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            invalidations=self._invalidations,
+            size=len(self._entries),
+        )
+
+
+_SHARED_CACHE: QueryCache | None = None
+_SHARED_CACHE_LOCK = threading.Lock()
+
+
+def shared_query_cache(config: CosmosConfig | None = None) -> QueryCache | None:
+    """Process-wide cache when ``COSMOS_QUERY_CACHE_TTL_SECONDS`` is positive, else ``None``."""
+
+    global _SHARED_CACHE
+    config = config or get_settings().cosmos
+    if config.query_cache_ttl <= 0:
+        return None
+    with _SHARED_CACHE_LOCK:
+        if _SHARED_CACHE is None:
+            _SHARED_CACHE = QueryCache(maxsize=config.query_cache_size, ttl=config.query_cache_ttl)
+        return _SHARED_CACHE
+
+
+def reset_shared_query_cache() -> None:
+    global _SHARED_CACHE
+    with _SHARED_CACHE_LOCK:
+        _SHARED_CACHE = None
@@ -0,0 +1,493 @@
+"""Cosmos DB change-feed processing for incrementally maintained read models.
+
+A :class:`ChangeFeedProcessor` reads a container's change feed one feed range at a time,
+hands each batch of changed documents to an async handler and checkpoints the feed
+continuation in a :class:`LeaseStore` once the handler succeeds. Delivery is therefore
+at-least-once: a batch whose handler fails (or whose checkpoint is lost) is delivered again,
+so handlers must be idempotent, e.g. keyed upserts of projection documents.
+
+Leases also spread feed ranges across service replicas: every processor instance with the
+same ``name`` claims an equal share of the unowned or expired leases and renews its own
+while it checkpoints. ``InMemoryLeaseStore`` together with the in-memory Cosmos emulator
+(``COSMOS_EMULATOR=memory``) drives the whole pipeline in tests; :meth:`drain` processes
+everything that is pending without starting the background loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import dataclasses
+import hashlib
+import json
+import logging
+import math
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import Counter
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import Any, Protocol
+
+from azure.cosmos import exceptions as cosmos_exceptions
+
+from tutor_lib.config import CosmosConfig
+from tutor_lib.metrics import MetricsSink, get_metrics_sink
+from tutor_lib.resilience import RetryPolicy
+
+from .client import CosmosClientPool, get_client_pool
+from .crud import COSMOS_RETRY_POLICY, CosmosCRUD, normalize_document
+from .patch import patch_set
+
+logger = logging.getLogger(__name__)
+
+ChangeHandler = Callable[[list[dict[str, Any]]], Awaitable[None]]
+
+
+class LeaseLostError(RuntimeError):
+    """Another processor instance took over the lease before it could be checkpointed."""
+
+
+@dataclass(frozen=True, slots=True)
+class ChangeBatch:
+    items: list[dict[str, Any]]
+    continuation: str | None
+
+
+@dataclass(frozen=True, slots=True)
+class Lease:
+    """Ownership and checkpoint of one feed range for one processor."""
+
+    processor: str
+    token: str
+    feed_range: Any
+    owner: str | None = None
+    expires_at: float = 0.0
+    continuation: str | None = None
+    etag: str | None = field(default=None, compare=False)
+
+    @property
+    def id(self) -> str:
+        return f"{self.processor}.{self.token}"
+
+    def held_by(self, owner: str, now: float) -> bool:
+        return self.owner == owner and self.expires_at > now
+
+    def is_available(self, now: float) -> bool:
+        return self.owner is None or self.expires_at <= now
+
+
+def lease_token(feed_range: Any) -> str:
+    """Stable identifier of a feed range, used as the lease key."""
+
+    encoded = json.dumps(feed_range, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+class ChangeFeedSource(Protocol):
+    async def feed_ranges(self) -> list[Any]: ...
+
+    async def read(
+        self, feed_range: Any, continuation: str | None, max_items: int
+    ) -> ChangeBatch: ...
+
+
+class CosmosChangeFeedSource:
+    """Change feed of one container through the shared client pool (or the emulator)."""
+
+    def __init__(
+        self,
+        container: str,
+        config: CosmosConfig,
+        *,
+        start_from_beginning: bool = True,
+        pool: CosmosClientPool | None = None,
+        retry_policy: RetryPolicy | None = None,
+    ) -> None:
+        self._container = container
+        self._endpoint = config.endpoint
+        self._database = config.database
+        # "Now" is pinned to when the source was built: a read that finds nothing yields no
+        # continuation, and re-reading from a moving "Now" would skip writes in between.
+        self._start_time: str | datetime = (
+            "Beginning" if start_from_beginning else datetime.now(UTC)
+        )
+        self._pool = pool or get_client_pool()
+        self._retry_policy = retry_policy or COSMOS_RETRY_POLICY
+
+    async def _container_client(self) -> Any:
+        return await self._pool.container(self._endpoint, self._database, self._container)
+
+    async def feed_ranges(self) -> list[Any]:
+        async def _execute() -> list[Any]:
+            container = await self._container_client()
+            return [feed_range async for feed_range in container.read_feed_ranges()]
+
+        return await self._retry_policy.run(
+            "changefeed.feed_ranges", _execute, is_retryable=CosmosCRUD._is_retryable_cosmos_error
+        )
+
+    async def read(self, feed_range: Any, continuation: str | None, max_items: int) -> ChangeBatch:
+        """Read at most one page of changes after ``continuation``."""
+
+        async def _execute() -> ChangeBatch:
+            kwargs: dict[str, Any] = {"feed_range": feed_range, "max_item_count": max_items}
+            if continuation is not None:
+                kwargs["continuation"] = continuation
+            else:
+                kwargs["start_time"] = self._start_time
+
+            container = await self._container_client()
+            pages = container.query_items_change_feed(**kwargs).by_page()
+            try:
+                page = await pages.__anext__()
+            except StopAsyncIteration:
+                items: list[dict[str, Any]] = []
+            else:
+                items = [normalize_document(item) async for item in page]
+            # The pager's token is the SDK's composite continuation; the ``etag`` header is the
+            # raw LSN, which the SDK would read back as a legacy token clashing with feed_range.
+            return ChangeBatch(items=items, continuation=pages.continuation_token or continuation)
+
+        return await self._retry_policy.run(
+            "changefeed.read", _execute, is_retryable=CosmosCRUD._is_retryable_cosmos_error
+        )
+
+
+class LeaseStore(ABC):
+    """Persistence for leases; every mutation is conditional on the lease's ``etag``."""
+
+    @abstractmethod
+    async def list_leases(self, processor: str) -> list[Lease]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def ensure(self, processor: str, token: str, feed_range: Any) -> Lease:
+        """Return the lease for ``token``, creating an unowned one if it does not exist."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def acquire(self, lease: Lease, owner: str, expires_at: float) -> Lease | None:
+        """Claim ``lease``; ``None`` when another instance changed it first."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def checkpoint(self, lease: Lease, continuation: str | None, expires_at: float) -> Lease:
+        """Store ``continuation`` and renew the lease; raises :class:`LeaseLostError` if taken over."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def release(self, lease: Lease) -> None:
+        raise NotImplementedError
+
+
+class InMemoryLeaseStore(LeaseStore):
+    def __init__(self) -> None:
+        self.leases: dict[str, Lease] = {}
+        self._lock = asyncio.Lock()
+
+    def _store(self, lease: Lease) -> Lease:
+        stored = dataclasses.replace(lease, etag=uuid.uuid4().hex)
+        self.leases[stored.id] = stored
+        return stored
+
+    def _current(self, lease: Lease) -> Lease | None:
+        current = self.leases.get(lease.id)
+        if current is None or current.etag != lease.etag:
+            return None
+        return current
+
+    async def list_leases(self, processor: str) -> list[Lease]:
+        return [lease for lease in self.leases.values() if lease.processor == processor]
+
+    async def ensure(self, processor: str, token: str, feed_range: Any) -> Lease:
+        async with self._lock:
+            lease = Lease(processor=processor, token=token, feed_range=feed_range)
+            return self.leases.get(lease.id) or self._store(lease)
+
+    async def acquire(self, lease: Lease, owner: str, expires_at: float) -> Lease | None:
+        async with self._lock:
+            if self._current(lease) is None:
+                return None
+            return self._store(dataclasses.replace(lease, owner=owner, expires_at=expires_at))
+
+    async def checkpoint(self, lease: Lease, continuation: str | None, expires_at: float) -> Lease:
+        async with self._lock:
+            if self._current(lease) is None:
+                raise LeaseLostError(lease.id)
+            return self._store(
+                dataclasses.replace(lease, continuation=continuation, expires_at=expires_at)
+            )
+
+    async def release(self, lease: Lease) -> None:
+        async with self._lock:
+            if self._current(lease) is not None:
+                self._store(dataclasses.replace(lease, owner=None, expires_at=0.0))
+
+
+class CosmosLeaseStore(LeaseStore):
+    """Leases as documents in a container partitioned by ``/id``; ETags guard every write."""
+
+    LIST_QUERY = "SELECT * FROM c WHERE c.processor = @processor"
+
+    def __init__(
+        self, container: str, config: CosmosConfig, *, crud: CosmosCRUD | None = None
+    ) -> None:
+        self._crud = crud or CosmosCRUD(container, config)
+
+    @staticmethod
+    def _from_document(document: dict[str, Any]) -> Lease:
+        return Lease(
+            processor=str(document["processor"]),
+            token=str(document["token"]),
+            feed_range=document.get("feed_range"),
+            owner=document.get("owner"),
+            expires_at=float(document.get("expires_at") or 0.0),
+            continuation=document.get("continuation"),
+            etag=document.get("_etag"),
+        )
+
+    async def list_leases(self, processor: str) -> list[Lease]:
+        rows = await self._crud.list_items(
+            query=self.LIST_QUERY, parameters=[{"name": "@processor", "value": processor}]
+        )
+        return [self._from_document(row) for row in rows]
+
+    async def ensure(self, processor: str, token: str, feed_range: Any) -> Lease:
+        lease = Lease(processor=processor, token=token, feed_range=feed_range)
+        result = await self._crud.create_item_strict(
+            {
+                "id": lease.id,
+                "processor": processor,
+                "token": token,
+                "feed_range": feed_range,
+                "owner": None,
+                "expires_at": 0.0,
+                "continuation": None,
+            },
+            partition_key=lease.id,
+        )
+        return self._from_document(result.item)
+
+    async def _patch(self, lease: Lease, values: dict[str, Any]) -> Lease:
+        document = await self._crud.patch_item(
+            lease.id,
+            [patch_set(f"/{name}", value) for name, value in values.items()],
+            partition_key=lease.id,
+            if_match=lease.etag,
+        )
+        return self._from_document(document)
+
+    async def acquire(self, lease: Lease, owner: str, expires_at: float) -> Lease | None:
+        try:
+            return await self._patch(lease, {"owner": owner, "expires_at": expires_at})
+        except (
+            cosmos_exceptions.CosmosAccessConditionFailedError,
+            cosmos_exceptions.CosmosResourceNotFoundError,
+        ):
+            return None
+
+    async def checkpoint(self, lease: Lease, continuation: str | None, expires_at: float) -> Lease:
+        try:
+            return await self._patch(
+                lease, {"continuation": continuation, "expires_at": expires_at}
+            )
+        except (
+            cosmos_exceptions.CosmosAccessConditionFailedError,
+            cosmos_exceptions.CosmosResourceNotFoundError,
+        ) as exc:
+            raise LeaseLostError(lease.id) from exc
+
+    async def release(self, lease: Lease) -> None:
+        with contextlib.suppress(
+            cosmos_exceptions.CosmosAccessConditionFailedError,
+            cosmos_exceptions.CosmosResourceNotFoundError,
+        ):
+            await self._patch(lease, {"owner": None, "expires_at": 0.0})
+
+
+class ChangeFeedProcessor:
+    """Deliver a container's changes to ``handler`` in batches, checkpointing after each."""
+
+    def __init__(
+        self,
+        name: str,
+        source: ChangeFeedSource,
+        leases: LeaseStore,
+        handler: ChangeHandler,
+        *,
+        owner: str | None = None,
+        max_batch_size: int = 100,
+        poll_interval: float = 5.0,
+        lease_ttl: float = 60.0,
+        metrics_sink: MetricsSink | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.name = name
+        self.owner = owner or uuid.uuid4().hex
+        self._source = source
+        self._leases = leases
+        self._handler = handler
+        self._max_batch_size = max_batch_size
+        self._poll_interval = poll_interval
+        self._lease_ttl = lease_ttl
+        self._metrics_sink = metrics_sink
+        self._clock = clock
+        self._owned: dict[str, Lease] = {}
+        self._feed_ranges: list[Any] | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def owned_leases(self) -> list[Lease]:
+        return list(self._owned.values())
+
+    def _metrics(self) -> MetricsSink:
+        return self._metrics_sink or get_metrics_sink()
+
+    async def _balance(self) -> list[Lease]:
+        """Ensure a lease per feed range and claim this instance's fair share of them."""
+
+        if self._feed_ranges is None:
+            self._feed_ranges = await self._source.feed_ranges()
+        existing = {lease.token: lease for lease in await self._leases.list_leases(self.name)}
+        for feed_range in self._feed_ranges:
+            token = lease_token(feed_range)
+            if token not in existing:
+                existing[token] = await self._leases.ensure(self.name, token, feed_range)
+
+        now = self._clock()
+        owners = {lease.owner for lease in existing.values() if not lease.is_available(now)}
+        owners.add(self.owner)
+        fair_share = math.ceil(len(existing) / len(owners))
+        owned = [lease for lease in existing.values() if lease.held_by(self.owner, now)]
+        for lease in existing.values():
+            if len(owned) >= fair_share:
+                break
+            if not lease.is_available(now):
+                continue
+            acquired = await self._leases.acquire(lease, self.owner, now + self._lease_ttl)
+            if acquired is not None:
+                owned.append(acquired)
+        if len(owned) < fair_share:
+            owned.extend(
+                await self._steal(existing.values(), fair_share - len(owned), fair_share, now)
+            )
+        self._owned = {lease.token: lease for lease in owned}
+        return owned
+
+    async def _steal(
+        self, leases: Iterable[Lease], wanted: int, fair_share: int, now: float
+    ) -> list[Lease]:
+        """Take leases from instances holding more than their share (they notice on checkpoint)."""
+
+        held = [
+            lease for lease in leases if lease.owner != self.owner and not lease.is_available(now)
+        ]
+        counts = Counter(lease.owner for lease in held)
+        stolen: list[Lease] = []
+        for lease in held:
+            if len(stolen) >= wanted:
+                break
+            if counts[lease.owner] <= fair_share:
+                continue
+            acquired = await self._leases.acquire(lease, self.owner, now + self._lease_ttl)
+            if acquired is not None:
+                counts[lease.owner] -= 1
+                stolen.append(acquired)
+        return stolen
+
+    async def _process(self, lease: Lease) -> int:
+        attributes = {"processor": self.name}
+        batch = await self._source.read(lease.feed_range, lease.continuation, self._max_batch_size)
+        if batch.items:
+            started = time.perf_counter()
+            try:
+                await self._handler(batch.items)
+            except Exception:
+                logger.exception(
+                    "Change feed handler for %s failed; batch will be redelivered", self.name
+                )
+                self._metrics().increment("changefeed.handler_errors", 1, attributes)
+                return 0
+            sink = self._metrics()
+            sink.increment("changefeed.batches", 1, attributes)
+            sink.increment("changefeed.documents", len(batch.items), attributes)
+            sink.observe(
+                "changefeed.handler_latency_ms", (time.perf_counter() - started) * 1000, attributes
+            )
+
+        now = self._clock()
+        if (
+            batch.continuation == lease.continuation
+            and lease.expires_at - now > self._lease_ttl / 2
+        ):
+            return len(batch.items)
+        try:
+            self._owned[lease.token] = await self._leases.checkpoint(
+                lease, batch.continuation, now + self._lease_ttl
+            )
+        except LeaseLostError:
+            logger.info("Lease %s was taken over before its checkpoint", lease.id)
+            self._owned.pop(lease.token, None)
+        return len(batch.items)
+
+    async def run_once(self) -> int:
+        """Balance leases and process one batch per owned lease; returns documents handled."""
+
+        handled = 0
+        for lease in await self._balance():
+            handled += await self._process(lease)
+        return handled
+
+    async def drain(self, max_rounds: int = 1000) -> int:
+        """Process until no changes are pending (tests and one-off catch-up jobs)."""
+
+        total = 0
+        for _ in range(max_rounds):
+            handled = await self.run_once()
+            total += handled
+            if handled == 0:
+                break
+        return total
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                handled = await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Change feed processor %s failed; retrying", self.name)
+                handled = 0
+            if handled == 0:
+                await asyncio.sleep(self._poll_interval)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name=f"changefeed:{self.name}")
+
+    async def stop(self) -> None:
+        """Stop polling and release owned leases so other instances pick them up at once."""
+
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        leases, self._owned = list(self._owned.values()), {}
+        for lease in leases:
+            try:
+                await self._leases.release(lease)
+            except Exception as exc:  # noqa: BLE001 - leases expire on their own
+                logger.warning("Failed to release lease %s: %s", lease.id, exc)
+
+    async def __aenter__(self) -> ChangeFeedProcessor:
+        self.start()
+        return self
+
+    async def __aexit__(self, *_exc: object) -> None:
+        await self.stop()
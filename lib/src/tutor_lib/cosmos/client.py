@@ -2,11 +2,137 @@
 
 from __future__ import annotations
 
+import asyncio
+import inspect
+import logging
+import os
+from collections.abc import Callable
+from typing import Any
+
 from azure.cosmos.aio import CosmosClient
 from azure.identity.aio import DefaultAzureCredential
 
+logger = logging.getLogger(__name__)
+
 
 def create_cosmos_client(endpoint: str) -> tuple[DefaultAzureCredential, CosmosClient]:
     credential = DefaultAzureCredential()
     client = CosmosClient(endpoint, credential=credential)
     return credential, client
+
+
+class CosmosClientPool:
+    """Process-wide cache of Cosmos clients: one client per endpoint, one proxy per container.
+
+    Clients are bound to the event loop that created them; a lookup from a different
+    loop (for example a fresh test client) transparently builds a new client and closes
+    the stale one.
+    """
+
+    def __init__(
+        self,
+        credential_factory: Callable[[], Any] | None = None,
+        client_factory: Callable[..., Any] | None = None,
+    ) -> None:
+        self._credential_factory = credential_factory or DefaultAzureCredential
+        self._client_factory = client_factory or CosmosClient
+        self._credential: Any | None = None
+        self._clients: dict[str, tuple[asyncio.AbstractEventLoop, Any]] = {}
+        self._containers: dict[tuple[str, str, str], Any] = {}
+        self._lock: asyncio.Lock | None = None
+        self._lock_loop: asyncio.AbstractEventLoop | None = None
+
+    def _get_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        return self._lock
+
+    async def client(self, endpoint: str) -> Any:
+        loop = asyncio.get_running_loop()
+        cached = self._clients.get(endpoint)
+        if cached is not None and cached[0] is loop:
+            return cached[1]
+
+        async with self._get_lock():
+            cached = self._clients.get(endpoint)
+            if cached is not None and cached[0] is loop:
+                return cached[1]
+            stale = self._forget(endpoint)
+            if self._credential is None:
+                self._credential = self._credential_factory()
+            client = self._client_factory(endpoint, credential=self._credential)
+            self._clients[endpoint] = (loop, client)
+        if stale is not None:
+            await self._close_stale(stale)
+        return client
+
+    async def container(self, endpoint: str, database: str, container: str) -> Any:
+        client = await self.client(endpoint)
+        key = (endpoint, database, container)
+        proxy = self._containers.get(key)
+        if proxy is None:
+            proxy = client.get_database_client(database).get_container_client(container)
+            self._containers[key] = proxy
+        return proxy
+
+    def _forget(self, endpoint: str) -> Any | None:
+        cached = self._clients.pop(endpoint, None)
+        for key in [key for key in self._containers if key[0] == endpoint]:
+            self._containers.pop(key, None)
+        return cached[1] if cached is not None else None
+
+    @staticmethod
+    async def _close_stale(client: Any) -> None:
+        # The client's transports belong to a previous event loop and may not close cleanly.
+        try:
+            await client.close()
+        except Exception as exc:  # noqa: BLE001 - a stale client must not fail the new lookup
+            logger.warning("Failed to close Cosmos client from a previous event loop: %s", exc)
+
+    async def close(self) -> None:
+        clients = [client for _, client in self._clients.values()]
+        credential = self._credential
+        self._clients.clear()
+        self._containers.clear()
+        self._credential = None
+
+        for client in clients:
+            try:
+                await client.close()
+            except Exception as exc:  # noqa: BLE001 - teardown must not mask shutdown
+                logger.warning("Failed to close Cosmos client: %s", exc)
+
+        if credential is not None:
+            close_method = getattr(credential, "close", None)
+            if callable(close_method):
+                result = close_method()
+                if inspect.isawaitable(result):
+                    await result
+
+
+_POOL = CosmosClientPool()
+EMULATOR_ENV = "COSMOS_EMULATOR"
+
+
+def _emulator_enabled() -> bool:
+    return os.getenv(EMULATOR_ENV, "").strip().lower() == "memory"
+
+
+def get_client_pool() -> CosmosClientPool:
+    """The shared pool; ``COSMOS_EMULATOR=memory`` swaps in the in-process emulator."""
+
+    if _emulator_enabled():
+        from .emulator import get_in_memory_pool
+
+        return get_in_memory_pool()
+    return _POOL
+
+
+async def close_cosmos_clients() -> None:
+    await _POOL.close()
+    if _emulator_enabled():
+        from .emulator import get_in_memory_pool
+
+        await get_in_memory_pool().close()
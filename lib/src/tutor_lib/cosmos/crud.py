@@ -3,17 +3,104 @@
 from __future__ import annotations
 
 import asyncio
-from collections.abc import AsyncIterator, Iterable, Mapping
+import logging
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, Mapping, Sequence
 from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass
 from typing import Any, cast
 
+from azure.core import MatchConditions
 from azure.core import exceptions as azure_exceptions
 from azure.cosmos import exceptions as cosmos_exceptions
-from azure.cosmos.aio import CosmosClient
-from azure.identity.aio import DefaultAzureCredential
 
 from tutor_lib.config import CosmosConfig
+from tutor_lib.metrics import MetricsSink, current_route, get_metrics_sink
+from tutor_lib.resilience import COSMOS, Bulkhead, RetryPolicy, get_bulkhead
+from tutor_lib.schemas import InvalidContinuationError
+
+from .cache import QueryCache
+from .client import CosmosClientPool, get_client_pool
+from .patch import PATCH_OPERATION_LIMIT, is_idempotent
+from .projection import projection_query
+
+logger = logging.getLogger(__name__)
+
+COSMOS_RETRY_POLICY = RetryPolicy(max_attempts=3, base_delay=0.5, max_delay=8.0, deadline=30.0)
+REQUEST_CHARGE_HEADER = "x-ms-request-charge"
+
+
+@dataclass(slots=True)
+class _OperationSample:
+    request_charge: float = 0.0
+    attempts: int = 0
+    item_count: int = 0
+
+
+_ACTIVE_SAMPLE: ContextVar[_OperationSample | None] = ContextVar("cosmos_operation_sample", default=None)
+
+
+def _capture_response(headers: Mapping[str, Any], *_: Any) -> None:
+    """``response_hook`` for SDK calls: add each response's RU charge to the active sample."""
+
+    sample = _ACTIVE_SAMPLE.get()
+    if sample is None or not headers:
+        return
+    charge = headers.get(REQUEST_CHARGE_HEADER)
+    if charge is None:
+        charge = next(
+            (value for key, value in headers.items() if str(key).lower() == REQUEST_CHARGE_HEADER),
+            None,
+        )
+    try:
+        sample.request_charge += float(charge or 0)
+    except (TypeError, ValueError):
+        return
+
+
+def normalize_document(value: Any) -> Any:
+    """Coerce a Cosmos result to plain ``dict``/``list`` values, copying only what must change.
+
+    The SDK already returns JSON-decoded dicts and lists, so those are returned as-is (no
+    allocation); a container is copied only when a tuple, another ``Mapping`` type (such as
+    the SDK's ``CosmosDict`` wrapper) or such a value nested inside it has to be converted.
+    """
+
+    value_type = type(value)
+    if value_type is dict:
+        copied: dict[Any, Any] | None = None
+        for key, item in value.items():
+            normalized = normalize_document(item)
+            if normalized is not item:
+                if copied is None:
+                    copied = dict(value)
+                copied[key] = normalized
+        return value if copied is None else copied
+    if value_type is list:
+        copied_list: list[Any] | None = None
+        for index, item in enumerate(value):
+            normalized = normalize_document(item)
+            if normalized is not item:
+                if copied_list is None:
+                    copied_list = list(value)
+                copied_list[index] = normalized
+        return value if copied_list is None else copied_list
+    if isinstance(value, Mapping):
+        return {key: normalize_document(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [normalize_document(item) for item in value]
+    return value
+
+
+def _item_count(result: Any) -> int:
+    if result is None:
+        return 0
+    if isinstance(result, QueryPage):
+        return len(result.items)
+    if isinstance(result, list):
+        return len(result)
+    return 1
 
 
 @dataclass(frozen=True, slots=True)
@@ -22,31 +109,76 @@ class StrictCreateResult:
     created: bool
 
 
+@dataclass(frozen=True, slots=True)
+class QueryPage:
+    items: list[Any]
+    continuation: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class BulkItemResult:
+    index: int
+    item_id: str | None
+    succeeded: bool
+    status_code: int | None = None
+    error: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class BulkWriteResult:
+    results: tuple[BulkItemResult, ...]
+
+    @property
+    def succeeded(self) -> int:
+        return sum(1 for result in self.results if result.succeeded)
+
+    @property
+    def failures(self) -> list[BulkItemResult]:
+        return [result for result in self.results if not result.succeeded]
+
+
 class CosmosCRUD:
-    def __init__(self, container_name: str, config: CosmosConfig) -> None:
+    DEFAULT_PAGE_SIZE = 100
+    DEFAULT_BULK_CONCURRENCY = 16
+    TRANSACTIONAL_BATCH_LIMIT = 100
+    # Operations that change the container and therefore invalidate its cached reads.
+    WRITE_OPERATIONS = frozenset(
+        {"create_item", "create_item_strict", "update_item", "delete_item", "patch_item", "batch_upsert"}
+    )
+
+    def __init__(
+        self,
+        container_name: str,
+        config: CosmosConfig,
+        *,
+        pool: CosmosClientPool | None = None,
+        retry_policy: RetryPolicy | None = None,
+        metrics_sink: MetricsSink | None = None,
+        cache: QueryCache | None = None,
+        bulkhead: Bulkhead | None = None,
+    ) -> None:
         self._endpoint = config.endpoint
         self._database = config.database
         self._container = container_name
+        self._pool = pool or get_client_pool()
+        self._retry_policy = retry_policy or COSMOS_RETRY_POLICY
+        self._metrics_sink = metrics_sink
+        self._cache = cache
+        self._bulkhead = bulkhead or get_bulkhead(COSMOS, config.endpoint)
 
     @asynccontextmanager
     async def _container_client(self) -> AsyncIterator[Any]:
-        async with DefaultAzureCredential() as credential:
-            async with CosmosClient(self._endpoint, credential=credential) as client:
-                database = client.get_database_client(self._database)
-                container = database.get_container_client(self._container)
-                yield container
+        yield await self._pool.container(self._endpoint, self._database, self._container)
 
     def _normalize(self, value: Any) -> Any:
-        if isinstance(value, Mapping):
-            return {key: self._normalize(item) for key, item in value.items()}
-        if isinstance(value, list):
-            return [self._normalize(item) for item in value]
-        if isinstance(value, tuple):
-            return [self._normalize(item) for item in value]
-        return value
+        return normalize_document(value)
 
     @staticmethod
-    def _is_retryable_cosmos_error(exc: Exception) -> bool:
+    def _is_retryable_cosmos_error(exc: BaseException) -> bool:
+        if not isinstance(exc, azure_exceptions.AzureError):
+            return False
+        if isinstance(exc, cosmos_exceptions.CosmosResourceNotFoundError):
+            return False
         if isinstance(exc, (azure_exceptions.ServiceRequestError, azure_exceptions.ServiceResponseError)):
             return True
 
@@ -57,57 +189,205 @@ class CosmosCRUD:
             return True
         return status_code >= 500
 
-    async def _with_retries(self, operation: str, callback: Any) -> Any:
-        delay_seconds = 0.5
-        max_attempts = 3
-        last_error: Exception | None = None
+    @staticmethod
+    def _is_unapplied_cosmos_error(exc: BaseException) -> bool:
+        """Failures that guarantee the write did not happen, so non-idempotent writes may retry."""
+        if isinstance(exc, azure_exceptions.ServiceRequestError):
+            return True
+        return isinstance(exc, azure_exceptions.AzureError) and getattr(exc, "status_code", None) == 429
 
-        for attempt in range(1, max_attempts + 1):
-            try:
+    async def _with_retries(
+        self,
+        operation: str,
+        callback: Any,
+        *,
+        is_retryable: Callable[[BaseException], bool] | None = None,
+    ) -> Any:
+        sample = _OperationSample()
+        token = _ACTIVE_SAMPLE.set(sample)
+        started = time.perf_counter()
+        outcome = "success"
+
+        async def _attempt() -> Any:
+            # Hold a slot per attempt only, so backoff sleeps don't starve other callers.
+            async with self._bulkhead:
+                sample.attempts += 1
                 return await callback()
-            except cosmos_exceptions.CosmosResourceNotFoundError:
-                raise
-            except (
-                cosmos_exceptions.CosmosHttpResponseError,
-                azure_exceptions.ServiceRequestError,
-                azure_exceptions.ServiceResponseError,
-                azure_exceptions.AzureError,
-            ) as exc:
-                if not self._is_retryable_cosmos_error(exc):
-                    raise
-                last_error = exc
-                if attempt == max_attempts:
-                    break
-                await asyncio.sleep(delay_seconds)
-                delay_seconds *= 2
-
-        if last_error is not None:
-            raise last_error
-        raise RuntimeError(f"Operation '{operation}' failed without an explicit exception")
+
+        try:
+            result = await self._retry_policy.run(
+                operation, _attempt, is_retryable=is_retryable or self._is_retryable_cosmos_error
+            )
+            sample.item_count = _item_count(result)
+            return result
+        except Exception:
+            outcome = "error"
+            raise
+        finally:
+            _ACTIVE_SAMPLE.reset(token)
+            # Failed writes may still have been applied, so they invalidate as well.
+            if self._cache is not None and operation in self.WRITE_OPERATIONS:
+                self._cache.invalidate(self._container)
+            self._record_sample(operation, sample, time.perf_counter() - started, outcome)
+
+    async def _cached(self, operation: str, parts: tuple[Any, ...], load: Callable[[], Awaitable[Any]]) -> Any:
+        """Serve ``load()`` from the query cache when one is configured."""
+
+        cache = self._cache
+        if cache is None:
+            return await load()
+        key = cache.key(self._container, operation, *parts)
+        hit, value = cache.get(key)
+        attributes = {"container": self._container, "operation": operation}
+        sink = self._metrics_sink or get_metrics_sink()
+        sink.increment("cosmos.cache.hits" if hit else "cosmos.cache.misses", 1, attributes)
+        if hit:
+            return value
+        generation = cache.generation(self._container)
+        value = await load()
+        cache.put(key, value, generation)
+        return value
+
+    def _record_sample(
+        self, operation: str, sample: _OperationSample, elapsed_seconds: float, outcome: str
+    ) -> None:
+        sink = self._metrics_sink or get_metrics_sink()
+        attributes = {
+            "container": self._container,
+            "operation": operation,
+            "route": current_route(),
+            "outcome": outcome,
+        }
+        try:
+            sink.increment("cosmos.operations", 1, attributes)
+            sink.observe("cosmos.request_charge", sample.request_charge, attributes)
+            sink.observe("cosmos.latency_ms", elapsed_seconds * 1000, attributes)
+            sink.observe("cosmos.item_count", sample.item_count, attributes)
+            if sample.attempts > 1:
+                sink.increment("cosmos.retries", sample.attempts - 1, attributes)
+        except Exception as exc:  # noqa: BLE001 - metrics never fail a data call
+            logger.debug("Failed to record Cosmos metrics for %s: %s", operation, exc)
+
+    @staticmethod
+    def _query_iterable(
+        container: Any,
+        query: str,
+        params: list[dict[str, Any]],
+        partition_key: str | None,
+        max_item_count: int | None = None,
+    ) -> Any:
+        kwargs: dict[str, Any] = {
+            "query": query,
+            "parameters": params,
+            "response_hook": _capture_response,
+        }
+        if partition_key is not None:
+            kwargs["partition_key"] = partition_key
+        if max_item_count is not None:
+            kwargs["max_item_count"] = max_item_count
+        return container.query_items(**kwargs)
 
     async def list_items(
         self,
         query: str = "SELECT * FROM c",
         parameters: Iterable[dict[str, Any]] | None = None,
         partition_key: str | None = None,
+        *,
+        fields: Iterable[str] | None = None,
     ) -> list[Any]:
+        """Return every matching document; ``fields`` limits them to those top-level properties."""
+
         params = list(parameters or [])
+        if fields is not None:
+            query = projection_query(query, fields)
 
         async def _execute() -> list[Any]:
             async with self._container_client() as container:
-                query_iterable = (
-                    container.query_items(query=query, parameters=params, partition_key=partition_key)
-                    if partition_key is not None
-                    else container.query_items(query=query, parameters=params)
-                )
+                query_iterable = self._query_iterable(container, query, params, partition_key)
                 return [self._normalize(item) async for item in query_iterable]
 
-        return await self._with_retries("list_items", _execute)
+        return await self._cached(
+            "list_items",
+            (query, params, partition_key),
+            lambda: self._with_retries("list_items", _execute),
+        )
+
+    async def query_page(
+        self,
+        query: str = "SELECT * FROM c",
+        parameters: Iterable[dict[str, Any]] | None = None,
+        partition_key: str | None = None,
+        *,
+        page_size: int,
+        continuation: str | None = None,
+        fields: Iterable[str] | None = None,
+    ) -> QueryPage:
+        """Return at most ``page_size`` documents and the token that resumes the query."""
+
+        params = list(parameters or [])
+        if fields is not None:
+            query = projection_query(query, fields)
+
+        async def _execute() -> QueryPage:
+            async with self._container_client() as container:
+                try:
+                    pages = self._query_iterable(
+                        container, query, params, partition_key, max_item_count=page_size
+                    ).by_page(continuation)
+                    page = await pages.__anext__()
+                except StopAsyncIteration:
+                    return QueryPage(items=[])
+                except (ValueError, TypeError, cosmos_exceptions.CosmosHttpResponseError) as exc:
+                    # The SDK rejects tokens it cannot decode, the service answers 400 to others.
+                    if continuation is None or getattr(exc, "status_code", 400) != 400:
+                        raise
+                    raise InvalidContinuationError(continuation) from exc
+                items = [self._normalize(item) async for item in page]
+                return QueryPage(items=items, continuation=pages.continuation_token or None)
+
+        return await self._cached(
+            "query_page",
+            (query, params, partition_key, page_size, continuation),
+            lambda: self._with_retries("query_page", _execute),
+        )
+
+    async def iter_items(
+        self,
+        query: str = "SELECT * FROM c",
+        parameters: Iterable[dict[str, Any]] | None = None,
+        partition_key: str | None = None,
+        *,
+        page_size: int | None = None,
+        continuation: str | None = None,
+        fields: Iterable[str] | None = None,
+    ) -> AsyncIterator[Any]:
+        """Yield normalized documents one Cosmos page at a time.
+
+        Each page is fetched under the retry policy and resumed from the last
+        continuation token, so a transient failure never replays documents that
+        were already yielded. ``fields`` projects documents as in :meth:`list_items`.
+        """
+
+        if fields is not None:
+            query = projection_query(query, fields)
+        while True:
+            page = await self.query_page(
+                query,
+                parameters,
+                partition_key,
+                page_size=page_size or self.DEFAULT_PAGE_SIZE,
+                continuation=continuation,
+            )
+            for item in page.items:
+                yield item
+            if not page.continuation:
+                return
+            continuation = page.continuation
 
     async def create_item(self, item: dict[str, Any]) -> Any:
         async def _execute() -> Any:
             async with self._container_client() as container:
-                created = await container.upsert_item(item)
+                created = await container.upsert_item(item, response_hook=_capture_response)
                 return self._normalize(created)
 
         return await self._with_retries("create_item", _execute)
@@ -125,7 +405,7 @@ class CosmosCRUD:
         async def _execute() -> StrictCreateResult:
             async with self._container_client() as container:
                 try:
-                    created = await container.create_item(body=item)
+                    created = await container.create_item(body=item, response_hook=_capture_response)
                     return StrictCreateResult(item=self._normalize(created), created=True)
                 except cosmos_exceptions.CosmosResourceExistsError:
                     if partition_key is None:
@@ -134,7 +414,9 @@ class CosmosCRUD:
                     if getattr(exc, "status_code", None) != 409 or partition_key is None:
                         raise
 
-                existing = await container.read_item(item=item_id, partition_key=partition_key)
+                existing = await container.read_item(
+                    item=item_id, partition_key=partition_key, response_hook=_capture_response
+                )
                 return StrictCreateResult(item=self._normalize(existing), created=False)
 
         return await self._with_retries("create_item_strict", _execute)
@@ -144,10 +426,14 @@ class CosmosCRUD:
 
         async def _execute() -> Any:
             async with self._container_client() as container:
-                item = await container.read_item(item=item_id, partition_key=key)
+                item = await container.read_item(
+                    item=item_id, partition_key=key, response_hook=_capture_response
+                )
                 return self._normalize(item)
 
-        return await self._with_retries("read_item", _execute)
+        return await self._cached(
+            "read_item", (item_id, key), lambda: self._with_retries("read_item", _execute)
+        )
 
     async def update_item(
         self,
@@ -159,7 +445,9 @@ class CosmosCRUD:
 
         async def _execute() -> Any:
             async with self._container_client() as container:
-                updated = await container.replace_item(item=item_id, body=item, partition_key=key)
+                updated = await container.replace_item(
+                    item=item_id, body=item, partition_key=key, response_hook=_capture_response
+                )
                 return self._normalize(updated)
 
         return await self._with_retries("update_item", _execute)
@@ -169,6 +457,185 @@ class CosmosCRUD:
 
         async def _execute() -> Any:
             async with self._container_client() as container:
-                return await container.delete_item(item=item_id, partition_key=key)
+                return await container.delete_item(
+                    item=item_id, partition_key=key, response_hook=_capture_response
+                )
 
         return await self._with_retries("delete_item", _execute)
+
+    async def patch_item(
+        self,
+        item_id: str,
+        operations: Sequence[Mapping[str, Any]],
+        *,
+        partition_key: Any = None,
+        if_match: str | None = None,
+    ) -> Any:
+        """Apply Cosmos patch operations (``set``/``incr``/``add``/...) server-side and return the document.
+
+        With ``if_match`` the patch only applies while the document still has that ``_etag``;
+        otherwise ``CosmosAccessConditionFailedError`` (412) is raised. More operations than a
+        single patch request accepts are sent as one transactional batch, so they stay atomic.
+        Non-idempotent operations (``incr``, ``add``) are only retried when throttled.
+        """
+
+        patch_operations = [dict(operation) for operation in operations]
+        if not patch_operations:
+            raise ValueError("patch_item requires at least one operation")
+        key = partition_key or item_id
+
+        async def _execute() -> Any:
+            async with self._container_client() as container:
+                if len(patch_operations) <= PATCH_OPERATION_LIMIT:
+                    kwargs: dict[str, Any] = {"response_hook": _capture_response}
+                    if if_match is not None:
+                        kwargs.update(etag=if_match, match_condition=MatchConditions.IfNotModified)
+                    patched = await container.patch_item(
+                        item=item_id, partition_key=key, patch_operations=patch_operations, **kwargs
+                    )
+                    return self._normalize(patched)
+                return self._normalize(
+                    await self._patch_in_batch(container, item_id, key, patch_operations, if_match)
+                )
+
+        retryable = None if is_idempotent(patch_operations) else self._is_unapplied_cosmos_error
+        return await self._with_retries("patch_item", _execute, is_retryable=retryable)
+
+    @staticmethod
+    async def _patch_in_batch(
+        container: Any,
+        item_id: str,
+        partition_key: Any,
+        operations: list[dict[str, Any]],
+        if_match: str | None,
+    ) -> Any:
+        batch: list[tuple[Any, ...]] = []
+        for start in range(0, len(operations), PATCH_OPERATION_LIMIT):
+            chunk = operations[start : start + PATCH_OPERATION_LIMIT]
+            options = {"if_match_etag": if_match} if if_match is not None and not batch else {}
+            batch.append(("patch", (item_id, chunk), options))
+        try:
+            results = await container.execute_item_batch(
+                batch_operations=batch, partition_key=partition_key, response_hook=_capture_response
+            )
+        except cosmos_exceptions.CosmosBatchOperationError as exc:
+            # Surface the failing operation's status as the equivalent single-request error.
+            status_code = int(exc.status_code or 400)
+            error_type = {
+                404: cosmos_exceptions.CosmosResourceNotFoundError,
+                412: cosmos_exceptions.CosmosAccessConditionFailedError,
+            }.get(status_code, cosmos_exceptions.CosmosHttpResponseError)
+            raise error_type(status_code=status_code, message=str(exc)) from exc
+        return results[-1].get("resourceBody")
+
+    @staticmethod
+    async def _run_bounded(
+        count: int,
+        concurrency: int,
+        worker: Callable[[int], Awaitable[None]],
+    ) -> None:
+        indexes = iter(range(count))
+
+        async def _drain() -> None:
+            for index in indexes:
+                await worker(index)
+
+        await asyncio.gather(*(_drain() for _ in range(max(1, min(concurrency, count)))))
+
+    @staticmethod
+    def _failed_result(index: int, item: Mapping[str, Any], exc: Exception) -> BulkItemResult:
+        return BulkItemResult(
+            index=index,
+            item_id=cast(str | None, item.get("id")),
+            succeeded=False,
+            status_code=cast(int | None, getattr(exc, "status_code", None)),
+            error=str(exc),
+        )
+
+    async def bulk_upsert(
+        self,
+        items: Iterable[dict[str, Any]],
+        *,
+        concurrency: int | None = None,
+    ) -> BulkWriteResult:
+        """Upsert ``items`` with at most ``concurrency`` requests in flight.
+
+        Every item is attempted; failures are reported per item instead of aborting the load.
+        """
+
+        documents = list(items)
+        results: list[BulkItemResult | None] = [None] * len(documents)
+
+        async def _upsert(index: int) -> None:
+            document = documents[index]
+            try:
+                await self.create_item(document)
+            except Exception as exc:  # noqa: BLE001 - reported per item
+                results[index] = self._failed_result(index, document, exc)
+            else:
+                results[index] = BulkItemResult(index=index, item_id=document.get("id"), succeeded=True)
+
+        await self._run_bounded(len(documents), concurrency or self.DEFAULT_BULK_CONCURRENCY, _upsert)
+        return BulkWriteResult(results=tuple(cast(list[BulkItemResult], results)))
+
+    async def batch_upsert(
+        self,
+        items: Iterable[dict[str, Any]],
+        *,
+        partition_key: str | Callable[[Mapping[str, Any]], Any] = "id",
+        concurrency: int | None = None,
+    ) -> BulkWriteResult:
+        """Upsert ``items`` as transactional batches grouped by partition key.
+
+        ``partition_key`` is the document field holding the key, or a callable that derives it.
+        Each batch of up to ``TRANSACTIONAL_BATCH_LIMIT`` operations commits atomically, so a
+        failing operation marks every item of its batch as failed.
+        """
+
+        key_of = partition_key if callable(partition_key) else (lambda item: item.get(partition_key))
+        documents = list(items)
+        groups: dict[Any, list[int]] = {}
+        for index, document in enumerate(documents):
+            groups.setdefault(key_of(document), []).append(index)
+
+        chunks: list[tuple[Any, list[int]]] = [
+            (key, indexes[start : start + self.TRANSACTIONAL_BATCH_LIMIT])
+            for key, indexes in groups.items()
+            for start in range(0, len(indexes), self.TRANSACTIONAL_BATCH_LIMIT)
+        ]
+        results: list[BulkItemResult | None] = [None] * len(documents)
+
+        async def _commit(chunk_index: int) -> None:
+            key, indexes = chunks[chunk_index]
+            operations = [("upsert", (documents[index],)) for index in indexes]
+
+            async def _execute() -> Any:
+                async with self._container_client() as container:
+                    return await container.execute_item_batch(
+                        batch_operations=operations, partition_key=key, response_hook=_capture_response
+                    )
+
+            try:
+                await self._with_retries("batch_upsert", _execute)
+            except cosmos_exceptions.CosmosBatchOperationError as exc:
+                failed_offset = exc.error_index
+                for offset, index in enumerate(indexes):
+                    document = documents[index]
+                    results[index] = BulkItemResult(
+                        index=index,
+                        item_id=document.get("id"),
+                        succeeded=False,
+                        status_code=exc.status_code if offset == failed_offset else 424,
+                        error=str(exc) if offset == failed_offset else "Batch rolled back",
+                    )
+            except Exception as exc:  # noqa: BLE001 - reported per item
+                for index in indexes:
+                    results[index] = self._failed_result(index, documents[index], exc)
+            else:
+                for index in indexes:
+                    results[index] = BulkItemResult(
+                        index=index, item_id=documents[index].get("id"), succeeded=True
+                    )
+
+        await self._run_bounded(len(chunks), concurrency or self.DEFAULT_BULK_CONCURRENCY, _commit)
+        return BulkWriteResult(results=tuple(cast(list[BulkItemResult], results)))
@@ -0,0 +1,27 @@
+"""In-memory Cosmos DB emulator for offline tests, benchmarks and profiling."""
+
+from .backend import (
+    DEFAULT_PARTITION_KEYS,
+    InMemoryContainer,
+    InMemoryCosmosAccount,
+    InMemoryCosmosClient,
+    InMemoryDatabase,
+    create_in_memory_pool,
+    get_in_memory_account,
+    get_in_memory_pool,
+)
+from .query import CompiledQuery, QuerySyntaxError, compile_query
+
+__all__ = [
+    "DEFAULT_PARTITION_KEYS",
+    "CompiledQuery",
+    "InMemoryContainer",
+    "InMemoryCosmosAccount",
+    "InMemoryCosmosClient",
+    "InMemoryDatabase",
+    "QuerySyntaxError",
+    "compile_query",
+    "create_in_memory_pool",
+    "get_in_memory_account",
+    "get_in_memory_pool",
+]
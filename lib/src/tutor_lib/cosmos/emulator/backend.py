@@ -0,0 +1,721 @@
+"""In-process stand-in for the async Cosmos SDK surface that ``CosmosCRUD`` drives.
+
+``InMemoryCosmosAccount.client`` is a drop-in ``client_factory`` for ``CosmosClientPool``, so
+the full CRUD stack (retries, metrics, pagination, bulk writes) runs unchanged against it.
+Errors are the SDK's own exception types, responses carry an approximate
+``x-ms-request-charge`` and both latency and 429 throttling can be injected.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import bisect
+import copy
+import json
+import random
+import time
+import uuid
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, Mapping, Sequence
+from datetime import datetime
+from typing import Any
+
+from azure.cosmos import exceptions as cosmos_exceptions
+from azure.cosmos.partition_key import NonePartitionKeyValue, NullPartitionKeyValue
+
+from ..client import CosmosClientPool
+from ..patch import PatchError, apply_patch_operations
+from .query import bind_parameters, compile_query
+
+# Mirrors ``cosmos_containers`` in infra/terraform/variables.tf.
+DEFAULT_PARTITION_KEYS: dict[str, str] = {
+    "essays": "/student_id",
+    "questions": "/student_id",
+    "answers": "/student_id",
+    "upskilling_plans": "/professor_id",
+    "learner_record_events": "/learner_key",
+    "insights_reports": "/school_id",
+    "insights_feedback": "/report_id",
+}
+
+_POINT_READ_CHARGE = 1.0
+_WRITE_CHARGE = 5.0
+_QUERY_BASE_CHARGE = 2.3
+_QUERY_SCAN_CHARGE = 0.05
+_CROSS_PARTITION_CHARGE = 1.0
+_SYSTEM_PROPERTIES = ("_rid", "_self", "_etag", "_attachments", "_ts")
+_CHANGE_FEED_CHARGE = 1.0
+_FULL_FEED_RANGE: dict[str, Any] = {
+    "Range": {"isMinInclusive": True, "isMaxInclusive": False, "min": "", "max": "FF"}
+}
+
+ResponseHook = Callable[[Mapping[str, Any], Any], None]
+
+
+def _status_error(
+    status_code: int, message: str, headers: Mapping[str, str] | None = None
+) -> Exception:
+    if status_code == 404:
+        error: Exception = cosmos_exceptions.CosmosResourceNotFoundError(
+            status_code=404, message=message
+        )
+    elif status_code == 409:
+        error = cosmos_exceptions.CosmosResourceExistsError(status_code=409, message=message)
+    elif status_code == 412:
+        error = cosmos_exceptions.CosmosAccessConditionFailedError(status_code=412, message=message)
+    else:
+        error = cosmos_exceptions.CosmosHttpResponseError(status_code=status_code, message=message)
+    error.headers = dict(headers or {})  # type: ignore[attr-defined]
+    return error
+
+
+def _partition_value(document: Mapping[str, Any], path: str) -> Any:
+    value: Any = document
+    for segment in path.strip("/").split("/"):
+        if not isinstance(value, Mapping) or segment not in value:
+            return None
+        value = value[segment]
+    return value
+
+
+def _partition_arg(value: Any) -> Any:
+    """Documents without (or with a null) partition key property share the ``None`` partition."""
+
+    if value is NonePartitionKeyValue or value is NullPartitionKeyValue:
+        return None
+    return value
+
+
+def _write_charge(document: Mapping[str, Any]) -> float:
+    size_kb = len(json.dumps(document, default=str)) / 1024
+    return round(_WRITE_CHARGE + size_kb, 2)
+
+
+class _PageIterator:
+    """``by_page`` result: yields one async iterable per page and tracks ``continuation_token``."""
+
+    def __init__(
+        self, results: Callable[[], Awaitable[list[Any]]], page_size: int | None, offset: int
+    ) -> None:
+        self._results = results
+        self._page_size = page_size
+        self._offset = offset
+        self._exhausted = False
+        self.continuation_token: str | None = None
+
+    def __aiter__(self) -> _PageIterator:
+        return self
+
+    async def __anext__(self) -> AsyncIterator[Any]:
+        if self._exhausted:
+            raise StopAsyncIteration
+        results = await self._results()
+        end = len(results) if self._page_size is None else self._offset + self._page_size
+        page = results[self._offset : end]
+        self._offset += len(page)
+        self._exhausted = self._offset >= len(results)
+        self.continuation_token = None if self._exhausted else str(self._offset)
+        return _aiter(page)
+
+
+async def _aiter(values: Sequence[Any]) -> AsyncIterator[Any]:
+    for value in values:
+        yield value
+
+
+class _ItemIterable:
+    """``query_items`` result: iterates items directly or pages via ``by_page``.
+
+    The query runs once, on first use, so charges land in the calling operation.
+    """
+
+    def __init__(self, run: Callable[[], Awaitable[list[Any]]], page_size: int | None) -> None:
+        self._run = run
+        self._page_size = page_size
+        self._results: list[Any] | None = None
+
+    async def _ensure_results(self) -> list[Any]:
+        if self._results is None:
+            self._results = await self._run()
+        return self._results
+
+    def by_page(self, continuation_token: str | None = None) -> _PageIterator:
+        if continuation_token is not None and not continuation_token.isdigit():
+            raise _status_error(400, f"Invalid continuation token '{continuation_token}'")
+        return _PageIterator(self._ensure_results, self._page_size, int(continuation_token or 0))
+
+    async def __aiter__(self) -> AsyncIterator[Any]:
+        for item in await self._ensure_results():
+            yield item
+
+
+def _change_feed_token(lsn: int) -> str:
+    return base64.b64encode(json.dumps({"lsn": lsn}).encode()).decode()
+
+
+def _change_feed_lsn(token: str) -> int:
+    try:
+        return int(json.loads(base64.b64decode(token, validate=True))["lsn"])
+    except (ValueError, KeyError, TypeError) as exc:
+        raise _status_error(400, f"Invalid change feed continuation '{token}'") from exc
+
+
+class _ChangeFeedPages:
+    """``by_page`` result of the change feed: at most one page, then ``continuation_token``.
+
+    As in the SDK the token is only updated once a page with changes was returned; an empty
+    read leaves the token the caller started from (``None`` for a ``start_time`` read).
+    """
+
+    def __init__(
+        self, read: Callable[[], Awaitable[tuple[list[Any], int]]], token: str | None
+    ) -> None:
+        self._read = read
+        self._done = False
+        self.continuation_token = token
+
+    def __aiter__(self) -> _ChangeFeedPages:
+        return self
+
+    async def __anext__(self) -> AsyncIterator[Any]:
+        if self._done:
+            raise StopAsyncIteration
+        self._done = True
+        results, lsn = await self._read()
+        if not results:
+            raise StopAsyncIteration
+        self.continuation_token = _change_feed_token(lsn)
+        return _aiter(results)
+
+
+class _ChangeFeedIterable:
+    def __init__(
+        self, read: Callable[[], Awaitable[tuple[list[Any], int]]], token: str | None
+    ) -> None:
+        self._read = read
+        self._token = token
+
+    def by_page(self, continuation_token: str | None = None) -> _ChangeFeedPages:
+        return _ChangeFeedPages(self._read, continuation_token or self._token)
+
+
+class InMemoryContainer:
+    def __init__(self, account: InMemoryCosmosAccount, name: str, partition_key_path: str) -> None:
+        self._account = account
+        self.id = name
+        self.partition_key_path = partition_key_path
+        self._partitions: dict[Any, dict[str, dict[str, Any]]] = {}
+        # Change feed bookkeeping: a container-wide log sequence number per write.
+        self._lsn = 0
+        self._document_lsns: dict[tuple[Any, str], int] = {}
+        self._lsn_times: list[float] = []
+
+    # -- helpers -----------------------------------------------------------------
+
+    def _key_of(self, document: Mapping[str, Any]) -> Any:
+        return _partition_value(document, self.partition_key_path)
+
+    def _stamp(self, document: Mapping[str, Any]) -> dict[str, Any]:
+        stored = copy.deepcopy(dict(document))
+        stored.setdefault("_rid", uuid.uuid4().hex[:16])
+        stored["_self"] = f"dbs/{self._account.name}/colls/{self.id}/docs/{stored['_rid']}"
+        stored["_etag"] = f'"{uuid.uuid4()}"'
+        stored["_attachments"] = "attachments/"
+        stored["_ts"] = int(time.time())
+        self._lsn += 1
+        self._lsn_times.append(time.time())
+        self._document_lsns[(self._key_of(stored), stored["id"])] = self._lsn
+        return stored
+
+    @staticmethod
+    def _respond(hook: ResponseHook | None, charge: float, result: Any = None) -> None:
+        if hook is not None:
+            hook({"x-ms-request-charge": f"{charge:.2f}", "x-ms-item-count": "1"}, result)
+
+    def _require_id(self, document: Mapping[str, Any]) -> str:
+        item_id = document.get("id")
+        if not isinstance(item_id, str) or not item_id:
+            raise _status_error(
+                400,
+                "The input content is invalid because the required properties - 'id; ' - are missing",
+            )
+        return item_id
+
+    def _check_etag(self, existing: Mapping[str, Any] | None, kwargs: Mapping[str, Any]) -> None:
+        etag = kwargs.get("etag")
+        condition = kwargs.get("match_condition")
+        if etag is None or condition is None:
+            return
+        if "IfNotModified" in str(condition) and (
+            existing is None or existing.get("_etag") != etag
+        ):
+            raise _status_error(
+                412,
+                "Operation cannot be performed because one of the specified precondition is not met",
+            )
+
+    def documents(self) -> list[dict[str, Any]]:
+        """Every stored document, for assertions in tests and fixtures."""
+        return [
+            copy.deepcopy(document)
+            for partition in self._partitions.values()
+            for document in partition.values()
+        ]
+
+    # -- SDK surface ---------------------------------------------------------------
+
+    async def read(self, **_kwargs: Any) -> dict[str, Any]:
+        return {"id": self.id, "partitionKey": {"paths": [self.partition_key_path], "kind": "Hash"}}
+
+    async def read_item(self, item: str, partition_key: Any, **kwargs: Any) -> dict[str, Any]:
+        await self._account._before_request()
+        document = self._partitions.get(_partition_arg(partition_key), {}).get(item)
+        if document is None:
+            raise _status_error(
+                404, f"Entity with the specified id '{item}' does not exist in the system."
+            )
+        self._respond(kwargs.get("response_hook"), _POINT_READ_CHARGE, document)
+        return copy.deepcopy(document)
+
+    async def create_item(self, body: Mapping[str, Any], **kwargs: Any) -> dict[str, Any]:
+        await self._account._before_request()
+        item_id = self._require_id(body)
+        partition = self._partitions.setdefault(self._key_of(body), {})
+        if item_id in partition:
+            raise _status_error(
+                409, f"Entity with the specified id '{item_id}' already exists in the system."
+            )
+        stored = partition[item_id] = self._stamp(body)
+        self._respond(kwargs.get("response_hook"), _write_charge(stored), stored)
+        return copy.deepcopy(stored)
+
+    async def upsert_item(self, body: Mapping[str, Any], **kwargs: Any) -> dict[str, Any]:
+        await self._account._before_request()
+        item_id = self._require_id(body)
+        partition = self._partitions.setdefault(self._key_of(body), {})
+        self._check_etag(partition.get(item_id), kwargs)
+        stored = partition[item_id] = self._stamp(body)
+        self._respond(kwargs.get("response_hook"), _write_charge(stored), stored)
+        return copy.deepcopy(stored)
+
+    async def replace_item(
+        self, item: str | Mapping[str, Any], body: Mapping[str, Any], **kwargs: Any
+    ) -> dict[str, Any]:
+        await self._account._before_request()
+        item_id = item if isinstance(item, str) else str(item.get("id"))
+        partition = self._partitions.get(self._key_of(body), {})
+        existing = partition.get(item_id)
+        if existing is None:
+            raise _status_error(
+                404, f"Entity with the specified id '{item_id}' does not exist in the system."
+            )
+        self._check_etag(existing, kwargs)
+        stored = partition[item_id] = self._stamp({**body, "id": item_id})
+        self._respond(kwargs.get("response_hook"), _write_charge(stored), stored)
+        return copy.deepcopy(stored)
+
+    def _patched(
+        self,
+        existing: Mapping[str, Any],
+        operations: Sequence[Mapping[str, Any]],
+        filter_predicate: str | None,
+    ) -> dict[str, Any]:
+        if filter_predicate and not compile_query(f"SELECT * {filter_predicate}").matches(
+            existing, {}
+        ):
+            raise _status_error(412, "Conditional patch predicate did not match the document")
+        try:
+            patched = apply_patch_operations(existing, operations)
+        except PatchError as exc:
+            raise _status_error(400, str(exc)) from exc
+        if self._key_of(patched) != self._key_of(existing):
+            raise _status_error(400, "The partition key property cannot be patched")
+        return self._stamp(patched)
+
+    async def patch_item(
+        self,
+        item: str | Mapping[str, Any],
+        partition_key: Any,
+        patch_operations: Sequence[Mapping[str, Any]],
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        await self._account._before_request()
+        item_id = item if isinstance(item, str) else str(item.get("id"))
+        partition = self._partitions.get(_partition_arg(partition_key), {})
+        existing = partition.get(item_id)
+        if existing is None:
+            raise _status_error(
+                404, f"Entity with the specified id '{item_id}' does not exist in the system."
+            )
+        self._check_etag(existing, kwargs)
+        stored = partition[item_id] = self._patched(
+            existing, patch_operations, kwargs.get("filter_predicate")
+        )
+        self._respond(kwargs.get("response_hook"), _write_charge(stored), stored)
+        return copy.deepcopy(stored)
+
+    async def delete_item(
+        self, item: str | Mapping[str, Any], partition_key: Any, **kwargs: Any
+    ) -> None:
+        await self._account._before_request()
+        item_id = item if isinstance(item, str) else str(item.get("id"))
+        partition = self._partitions.get(_partition_arg(partition_key), {})
+        existing = partition.get(item_id)
+        if existing is None:
+            raise _status_error(
+                404, f"Entity with the specified id '{item_id}' does not exist in the system."
+            )
+        self._check_etag(existing, kwargs)
+        del partition[item_id]
+        self._document_lsns.pop((_partition_arg(partition_key), item_id), None)
+        self._respond(kwargs.get("response_hook"), _WRITE_CHARGE)
+
+    def query_items(
+        self,
+        query: str,
+        parameters: Iterable[Mapping[str, Any]] | None = None,
+        partition_key: Any = None,
+        max_item_count: int | None = None,
+        **kwargs: Any,
+    ) -> _ItemIterable:
+        compile_query(query)
+        page_size = max_item_count if max_item_count and max_item_count > 0 else None
+        return _ItemIterable(
+            lambda: self._run_query(
+                query, list(parameters or []), partition_key, kwargs.get("response_hook")
+            ),
+            page_size,
+        )
+
+    async def _run_query(
+        self,
+        query: str,
+        parameters: Iterable[Mapping[str, Any]],
+        partition_key: Any,
+        response_hook: ResponseHook | None,
+    ) -> list[Any]:
+        await self._account._before_request()
+        compiled = compile_query(query)
+        if partition_key is not None:
+            partitions = [self._partitions.get(_partition_arg(partition_key), {})]
+        else:
+            partitions = list(self._partitions.values())
+        documents = [document for partition in partitions for document in partition.values()]
+        results = compiled.execute(documents, bind_parameters(parameters))
+        charge = _QUERY_BASE_CHARGE + _QUERY_SCAN_CHARGE * len(documents)
+        if partition_key is None:
+            charge += _CROSS_PARTITION_CHARGE * max(0, len(partitions) - 1)
+        if response_hook is not None:
+            response_hook(
+                {"x-ms-request-charge": f"{charge:.2f}", "x-ms-item-count": str(len(results))},
+                results,
+            )
+        return results
+
+    def read_feed_ranges(self, **_kwargs: Any) -> AsyncIterator[dict[str, Any]]:
+        """One feed range spanning the whole container."""
+        return _aiter([copy.deepcopy(_FULL_FEED_RANGE)])
+
+    def query_items_change_feed(self, **kwargs: Any) -> _ChangeFeedIterable:
+        """Latest-version change feed: each changed document once, in write order; no deletes.
+
+        Like the service, the ``etag`` response header carries the raw log sequence number
+        while ``by_page().continuation_token`` carries an opaque composite token. A digit-only
+        continuation is a legacy partition-range token, which the SDK rejects next to a
+        ``feed_range``. Each call serves a single page of at most ``max_item_count`` changes;
+        a datetime ``start_time`` starts after the last write made before it.
+        """
+
+        continuation = kwargs.get("continuation")
+        start_time = kwargs.get("start_time", "Now")
+        if continuation is not None and continuation.strip("'\"").isdigit():
+            if kwargs.get("feed_range") is not None:
+                raise ValueError("feed_range and continuation are incompatible")
+        if continuation is None and not (
+            start_time in ("Beginning", "Now")
+            or (isinstance(start_time, datetime) and start_time.tzinfo is not None)
+        ):
+            raise _status_error(
+                400, "start_time must be 'Beginning', 'Now' or a timezone-aware datetime"
+            )
+        return _ChangeFeedIterable(
+            lambda: self._read_changes(
+                continuation, start_time, kwargs.get("max_item_count"), kwargs.get("response_hook")
+            ),
+            continuation,
+        )
+
+    async def _read_changes(
+        self,
+        continuation: str | None,
+        start_time: str | datetime,
+        max_item_count: int | None,
+        response_hook: ResponseHook | None,
+    ) -> tuple[list[dict[str, Any]], int]:
+        await self._account._before_request()
+        if continuation is not None:
+            since = (
+                int(continuation.strip("'\""))
+                if continuation.strip("'\"").isdigit()
+                else _change_feed_lsn(continuation)
+            )
+        elif isinstance(start_time, datetime):
+            since = bisect.bisect_left(self._lsn_times, start_time.timestamp())
+        else:
+            since = 0 if start_time == "Beginning" else self._lsn
+        changed = sorted(
+            (
+                (self._document_lsns[(key, item_id)], document)
+                for key, partition in self._partitions.items()
+                for item_id, document in partition.items()
+                if self._document_lsns.get((key, item_id), 0) > since
+            ),
+            key=lambda entry: entry[0],
+        )
+        if max_item_count and max_item_count > 0:
+            changed = changed[:max_item_count]
+        results = [{**copy.deepcopy(document), "_lsn": lsn} for lsn, document in changed]
+        lsn = changed[-1][0] if changed else since
+        if response_hook is not None:
+            charge = _CHANGE_FEED_CHARGE + _QUERY_SCAN_CHARGE * len(results)
+            response_hook(
+                {
+                    "etag": str(lsn),
+                    "x-ms-request-charge": f"{charge:.2f}",
+                    "x-ms-item-count": str(len(results)),
+                },
+                results,
+            )
+        return results, lsn
+
+    async def execute_item_batch(
+        self,
+        batch_operations: Sequence[Sequence[Any]],
+        partition_key: Any,
+        **kwargs: Any,
+    ) -> list[dict[str, Any]]:
+        await self._account._before_request()
+        partition_key = _partition_arg(partition_key)
+        working = copy.deepcopy(self._partitions.get(partition_key, {}))
+        responses: list[dict[str, Any]] = []
+        charge = 0.0
+        for index, operation in enumerate(batch_operations):
+            kind = str(operation[0]).lower()
+            args = tuple(operation[1]) if len(operation) > 1 else ()
+            try:
+                if kind in {"create", "upsert", "replace"}:
+                    body = args[-1]
+                    item_id = self._require_id(body)
+                    if self._key_of(body) != partition_key:
+                        raise _status_error(
+                            400,
+                            "Partition key of the operation does not match the batch partition key",
+                        )
+                    if kind == "create" and item_id in working:
+                        raise _status_error(
+                            409,
+                            f"Entity with the specified id '{item_id}' already exists in the system.",
+                        )
+                    if kind == "replace" and item_id not in working:
+                        raise _status_error(
+                            404,
+                            f"Entity with the specified id '{item_id}' does not exist in the system.",
+                        )
+                    stored = working[item_id] = self._stamp(body)
+                    charge += _write_charge(stored)
+                    responses.append(
+                        {"statusCode": 201 if kind == "create" else 200, "resourceBody": stored}
+                    )
+                elif kind == "patch":
+                    item_id = str(args[0])
+                    options = dict(operation[2]) if len(operation) > 2 else {}
+                    existing = working.get(item_id)
+                    if existing is None:
+                        raise _status_error(
+                            404,
+                            f"Entity with the specified id '{item_id}' does not exist in the system.",
+                        )
+                    etag = options.get("if_match_etag")
+                    if etag is not None and existing.get("_etag") != etag:
+                        raise _status_error(
+                            412,
+                            "Operation cannot be performed because one of the specified precondition is not met",
+                        )
+                    stored = working[item_id] = self._patched(
+                        existing, args[1], options.get("filter_predicate")
+                    )
+                    charge += _write_charge(stored)
+                    responses.append({"statusCode": 200, "resourceBody": stored})
+                elif kind in {"delete", "read"}:
+                    item_id = str(args[0])
+                    if item_id not in working:
+                        raise _status_error(
+                            404,
+                            f"Entity with the specified id '{item_id}' does not exist in the system.",
+                        )
+                    if kind == "delete":
+                        del working[item_id]
+                        charge += _WRITE_CHARGE
+                        responses.append({"statusCode": 204})
+                    else:
+                        charge += _POINT_READ_CHARGE
+                        responses.append(
+                            {"statusCode": 200, "resourceBody": copy.deepcopy(working[item_id])}
+                        )
+                else:
+                    raise _status_error(400, f"Unsupported batch operation {kind!r}")
+            except cosmos_exceptions.CosmosHttpResponseError as exc:
+                status_code = int(getattr(exc, "status_code", 400) or 400)
+                raise cosmos_exceptions.CosmosBatchOperationError(
+                    error_index=index,
+                    headers={},
+                    status_code=status_code,
+                    message=str(exc),
+                    operation_responses=[
+                        {"statusCode": status_code if position == index else 424}
+                        for position in range(len(batch_operations))
+                    ],
+                ) from exc
+        self._partitions[partition_key] = working
+        self._respond(kwargs.get("response_hook"), charge, responses)
+        return responses
+
+
+class InMemoryDatabase:
+    def __init__(self, account: InMemoryCosmosAccount, name: str) -> None:
+        self._account = account
+        self.id = name
+
+    async def read(self, **_kwargs: Any) -> dict[str, Any]:
+        return {"id": self.id}
+
+    def get_container_client(self, container: str) -> InMemoryContainer:
+        return self._account.container(self.id, container)
+
+    async def create_container_if_not_exists(
+        self, id: str, partition_key: Any = None, **_kwargs: Any
+    ) -> InMemoryContainer:  # noqa: A002 - SDK signature
+        path = getattr(partition_key, "path", None) or (
+            partition_key if isinstance(partition_key, str) else None
+        )
+        return self._account.container(self.id, id, partition_key_path=path)
+
+
+class InMemoryCosmosClient:
+    def __init__(self, account: InMemoryCosmosAccount, endpoint: str) -> None:
+        self._account = account
+        self.url_connection = endpoint
+
+    def get_database_client(self, database: str) -> InMemoryDatabase:
+        return InMemoryDatabase(self._account, database)
+
+    async def create_database(self, id: str, **_kwargs: Any) -> InMemoryDatabase:  # noqa: A002 - SDK signature
+        return InMemoryDatabase(self._account, id)
+
+    async def create_database_if_not_exists(self, id: str, **_kwargs: Any) -> InMemoryDatabase:  # noqa: A002 - SDK signature
+        return InMemoryDatabase(self._account, id)
+
+    async def close(self) -> None:
+        return None
+
+
+class InMemoryCosmosAccount:
+    """All databases and containers of one emulated account, plus fault injection knobs.
+
+    ``latency`` is a fixed delay or a ``(low, high)`` range in seconds applied to every request;
+    ``throttle_rate`` is the probability that a request answers 429 with ``retry_after_ms``.
+    ``throttle_next(n)`` forces the next ``n`` requests to be throttled.
+    """
+
+    def __init__(
+        self,
+        *,
+        name: str = "tutor-emulator",
+        partition_keys: Mapping[str, str] | None = None,
+        latency: float | tuple[float, float] = 0.0,
+        throttle_rate: float = 0.0,
+        retry_after_ms: int = 10,
+        seed: int | None = None,
+    ) -> None:
+        self.name = name
+        self.partition_keys = {**DEFAULT_PARTITION_KEYS, **(partition_keys or {})}
+        self.latency = latency
+        self.throttle_rate = throttle_rate
+        self.retry_after_ms = retry_after_ms
+        self.requests = 0
+        self.throttled = 0
+        self._forced_throttles = 0
+        self._rng = random.Random(seed)
+        self._containers: dict[tuple[str, str], InMemoryContainer] = {}
+
+    def client(
+        self, endpoint: str = "memory://", credential: Any = None, **_kwargs: Any
+    ) -> InMemoryCosmosClient:
+        del credential
+        return InMemoryCosmosClient(self, endpoint)
+
+    def container(
+        self, database: str, name: str, *, partition_key_path: str | None = None
+    ) -> InMemoryContainer:
+        key = (database, name)
+        container = self._containers.get(key)
+        if container is None:
+            path = partition_key_path or self.partition_keys.get(name, "/id")
+            container = self._containers[key] = InMemoryContainer(self, name, path)
+        return container
+
+    def throttle_next(self, count: int = 1) -> None:
+        self._forced_throttles += count
+
+    def reset(self) -> None:
+        self._containers.clear()
+        self.requests = 0
+        self.throttled = 0
+        self._forced_throttles = 0
+
+    async def _before_request(self) -> None:
+        self.requests += 1
+        delay = self.latency
+        if isinstance(delay, tuple):
+            delay = self._rng.uniform(*delay)
+        if delay:
+            await asyncio.sleep(delay)
+        throttle = self._forced_throttles > 0
+        if throttle:
+            self._forced_throttles -= 1
+        elif self.throttle_rate and self._rng.random() < self.throttle_rate:
+            throttle = True
+        if throttle:
+            self.throttled += 1
+            raise _status_error(
+                429,
+                "Request rate is large. More Request Units may be needed, so no changes were made.",
+                {"x-ms-retry-after-ms": str(self.retry_after_ms), "x-ms-request-charge": "0"},
+            )
+
+
+def create_in_memory_pool(account: InMemoryCosmosAccount | None = None) -> CosmosClientPool:
+    """A ``CosmosClientPool`` whose clients are served by ``account`` instead of Azure."""
+
+    account = account or InMemoryCosmosAccount()
+    return CosmosClientPool(credential_factory=lambda: None, client_factory=account.client)
+
+
+_ACCOUNT: InMemoryCosmosAccount | None = None
+_EMULATOR_POOL: CosmosClientPool | None = None
+
+
+def get_in_memory_account() -> InMemoryCosmosAccount:
+    """Process-wide emulated account used when ``COSMOS_EMULATOR=memory``."""
+
+    global _ACCOUNT
+    if _ACCOUNT is None:
+        _ACCOUNT = InMemoryCosmosAccount()
+    return _ACCOUNT
+
+
+def get_in_memory_pool() -> CosmosClientPool:
+    global _EMULATOR_POOL
+    if _EMULATOR_POOL is None:
+        _EMULATOR_POOL = create_in_memory_pool(get_in_memory_account())
+    return _EMULATOR_POOL
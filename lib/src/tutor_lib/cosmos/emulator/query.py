@@ -0,0 +1,604 @@
+"""Interpreter for the subset of Cosmos NoSQL queries used across Tutor services.
+
+Supported: ``SELECT [TOP n] * | VALUE expr | expr [AS alias], ...`` over a single ``FROM``
+alias, ``WHERE`` with ``AND``/``OR``/``NOT``, comparisons, ``IN``, ``BETWEEN``, the scalar
+functions in ``_FUNCTIONS``, ``VALUE COUNT(...)``, ``ORDER BY`` over one or more paths and
+``OFFSET n LIMIT m``. Missing properties evaluate to *undefined* and, as in Cosmos, never
+satisfy a comparison.
+"""
+
+from __future__ import annotations
+
+import copy
+import re
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any
+
+
+class QuerySyntaxError(ValueError):
+    """The query uses syntax the emulator does not understand."""
+
+
+class _Undefined:
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "undefined"
+
+
+UNDEFINED: Any = _Undefined()
+
+Evaluator = Callable[[Any, Mapping[str, Any]], Any]
+
+_TOKEN_PATTERN = re.compile(
+    r"""
+    (?P<ws>\s+)
+    | (?P<string>'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")
+    | (?P<number>-?\d+(?:\.\d+)?)
+    | (?P<param>@[A-Za-z_][A-Za-z0-9_]*)
+    | (?P<ident>[A-Za-z_][A-Za-z0-9_]*)
+    | (?P<op><=|>=|!=|<>|=|<|>)
+    | (?P<punct>[(),.\[\]*])
+    """,
+    re.VERBOSE,
+)
+
+_KEYWORDS = {
+    "SELECT",
+    "TOP",
+    "VALUE",
+    "FROM",
+    "WHERE",
+    "ORDER",
+    "BY",
+    "ASC",
+    "DESC",
+    "AND",
+    "OR",
+    "NOT",
+    "IN",
+    "AS",
+    "OFFSET",
+    "LIMIT",
+    "BETWEEN",
+    "TRUE",
+    "FALSE",
+    "NULL",
+}
+
+
+@dataclass(frozen=True, slots=True)
+class _Token:
+    kind: str
+    value: str
+
+
+def _tokenize(text: str) -> list[_Token]:
+    tokens: list[_Token] = []
+    position = 0
+    while position < len(text):
+        match = _TOKEN_PATTERN.match(text, position)
+        if match is None:
+            raise QuerySyntaxError(f"Unexpected character {text[position]!r} at {position}")
+        position = match.end()
+        kind = match.lastgroup or ""
+        if kind == "ws":
+            continue
+        value = match.group()
+        if kind == "ident" and value.upper() in _KEYWORDS:
+            tokens.append(_Token("keyword", value.upper()))
+        else:
+            tokens.append(_Token(kind, value))
+    return tokens
+
+
+_ESCAPES = {"n": "\n", "t": "\t", "r": "\r"}
+
+
+def _unescape(text: str) -> str:
+    return re.sub(r"\\(.)", lambda match: _ESCAPES.get(match.group(1), match.group(1)), text)
+
+
+def _type_rank(value: Any) -> int:
+    if value is UNDEFINED:
+        return 0
+    if value is None:
+        return 1
+    if isinstance(value, bool):
+        return 2
+    if isinstance(value, (int, float)):
+        return 3
+    if isinstance(value, str):
+        return 4
+    if isinstance(value, list):
+        return 5
+    return 6
+
+
+def _comparable(left: Any, right: Any) -> bool:
+    rank = _type_rank(left)
+    return rank != 0 and rank == _type_rank(right)
+
+
+def _compare(operator: str, left: Any, right: Any) -> Any:
+    if operator in {"=", "!=", "<>"}:
+        if left is UNDEFINED or right is UNDEFINED:
+            return UNDEFINED
+        if _type_rank(left) != _type_rank(right):
+            return UNDEFINED
+        return (left == right) if operator == "=" else (left != right)
+    if not _comparable(left, right) or _type_rank(left) not in {2, 3, 4}:
+        return UNDEFINED
+    if operator == "<":
+        return left < right
+    if operator == "<=":
+        return left <= right
+    if operator == ">":
+        return left > right
+    return left >= right
+
+
+def _array_contains(array: Any, value: Any, partial: Any = False) -> Any:
+    if not isinstance(array, list):
+        return UNDEFINED
+    if partial is True and isinstance(value, Mapping):
+        return any(
+            isinstance(entry, Mapping)
+            and all(entry.get(key, UNDEFINED) == item for key, item in value.items())
+            for entry in array
+        )
+    return any(_type_rank(entry) == _type_rank(value) and entry == value for entry in array)
+
+
+def _string_function(function: Callable[..., Any]) -> Callable[..., Any]:
+    def _wrapped(*args: Any) -> Any:
+        if not all(isinstance(arg, str) for arg in args[:2]):
+            return UNDEFINED
+        return function(*args)
+
+    return _wrapped
+
+
+_FUNCTIONS: dict[str, Callable[..., Any]] = {
+    "ARRAY_CONTAINS": _array_contains,
+    "ARRAY_LENGTH": lambda value: len(value) if isinstance(value, list) else UNDEFINED,
+    "IS_DEFINED": lambda value: value is not UNDEFINED,
+    "IS_NULL": lambda value: value is None,
+    "IS_ARRAY": lambda value: isinstance(value, list),
+    "IS_STRING": lambda value: isinstance(value, str),
+    "STARTSWITH": _string_function(
+        lambda value, prefix, ignore_case=False: (
+            value.lower().startswith(prefix.lower())
+            if ignore_case is True
+            else value.startswith(prefix)
+        )
+    ),
+    "ENDSWITH": _string_function(
+        lambda value, suffix, ignore_case=False: (
+            value.lower().endswith(suffix.lower())
+            if ignore_case is True
+            else value.endswith(suffix)
+        )
+    ),
+    "CONTAINS": _string_function(
+        lambda value, part, ignore_case=False: (
+            part.lower() in value.lower() if ignore_case is True else part in value
+        )
+    ),
+    "LOWER": lambda value: value.lower() if isinstance(value, str) else UNDEFINED,
+    "UPPER": lambda value: value.upper() if isinstance(value, str) else UNDEFINED,
+    "LENGTH": lambda value: len(value) if isinstance(value, str) else UNDEFINED,
+}
+
+
+@dataclass(frozen=True, slots=True)
+class _OrderKey:
+    evaluate: Evaluator
+    descending: bool
+
+
+@dataclass(slots=True)
+class CompiledQuery:
+    """A parsed query; ``execute`` applies it to an iterable of documents."""
+
+    text: str
+    star: bool = True
+    value: Evaluator | None = None
+    count: Evaluator | None = None
+    projection: list[tuple[str, Evaluator]] = field(default_factory=list)
+    where: Evaluator | None = None
+    order_by: list[_OrderKey] = field(default_factory=list)
+    top: int | None = None
+    offset: int | None = None
+    limit: int | None = None
+
+    def matches(self, document: Any, parameters: Mapping[str, Any]) -> bool:
+        return self.where is None or self.where(document, parameters) is True
+
+    def execute(self, documents: Iterable[Any], parameters: Mapping[str, Any]) -> list[Any]:
+        matched = [document for document in documents if self.matches(document, parameters)]
+
+        if self.count is not None:
+            return [
+                sum(1 for document in matched if self.count(document, parameters) is not UNDEFINED)
+            ]
+
+        for key in reversed(self.order_by):
+            matched.sort(
+                key=lambda document, key=key: _sort_key(key.evaluate(document, parameters)),
+                reverse=key.descending,
+            )
+
+        if self.offset is not None:
+            matched = matched[self.offset :]
+        if self.limit is not None:
+            matched = matched[: self.limit]
+        if self.top is not None:
+            matched = matched[: self.top]
+
+        return [self._project(document, parameters) for document in matched]
+
+    def _project(self, document: Any, parameters: Mapping[str, Any]) -> Any:
+        if self.star:
+            return copy.deepcopy(document)
+        if self.value is not None:
+            return copy.deepcopy(self.value(document, parameters))
+        projected: dict[str, Any] = {}
+        for name, evaluate in self.projection:
+            value = evaluate(document, parameters)
+            if value is not UNDEFINED:
+                projected[name] = copy.deepcopy(value)
+        return projected
+
+
+def _sort_key(value: Any) -> tuple[int, Any]:
+    rank = _type_rank(value)
+    if rank in {2, 3, 4}:
+        return rank, value
+    return rank, 0
+
+
+class _Parser:
+    def __init__(self, text: str) -> None:
+        self._text = text
+        self._tokens = _tokenize(text)
+        self._position = 0
+        self._alias = "c"
+
+    def _peek(self, offset: int = 0) -> _Token | None:
+        index = self._position + offset
+        return self._tokens[index] if index < len(self._tokens) else None
+
+    def _accept(self, kind: str, value: str | None = None) -> _Token | None:
+        token = self._peek()
+        if token is not None and token.kind == kind and (value is None or token.value == value):
+            self._position += 1
+            return token
+        return None
+
+    def _expect(self, kind: str, value: str | None = None) -> _Token:
+        token = self._accept(kind, value)
+        if token is None:
+            found = self._peek()
+            raise QuerySyntaxError(
+                f"Expected {value or kind} but found {found.value if found else 'end of query'!r} in {self._text!r}"
+            )
+        return token
+
+    def _integer(self) -> int:
+        token = self._accept("number") or self._expect("param")
+        if token.kind == "param":
+            raise QuerySyntaxError(
+                "Parameterized TOP/OFFSET/LIMIT values are not supported by the emulator"
+            )
+        return int(token.value)
+
+    def parse(self) -> CompiledQuery:
+        query = CompiledQuery(text=self._text)
+        self._expect("keyword", "SELECT")
+        if self._accept("keyword", "TOP"):
+            query.top = self._integer()
+
+        projection_start = self._position
+        depth = 0
+        while True:
+            token = self._peek()
+            if token is None:
+                raise QuerySyntaxError("Missing FROM clause")
+            if token.kind == "punct" and token.value == "(":
+                depth += 1
+            elif token.kind == "punct" and token.value == ")":
+                depth -= 1
+            elif depth == 0 and token.kind == "keyword" and token.value == "FROM":
+                break
+            self._position += 1
+        projection_end = self._position
+
+        self._expect("keyword", "FROM")
+        self._alias = self._expect("ident").value
+        self._parse_projection(query, projection_start, projection_end)
+
+        if self._accept("keyword", "WHERE"):
+            query.where = self._expression()
+        if self._accept("keyword", "ORDER"):
+            self._expect("keyword", "BY")
+            while True:
+                evaluate = self._expression()
+                descending = bool(self._accept("keyword", "DESC"))
+                if not descending:
+                    self._accept("keyword", "ASC")
+                query.order_by.append(_OrderKey(evaluate, descending))
+                if not self._accept("punct", ","):
+                    break
+        if self._accept("keyword", "OFFSET"):
+            query.offset = self._integer()
+            self._expect("keyword", "LIMIT")
+            query.limit = self._integer()
+        if self._peek() is not None:
+            raise QuerySyntaxError(f"Unexpected {self._peek().value!r} in {self._text!r}")  # type: ignore[union-attr]
+        return query
+
+    def _parse_projection(self, query: CompiledQuery, start: int, end: int) -> None:
+        saved_tokens, saved_position = self._tokens, self._position
+        self._tokens, self._position = saved_tokens[start:end], 0
+        try:
+            if self._accept("punct", "*"):
+                query.star = True
+            elif self._accept("keyword", "VALUE"):
+                query.star = False
+                token, following = self._peek(), self._peek(1)
+                if (
+                    token is not None
+                    and token.kind == "ident"
+                    and token.value.upper() == "COUNT"
+                    and following is not None
+                    and following.value == "("
+                ):
+                    self._position += 2
+                    query.count = self._expression()
+                    self._expect("punct", ")")
+                else:
+                    query.value = self._expression()
+            else:
+                query.star = False
+                while True:
+                    item_start = self._position
+                    evaluate = self._expression()
+                    if self._accept("keyword", "AS"):
+                        name = self._expect("ident").value
+                    else:
+                        name = self._default_name(item_start)
+                    query.projection.append((name, evaluate))
+                    if not self._accept("punct", ","):
+                        break
+            if self._peek() is not None:
+                raise QuerySyntaxError(f"Unsupported projection in {self._text!r}")
+        finally:
+            self._tokens, self._position = saved_tokens, saved_position
+
+    def _default_name(self, item_start: int) -> str:
+        for token in reversed(self._tokens[item_start : self._position]):
+            if token.kind == "ident":
+                return token.value
+            if token.kind == "string":
+                return token.value[1:-1]
+        return f"${len(self._tokens)}"
+
+    def _expression(self) -> Evaluator:
+        return self._or()
+
+    def _or(self) -> Evaluator:
+        left = self._and()
+        while self._accept("keyword", "OR"):
+            right = self._and()
+            left = _logical_or(left, right)
+        return left
+
+    def _and(self) -> Evaluator:
+        left = self._not()
+        while self._accept("keyword", "AND"):
+            right = self._not()
+            left = _logical_and(left, right)
+        return left
+
+    def _not(self) -> Evaluator:
+        if self._accept("keyword", "NOT"):
+            operand = self._not()
+
+            def _negate(document: Any, parameters: Mapping[str, Any]) -> Any:
+                value = operand(document, parameters)
+                return (not value) if isinstance(value, bool) else UNDEFINED
+
+            return _negate
+        return self._comparison()
+
+    def _comparison(self) -> Evaluator:
+        left = self._primary()
+        operator = self._accept("op")
+        if operator is not None:
+            right = self._primary()
+            symbol = operator.value
+            return lambda document, parameters: _compare(
+                symbol, left(document, parameters), right(document, parameters)
+            )
+
+        negated = False
+        token = self._peek()
+        if token is not None and token.kind == "keyword" and token.value == "NOT":
+            following = self._peek(1)
+            if following is not None and following.value in {"IN", "BETWEEN"}:
+                self._position += 1
+                negated = True
+
+        if self._accept("keyword", "IN"):
+            self._expect("punct", "(")
+            options = [self._expression()]
+            while self._accept("punct", ","):
+                options.append(self._expression())
+            self._expect("punct", ")")
+
+            def _in(document: Any, parameters: Mapping[str, Any]) -> Any:
+                value = left(document, parameters)
+                if value is UNDEFINED:
+                    return UNDEFINED
+                found = any(
+                    _compare("=", value, option(document, parameters)) is True for option in options
+                )
+                return found != negated
+
+            return _in
+
+        if self._accept("keyword", "BETWEEN"):
+            low = self._primary()
+            self._expect("keyword", "AND")
+            high = self._primary()
+
+            def _between(document: Any, parameters: Mapping[str, Any]) -> Any:
+                value = left(document, parameters)
+                lower = _compare(">=", value, low(document, parameters))
+                upper = _compare("<=", value, high(document, parameters))
+                if lower is UNDEFINED or upper is UNDEFINED:
+                    return UNDEFINED
+                return (lower and upper) != negated
+
+            return _between
+
+        return left
+
+    def _primary(self) -> Evaluator:
+        if self._accept("punct", "("):
+            inner = self._expression()
+            self._expect("punct", ")")
+            return inner
+
+        token = self._peek()
+        if token is None:
+            raise QuerySyntaxError(f"Unexpected end of query {self._text!r}")
+
+        if token.kind == "string":
+            self._position += 1
+            literal = _unescape(token.value[1:-1])
+            return lambda _document, _parameters: literal
+        if token.kind == "number":
+            self._position += 1
+            number = float(token.value) if "." in token.value else int(token.value)
+            return lambda _document, _parameters: number
+        if token.kind == "param":
+            self._position += 1
+            name = token.value
+            return lambda _document, parameters: parameters.get(name, UNDEFINED)
+        if token.kind == "keyword" and token.value in {"TRUE", "FALSE", "NULL"}:
+            self._position += 1
+            constant = {"TRUE": True, "FALSE": False, "NULL": None}[token.value]
+            return lambda _document, _parameters: constant
+        if token.kind == "punct" and token.value == "[":
+            self._position += 1
+            items: list[Evaluator] = []
+            if not self._accept("punct", "]"):
+                items.append(self._expression())
+                while self._accept("punct", ","):
+                    items.append(self._expression())
+                self._expect("punct", "]")
+            return lambda document, parameters: [item(document, parameters) for item in items]
+        if token.kind == "ident":
+            following = self._peek(1)
+            if following is not None and following.value == "(":
+                return self._function_call()
+            return self._path()
+        raise QuerySyntaxError(f"Unexpected {token.value!r} in {self._text!r}")
+
+    def _function_call(self) -> Evaluator:
+        name = self._expect("ident").value.upper()
+        function = _FUNCTIONS.get(name)
+        if function is None:
+            raise QuerySyntaxError(f"Function {name} is not supported by the emulator")
+        self._expect("punct", "(")
+        arguments: list[Evaluator] = []
+        if not self._accept("punct", ")"):
+            arguments.append(self._expression())
+            while self._accept("punct", ","):
+                arguments.append(self._expression())
+            self._expect("punct", ")")
+
+        def _call(document: Any, parameters: Mapping[str, Any]) -> Any:
+            values = [argument(document, parameters) for argument in arguments]
+            if name == "IS_DEFINED":
+                return function(*values)
+            if values and values[0] is UNDEFINED:
+                return False if name.startswith("IS_") else UNDEFINED
+            return function(*values)
+
+        return _call
+
+    def _path(self) -> Evaluator:
+        root = self._expect("ident").value
+        if root != self._alias:
+            raise QuerySyntaxError(
+                f"Unknown alias {root!r}; the emulator supports a single FROM alias"
+            )
+        segments: list[str | int] = []
+        while True:
+            if self._accept("punct", "."):
+                segments.append(self._expect("ident").value)
+            elif self._accept("punct", "["):
+                token = self._accept("string") or self._expect("number")
+                segments.append(token.value[1:-1] if token.kind == "string" else int(token.value))
+                self._expect("punct", "]")
+            else:
+                break
+
+        def _resolve(document: Any, _parameters: Mapping[str, Any]) -> Any:
+            value = document
+            for segment in segments:
+                if isinstance(segment, int):
+                    if not isinstance(value, list) or not -len(value) <= segment < len(value):
+                        return UNDEFINED
+                    value = value[segment]
+                elif isinstance(value, Mapping) and segment in value:
+                    value = value[segment]
+                else:
+                    return UNDEFINED
+            return value
+
+        return _resolve
+
+
+def _logical_and(left: Evaluator, right: Evaluator) -> Evaluator:
+    def _evaluate(document: Any, parameters: Mapping[str, Any]) -> Any:
+        first = left(document, parameters)
+        if first is False:
+            return False
+        second = right(document, parameters)
+        if second is False:
+            return False
+        if first is True and second is True:
+            return True
+        return UNDEFINED
+
+    return _evaluate
+
+
+def _logical_or(left: Evaluator, right: Evaluator) -> Evaluator:
+    def _evaluate(document: Any, parameters: Mapping[str, Any]) -> Any:
+        first = left(document, parameters)
+        if first is True:
+            return True
+        second = right(document, parameters)
+        if second is True:
+            return True
+        if first is False and second is False:
+            return False
+        return UNDEFINED
+
+    return _evaluate
+
+
+@lru_cache(maxsize=256)
+def compile_query(text: str) -> CompiledQuery:
+    return _Parser(text).parse()
+
+
+def bind_parameters(parameters: Iterable[Mapping[str, Any]] | None) -> dict[str, Any]:
+    return {str(parameter["name"]): parameter.get("value") for parameter in parameters or ()}
@@ -0,0 +1,55 @@
+"""Partition key bookkeeping for repositories whose callers only know a document ``id``."""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Any
+
+
+class PartitionKeyCache:
+    """Bounded LRU of document ``id`` → partition key value.
+
+    Repositories remember the key of every document they write or read, so a later
+    lookup by ``id`` can be served as a point read instead of a cross-partition query.
+    """
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        self._maxsize = maxsize
+        self._entries: OrderedDict[str, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, item_id: object) -> bool:
+        return item_id in self._entries
+
+    def get(self, item_id: str) -> Any | None:
+        with self._lock:
+            if item_id not in self._entries:
+                return None
+            self._entries.move_to_end(item_id)
+            return self._entries[item_id]
+
+    def remember(self, item_id: str, partition_key: Any) -> None:
+        if partition_key is None:
+            return
+        with self._lock:
+            self._entries[item_id] = partition_key
+            self._entries.move_to_end(item_id)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def forget(self, item_id: str) -> None:
+        with self._lock:
+            self._entries.pop(item_id, None)
+
+    def candidates(self, item_id: str, *hints: Any) -> list[Any]:
+        """Distinct partition keys worth a point read: caller hints first, then the cached key."""
+
+        keys: list[Any] = []
+        for key in (*hints, self.get(item_id)):
+            if key is not None and key not in keys:
+                keys.append(key)
+        return keys
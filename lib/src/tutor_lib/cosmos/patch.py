@@ -0,0 +1,167 @@
+"""Cosmos DB partial-document patch operations.
+
+Builders return the plain ``{"op", "path", "value"}`` dictionaries the SDK sends as-is.
+``apply_patch_operations`` evaluates the same operations locally, for the in-memory
+emulator and test doubles.
+"""
+
+from __future__ import annotations
+
+import copy
+from collections.abc import Iterable, Mapping, Sequence
+from typing import Any
+
+# Cosmos DB accepts at most this many operations in one patch request.
+PATCH_OPERATION_LIMIT = 10
+IDEMPOTENT_PATCH_OPS = frozenset({"set", "replace", "remove"})
+
+PatchOperation = dict[str, Any]
+
+
+class PatchError(ValueError):
+    """An operation cannot be applied to the document (Cosmos answers 400)."""
+
+
+def _pointer(path: str) -> str:
+    if path.startswith("/"):
+        return path
+    return "/" + path.replace("~", "~0").replace("/", "~1")
+
+
+def patch_set(path: str, value: Any) -> PatchOperation:
+    return {"op": "set", "path": _pointer(path), "value": value}
+
+
+def patch_replace(path: str, value: Any) -> PatchOperation:
+    return {"op": "replace", "path": _pointer(path), "value": value}
+
+
+def patch_add(path: str, value: Any) -> PatchOperation:
+    return {"op": "add", "path": _pointer(path), "value": value}
+
+
+def patch_incr(path: str, value: int | float = 1) -> PatchOperation:
+    return {"op": "incr", "path": _pointer(path), "value": value}
+
+
+def patch_remove(path: str) -> PatchOperation:
+    return {"op": "remove", "path": _pointer(path)}
+
+
+def patch_fields(
+    values: Mapping[str, Any], *, exclude: Iterable[str] = ("id",)
+) -> list[PatchOperation]:
+    """``set`` operations for top-level fields, skipping immutable ones such as ``id``."""
+
+    skipped = set(exclude)
+    return [patch_set(field, value) for field, value in values.items() if field not in skipped]
+
+
+def is_idempotent(operations: Iterable[Mapping[str, Any]]) -> bool:
+    """Whether re-sending ``operations`` after an ambiguous failure is harmless."""
+
+    return all(
+        str(operation.get("op", "")).lower() in IDEMPOTENT_PATCH_OPS for operation in operations
+    )
+
+
+def _segments(path: str) -> list[str]:
+    if not path.startswith("/") or path == "/":
+        raise PatchError(f"Invalid patch path {path!r}")
+    return [segment.replace("~1", "/").replace("~0", "~") for segment in path[1:].split("/")]
+
+
+def _parent(document: Any, segments: Sequence[str], path: str) -> Any:
+    target = document
+    for segment in segments[:-1]:
+        if isinstance(target, dict) and segment in target:
+            target = target[segment]
+        elif isinstance(target, list) and segment.isdigit() and int(segment) < len(target):
+            target = target[int(segment)]
+        else:
+            raise PatchError(f"Path {path!r} does not exist")
+    return target
+
+
+def _array_index(container: list[Any], segment: str, path: str, *, inserting: bool) -> int:
+    if inserting and segment == "-":
+        return len(container)
+    if not segment.isdigit():
+        raise PatchError(f"Invalid array index in {path!r}")
+    index = int(segment)
+    limit = len(container) if inserting else len(container) - 1
+    if index > limit:
+        raise PatchError(f"Array index out of range in {path!r}")
+    return index
+
+
+def _apply(document: dict[str, Any], operation: Mapping[str, Any]) -> None:
+    op = str(operation.get("op", "")).lower()
+    path = str(operation.get("path", ""))
+    segments = _segments(path)
+    if segments == ["id"]:
+        raise PatchError("The id property cannot be patched")
+    parent = _parent(document, segments, path)
+    key = segments[-1]
+    value = copy.deepcopy(operation.get("value"))
+
+    if isinstance(parent, list):
+        if op in {"add", "set"}:
+            index = _array_index(parent, key, path, inserting=op == "add")
+            if op == "add":
+                parent.insert(index, value)
+            else:
+                parent[index] = value
+        elif op == "replace":
+            parent[_array_index(parent, key, path, inserting=False)] = value
+        elif op == "remove":
+            del parent[_array_index(parent, key, path, inserting=False)]
+        elif op == "incr":
+            index = _array_index(parent, key, path, inserting=False)
+            parent[index] = _increment(parent[index], value, path)
+        else:
+            raise PatchError(f"Unsupported patch operation {op!r}")
+        return
+
+    if not isinstance(parent, dict):
+        raise PatchError(f"Path {path!r} does not address an object property")
+    if op in {"set", "add"}:
+        parent[key] = value
+    elif op == "replace":
+        if key not in parent:
+            raise PatchError(f"Path {path!r} does not exist")
+        parent[key] = value
+    elif op == "remove":
+        if key not in parent:
+            raise PatchError(f"Path {path!r} does not exist")
+        del parent[key]
+    elif op == "incr":
+        parent[key] = _increment(parent.get(key, 0), value, path)
+    elif op == "move":
+        source = str(operation.get("from", ""))
+        source_segments = _segments(source)
+        source_parent = _parent(document, source_segments, source)
+        if not isinstance(source_parent, dict) or source_segments[-1] not in source_parent:
+            raise PatchError(f"Path {source!r} does not exist")
+        parent[key] = source_parent.pop(source_segments[-1])
+    else:
+        raise PatchError(f"Unsupported patch operation {op!r}")
+
+
+def _increment(current: Any, value: Any, path: str) -> Any:
+    if isinstance(current, bool) or not isinstance(current, (int, float)):
+        raise PatchError(f"Cannot increment non-numeric value at {path!r}")
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise PatchError(f"Increment value for {path!r} must be numeric")
+    return current + value
+
+
+def apply_patch_operations(
+    document: Mapping[str, Any], operations: Iterable[Mapping[str, Any]]
+) -> dict[str, Any]:
+    """Return a patched copy of ``document``; all operations apply or none do."""
+
+    patched = copy.deepcopy(dict(document))
+    for operation in operations:
+        _apply(patched, operation)
+    return patched
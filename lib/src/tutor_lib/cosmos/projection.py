@@ -0,0 +1,31 @@
+"""Server-side field projection for ``SELECT * FROM c`` queries."""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable
+
+_SELECT_ALL = re.compile(r"^\s*SELECT\s+\*\s+FROM\s+(?P<alias>[A-Za-z_]\w*)\b", re.IGNORECASE)
+_PROPERTY_NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def projection_query(query: str, fields: Iterable[str]) -> str:
+    """Rewrite ``SELECT * FROM c ...`` to ``SELECT c.a, c.b FROM c ...``.
+
+    Only the listed top-level properties cross the wire; documents missing one simply
+    omit it, as with ``SELECT *``. ``WHERE``/``ORDER BY`` clauses are kept unchanged and may
+    still reference properties that are not projected.
+    """
+
+    names = list(dict.fromkeys(fields))
+    if not names:
+        raise ValueError("fields must name at least one property")
+    invalid = [name for name in names if not _PROPERTY_NAME.match(name)]
+    if invalid:
+        raise ValueError(f"Cannot project non-identifier properties: {', '.join(invalid)}")
+    match = _SELECT_ALL.match(query)
+    if match is None:
+        raise ValueError("fields= requires a query of the form 'SELECT * FROM <alias> ...'")
+    alias = match.group("alias")
+    projection = ", ".join(f"{alias}.{name}" for name in names)
+    return f"SELECT {projection} FROM {alias}{query[match.end() :]}"
@@ -12,6 +12,8 @@ from typing import Any, Protocol
 from azure.core.credentials_async import AsyncTokenCredential
 from azure.identity.aio import DefaultAzureCredential as AsyncDefaultAzureCredential
 
+from tutor_lib.resilience import SERVICE_BUS, get_bulkhead
+
 from .models import LearnerRecordEvent, event_to_payload
 from .repository import LearnerRecordAppendResult, LearnerRecordEventRepository
 
@@ -98,7 +100,7 @@ class AzureServiceBusLearnerRecordEventPublisher:
     async def publish(self, event: LearnerRecordEvent) -> None:
         from azure.servicebus.aio import ServiceBusClient
 
-        async with self._credential() as credential:
+        async with get_bulkhead(SERVICE_BUS, self._topic_name), self._credential() as credential:
             async with ServiceBusClient(
                 fully_qualified_namespace=self._fully_qualified_namespace,
                 credential=credential,
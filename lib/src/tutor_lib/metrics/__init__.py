@@ -0,0 +1,29 @@
+from .http import RouteContextMiddleware, current_route, instrument_app
+from .sinks import (
+    CompositeMetricsSink,
+    HistogramSummary,
+    InMemoryMetricsSink,
+    MetricsSink,
+    NoOpMetricsSink,
+    OpenTelemetryMetricsSink,
+    configure_metrics_sink,
+    get_in_memory_sink,
+    get_metrics_sink,
+    set_metrics_sink,
+)
+
+__all__ = [
+    "CompositeMetricsSink",
+    "HistogramSummary",
+    "InMemoryMetricsSink",
+    "MetricsSink",
+    "NoOpMetricsSink",
+    "OpenTelemetryMetricsSink",
+    "RouteContextMiddleware",
+    "configure_metrics_sink",
+    "current_route",
+    "get_in_memory_sink",
+    "get_metrics_sink",
+    "instrument_app",
+    "set_metrics_sink",
+]
@@ -0,0 +1,59 @@
+"""Route attribution and the ``/metrics`` endpoint for FastAPI services."""
+
+from __future__ import annotations
+
+from collections.abc import MutableMapping
+from contextvars import ContextVar
+from typing import Any
+
+from fastapi import FastAPI
+
+from .sinks import configure_metrics_sink, get_in_memory_sink
+
+BACKGROUND_ROUTE = "background"
+UNMATCHED_ROUTE = "unmatched"
+
+_REQUEST_SCOPE: ContextVar[MutableMapping[str, Any] | None] = ContextVar("tutor_request_scope", default=None)
+
+
+def current_route() -> str:
+    """``"<METHOD> <route template>"`` of the request being served, for metric attribution."""
+
+    scope = _REQUEST_SCOPE.get()
+    if scope is None:
+        return BACKGROUND_ROUTE
+    route_path = getattr(scope.get("route"), "path", None)
+    if not route_path:
+        return UNMATCHED_ROUTE
+    return f"{scope.get('method', '')} {route_path}".strip()
+
+
+class RouteContextMiddleware:
+    """Expose the ASGI scope to code running inside the request, so samples carry their route."""
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: MutableMapping[str, Any], receive: Any, send: Any) -> None:
+        if scope.get("type") != "http":
+            await self.app(scope, receive, send)
+            return
+        token = _REQUEST_SCOPE.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _REQUEST_SCOPE.reset(token)
+
+
+def instrument_app(app: FastAPI, *, path: str = "/metrics") -> None:
+    """Attribute dependency metrics to routes and serve the in-memory aggregate at ``path``."""
+
+    from tutor_lib.config import get_settings
+
+    configure_metrics_sink(get_settings().metrics.exporter)
+    app.add_middleware(RouteContextMiddleware)
+
+    @app.get(path, tags=["Observability"])
+    async def metrics() -> dict[str, Any]:
+        sink = get_in_memory_sink()
+        return {"routes": sink.by_attribute("route"), "series": sink.snapshot()}
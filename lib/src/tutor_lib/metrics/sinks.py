@@ -0,0 +1,219 @@
+"""Pluggable metrics sinks for dependency instrumentation."""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from typing import Any, Protocol
+
+logger = logging.getLogger(__name__)
+
+Attributes = Mapping[str, str]
+_SeriesKey = tuple[str, tuple[tuple[str, str], ...]]
+
+
+def _series_key(name: str, attributes: Attributes | None) -> _SeriesKey:
+    return name, tuple(sorted((attributes or {}).items()))
+
+
+class MetricsSink(Protocol):
+    def increment(self, name: str, value: float = 1, attributes: Attributes | None = None) -> None: ...
+
+    def observe(self, name: str, value: float, attributes: Attributes | None = None) -> None: ...
+
+
+class NoOpMetricsSink:
+    def increment(self, name: str, value: float = 1, attributes: Attributes | None = None) -> None:
+        del name, value, attributes
+
+    def observe(self, name: str, value: float, attributes: Attributes | None = None) -> None:
+        del name, value, attributes
+
+
+@dataclass(slots=True)
+class HistogramSummary:
+    count: int = 0
+    total: float = 0.0
+    minimum: float = 0.0
+    maximum: float = 0.0
+
+    def add(self, value: float) -> None:
+        if self.count == 0:
+            self.minimum = self.maximum = value
+        else:
+            self.minimum = min(self.minimum, value)
+            self.maximum = max(self.maximum, value)
+        self.count += 1
+        self.total += value
+
+    def merge(self, other: HistogramSummary) -> None:
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.minimum, self.maximum = other.minimum, other.maximum
+        else:
+            self.minimum = min(self.minimum, other.minimum)
+            self.maximum = max(self.maximum, other.maximum)
+        self.count += other.count
+        self.total += other.total
+
+    def as_dict(self) -> dict[str, float]:
+        return {
+            "count": self.count,
+            "sum": round(self.total, 4),
+            "min": round(self.minimum, 4),
+            "max": round(self.maximum, 4),
+            "avg": round(self.total / self.count, 4) if self.count else 0.0,
+        }
+
+
+class InMemoryMetricsSink:
+    """Aggregate counters and histogram summaries per (name, attributes) series."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: dict[_SeriesKey, float] = {}
+        self._histograms: dict[_SeriesKey, HistogramSummary] = {}
+
+    def increment(self, name: str, value: float = 1, attributes: Attributes | None = None) -> None:
+        key = _series_key(name, attributes)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, attributes: Attributes | None = None) -> None:
+        key = _series_key(name, attributes)
+        with self._lock:
+            self._histograms.setdefault(key, HistogramSummary()).add(value)
+
+    def counter(self, name: str, **attributes: str) -> float:
+        """Sum of a counter across every series whose attributes include ``attributes``."""
+        with self._lock:
+            return sum(
+                value
+                for (series_name, labels), value in self._counters.items()
+                if series_name == name and set(attributes.items()) <= set(labels)
+            )
+
+    def histogram(self, name: str, **attributes: str) -> HistogramSummary:
+        merged = HistogramSummary()
+        with self._lock:
+            for (series_name, labels), summary in self._histograms.items():
+                if series_name == name and set(attributes.items()) <= set(labels):
+                    merged.merge(summary)
+        return merged
+
+    def snapshot(self) -> dict[str, list[dict[str, Any]]]:
+        with self._lock:
+            counters = [
+                {"name": name, "attributes": dict(labels), "value": value}
+                for (name, labels), value in self._counters.items()
+            ]
+            histograms = [
+                {"name": name, "attributes": dict(labels), **summary.as_dict()}
+                for (name, labels), summary in self._histograms.items()
+            ]
+        return {"counters": counters, "histograms": histograms}
+
+    def by_attribute(self, attribute: str) -> dict[str, dict[str, Any]]:
+        """Roll every series up by one attribute, e.g. ``route``."""
+
+        grouped: dict[str, dict[str, Any]] = {}
+        with self._lock:
+            for (name, labels), value in self._counters.items():
+                group = grouped.setdefault(dict(labels).get(attribute, ""), {})
+                group[name] = group.get(name, 0) + value
+            summaries: dict[tuple[str, str], HistogramSummary] = {}
+            for (name, labels), summary in self._histograms.items():
+                summaries.setdefault((dict(labels).get(attribute, ""), name), HistogramSummary()).merge(summary)
+        for (group_name, name), summary in summaries.items():
+            grouped.setdefault(group_name, {})[name] = summary.as_dict()
+        return grouped
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+
+class OpenTelemetryMetricsSink:
+    """Forward samples to an OpenTelemetry meter; requires ``opentelemetry-api``."""
+
+    def __init__(self, meter_name: str = "tutor_lib", meter: Any | None = None) -> None:
+        if meter is None:
+            from opentelemetry import metrics
+
+            meter = metrics.get_meter(meter_name)
+        self._meter = meter
+        self._counters: dict[str, Any] = {}
+        self._histograms: dict[str, Any] = {}
+
+    def increment(self, name: str, value: float = 1, attributes: Attributes | None = None) -> None:
+        instrument = self._counters.get(name)
+        if instrument is None:
+            instrument = self._counters[name] = self._meter.create_counter(name)
+        instrument.add(value, attributes=dict(attributes or {}))
+
+    def observe(self, name: str, value: float, attributes: Attributes | None = None) -> None:
+        instrument = self._histograms.get(name)
+        if instrument is None:
+            instrument = self._histograms[name] = self._meter.create_histogram(name)
+        instrument.record(value, attributes=dict(attributes or {}))
+
+
+class CompositeMetricsSink:
+    """Fan samples out to several sinks; a failing sink never breaks the caller."""
+
+    def __init__(self, sinks: Iterable[MetricsSink]) -> None:
+        self.sinks = tuple(sinks)
+
+    def increment(self, name: str, value: float = 1, attributes: Attributes | None = None) -> None:
+        for sink in self.sinks:
+            try:
+                sink.increment(name, value, attributes)
+            except Exception as exc:  # noqa: BLE001 - metrics are best effort
+                logger.debug("Metrics sink %r failed: %s", sink, exc)
+
+    def observe(self, name: str, value: float, attributes: Attributes | None = None) -> None:
+        for sink in self.sinks:
+            try:
+                sink.observe(name, value, attributes)
+            except Exception as exc:  # noqa: BLE001 - metrics are best effort
+                logger.debug("Metrics sink %r failed: %s", sink, exc)
+
+
+_IN_MEMORY_SINK = InMemoryMetricsSink()
+_SINK: MetricsSink = _IN_MEMORY_SINK
+
+
+def get_metrics_sink() -> MetricsSink:
+    return _SINK
+
+
+def set_metrics_sink(sink: MetricsSink) -> None:
+    global _SINK
+    _SINK = sink
+
+
+def get_in_memory_sink() -> InMemoryMetricsSink:
+    """The process-wide aggregate served by ``/metrics``."""
+    return _IN_MEMORY_SINK
+
+
+def configure_metrics_sink(exporter: str = "memory") -> MetricsSink:
+    """Select the process-wide sink: ``memory`` (default), ``otel`` (memory + OpenTelemetry) or ``none``."""
+
+    choice = (exporter or "memory").strip().lower()
+    if choice == "none":
+        sink: MetricsSink = NoOpMetricsSink()
+    elif choice in {"otel", "opentelemetry"}:
+        try:
+            sink = CompositeMetricsSink([_IN_MEMORY_SINK, OpenTelemetryMetricsSink()])
+        except ImportError:
+            logger.warning("opentelemetry-api is not installed; falling back to in-memory metrics")
+            sink = _IN_MEMORY_SINK
+    else:
+        sink = _IN_MEMORY_SINK
+    set_metrics_sink(sink)
+    return sink
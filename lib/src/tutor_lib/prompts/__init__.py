@@ -0,0 +1,3 @@
+from .composer import PromptComposer, PromptContext, shared_prompt_composer
+
+__all__ = ["PromptComposer", "PromptContext", "shared_prompt_composer"]
@@ -0,0 +1,114 @@
+"""Jinja prompt templates compiled once per process and rendered from reusable contexts."""
+
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Iterator, Mapping
+from functools import cache
+from pathlib import Path
+from typing import Any
+
+import jinja2
+from pydantic import BaseModel
+
+
+def _dump(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if isinstance(value, (list, tuple)):
+        return [_dump(item) for item in value]
+    return value
+
+
+class PromptContext(Mapping[str, Any]):
+    """Template variables with every pydantic model already dumped to plain data.
+
+    Build one per request and pass it to each render, so graders that share the same
+    question, answer or essay do not serialize them again.
+    """
+
+    __slots__ = ("_values",)
+
+    def __init__(self, values: Mapping[str, Any]) -> None:
+        self._values = {name: _dump(value) for name, value in values.items()}
+
+    def __getitem__(self, name: str) -> Any:
+        return self._values[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._values)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+
+class PromptComposer:
+    """Render the ``*.jinja`` templates of one directory.
+
+    Every template is compiled when the composer is built and never reloaded, and each
+    gets a version hash of its source so cached evaluations can be tied to the template
+    that produced them. Use :func:`shared_prompt_composer` to build one per directory.
+    """
+
+    def __init__(
+        self,
+        template_dir: Path | str,
+        *,
+        extension: str = ".jinja",
+        trim_blocks: bool = False,
+        lstrip_blocks: bool = False,
+    ) -> None:
+        loader = jinja2.FileSystemLoader(str(template_dir))
+        self._env = jinja2.Environment(
+            loader=loader,
+            autoescape=False,
+            auto_reload=False,
+            trim_blocks=trim_blocks,
+            lstrip_blocks=lstrip_blocks,
+        )
+        self._templates: dict[str, jinja2.Template] = {}
+        self._versions: dict[str, str] = {}
+        for name in self._env.list_templates(filter_func=lambda name: name.endswith(extension)):
+            source, _, _ = loader.get_source(self._env, name)
+            self._templates[name] = self._env.get_template(name)
+            self._versions[name] = hashlib.sha256(source.encode("utf-8")).hexdigest()[:16]
+        self.version = hashlib.sha256(
+            "\n".join(
+                f"{name}:{digest}" for name, digest in sorted(self._versions.items())
+            ).encode()
+        ).hexdigest()[:16]
+
+    @property
+    def template_names(self) -> list[str]:
+        return sorted(self._templates)
+
+    def template_version(self, template_name: str) -> str:
+        try:
+            return self._versions[template_name]
+        except KeyError:
+            raise jinja2.TemplateNotFound(template_name) from None
+
+    @staticmethod
+    def context(**values: Any) -> PromptContext:
+        return PromptContext(values)
+
+    def render(
+        self, template_name: str, context: Mapping[str, Any] | None = None, /, **values: Any
+    ) -> str:
+        """Render ``template_name`` with ``context`` plus per-render ``values`` such as a dimension."""
+
+        template = self._templates.get(template_name)
+        if template is None:
+            raise jinja2.TemplateNotFound(template_name)
+        variables = dict(context or {})
+        variables.update((name, _dump(value)) for name, value in values.items())
+        return template.render(variables)
+
+
+@cache
+def shared_prompt_composer(
+    template_dir: Path | str, *, trim_blocks: bool = False, lstrip_blocks: bool = False
+) -> PromptComposer:
+    """Process-wide composer for ``template_dir``, compiled on first use."""
+
+    return PromptComposer(Path(template_dir), trim_blocks=trim_blocks, lstrip_blocks=lstrip_blocks)
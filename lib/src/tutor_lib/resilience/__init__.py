@@ -0,0 +1,41 @@
+from .breaker import (
+    CircuitBreaker,
+    CircuitOpenError,
+    CircuitState,
+    circuit_breaker_readiness,
+    circuit_breaker_states,
+    get_circuit_breaker,
+    reset_circuit_breakers,
+)
+from .bulkhead import (
+    COSMOS,
+    FOUNDRY,
+    SERVICE_BUS,
+    Bulkhead,
+    BulkheadFullError,
+    configure_load_shedding,
+    get_bulkhead,
+    reset_bulkheads,
+)
+from .retry import RetryMetrics, RetryPolicy, retry_after_seconds
+
+__all__ = [
+    "COSMOS",
+    "FOUNDRY",
+    "SERVICE_BUS",
+    "Bulkhead",
+    "BulkheadFullError",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "CircuitState",
+    "RetryMetrics",
+    "RetryPolicy",
+    "circuit_breaker_readiness",
+    "circuit_breaker_states",
+    "configure_load_shedding",
+    "get_circuit_breaker",
+    "get_bulkhead",
+    "reset_bulkheads",
+    "reset_circuit_breakers",
+    "retry_after_seconds",
+]
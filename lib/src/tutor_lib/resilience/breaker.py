@@ -0,0 +1,241 @@
+"""Circuit breakers that fail fast while a dependency partition is unhealthy."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from enum import StrEnum
+from typing import Any, TypeVar
+
+from tutor_lib.metrics import MetricsSink, get_metrics_sink
+
+T = TypeVar("T")
+
+
+class CircuitState(StrEnum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a dependency whose circuit is open.
+
+    It is a ``RuntimeError`` so routes that already degrade to a fallback on runtime
+    failures answer immediately instead of waiting through retries.
+    """
+
+    def __init__(self, dependency: str, partition: str, retry_after: float) -> None:
+        super().__init__(f"{dependency} ({partition}) circuit is open")
+        self.dependency = dependency
+        self.partition = partition
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker for one dependency partition.
+
+    The circuit opens after ``failure_threshold`` consecutive failures, or when at least
+    ``minimum_calls`` of the last ``window_size`` calls were made and ``failure_rate`` of
+    them failed. While open every call raises :class:`CircuitOpenError`. After
+    ``reset_timeout`` seconds up to ``half_open_max_calls`` probes are let through: a
+    success closes the circuit, a failure opens it again. Only errors accepted by the
+    caller's ``is_failure`` count; others pass through without affecting the state.
+    """
+
+    def __init__(
+        self,
+        dependency: str,
+        partition: str = "default",
+        *,
+        failure_threshold: int = 5,
+        failure_rate: float = 0.5,
+        window_size: int = 20,
+        minimum_calls: int = 10,
+        reset_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        metrics_sink: MetricsSink | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be at least 1")
+        self.dependency = dependency
+        self.partition = partition
+        self.failure_threshold = failure_threshold
+        self.failure_rate = failure_rate
+        self.minimum_calls = max(1, minimum_calls)
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = max(1, half_open_max_calls)
+        self._metrics_sink = metrics_sink
+        self._clock = clock
+        self._state = CircuitState.CLOSED
+        self._outcomes: deque[bool] = deque(maxlen=max(1, window_size))
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> CircuitState:
+        with self._lock:
+            self._refresh()
+            return self._state
+
+    def _attributes(self, **extra: str) -> dict[str, str]:
+        return {"dependency": self.dependency, "partition": self.partition, **extra}
+
+    def _transition(self, state: CircuitState) -> None:
+        if state is self._state:
+            return
+        self._state = state
+        self._probes = 0
+        if state is CircuitState.OPEN:
+            self._opened_at = self._clock()
+        else:
+            self._outcomes.clear()
+            self._consecutive_failures = 0
+        sink = self._metrics_sink or get_metrics_sink()
+        sink.increment("circuit.transitions", 1, self._attributes(state=state.value))
+
+    def _refresh(self) -> None:
+        if (
+            self._state is CircuitState.OPEN
+            and self._clock() - self._opened_at >= self.reset_timeout
+        ):
+            self._transition(CircuitState.HALF_OPEN)
+
+    def _retry_after(self) -> float:
+        return max(0.0, self.reset_timeout - (self._clock() - self._opened_at))
+
+    def _admit(self) -> None:
+        with self._lock:
+            self._refresh()
+            if self._state is CircuitState.CLOSED:
+                return
+            if self._state is CircuitState.HALF_OPEN and self._probes < self.half_open_max_calls:
+                self._probes += 1
+                return
+            retry_after = self._retry_after() if self._state is CircuitState.OPEN else 1.0
+        sink = self._metrics_sink or get_metrics_sink()
+        sink.increment("circuit.rejected", 1, self._attributes())
+        raise CircuitOpenError(self.dependency, self.partition, retry_after)
+
+    def _record(self, failed: bool | None) -> None:
+        """Record an admitted call: ``True`` failed, ``False`` succeeded, ``None`` did not count."""
+
+        with self._lock:
+            if self._state is CircuitState.HALF_OPEN:
+                self._probes = max(0, self._probes - 1)
+                if failed is True:
+                    self._transition(CircuitState.OPEN)
+                elif failed is False:
+                    self._transition(CircuitState.CLOSED)
+                return
+            if failed is None or self._state is not CircuitState.CLOSED:
+                return
+            self._outcomes.append(failed)
+            self._consecutive_failures = self._consecutive_failures + 1 if failed else 0
+            failures = sum(self._outcomes)
+            if self._consecutive_failures >= self.failure_threshold or (
+                len(self._outcomes) >= self.minimum_calls
+                and failures / len(self._outcomes) >= self.failure_rate
+            ):
+                self._transition(CircuitState.OPEN)
+
+    @contextmanager
+    def guard(
+        self, is_failure: Callable[[BaseException], bool] = lambda _exc: True
+    ) -> Iterator[None]:
+        """Admit one call (or raise :class:`CircuitOpenError`) and record how the block ended."""
+
+        self._admit()
+        try:
+            yield
+        except Exception as exc:
+            self._record(True if is_failure(exc) else None)
+            raise
+        except BaseException:
+            self._record(None)
+            raise
+        self._record(False)
+
+    async def call(
+        self,
+        callback: Callable[[], Awaitable[T]],
+        *,
+        is_failure: Callable[[BaseException], bool] = lambda _exc: True,
+    ) -> T:
+        with self.guard(is_failure):
+            return await callback()
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            self._refresh()
+            snapshot: dict[str, Any] = {
+                "state": self._state.value,
+                "consecutive_failures": self._consecutive_failures,
+                "window_failures": sum(self._outcomes),
+                "window_calls": len(self._outcomes),
+            }
+            if self._state is CircuitState.OPEN:
+                snapshot["retry_after"] = round(self._retry_after(), 3)
+            return snapshot
+
+
+_BREAKERS: dict[tuple[str, str], CircuitBreaker] = {}
+_BREAKERS_LOCK = threading.Lock()
+
+
+def get_circuit_breaker(dependency: str, partition: str = "default") -> CircuitBreaker:
+    """Process-wide breaker for ``dependency`` and a partition such as a model deployment.
+
+    Thresholds come from the ``CIRCUIT_BREAKER_*`` settings.
+    """
+
+    key = (dependency, partition or "default")
+    with _BREAKERS_LOCK:
+        breaker = _BREAKERS.get(key)
+        if breaker is None:
+            from tutor_lib.config import get_settings
+
+            settings = get_settings().circuit_breaker
+            breaker = CircuitBreaker(
+                dependency,
+                key[1],
+                failure_threshold=settings.failure_threshold,
+                failure_rate=settings.failure_rate,
+                window_size=settings.window_size,
+                minimum_calls=settings.minimum_calls,
+                reset_timeout=settings.reset_timeout,
+                half_open_max_calls=settings.half_open_max_calls,
+            )
+            _BREAKERS[key] = breaker
+        return breaker
+
+
+def circuit_breaker_states(dependency: str | None = None) -> dict[str, dict[str, Any]]:
+    """Snapshots of the breakers created so far, keyed ``"<dependency>:<partition>"``."""
+
+    with _BREAKERS_LOCK:
+        breakers = list(_BREAKERS.values())
+    return {
+        f"{breaker.dependency}:{breaker.partition}": breaker.snapshot()
+        for breaker in breakers
+        if dependency is None or breaker.dependency == dependency
+    }
+
+
+def circuit_breaker_readiness(dependency: str | None = None) -> dict[str, Any]:
+    """``/ready`` payload: ``"degraded"`` while any matching circuit is not closed."""
+
+    circuits = circuit_breaker_states(dependency)
+    degraded = any(circuit["state"] != CircuitState.CLOSED.value for circuit in circuits.values())
+    return {"status": "degraded" if degraded else "ready", "circuits": circuits}
+
+
+def reset_circuit_breakers() -> None:
+    with _BREAKERS_LOCK:
+        _BREAKERS.clear()
@@ -0,0 +1,203 @@
+"""Per-dependency concurrency limits with bounded queues and load shedding."""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING, Any, TypeVar
+
+from tutor_lib.metrics import MetricsSink, get_metrics_sink
+
+if TYPE_CHECKING:
+    from fastapi import FastAPI
+
+T = TypeVar("T")
+
+COSMOS = "cosmos"
+FOUNDRY = "foundry"
+SERVICE_BUS = "service_bus"
+
+
+class BulkheadFullError(Exception):
+    """Raised when a call is shed because its dependency is saturated."""
+
+    def __init__(self, dependency: str, partition: str, reason: str, retry_after: float) -> None:
+        super().__init__(f"{dependency} ({partition}) is saturated: {reason}")
+        self.dependency = dependency
+        self.partition = partition
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class Bulkhead:
+    """Cap in-flight calls to one dependency partition and shed load past a bounded queue.
+
+    Up to ``max_concurrent`` calls run at once. Up to ``max_queue`` more wait in FIFO order for
+    at most ``queue_timeout`` seconds; anything beyond that fails fast with
+    :class:`BulkheadFullError`. ``max_concurrent=None`` disables the limit. Waiters are
+    plain futures of the running loop, so one instance can serve several event loops.
+    """
+
+    def __init__(
+        self,
+        dependency: str,
+        partition: str = "default",
+        *,
+        max_concurrent: int | None,
+        max_queue: int = 0,
+        queue_timeout: float | None = None,
+        retry_after: float = 1.0,
+        metrics_sink: MetricsSink | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_concurrent is not None and max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1 or None")
+        self.dependency = dependency
+        self.partition = partition
+        self.max_concurrent = max_concurrent
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self._metrics_sink = metrics_sink
+        self._clock = clock
+        self._active = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for waiter in self._waiters if not waiter.done())
+
+    def _attributes(self, **extra: str) -> dict[str, str]:
+        return {"dependency": self.dependency, "partition": self.partition, **extra}
+
+    def _reject(self, reason: str) -> BulkheadFullError:
+        sink = self._metrics_sink or get_metrics_sink()
+        sink.increment("bulkhead.rejected", 1, self._attributes(reason=reason))
+        return BulkheadFullError(self.dependency, self.partition, reason, self.retry_after)
+
+    async def acquire(self) -> None:
+        if self.max_concurrent is None:
+            return
+        sink = self._metrics_sink or get_metrics_sink()
+        if self._active < self.max_concurrent and not self.queued:
+            self._active += 1
+            sink.observe("bulkhead.in_flight", self._active, self._attributes())
+            return
+        if self.queued >= self.max_queue:
+            raise self._reject("queue_full")
+
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        started = self._clock()
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except TimeoutError:
+            raise self._reject("queue_timeout") from None
+        except asyncio.CancelledError:
+            # The slot may have been handed over just before the cancellation landed.
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        finally:
+            if waiter in self._waiters and waiter.done():
+                self._waiters.remove(waiter)
+        sink.observe("bulkhead.queue_wait_seconds", self._clock() - started, self._attributes())
+        sink.observe("bulkhead.in_flight", self._active, self._attributes())
+
+    def release(self) -> None:
+        if self.max_concurrent is None:
+            return
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                # Hand the slot straight to the next waiter; ``_active`` is unchanged.
+                waiter.set_result(None)
+                return
+        self._active -= 1
+
+    async def __aenter__(self) -> Bulkhead:
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *_: Any) -> None:
+        self.release()
+
+    async def run(self, callback: Callable[[], Awaitable[T]]) -> T:
+        async with self:
+            return await callback()
+
+
+_BULKHEADS: dict[tuple[str, str], Bulkhead] = {}
+_BULKHEADS_LOCK = threading.Lock()
+
+
+def _limit_for(dependency: str) -> int | None:
+    from tutor_lib.config import get_settings
+
+    limits = get_settings().bulkhead
+    configured = {
+        COSMOS: limits.cosmos_max_concurrency,
+        FOUNDRY: limits.foundry_max_concurrency,
+        SERVICE_BUS: limits.service_bus_max_concurrency,
+    }.get(dependency, limits.default_max_concurrency)
+    return configured if configured > 0 else None
+
+
+def get_bulkhead(dependency: str, partition: str = "default") -> Bulkhead:
+    """Process-wide bulkhead for ``dependency`` (e.g. ``"foundry"``) and a partition such as a deployment.
+
+    Limits come from the ``BULKHEAD_*`` settings; a limit of 0 leaves that dependency unbounded.
+    """
+
+    key = (dependency, partition or "default")
+    with _BULKHEADS_LOCK:
+        bulkhead = _BULKHEADS.get(key)
+        if bulkhead is None:
+            from tutor_lib.config import get_settings
+
+            settings = get_settings().bulkhead
+            bulkhead = Bulkhead(
+                dependency,
+                key[1],
+                max_concurrent=_limit_for(dependency),
+                max_queue=settings.max_queue,
+                queue_timeout=settings.queue_timeout if settings.queue_timeout > 0 else None,
+                retry_after=settings.retry_after,
+            )
+            _BULKHEADS[key] = bulkhead
+        return bulkhead
+
+
+def reset_bulkheads() -> None:
+    with _BULKHEADS_LOCK:
+        _BULKHEADS.clear()
+
+
+def configure_load_shedding(app: FastAPI) -> None:
+    """Answer :class:`BulkheadFullError` with ``503 Service Unavailable`` and ``Retry-After``."""
+
+    from fastapi import Request
+    from fastapi.responses import JSONResponse
+
+    async def _shed(_: Request, exc: Exception) -> JSONResponse:
+        assert isinstance(exc, BulkheadFullError)
+        return JSONResponse(
+            status_code=503,
+            content={
+                "success": False,
+                "type": "overloaded",
+                "title": "Service busy",
+                "detail": {"dependency": exc.dependency, "reason": exc.reason},
+            },
+            headers={"Retry-After": str(max(1, math.ceil(exc.retry_after)))},
+        )
+
+    app.add_exception_handler(BulkheadFullError, _shed)
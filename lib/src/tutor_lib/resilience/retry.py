@@ -0,0 +1,142 @@
+"""Retry policy with decorrelated jitter, server-hinted delays and deadline budgets."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from collections import Counter
+from collections.abc import Awaitable, Callable, Mapping
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_RETRY_AFTER_MS_HEADERS = ("x-ms-retry-after-ms", "retry-after-ms")
+_RETRY_AFTER_HEADER = "retry-after"
+
+
+def _headers_of(exc: BaseException) -> Mapping[str, Any]:
+    headers = getattr(exc, "headers", None)
+    if not isinstance(headers, Mapping):
+        response = getattr(exc, "response", None)
+        headers = getattr(response, "headers", None)
+    if not isinstance(headers, Mapping):
+        return {}
+    return {str(key).lower(): value for key, value in headers.items()}
+
+
+def retry_after_seconds(exc: BaseException) -> float | None:
+    """Return the delay the service asked for, from ``x-ms-retry-after-ms`` or ``Retry-After``."""
+
+    headers = _headers_of(exc)
+    for name in _RETRY_AFTER_MS_HEADERS:
+        value = headers.get(name)
+        if value is not None:
+            try:
+                return max(0.0, float(value) / 1000)
+            except (TypeError, ValueError):
+                return None
+    value = headers.get(_RETRY_AFTER_HEADER)
+    if value is not None:
+        try:
+            return max(0.0, float(value))
+        except (TypeError, ValueError):
+            return None
+    return None
+
+
+@dataclass(slots=True)
+class RetryMetrics:
+    """Per-operation counters: attempts, retries, throttled, successes, exhausted, budget_exhausted."""
+
+    counters: Counter[tuple[str, str]] = field(default_factory=Counter)
+
+    def increment(self, operation: str, outcome: str) -> None:
+        self.counters[(operation, outcome)] += 1
+
+    def get(self, operation: str, outcome: str) -> int:
+        return self.counters[(operation, outcome)]
+
+    def snapshot(self) -> dict[str, dict[str, int]]:
+        result: dict[str, dict[str, int]] = {}
+        for (operation, outcome), value in self.counters.items():
+            result.setdefault(operation, {})[outcome] = value
+        return result
+
+    def reset(self) -> None:
+        self.counters.clear()
+
+
+@dataclass(slots=True)
+class RetryPolicy:
+    """Retry transient failures without callers retrying in lockstep.
+
+    Delays follow decorrelated jitter (``uniform(base, previous * 3)`` capped at ``max_delay``)
+    unless the error carries a server hint, which is honored as-is. ``deadline`` bounds the
+    total time spent on one call: no retry is scheduled if its delay would cross the budget.
+    """
+
+    max_attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+    deadline: float | None = 30.0
+    is_retryable: Callable[[BaseException], bool] = lambda _exc: False
+    metrics: RetryMetrics = field(default_factory=RetryMetrics)
+    sleep: Callable[[float], Awaitable[Any]] | None = None
+    clock: Callable[[], float] = time.monotonic
+    rng: random.Random = field(default_factory=random.Random)
+
+    def next_delay(self, previous: float) -> float:
+        upper = max(self.base_delay, previous * 3)
+        return min(self.max_delay, self.rng.uniform(self.base_delay, upper))
+
+    async def run(
+        self,
+        operation: str,
+        callback: Callable[[], Awaitable[T]],
+        *,
+        is_retryable: Callable[[BaseException], bool] | None = None,
+        deadline: float | None = None,
+    ) -> T:
+        classify = is_retryable or self.is_retryable
+        budget = deadline if deadline is not None else self.deadline
+        started = self.clock()
+        delay = self.base_delay
+
+        for attempt in range(1, self.max_attempts + 1):
+            self.metrics.increment(operation, "attempts")
+            try:
+                result = await callback()
+            except Exception as exc:
+                if not classify(exc):
+                    raise
+                if getattr(exc, "status_code", None) == 429:
+                    self.metrics.increment(operation, "throttled")
+                if attempt == self.max_attempts:
+                    self.metrics.increment(operation, "exhausted")
+                    raise
+
+                hinted = retry_after_seconds(exc)
+                delay = hinted if hinted is not None else self.next_delay(delay)
+                if budget is not None and self.clock() - started + delay > budget:
+                    self.metrics.increment(operation, "budget_exhausted")
+                    raise
+                self.metrics.increment(operation, "retries")
+                logger.debug(
+                    "Retrying %s after %.3fs (attempt %d/%d): %s",
+                    operation,
+                    delay,
+                    attempt,
+                    self.max_attempts,
+                    exc,
+                )
+                await (self.sleep or asyncio.sleep)(delay)
+            else:
+                self.metrics.increment(operation, "successes")
+                return result
+
+        raise RuntimeError(f"Operation '{operation}' failed without an explicit exception")
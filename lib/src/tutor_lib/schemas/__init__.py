@@ -1,3 +1,21 @@
 from .envelope import ApiEnvelope
+from .pagination import (
+    CONTINUATION_HEADER,
+    InvalidContinuationError,
+    PageQuery,
+    page_query,
+    paged_success_response,
+)
+from .streaming import format_sse, stream_sse_response, stream_success_response
 
-__all__ = ["ApiEnvelope"]
+__all__ = [
+    "ApiEnvelope",
+    "CONTINUATION_HEADER",
+    "InvalidContinuationError",
+    "PageQuery",
+    "page_query",
+    "format_sse",
+    "paged_success_response",
+    "stream_sse_response",
+    "stream_success_response",
+]
@@ -0,0 +1,101 @@
+"""Continuation-token pagination for list endpoints."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator, Callable, Iterable
+from dataclasses import dataclass
+from typing import Annotated, Any, Protocol
+
+from fastapi import HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+
+from .streaming import stream_success_response
+
+CONTINUATION_HEADER = "X-Continuation-Token"
+MAX_PAGE_SIZE = 1000
+
+
+class InvalidContinuationError(ValueError):
+    """A continuation token that the paged source cannot resume from."""
+
+    def __init__(self, continuation: str) -> None:
+        super().__init__(f"Invalid continuation token: {continuation!r}")
+        self.continuation = continuation
+
+
+class PagedSource(Protocol):
+    def iter_items(self, *args: Any, **kwargs: Any) -> AsyncIterator[Any]: ...
+
+    async def query_page(self, *args: Any, **kwargs: Any) -> Any: ...
+
+
+@dataclass(frozen=True, slots=True)
+class PageQuery:
+    page_size: int | None = None
+    continuation: str | None = None
+
+    @property
+    def requested(self) -> bool:
+        return self.page_size is not None or self.continuation is not None
+
+
+def page_query(
+    page_size: Annotated[
+        int | None, Query(ge=1, le=MAX_PAGE_SIZE, description="Maximum number of items to return.")
+    ] = None,
+    continuation: Annotated[
+        str | None, Query(description=f"Token from a previous response's {CONTINUATION_HEADER} header.")
+    ] = None,
+) -> PageQuery:
+    return PageQuery(page_size=page_size, continuation=continuation)
+
+
+async def _iterate(items: Iterable[Any]) -> AsyncIterator[Any]:
+    for item in items:
+        yield item
+
+
+async def paged_success_response(
+    title: str,
+    message: str,
+    source: PagedSource,
+    page: PageQuery,
+    *,
+    query: str | None = None,
+    parameters: Iterable[dict[str, Any]] | None = None,
+    fields: Iterable[str] | None = None,
+    transform: Callable[[Any], Any] | None = None,
+    default_page_size: int = 100,
+) -> StreamingResponse:
+    """List ``source`` either as one bounded page or, when no paging was requested, as a stream.
+
+    A bounded page advertises the token for the next page in ``X-Continuation-Token``;
+    the header is omitted on the last page, and a token the source rejects with
+    :class:`InvalidContinuationError` is answered with ``400``. ``fields`` projects
+    documents server-side.
+    """
+
+    query_kwargs: dict[str, Any] = {}
+    if query is not None:
+        query_kwargs["query"] = query
+    if parameters is not None:
+        query_kwargs["parameters"] = parameters
+    if fields is not None:
+        query_kwargs["fields"] = tuple(fields)
+
+    if not page.requested:
+        items = source.iter_items(**query_kwargs)
+        return await stream_success_response(title, message, items, transform)
+
+    try:
+        result = await source.query_page(
+            **query_kwargs,
+            page_size=page.page_size or default_page_size,
+            continuation=page.continuation,
+        )
+    except InvalidContinuationError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    headers = {CONTINUATION_HEADER: result.continuation} if result.continuation else None
+    return await stream_success_response(
+        title, message, _iterate(result.items), transform, headers=headers
+    )
@@ -0,0 +1,90 @@
+"""Streamed success envelopes for list endpoints and server-sent events for agent output."""
+
+from __future__ import annotations
+
+import json
+import logging
+from collections.abc import AsyncIterable, AsyncIterator, Callable, Mapping
+from typing import Any
+
+from fastapi import status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+
+logger = logging.getLogger(__name__)
+
+_SENTINEL = object()
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def _encode(value: Any) -> str:
+    return json.dumps(jsonable_encoder(value), ensure_ascii=False, separators=(",", ":"))
+
+
+async def stream_success_response(
+    title: str,
+    message: str,
+    items: AsyncIterable[Any],
+    transform: Callable[[Any], Any] | None = None,
+    *,
+    headers: Mapping[str, str] | None = None,
+) -> StreamingResponse:
+    """Return ``{"title", "message", "content": [...]}`` with ``content`` written item by item.
+
+    The first item is fetched before the response starts so that errors raised while
+    opening the query still reach the application's exception handlers.
+    """
+
+    iterator = aiter(items)
+    first = await anext(iterator, _SENTINEL)
+
+    async def _body() -> AsyncIterator[str]:
+        yield f'{{"title":{_encode(title)},"message":{_encode(message)},"content":['
+        if first is not _SENTINEL:
+            yield _encode(transform(first) if transform else first)
+            async for item in iterator:
+                yield "," + _encode(transform(item) if transform else item)
+        yield "]}"
+
+    return StreamingResponse(
+        _body(),
+        status_code=status.HTTP_200_OK,
+        media_type="application/json",
+        headers=dict(headers) if headers else None,
+    )
+
+
+def format_sse(event: str, data: Any) -> str:
+    """Encode one server-sent event whose ``data`` is JSON."""
+
+    return f"event: {event}\ndata: {_encode(data)}\n\n"
+
+
+async def stream_sse_response(events: AsyncIterable[tuple[str, Any]]) -> StreamingResponse:
+    """Return ``text/event-stream`` for ``(event, data)`` pairs.
+
+    As with :func:`stream_success_response`, the first event is produced before the response
+    starts so failures up to that point still reach the exception handlers. Later failures
+    end the stream with an ``error`` event, since the status line has already been sent.
+    """
+
+    iterator = aiter(events)
+    first = await anext(iterator, _SENTINEL)
+
+    async def _body() -> AsyncIterator[str]:
+        if first is _SENTINEL:
+            return
+        yield format_sse(*first)
+        try:
+            async for event, data in iterator:
+                yield format_sse(event, data)
+        except Exception as exc:  # noqa: BLE001 - the client is told instead of a 500
+            logger.exception("Event stream failed after it started")
+            yield format_sse("error", {"message": str(exc)})
+
+    return StreamingResponse(
+        _body(),
+        status_code=status.HTTP_200_OK,
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
@@ -0,0 +1,118 @@
+"""
+Micro-benchmark for CosmosCRUD result normalization on 1k-document pages.
+
+Compares the previous normalizer, which rebuilt every mapping and list, with
+``tutor_lib.cosmos.crud.normalize_document``, which returns the SDK's plain
+dicts and lists untouched. Pages mimic the largest documents we list: upskilling
+plans with evaluations and insights reports with indicators.
+
+Usage:
+    python scripts/benchmark_cosmos_normalize.py [--documents 1000] [--repeat 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import timeit
+import tracemalloc
+from collections.abc import Callable, Mapping
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "lib" / "src"))
+
+from tutor_lib.cosmos.crud import normalize_document  # noqa: E402
+
+
+def legacy_normalize(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return {key: legacy_normalize(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [legacy_normalize(item) for item in value]
+    if isinstance(value, tuple):
+        return [legacy_normalize(item) for item in value]
+    return value
+
+
+def _plan(index: int) -> dict[str, Any]:
+    return {
+        "id": f"plan-{index}",
+        "docType": "plan",
+        "professor_id": f"prof-{index % 20}",
+        "title": f"Plan {index}",
+        "status": "evaluated",
+        "paragraphs": [{"title": f"P{p}", "content": "lorem ipsum " * 40} for p in range(6)],
+        "evaluations": [
+            {
+                "paragraph_index": p,
+                "feedback": [
+                    {"agent": agent, "score": 4, "strengths": ["clear"], "improvements": ["pace"]}
+                    for agent in ("clarity", "alignment", "engagement")
+                ],
+            }
+            for p in range(6)
+        ],
+        "_rid": "abc==",
+        "_etag": '"0000"',
+        "_ts": 1700000000 + index,
+    }
+
+
+def _report(index: int) -> dict[str, Any]:
+    return {
+        "id": f"report-{index}",
+        "docType": "insight_report",
+        "school_id": f"school-{index % 10}",
+        "indicators": [
+            {"name": f"indicator-{i}", "value": i / 10, "trend": [1, 2, 3]} for i in range(12)
+        ],
+        "trends": ["steady"] * 5,
+        "alerts": ["attendance"] * 3,
+        "deep_links": [{"label": "Open", "href": f"/reports/{index}"}],
+    }
+
+
+def _page(size: int) -> list[dict[str, Any]]:
+    return [_plan(index) if index % 2 else _report(index) for index in range(size)]
+
+
+def _measure(
+    normalize: Callable[[Any], Any], page: list[dict[str, Any]], repeat: int
+) -> tuple[float, int]:
+    seconds = min(timeit.repeat(lambda: [normalize(doc) for doc in page], number=1, repeat=repeat))
+    tracemalloc.start()
+    result = [normalize(doc) for doc in page]
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return seconds, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--documents", type=int, default=1000, help="Documents per page.")
+    parser.add_argument(
+        "--repeat", type=int, default=20, help="Timing runs; the fastest is reported."
+    )
+    args = parser.parse_args()
+
+    page = _page(args.documents)
+    assert [normalize_document(doc) for doc in page] == [legacy_normalize(doc) for doc in page]
+
+    legacy_seconds, legacy_peak = _measure(legacy_normalize, page, args.repeat)
+    fast_seconds, fast_peak = _measure(normalize_document, page, args.repeat)
+
+    print(f"{args.documents} documents per page, best of {args.repeat}")
+    print(f"{'':<12}{'ms/page':>10}{'peak KiB':>12}")
+    print(f"{'legacy':<12}{legacy_seconds * 1000:>10.2f}{legacy_peak / 1024:>12.1f}")
+    print(f"{'fast path':<12}{fast_seconds * 1000:>10.2f}{fast_peak / 1024:>12.1f}")
+    print(
+        f"speed-up {legacy_seconds / fast_seconds:.2f}x, allocation -{100 * (1 - fast_peak / legacy_peak):.0f}%"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -75,6 +75,11 @@ class _AvatarOrchestratorStub:
         self.calls.append(params)
         return "stubbed-avatar-answer"
 
+    async def stream(self, params):
+        self.calls.append(params)
+        for chunk in ("stubbed-", "avatar-", "answer"):
+            yield chunk
+
 
 class _SpeechBrokerStub:
     async def create_session(self):
@@ -103,6 +108,26 @@ def test_avatar_response_uses_orchestrator_stub(avatar_main_module, monkeypatch:
     assert stub.calls[0].prompt == "How can I improve my introduction?"
 
 
+def test_avatar_response_stream_emits_deltas_then_full_text(
+    avatar_main_module, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    stub = _AvatarOrchestratorStub()
+    monkeypatch.setattr(avatar_main_module, "_avatar", lambda: stub)
+    client = TestClient(avatar_main_module.app)
+
+    response = client.post(
+        "/response/stream",
+        json={"case_id": "case-123", "prompt": "How can I improve my introduction?", "chat_history": []},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    frames = [frame for frame in response.text.split("\n\n") if frame]
+    assert frames[0] == 'event: delta\ndata: {"text":"stubbed-"}'
+    assert frames[-1] == 'event: result\ndata: {"text":"stubbed-avatar-answer"}'
+    assert len(stub.calls) == 1
+
+
 def test_speech_session_token_returns_stubbed_realtime_payload(
     avatar_main_module,
     monkeypatch: pytest.MonkeyPatch,
@@ -29,6 +29,7 @@ def fixture_api_client(monkeypatch):
             sys.modules.pop(module_name, None)
 
     from tutor_lib import config as common_config
+    from tutor_lib.cosmos import BulkItemResult, BulkWriteResult, apply_patch_operations
 
     common_config.get_settings.cache_clear()
 
@@ -45,6 +46,10 @@ def fixture_api_client(monkeypatch):
         async def list_items(self) -> list[dict]:
             return list(storage[self._container].values())
 
+        async def iter_items(self):
+            for item in list(storage[self._container].values()):
+                yield item
+
         async def create_item(self, item: dict) -> dict:
             storage[self._container][item["id"]] = item
             return item
@@ -59,9 +64,21 @@ def fixture_api_client(monkeypatch):
             storage[self._container][item_id] = item
             return item
 
+        async def patch_item(self, item_id: str, operations: list[dict], **_: object) -> dict:
+            patched = apply_patch_operations(await self.read_item(item_id), operations)
+            storage[self._container][item_id] = patched
+            return patched
+
         async def delete_item(self, item_id: str) -> None:
             storage[self._container].pop(item_id, None)
 
+        async def bulk_upsert(self, items: list[dict], concurrency: int | None = None) -> BulkWriteResult:
+            results = []
+            for index, item in enumerate(items):
+                storage[self._container][item["id"]] = item
+                results.append(BulkItemResult(index, item["id"], True))
+            return BulkWriteResult(tuple(results))
+
     def stub_crud(container: str) -> StubRepo:
         return StubRepo(container)
 
@@ -191,3 +208,35 @@ def test_bulk_sync_roster(api_client: TestClient):
         "classes": 1,
         "groups": 1,
     }
+
+
+def test_bulk_sync_roster_reports_per_item_failures(api_client: TestClient, monkeypatch):
+    from app import main
+    from tutor_lib.cosmos import BulkItemResult, BulkWriteResult
+
+    async def flaky_bulk_create(container: str, items: list[dict]) -> BulkWriteResult:
+        results = []
+        for index, item in enumerate(items):
+            if item["id"] == "student-bad":
+                results.append(BulkItemResult(index, item["id"], False, status_code=429, error="throttled"))
+            else:
+                results.append(BulkItemResult(index, item["id"], True))
+        return BulkWriteResult(tuple(results))
+
+    monkeypatch.setattr(main, "_bulk_create", flaky_bulk_create)
+
+    payload = {
+        "students": [
+            {"id": "student-ok", "name": "Ana", "email": "ana@example.com", "class_id": "class-1"},
+            {"id": "student-bad", "name": "Rui", "email": "rui@example.com", "class_id": "class-1"},
+        ],
+    }
+
+    response = api_client.post("/lms/bulk-sync", json=payload, headers=_auth_headers())
+
+    assert response.status_code == 207
+    detail = response.json()["detail"]
+    assert detail["synchronized"]["students"] == 1
+    assert detail["failures"] == {
+        "students": [{"id": "student-bad", "status_code": 429, "error": "throttled"}]
+    }
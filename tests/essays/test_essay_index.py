@@ -0,0 +1,92 @@
+"""Tests for the essay id → partition key index."""
+
+# pylint: disable=redefined-outer-name
+
+import importlib
+import sys
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture
+def essays_cosmos_module():
+    repo_root = Path(__file__).resolve().parents[2]
+    for entry in (str(repo_root / "apps" / "essays" / "src"), str(repo_root / "lib" / "src")):
+        if entry in sys.path:
+            sys.path.remove(entry)
+        sys.path.insert(0, entry)
+    for module_name in list(sys.modules):
+        if module_name == "app" or module_name.startswith("app."):
+            sys.modules.pop(module_name, None)
+    return importlib.import_module("app.cosmos")
+
+
+@pytest.fixture
+def account(essays_cosmos_module):
+    from tutor_lib.cosmos.emulator import InMemoryCosmosAccount
+
+    return InMemoryCosmosAccount()
+
+
+def _index(module, account):
+    from tutor_lib.config import CosmosConfig
+    from tutor_lib.cosmos import CosmosCRUD
+    from tutor_lib.cosmos.emulator import create_in_memory_pool
+
+    config = CosmosConfig(COSMOS_ENDPOINT="memory://", COSMOS_DATABASE="tutor")
+    pool = create_in_memory_pool(account)
+    essays = module.CosmosCRUD("essays", config, pool=pool)
+    return essays, module.EssayPartitionIndex(essays, CosmosCRUD("essay_index", config, pool=pool))
+
+
+@pytest.mark.asyncio
+async def test_indexed_essays_are_point_read(essays_cosmos_module, account):
+    essays, index = _index(essays_cosmos_module, account)
+    document = {"id": "essay-1", "student_id": "student-9", "topic": "Topic"}
+    await essays.create_item(document)
+    await index.record(document)
+
+    _, fresh = _index(essays_cosmos_module, account)
+    before = account.requests
+    found = await fresh.get("essay-1")
+
+    assert found["topic"] == "Topic"
+    assert account.requests - before == 2
+    assert await fresh.partition_key_for("essay-1") == "student-9"
+    entries = account.container("tutor", "essay_index").documents()
+    assert entries[0]["student_id"] == "student-9"
+
+
+@pytest.mark.asyncio
+async def test_unindexed_essays_fall_back_to_query_and_get_indexed(essays_cosmos_module, account):
+    essays, index = _index(essays_cosmos_module, account)
+    await essays.create_item({"id": "template-essay", "topic": "No student"})
+
+    assert (await index.get("template-essay"))["topic"] == "No student"
+    entry = account.container("tutor", "essay_index").documents()[0]
+    assert entry["has_partition_key"] is False
+
+    before = account.requests
+    assert (await index.get("template-essay"))["topic"] == "No student"
+    assert account.requests - before == 1
+    assert await index.get("missing") is None
+
+
+@pytest.mark.asyncio
+async def test_backfill_indexes_every_essay_and_forget_removes_entries(
+    essays_cosmos_module, account
+):
+    essays, index = _index(essays_cosmos_module, account)
+    for number in range(5):
+        await essays.create_item({"id": f"essay-{number}", "student_id": f"student-{number % 2}"})
+    await essays.create_item({"id": "template", "topic": "t"})
+
+    assert await index.backfill(page_size=2, dry_run=True) == 6
+    assert account.container("tutor", "essay_index").documents() == []
+    assert await index.backfill(page_size=2) == 6
+    assert len(account.container("tutor", "essay_index").documents()) == 6
+
+    await index.forget("essay-3")
+    assert await index.partition_key_for("essay-3") is None
+    assert len(account.container("tutor", "essay_index").documents()) == 5
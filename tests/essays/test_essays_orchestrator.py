@@ -2,6 +2,7 @@
 
 # pylint: disable=redefined-outer-name
 
+import contextlib
 import importlib
 import json
 import sys
@@ -38,6 +39,7 @@ def _install_tutor_lib_agents_stub() -> None:
 
     agents_module.FoundryAgentService = _ImportSafeFoundryAgentService
     agents_module.AgentAttachment = _ImportSafeAgentAttachment
+    agents_module.bypass_evaluation_cache = lambda _enabled=True: contextlib.nullcontext()
     sys.modules["tutor_lib.agents"] = agents_module
 
 
@@ -704,4 +706,27 @@ async def test_reprocess_endpoint_returns_400_when_assembly_missing_or_unresolva
         await module.reprocess_essay_evaluation(document["id"])
 
     assert exc_info.value.status_code == 400
-    assert expected_substring in str(exc_info.value.detail)
\ No newline at end of file
+    assert expected_substring in str(exc_info.value.detail)
+
+@pytest.mark.asyncio
+async def test_create_essay_survives_a_failed_index_write(monkeypatch, essays_main_module_fixture):
+    module = essays_main_module_fixture
+    stored = []
+
+    class _Essays:
+        async def create_item(self, document):
+            stored.append(document)
+            return document
+
+    async def _unavailable(_document):
+        raise module.cosmos_exceptions.CosmosHttpResponseError(status_code=503, message="down")
+
+    monkeypatch.setattr(module, "_crud", lambda _container: _Essays())
+    monkeypatch.setattr(module.essay_index, "record", _unavailable)
+
+    response = await module.create_essay(
+        module.Essay(id="essay-123", topic="Topic", content="Essay text")
+    )
+
+    assert response.status_code == 200
+    assert [document["id"] for document in stored] == ["essay-123"]
@@ -75,3 +75,28 @@ def test_run_with_unknown_dataset_returns_404(api_client: TestClient):
         headers=_auth_headers(),
     )
     assert run_response.status_code == 404
+
+
+def test_list_datasets_pages_with_continuation_header(api_client: TestClient):
+    for index in range(3):
+        api_client.post(
+            "/datasets",
+            json={"dataset_id": f"dataset-{index}", "name": f"Set {index}", "items": []},
+            headers=_auth_headers(),
+        )
+
+    first = api_client.get("/datasets", params={"page_size": 2}, headers=_auth_headers())
+    assert first.status_code == 200
+    assert [item["dataset_id"] for item in first.json()] == ["dataset-0", "dataset-1"]
+    token = first.headers["X-Continuation-Token"]
+
+    second = api_client.get(
+        "/datasets", params={"page_size": 2, "continuation": token}, headers=_auth_headers()
+    )
+    assert [item["dataset_id"] for item in second.json()] == ["dataset-2"]
+    assert "X-Continuation-Token" not in second.headers
+
+    invalid = api_client.get(
+        "/datasets", params={"page_size": 2, "continuation": "not-a-token"}, headers=_auth_headers()
+    )
+    assert invalid.status_code == 400
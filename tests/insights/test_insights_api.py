@@ -531,3 +531,96 @@ def test_blank_cosmos_endpoint_falls_back_to_in_memory(monkeypatch: pytest.Monke
     repository = main_module._repository()
 
     assert isinstance(repository, main_module.InMemoryInsightsRepository)
+
+
+@pytest.mark.asyncio
+async def test_cosmos_repository_point_reads_reports_by_school(insights_module, monkeypatch):
+    monkeypatch.setenv("COSMOS_EMULATOR", "memory")
+    from tutor_lib.config import CosmosConfig
+    from tutor_lib.cosmos.emulator import get_in_memory_account
+
+    account = get_in_memory_account()
+    account.reset()
+    store = importlib.import_module("app.store")
+    config = CosmosConfig(COSMOS_ENDPOINT="memory://", COSMOS_DATABASE="unit-test-db")
+    report = store.ReportRecord(
+        report_id="report-1",
+        school_id="school-a",
+        supervisor_id="supervisor-1",
+        week_of=None,
+        generated_at="2024-01-01T00:00:00+00:00",
+        source="test",
+    )
+    await store.CosmosInsightsRepository(config).create_report(report)
+
+    repository = store.CosmosInsightsRepository(config)
+    before = account.requests
+    assert (await repository.get_report("report-1", school_id="school-a")).school_id == "school-a"
+    assert account.requests - before == 1
+
+    legacy = store.CosmosInsightsRepository(config)
+    assert (await legacy.get_report("report-1", school_id="school-b")).school_id == "school-a"
+    before = account.requests
+    loaded = await legacy.get_report("report-1")
+    assert account.requests - before == 1
+
+    feedback = store.FeedbackRecord(
+        feedback_id="feedback-1",
+        report_id="report-1",
+        school_id="school-a",
+        supervisor_id="supervisor-1",
+        rating=5,
+        comments=None,
+        submitted_at="2024-01-02T00:00:00+00:00",
+    )
+    await legacy.create_feedback(feedback, report=loaded)
+    assert (await repository.get_report("report-1", school_id="school-a")).feedback_count == 1
+    account.reset()
+
+
+@pytest.mark.asyncio
+async def test_cosmos_repository_summary_listing_and_metrics_use_projections(insights_module, monkeypatch):
+    monkeypatch.setenv("COSMOS_EMULATOR", "memory")
+    from tutor_lib.config import CosmosConfig
+    from tutor_lib.cosmos.emulator import get_in_memory_account
+
+    get_in_memory_account().reset()
+    store = importlib.import_module("app.store")
+    repository = store.CosmosInsightsRepository(
+        CosmosConfig(COSMOS_ENDPOINT="memory://", COSMOS_DATABASE="unit-test-db")
+    )
+    for index, school_id in enumerate(["school-a", "school-b"]):
+        await repository.create_report(
+            store.ReportRecord(
+                report_id=f"report-{index}",
+                school_id=school_id,
+                supervisor_id="supervisor-1",
+                week_of=None,
+                generated_at=f"2024-01-0{index + 1}T00:00:00+00:00",
+                source="test",
+                indicators=[{"name": "attendance", "value": 0.9}],
+                trends=["steady"],
+            )
+        )
+    await repository.create_feedback(
+        store.FeedbackRecord(
+            feedback_id="feedback-1",
+            report_id="report-0",
+            school_id="school-a",
+            supervisor_id="supervisor-1",
+            rating=4,
+            comments=None,
+            submitted_at="2024-01-02T00:00:00+00:00",
+        )
+    )
+
+    summaries = await repository.list_reports({"school-a", "school-b"}, summary=True)
+    assert [report.report_id for report in summaries] == ["report-1", "report-0"]
+    assert all(report.indicators == [] and report.trends == [] for report in summaries)
+    assert summaries[1].feedback_count == 1
+    assert (await repository.list_reports({"school-a"}))[0].indicators
+
+    metrics = await repository.get_pilot_metrics({"school-a", "school-b"})
+    assert (metrics.total_reports, metrics.total_feedback, metrics.average_rating) == (2, 1, 4)
+    assert metrics.school_count == 2
+    get_in_memory_account().reset()
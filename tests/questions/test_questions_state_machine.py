@@ -1,9 +1,20 @@
+import asyncio
+import importlib
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
 import pytest
+from azure.core.exceptions import ResourceNotFoundError
+from fastapi.testclient import TestClient
 
 from questions.app.questions import (
+    BatchGraders,
     QuestionEvaluationStatus,
     QuestionStateMachine,
     evaluate_question,
+    stream_question_evaluation,
 )
 from questions.app.schemas import Answer, Grader, Question
 
@@ -30,6 +41,11 @@ class _StubFoundryAgentService:
         self.calls.append((agent_id, prompt))
         return self.response_text
 
+    async def stream_agent(self, agent_id: str, prompt: str, **kwargs):
+        self.calls.append((agent_id, prompt))
+        for line in self.response_text.splitlines(keepends=True):
+            yield line
+
 
 @pytest.mark.asyncio
 async def test_evaluate_question_returns_completed(monkeypatch):
@@ -88,4 +104,251 @@ async def test_confidence_inference_handles_low_confidence(monkeypatch):
 
     dim = result.dimensions[0]
     assert dim.confidence == pytest.approx(0.4)
-    assert "Low confidence" in " ".join(dim.notes)
\ No newline at end of file
+    assert "Low confidence" in " ".join(dim.notes)
+
+
+@pytest.mark.asyncio
+async def test_stream_question_evaluation_emits_deltas_then_result(monkeypatch):
+    monkeypatch.setattr("questions.app.questions.FoundryAgentService", _StubFoundryAgentService)
+
+    async def _fake_ensure(self):
+        self.graders = [
+            Grader(agent_id="grader-1", deployment="fake-deployment", dimension="accuracy"),
+            Grader(agent_id="grader-2", deployment="fake-deployment", dimension="clarity"),
+        ]
+
+    monkeypatch.setattr(QuestionStateMachine, "ensure_assembly", _fake_ensure)
+
+    events = [
+        event
+        async for event in stream_question_evaluation(
+            assembly_id="assembly-123",
+            question=Question(id="q1", topic="Math", question="2+2", explanation=None),
+            answer=Answer(id="a1", text="4", question_id="q1", respondent="Student"),
+        )
+    ]
+
+    kinds = [kind for kind, _ in events]
+    assert kinds.count("delta") == 4
+    assert kinds.count("dimension") == 2
+    assert kinds[-1] == "result"
+    result = events[-1][1]
+    assert result.status is QuestionEvaluationStatus.COMPLETED
+    assert [dim.dimension for dim in result.dimensions] == ["accuracy", "clarity"]
+    assert result.dimensions[0].confidence == pytest.approx(0.9)
+
+
+class _BatchingFoundryAgentService(_StubFoundryAgentService):
+    """Answers the batch grader with a structured reply that leaves out ``depth``."""
+
+    created: list[dict] = []
+
+    async def get_agent(self, agent_id: str) -> SimpleNamespace:
+        return SimpleNamespace(id=agent_id, instructions=f"Grade like {agent_id}")
+
+    async def list_agents(self) -> list:
+        return []
+
+    async def create_agent(self, **kwargs) -> SimpleNamespace:
+        self.created.append(kwargs)
+        return SimpleNamespace(id="batch-grader")
+
+    async def run_agent(self, agent_id: str, prompt: str, **kwargs) -> str:
+        if agent_id != "batch-grader":
+            return await super().run_agent(agent_id, prompt, **kwargs)
+        self.calls.append((agent_id, prompt))
+        return json.dumps(
+            {
+                "dimensions": [
+                    {
+                        "dimension": "clarity",
+                        "verdict": "Clear",
+                        "confidence": 0.8,
+                        "notes": ["Concise"],
+                    },
+                    {"dimension": "accuracy", "verdict": "Correct", "confidence": 0.95},
+                ]
+            }
+        )
+
+
+@pytest.mark.asyncio
+async def test_batched_mode_grades_a_deployment_in_one_run_and_falls_back_per_dimension(monkeypatch):
+    monkeypatch.setattr("questions.app.questions.FoundryAgentService", _BatchingFoundryAgentService)
+    monkeypatch.setattr("questions.app.questions._BATCH_GRADERS", BatchGraders())
+    _BatchingFoundryAgentService.created = []
+    graders = [
+        Grader(agent_id="grader-1", deployment="gpt-5", dimension="accuracy"),
+        Grader(agent_id="grader-2", deployment="gpt-5", dimension="clarity"),
+        Grader(agent_id="grader-3", deployment="gpt-5", dimension="depth"),
+        Grader(agent_id="grader-4", deployment="gpt-5-nano", dimension="tone"),
+    ]
+    machine = QuestionStateMachine(
+        "assembly-123",
+        Question(id="q1", topic="Math", question="2+2", explanation=None),
+        Answer(id="a1", text="4", question_id="q1", respondent="Student"),
+        batched=True,
+    )
+
+    async def _fake_ensure():
+        machine.graders = graders
+
+    monkeypatch.setattr(machine, "ensure_assembly", _fake_ensure)
+
+    result = await machine.evaluate()
+
+    assert [dim.dimension for dim in result.dimensions] == ["accuracy", "clarity", "depth", "tone"]
+    assert [dim.verdict for dim in result.dimensions[:2]] == ["Correct", "Clear"]
+    assert result.dimensions[1].notes == ["Clear", "Concise"]
+    assert result.dimensions[2].verdict.startswith("Strong verdict")
+    called = sorted(agent_id for agent_id, _ in machine.agent_service.calls)
+    assert called == ["batch-grader", "grader-3", "grader-4"]
+    batch_prompt = dict(machine.agent_service.calls)["batch-grader"]
+    assert batch_prompt.count("answer: 4") == 1
+    assert "Grade like grader-3" in batch_prompt
+    assert [agent["deployment"] for agent in _BatchingFoundryAgentService.created] == ["gpt-5"]
+
+
+class _SlowListingFoundryAgentService(_BatchingFoundryAgentService):
+    instructions = "Grade like before"
+
+    async def get_agent(self, agent_id: str) -> SimpleNamespace:
+        return SimpleNamespace(id=agent_id, instructions=self.instructions)
+
+    async def list_agents(self) -> list:
+        await asyncio.sleep(0)
+        return []
+
+    async def run_agent(self, agent_id: str, prompt: str, **kwargs) -> str:
+        if agent_id == "batch-grader":
+            raise ResourceNotFoundError("agent deleted")
+        return await super().run_agent(agent_id, prompt, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_batch_graders_share_lookups_and_drop_agents_whose_runs_fail(monkeypatch):
+    monkeypatch.setattr(
+        "questions.app.questions.FoundryAgentService", _SlowListingFoundryAgentService
+    )
+    now = [0.0]
+    batch_graders = BatchGraders(instructions_ttl=60, clock=lambda: now[0])
+    monkeypatch.setattr("questions.app.questions._BATCH_GRADERS", batch_graders)
+    _SlowListingFoundryAgentService.created = []
+    service = _SlowListingFoundryAgentService()
+    grader = Grader(agent_id="grader-1", deployment="gpt-5", dimension="accuracy")
+
+    ids = await asyncio.gather(*(batch_graders.agent_id(service, "gpt-5") for _ in range(3)))
+    assert ids == ["batch-grader"] * 3
+    assert len(_SlowListingFoundryAgentService.created) == 1
+
+    assert await batch_graders.instructions(service, grader) == "Grade like before"
+    service.instructions = "Grade like now"
+    assert await batch_graders.instructions(service, grader) == "Grade like before"
+    now[0] += 61
+    assert await batch_graders.instructions(service, grader) == "Grade like now"
+
+    machine = QuestionStateMachine(
+        "assembly-123",
+        Question(id="q1", topic="Math", question="2+2", explanation=None),
+        Answer(id="a1", text="4", question_id="q1", respondent="Student"),
+        batched=True,
+    )
+
+    async def _fake_ensure():
+        machine.graders = [
+            grader,
+            Grader(agent_id="grader-2", deployment="gpt-5", dimension="depth"),
+        ]
+
+    monkeypatch.setattr(machine, "ensure_assembly", _fake_ensure)
+
+    result = await machine.evaluate()
+
+    assert [dim.verdict[:6] for dim in result.dimensions] == ["Strong", "Strong"]
+    await batch_graders.agent_id(service, "gpt-5")
+    assert len(_SlowListingFoundryAgentService.created) == 2
+
+
+def _import_questions_main():
+    questions_app = str(Path(__file__).resolve().parents[2] / "apps" / "questions")
+    if questions_app in sys.path:
+        sys.path.remove(questions_app)
+    sys.path.insert(0, questions_app)
+    for module_name in list(sys.modules):
+        if module_name == "app" or module_name.startswith("app."):
+            sys.modules.pop(module_name, None)
+    return importlib.import_module("app.main")
+
+
+@pytest.fixture(name="questions_main")
+def fixture_questions_main():
+    return _import_questions_main()
+
+
+def test_grader_route_answers_a_run_past_its_deadline_with_the_fallback(
+    monkeypatch, questions_main
+):
+    async def _timed_out(*_args, **_kwargs):
+        raise TimeoutError("Agent run did not finish within 120s.")
+
+    monkeypatch.setattr(questions_main, "evaluate_question", _timed_out)
+    payload = {
+        "case_id": "case-1",
+        "question": {
+            "id": "q1",
+            "topic": "Fractions",
+            "question": "1/2 + 1/4?",
+            "explanation": None,
+        },
+        "answer": {"id": "a1", "text": "3/4", "question_id": "q1", "respondent": "student-1"},
+    }
+
+    response = TestClient(questions_main.app).post("/grader/interaction", json=payload)
+
+    assert response.status_code == 200
+    assert "runtime failure" in response.json()["overall"]
+
+
+@pytest.mark.asyncio
+async def test_assembly_update_route_invalidates_the_assembly_grading_reads(monkeypatch):
+    monkeypatch.setenv("COSMOS_EMULATOR", "memory")
+    from tutor_lib.cosmos import reset_shared_query_cache
+    from tutor_lib.cosmos.emulator import get_in_memory_account
+
+    main = _import_questions_main()
+    schemas = importlib.import_module("app.schemas")
+    questions = importlib.import_module("app.questions")
+    monkeypatch.setattr(main.settings.cosmos, "query_cache_ttl", 60.0)
+    reset_shared_query_cache()
+    get_in_memory_account().reset()
+
+    def _definition(agent_id: str):
+        grader = schemas.GraderDefinition(
+            agent_id=agent_id,
+            name=agent_id,
+            instructions="Grade the answer.",
+            deployment="gpt-5",
+            dimension="accuracy",
+        )
+        return schemas.AssemblyDefinition(id="asm-cache", topic_name="Fractions", agents=[grader])
+
+    async def _graders() -> list[str]:
+        machine = questions.QuestionStateMachine(
+            "asm-cache",
+            schemas.Question(id="q1", topic="Fractions", question="1/2 + 1/4?", explanation=None),
+            schemas.Answer(id="a1", text="3/4", question_id="q1", respondent="student-1"),
+        )
+        await machine.ensure_assembly()
+        return [grader.agent_id for grader in machine.graders]
+
+    try:
+        await main.create_assembly(_definition("grader-1"))
+        assert await _graders() == ["grader-1"]
+
+        await main.update_assembly("asm-cache", _definition("grader-2"))
+
+        assert await _graders() == ["grader-2"]
+    finally:
+        main._crud.cache_clear()
+        reset_shared_query_cache()
+        get_in_memory_account().reset()
@@ -0,0 +1,37 @@
+"""Path setup for shared library tests.
+
+Adds ``lib/src`` to ``sys.path`` so ``tutor_lib`` resolves without an editable
+install, and provides the environment ``tutor_lib.config`` validates at import.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+_REPO_ROOT = Path(__file__).resolve().parents[2]
+_LIB_SRC = str(_REPO_ROOT / "lib" / "src")
+
+if _LIB_SRC in sys.path:
+    sys.path.remove(_LIB_SRC)
+sys.path.insert(0, _LIB_SRC)
+
+os.environ.setdefault("COSMOS_ENDPOINT", "https://localhost:8081/")
+os.environ.setdefault("COSMOS_DATABASE", "unit-test-db")
+os.environ.setdefault("PROJECT_ENDPOINT", "https://fake-endpoint.azure.com/")
+
+from tutor_lib.agents import evaluations, ratelimit  # noqa: E402 - needs the path set up above
+from tutor_lib.resilience import reset_circuit_breakers  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _fresh_process_state():
+    # Bound at collection: other suites replace ``tutor_lib.agents`` in ``sys.modules``.
+    evaluations.reset_shared_evaluation_cache()
+    ratelimit.reset_shared_rate_limiter()
+    reset_circuit_breakers()
+    yield
+    evaluations.reset_shared_evaluation_cache()
+    ratelimit.reset_shared_rate_limiter()
+    reset_circuit_breakers()
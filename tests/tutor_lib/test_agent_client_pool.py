@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+from tutor_lib.agents import FoundryAgentService, ProjectClientPool
+from tutor_lib.resilience import RetryPolicy
+
+
+class _StubAgents:
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    async def get_agent(self, agent_id: str) -> dict:
+        self.calls.append(agent_id)
+        return {"id": agent_id}
+
+
+class _StubProjectClient:
+    instances: list["_StubProjectClient"] = []
+
+    def __init__(self, *, endpoint: str, credential) -> None:
+        self.endpoint = endpoint
+        self.credential = credential
+        self.entered = 0
+        self.closed = False
+        self.agents = _StubAgents()
+        _StubProjectClient.instances.append(self)
+
+    async def __aenter__(self) -> "_StubProjectClient":
+        self.entered += 1
+        return self
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class _StubCredential:
+    created = 0
+
+    def __init__(self) -> None:
+        _StubCredential.created += 1
+        self.closed = False
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture
+def pool() -> ProjectClientPool:
+    _StubProjectClient.instances = []
+    _StubCredential.created = 0
+    return ProjectClientPool(credential_factory=_StubCredential, client_factory=_StubProjectClient)
+
+
+@pytest.mark.asyncio
+async def test_services_share_one_entered_client_and_credential_per_endpoint(pool):
+    first = FoundryAgentService("https://a", pool=pool, retry_policy=RetryPolicy())
+    second = FoundryAgentService("https://a", pool=pool, retry_policy=RetryPolicy())
+
+    await first.get_agent("asst-1")
+    await second.get_agent("asst-2")
+    await FoundryAgentService("https://b", pool=pool).get_agent("asst-3")
+
+    client_a, client_b = _StubProjectClient.instances
+    assert client_a.agents.calls == ["asst-1", "asst-2"]
+    assert (client_a.entered, client_b.entered) == (1, 1)
+    assert client_a.credential is client_b.credential
+    assert _StubCredential.created == 1
+
+
+@pytest.mark.asyncio
+async def test_pool_close_releases_clients_and_credential(pool):
+    service = FoundryAgentService("https://a", pool=pool)
+    await service.get_agent("asst-1")
+    client = _StubProjectClient.instances[0]
+
+    await pool.close()
+
+    assert client.closed and client.credential.closed
+    await service.get_agent("asst-2")
+    assert len(_StubProjectClient.instances) == 2
+
+
+def test_a_lookup_from_a_new_event_loop_closes_the_stale_client(pool):
+    asyncio.run(pool.client("https://a"))
+    asyncio.run(pool.client("https://a"))
+
+    stale, fresh = _StubProjectClient.instances
+    assert (stale.closed, fresh.closed) == (True, False)
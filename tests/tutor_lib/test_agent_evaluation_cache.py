@@ -0,0 +1,132 @@
+from types import SimpleNamespace
+
+import pytest
+from azure.ai.agents.models import ThreadRun
+from tutor_lib.agents import (
+    AgentAttachment,
+    CosmosEvaluationCache,
+    FoundryAgentService,
+    InMemoryEvaluationCache,
+    ProjectClientPool,
+    bypass_evaluation_cache,
+    evaluation_cache_key,
+)
+from tutor_lib.config import CosmosConfig
+from tutor_lib.cosmos import CosmosCRUD
+from tutor_lib.cosmos.emulator import InMemoryCosmosAccount, create_in_memory_pool
+from tutor_lib.metrics import InMemoryMetricsSink
+
+
+class _Runs:
+    def __init__(self) -> None:
+        self.created = 0
+
+    async def create(self, *, thread_id: str, agent_id: str) -> ThreadRun:
+        self.created += 1
+        return ThreadRun({"id": "run-1", "thread_id": thread_id, "status": "completed"})
+
+
+class _Messages:
+    def __init__(self, runs: _Runs) -> None:
+        self._runs = runs
+
+    async def create(self, **_kwargs) -> None:
+        return None
+
+    async def list(self, **_kwargs):
+        yield SimpleNamespace(content=[{"text": f"Verdict #{self._runs.created}"}])
+
+
+class _Threads:
+    async def create(self) -> SimpleNamespace:
+        return SimpleNamespace(id="thread-1")
+
+
+class _Clock:
+    def __init__(self, now: float = 0.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _service(runs: _Runs, cache) -> FoundryAgentService:
+    agents = SimpleNamespace(runs=runs, messages=_Messages(runs), threads=_Threads())
+    pool = ProjectClientPool(
+        credential_factory=object, client_factory=lambda **_kwargs: SimpleNamespace(agents=agents)
+    )
+    return FoundryAgentService(
+        "https://project", pool=pool, evaluation_cache=cache, streaming=False
+    )
+
+
+@pytest.mark.asyncio
+async def test_repeated_evaluations_skip_foundry_until_refreshed():
+    sink = InMemoryMetricsSink()
+    runs = _Runs()
+    service = _service(runs, InMemoryEvaluationCache(ttl=60, metrics_sink=sink))
+
+    assert await service.run_agent("grader", "grade essay", deployment="gpt-5") == "Verdict #1"
+    assert await service.run_agent("grader", "grade essay", deployment="gpt-5") == "Verdict #1"
+    assert [
+        chunk async for chunk in service.stream_agent("grader", "grade essay", deployment="gpt-5")
+    ] == ["Verdict #1"]
+    assert runs.created == 1
+
+    with bypass_evaluation_cache():
+        assert await service.run_agent("grader", "grade essay", deployment="gpt-5") == "Verdict #2"
+    assert await service.run_agent("grader", "grade essay", deployment="gpt-5") == "Verdict #2"
+    assert (
+        await service.run_agent("grader", "grade essay", deployment="gpt-5", cache=False)
+        == "Verdict #3"
+    )
+
+    assert sink.counter("agent.evaluation_cache.hits", backend="memory") == 3
+    assert sink.counter("agent.evaluation_cache.bypassed", backend="memory") == 1
+
+
+def test_key_covers_agent_deployment_prompt_and_attachment_bytes():
+    image = AgentAttachment(file_name="a.png", content_type="image/png", payload=b"one")
+    renamed = AgentAttachment(file_name="b.png", content_type="image/png", payload=b"one")
+    edited = AgentAttachment(file_name="a.png", content_type="image/png", payload=b"two")
+
+    base = evaluation_cache_key("grader", "gpt-5", "grade", [image])
+    assert evaluation_cache_key("grader", "gpt-5", "grade", [renamed]) == base
+    assert evaluation_cache_key("grader", "gpt-5", "grade", [edited]) != base
+    assert evaluation_cache_key("grader", "gpt-5-nano", "grade", [image]) != base
+    assert evaluation_cache_key("grader", "gpt-5", "grade!", [image]) != base
+    assert evaluation_cache_key("grader", "gpt-5", "grade", [image], instructions="x") != base
+
+
+@pytest.mark.asyncio
+async def test_in_memory_backend_expires_and_evicts_least_recently_used():
+    clock = _Clock()
+    cache = InMemoryEvaluationCache(ttl=10, maxsize=2, clock=clock)
+    await cache.set("a", "A")
+    await cache.set("b", "B")
+    assert await cache.get("a") == "A"
+    await cache.set("c", "C")
+
+    assert (await cache.get("b"), len(cache)) == (None, 2)
+    clock.now = 11
+    assert await cache.get("a") is None
+
+
+@pytest.mark.asyncio
+async def test_cosmos_backend_shares_replies_and_ignores_expired_documents():
+    clock = _Clock(1_000.0)
+    crud = CosmosCRUD(
+        "evaluation_cache",
+        CosmosConfig(COSMOS_ENDPOINT="memory://"),
+        pool=create_in_memory_pool(InMemoryCosmosAccount()),
+    )
+    writer = CosmosEvaluationCache(crud, ttl=30, clock=clock)
+    reader = CosmosEvaluationCache(crud, ttl=30, clock=clock)
+
+    assert await reader.lookup("key") is None
+    await writer.store("key", "Verdict: good")
+    assert await reader.lookup("key") == "Verdict: good"
+    assert (await crud.read_item("key"))["ttl"] == 30
+
+    clock.now += 31
+    assert await reader.lookup("key") is None
@@ -0,0 +1,183 @@
+from types import SimpleNamespace
+
+import pytest
+from azure.ai.agents.models import ThreadRun
+from azure.cosmos import exceptions as cosmos_exceptions
+from tutor_lib.agents import (
+    AgentAttachment,
+    CosmosRateLimitStore,
+    DeploymentQuota,
+    DeploymentRateLimiter,
+    FoundryAgentService,
+    InMemoryRateLimitStore,
+    ProjectClientPool,
+    RateLimitExceededError,
+    estimate_tokens,
+)
+from tutor_lib.config import CosmosConfig
+from tutor_lib.cosmos import CosmosCRUD
+from tutor_lib.cosmos.emulator import InMemoryCosmosAccount, create_in_memory_pool
+from tutor_lib.metrics import InMemoryMetricsSink
+
+
+class _Clock:
+    def __init__(self, now: float = 0.0) -> None:
+        self.now = now
+        self.slept: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def _limiter(clock: _Clock, quota: DeploymentQuota, **kwargs) -> DeploymentRateLimiter:
+    return DeploymentRateLimiter(
+        {"gpt-5": quota},
+        store=kwargs.pop("store", None) or InMemoryRateLimitStore(clock=clock),
+        sleep=clock.sleep,
+        clock=clock,
+        **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+async def test_runs_wait_for_the_bucket_to_refill_and_are_shed_past_the_max_wait():
+    clock, sink = _Clock(), InMemoryMetricsSink()
+    limiter = _limiter(
+        clock,
+        DeploymentQuota(tokens_per_minute=600, requests_per_minute=60),
+        max_wait=15,
+        metrics_sink=sink,
+    )
+
+    await limiter.acquire("gpt-5", 600)
+    await limiter.acquire("gpt-5", 100)
+    assert clock.slept == [10.0]
+
+    with pytest.raises(RateLimitExceededError) as shed:
+        await limiter.acquire("gpt-5", 600)
+    assert (shed.value.reason, shed.value.partition, shed.value.retry_after) == (
+        "rate_limited",
+        "gpt-5",
+        60.0,
+    )
+    assert sink.counter("agent.rate_limit.rejected", deployment="gpt-5", backend="memory") == 1
+
+    await limiter.acquire("gpt-5-nano", 10**9)
+    assert clock.slept == [10.0]
+
+
+@pytest.mark.asyncio
+async def test_reported_usage_refunds_or_charges_the_estimate():
+    clock = _Clock()
+    limiter = _limiter(clock, DeploymentQuota(tokens_per_minute=1_000), max_wait=0)
+
+    await limiter.acquire("gpt-5", 900)
+    await limiter.settle("gpt-5", 900, 100)
+    await limiter.acquire("gpt-5", 900)
+
+    await limiter.settle("gpt-5", 900, 1_000)
+    with pytest.raises(RateLimitExceededError):
+        await limiter.acquire("gpt-5", 1)
+
+
+@pytest.mark.asyncio
+async def test_cosmos_store_gives_every_replica_one_budget():
+    clock = _Clock(1_000.0)
+    crud = CosmosCRUD(
+        "rate_limits",
+        CosmosConfig(COSMOS_ENDPOINT="memory://"),
+        pool=create_in_memory_pool(InMemoryCosmosAccount()),
+    )
+    quota = DeploymentQuota(requests_per_minute=2)
+    replicas = [
+        _limiter(clock, quota, store=CosmosRateLimitStore(crud, clock=clock), max_wait=0)
+        for _ in range(2)
+    ]
+
+    await replicas[0].acquire("gpt-5", 1)
+    await replicas[1].acquire("gpt-5", 1)
+    with pytest.raises(RateLimitExceededError):
+        await replicas[0].acquire("gpt-5", 1)
+
+    clock.now += 30
+    await replicas[1].acquire("gpt-5", 1)
+    assert (await crud.read_item("gpt-5"))["requests"] == pytest.approx(0.0)
+
+
+@pytest.mark.asyncio
+async def test_cosmos_store_rereads_a_bucket_another_replica_created_first(monkeypatch):
+    clock = _Clock(1_000.0)
+    crud = CosmosCRUD(
+        "rate_limits",
+        CosmosConfig(COSMOS_ENDPOINT="memory://"),
+        pool=create_in_memory_pool(InMemoryCosmosAccount()),
+    )
+
+    async def _lose_the_race(item, *, partition_key=None):
+        await crud.create_item(dict(item, requests=1.0))
+        raise cosmos_exceptions.CosmosResourceExistsError(message="Conflict")
+
+    monkeypatch.setattr(crud, "create_item_strict", _lose_the_race)
+    limiter = _limiter(
+        clock,
+        DeploymentQuota(requests_per_minute=2),
+        store=CosmosRateLimitStore(crud, clock=clock),
+        max_wait=0,
+    )
+
+    await limiter.acquire("gpt-5", 1)
+    assert (await crud.read_item("gpt-5"))["requests"] == pytest.approx(0.0)
+    with pytest.raises(RateLimitExceededError):
+        await limiter.acquire("gpt-5", 1)
+
+
+class _Runs:
+    async def create(self, *, thread_id: str, agent_id: str) -> ThreadRun:
+        return ThreadRun(
+            {
+                "id": "run-1",
+                "thread_id": thread_id,
+                "status": "completed",
+                "usage": {"prompt_tokens": 40, "completion_tokens": 10, "total_tokens": 50},
+            }
+        )
+
+
+class _Messages:
+    async def create(self, **_kwargs) -> None:
+        return None
+
+    async def list(self, **_kwargs):
+        yield SimpleNamespace(content=[{"text": "Verdict: good"}])
+
+
+class _Threads:
+    async def create(self) -> SimpleNamespace:
+        return SimpleNamespace(id="thread-1")
+
+
+@pytest.mark.asyncio
+async def test_agent_runs_spend_the_deployment_budget_with_their_reported_usage():
+    clock = _Clock()
+    store = InMemoryRateLimitStore(clock=clock)
+    limiter = _limiter(clock, DeploymentQuota(tokens_per_minute=2_000), store=store, max_wait=0)
+    agents = SimpleNamespace(runs=_Runs(), messages=_Messages(), threads=_Threads())
+    pool = ProjectClientPool(
+        credential_factory=object, client_factory=lambda **_kwargs: SimpleNamespace(agents=agents)
+    )
+    service = FoundryAgentService(
+        "https://project", pool=pool, rate_limiter=limiter, streaming=False
+    )
+    image = AgentAttachment(file_name="essay.png", content_type="image/png", payload=b"png")
+    assert estimate_tokens("x" * 400, [image], completion_tokens=1_024) == 100 + 765 + 1_024
+
+    for _ in range(3):
+        await service.run_agent("grader", "grade", deployment="gpt-5", cache=False)
+        stream = service.stream_agent("grader", "grade", deployment="gpt-5", cache=False)
+        assert [chunk async for chunk in stream] == ["Verdict: good"]
+
+    assert store._buckets["gpt-5"].tokens == pytest.approx(2_000 - 6 * 50)
@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+from tutor_lib.agents import AgentRegistry, AgentRunContext, AgentSpec, close_agent_registries
+
+
+class _StubChatClient:
+    instances: list["_StubChatClient"] = []
+
+    def __init__(self, **kwargs) -> None:
+        self.kwargs = kwargs
+        self.closed = False
+        _StubChatClient.instances.append(self)
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class _StubAgent:
+    def __init__(self, *, chat_client, **kwargs) -> None:
+        self.chat_client = chat_client
+        self.kwargs = kwargs
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def run(self, prompt: str, **_kwargs) -> str:
+        self.started.set()
+        await self.release.wait()
+        assert not self.chat_client.closed
+        return prompt
+
+
+class _StubCredential:
+    def __init__(self) -> None:
+        self.closed = False
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture(autouse=True)
+def _stub_agent_framework(monkeypatch):
+    _StubChatClient.instances = []
+    monkeypatch.setattr("tutor_lib.agents.clients.AzureAIAgentClient", _StubChatClient)
+    monkeypatch.setattr("tutor_lib.agents.clients._Agent", _StubAgent)
+
+
+def _spec(name: str = "avatar-case-1", instructions: str = "Act as the patient.") -> AgentSpec:
+    return AgentSpec(name=name, instructions=instructions, deployment="gpt-5-nano")
+
+
+def test_identical_specs_reuse_one_agent_and_credential():
+    registry = AgentRegistry("https://project", credential_factory=_StubCredential)
+
+    first = registry.create(_spec())
+    assert registry.create(_spec()) is first
+    assert registry.create(_spec(instructions="Act as the doctor.")) is not first
+
+    first_client, second_client = _StubChatClient.instances
+    assert first_client.kwargs["async_credential"] is second_client.kwargs["async_credential"]
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction_closes_the_evicted_client():
+    registry = AgentRegistry("https://project", credential_factory=_StubCredential, max_agents=2)
+
+    case_1 = registry.create(_spec("avatar-case-1"))
+    registry.create(_spec("avatar-case-2"))
+    assert registry.create(_spec("avatar-case-1")) is case_1
+    registry.create(_spec("avatar-case-3"))
+    await asyncio.sleep(0)
+
+    assert len(registry) == 2
+    assert [client.closed for client in _StubChatClient.instances] == [False, True, False]
+    assert registry.create(_spec("avatar-case-1")) is case_1
+
+
+@pytest.mark.asyncio
+async def test_close_releases_every_agent_and_the_credential():
+    registry = AgentRegistry("https://project", credential_factory=_StubCredential)
+    registry.create(_spec("avatar-case-1"))
+    registry.create(_spec("avatar-case-2"))
+    credential = _StubChatClient.instances[0].kwargs["async_credential"]
+
+    await close_agent_registries()
+
+    assert all(client.closed for client in _StubChatClient.instances)
+    assert credential.closed
+    assert len(registry) == 0
+
+
+@pytest.mark.asyncio
+async def test_an_agent_evicted_mid_run_is_closed_once_the_run_finishes():
+    registry = AgentRegistry("https://project", credential_factory=_StubCredential, max_agents=1)
+    busy = registry.create(_spec("avatar-case-1"))
+    run = asyncio.create_task(AgentRunContext(busy).run("hello"))
+    await busy.started.wait()
+
+    registry.create(_spec("avatar-case-2"))
+    await asyncio.sleep(0)
+    assert not busy.chat_client.closed
+
+    busy.release.set()
+    assert await run == "hello"
+    await asyncio.sleep(0)
+    assert busy.chat_client.closed
+    assert [client.closed for client in _StubChatClient.instances] == [True, False]
@@ -0,0 +1,187 @@
+from types import SimpleNamespace
+
+import pytest
+from azure.ai.agents.models import MessageDeltaChunk, ThreadRun
+from tutor_lib.agents import FoundryAgentService, ProjectClientPool
+from tutor_lib.metrics import InMemoryMetricsSink
+
+
+def _run(status: str) -> ThreadRun:
+    return ThreadRun({"id": "run-1", "thread_id": "thread-1", "status": status})
+
+
+class _Stream:
+    def __init__(self, events: list) -> None:
+        self._events = events
+
+    async def __aenter__(self) -> "_Stream":
+        return self
+
+    async def __aexit__(self, *_exc) -> None:
+        return None
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for event in self._events:
+            yield event
+
+
+class _Runs:
+    def __init__(self, statuses: list[str], stream_events: list | None = None) -> None:
+        self._statuses = statuses
+        self.gets = 0
+        self.cancelled: list[str] = []
+        if stream_events is not None:
+            self.stream = self._stream
+        self._stream_events = stream_events
+
+    async def _stream(self, *, thread_id: str, agent_id: str) -> _Stream:
+        return _Stream(self._stream_events or [])
+
+    async def create(self, *, thread_id: str, agent_id: str) -> ThreadRun:
+        return _run(self._statuses[0])
+
+    async def get(self, *, thread_id: str, run_id: str) -> ThreadRun:
+        self.gets += 1
+        return _run(self._statuses[min(self.gets, len(self._statuses) - 1)])
+
+    async def cancel(self, *, thread_id: str, run_id: str) -> None:
+        self.cancelled.append(run_id)
+
+
+class _Messages:
+    async def create(self, **_kwargs) -> None:
+        return None
+
+    async def list(self, **_kwargs):
+        yield SimpleNamespace(content=[{"text": "Verdict: good"}])
+
+
+class _Threads:
+    async def create(self) -> SimpleNamespace:
+        return SimpleNamespace(id="thread-1")
+
+
+def _service(runs: _Runs, sink: InMemoryMetricsSink, delays: list[float], **kwargs):
+    agents = SimpleNamespace(runs=runs, messages=_Messages(), threads=_Threads())
+
+    async def _sleep(delay: float) -> None:
+        delays.append(delay)
+
+    pool = ProjectClientPool(
+        credential_factory=object,
+        client_factory=lambda **_kwargs: SimpleNamespace(agents=agents),
+    )
+    return FoundryAgentService(
+        "https://project", pool=pool, metrics_sink=sink, sleep=_sleep, **kwargs
+    )
+
+
+@pytest.mark.asyncio
+async def test_polling_starts_fast_and_backs_off():
+    sink, delays = InMemoryMetricsSink(), []
+    runs = _Runs(
+        ["queued", "in_progress", "in_progress", "in_progress", "in_progress", "completed"]
+    )
+    service = _service(runs, sink, delays, streaming=False)
+
+    assert await service.run_agent("asst", "grade", deployment="gpt-5") == "Verdict: good"
+    assert delays == [0.1, 0.2, 0.4, 0.8, 1.6]
+    summary = sink.histogram("agent.run.latency_ms", deployment="gpt-5", status="completed")
+    assert summary.count == 1
+
+
+@pytest.mark.asyncio
+async def test_streaming_completes_without_polling_and_records_ttft():
+    sink, delays = InMemoryMetricsSink(), []
+    delta = MessageDeltaChunk({"id": "m", "delta": {"content": []}})
+    events = [
+        ("thread.run.created", _run("queued"), None),
+        ("thread.message.delta", delta, None),
+        ("thread.message.delta", delta, None),
+        ("thread.run.completed", _run("completed"), None),
+    ]
+    runs = _Runs(["queued"], stream_events=events)
+    service = _service(runs, sink, delays)
+
+    assert await service.run_agent("asst", "grade") == "Verdict: good"
+    assert (runs.gets, delays) == (0, [])
+    ttft = sink.histogram("agent.run.ttft_ms", mode="stream")
+    assert ttft.count == 1
+
+
+@pytest.mark.asyncio
+async def test_runs_past_the_deadline_are_cancelled():
+    sink = InMemoryMetricsSink()
+    runs = _Runs(["in_progress"])
+    service = FoundryAgentService(
+        "https://project",
+        pool=ProjectClientPool(
+            credential_factory=object,
+            client_factory=lambda **_kwargs: SimpleNamespace(
+                agents=SimpleNamespace(runs=runs, messages=_Messages(), threads=_Threads())
+            ),
+        ),
+        streaming=False,
+        run_deadline=0.05,
+        metrics_sink=sink,
+    )
+
+    with pytest.raises(TimeoutError):
+        await service.run_agent("asst", "grade")
+    assert runs.cancelled == ["run-1"]
+    assert sink.counter("agent.run.timeouts", mode="poll") == 1
+
+
+def _delta(text: str) -> MessageDeltaChunk:
+    return MessageDeltaChunk(
+        {"id": "m", "delta": {"content": [{"type": "text", "index": 0, "text": {"value": text}}]}}
+    )
+
+
+@pytest.mark.asyncio
+async def test_stream_agent_yields_deltas_as_they_arrive():
+    sink, delays = InMemoryMetricsSink(), []
+    events = [
+        ("thread.message.delta", _delta("Verdict: "), None),
+        ("thread.message.delta", _delta("good"), None),
+        ("thread.run.completed", _run("completed"), None),
+    ]
+    service = _service(_Runs(["queued"], stream_events=events), sink, delays)
+
+    chunks = [chunk async for chunk in service.stream_agent("asst", "grade")]
+
+    assert chunks == ["Verdict: ", "good"]
+
+
+@pytest.mark.asyncio
+async def test_stream_agent_falls_back_to_the_final_message_when_polling():
+    sink, delays = InMemoryMetricsSink(), []
+    service = _service(_Runs(["queued", "completed"]), sink, delays, streaming=False)
+
+    assert [chunk async for chunk in service.stream_agent("asst", "grade")] == ["Verdict: good"]
+
+
+def test_sse_response_frames_events_and_reports_late_failures():
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from tutor_lib.schemas import stream_sse_response
+
+    app = FastAPI()
+
+    @app.get("/events")
+    async def events():
+        async def _events():
+            yield "delta", {"text": "Hi"}
+            raise RuntimeError("boom")
+
+        return await stream_sse_response(_events())
+
+    response = TestClient(app).get("/events")
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.text == (
+        'event: delta\ndata: {"text":"Hi"}\n\nevent: error\ndata: {"message":"boom"}\n\n'
+    )
@@ -0,0 +1,131 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from azure.ai.agents.models import ThreadRun
+from tutor_lib.agents import (
+    AgentAttachment,
+    AttachmentUploadCache,
+    FoundryAgentService,
+    ProjectClientPool,
+)
+
+
+class _Files:
+    def __init__(self) -> None:
+        self.uploads = 0
+        self.deleted: list[str] = []
+
+    async def upload(self, **_kwargs) -> SimpleNamespace:
+        self.uploads += 1
+        await asyncio.sleep(0)
+        return SimpleNamespace(id=f"file-{self.uploads}")
+
+    async def delete(self, *, file_id: str) -> None:
+        self.deleted.append(file_id)
+
+
+class _Runs:
+    async def create(self, *, thread_id: str, agent_id: str) -> ThreadRun:
+        return ThreadRun({"id": "run-1", "thread_id": thread_id, "status": "completed"})
+
+
+class _Messages:
+    def __init__(self) -> None:
+        self.attached: list[list[str]] = []
+
+    async def create(self, *, attachments=None, **_kwargs) -> None:
+        self.attached.append([item["file_id"] for item in attachments or []])
+
+    async def list(self, **_kwargs):
+        yield SimpleNamespace(content=[{"text": "Verdict: good"}])
+
+
+class _Threads:
+    async def create(self) -> SimpleNamespace:
+        return SimpleNamespace(id="thread-1")
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _service(files: _Files, messages: _Messages, cache: AttachmentUploadCache | None):
+    agents = SimpleNamespace(files=files, runs=_Runs(), messages=messages, threads=_Threads())
+    pool = ProjectClientPool(
+        credential_factory=object, client_factory=lambda **_kwargs: SimpleNamespace(agents=agents)
+    )
+    return FoundryAgentService("https://project", pool=pool, upload_cache=cache, streaming=False)
+
+
+IMAGE = AgentAttachment(file_name="essay.png", content_type="image/png", payload=b"png-bytes")
+
+
+@pytest.mark.asyncio
+async def test_identical_attachments_are_uploaded_once_across_concurrent_runs():
+    files, messages = _Files(), _Messages()
+    service = _service(files, messages, AttachmentUploadCache(ttl=60))
+
+    await asyncio.gather(
+        *(service.run_agent(f"grader-{index}", "grade", attachments=[IMAGE]) for index in range(3))
+    )
+    await service.run_agent("grader-4", "grade", attachments=[IMAGE])
+
+    assert files.uploads == 1
+    assert messages.attached == [["file-1"]] * 4
+    assert files.deleted == []
+
+
+@pytest.mark.asyncio
+async def test_idle_uploads_are_deleted_after_the_ttl_and_reuploaded():
+    files, messages, clock = _Files(), _Messages(), _Clock()
+    service = _service(files, messages, AttachmentUploadCache(ttl=60, clock=clock))
+    other = AgentAttachment(file_name="other.png", content_type="image/png", payload=b"other")
+
+    await service.run_agent("grader", "grade", attachments=[IMAGE], cache=False)
+    clock.now = 61
+    await service.run_agent("grader", "grade", attachments=[other], cache=False)
+    assert files.deleted == ["file-1"]
+
+    await service.run_agent("grader", "grade", attachments=[IMAGE], cache=False)
+    assert files.uploads == 3
+
+
+@pytest.mark.asyncio
+async def test_failed_upload_is_not_cached_and_capacity_evicts_idle_files():
+    cache = AttachmentUploadCache(ttl=60, max_entries=1)
+    key = cache.key("https://project", b"bytes", "vision")
+
+    async def _fail() -> str:
+        raise RuntimeError("upload failed")
+
+    with pytest.raises(RuntimeError):
+        await cache.acquire(key, _fail)
+    assert len(cache) == 0
+
+    async def _upload() -> str:
+        return "file-a"
+
+    held = await cache.acquire(key, _upload)
+    assert cache.expired("https://project") == []
+    cache.release([held])
+    other = await cache.acquire(cache.key("https://project", b"more", "vision"), _upload)
+    assert other.refs == 1
+    assert cache.expired("https://project") == ["file-a"]
+
+
+@pytest.mark.asyncio
+async def test_without_a_cache_each_run_uploads_and_deletes(monkeypatch):
+    monkeypatch.setattr("tutor_lib.agents.clients.shared_upload_cache", lambda _config: None)
+    files, messages = _Files(), _Messages()
+    service = _service(files, messages, None)
+
+    await service.run_agent("grader", "grade", attachments=[IMAGE], cache=False)
+    await service.run_agent("grader", "grade", attachments=[IMAGE], cache=False)
+
+    assert files.uploads == 2
+    assert files.deleted == ["file-1", "file-2"]
@@ -0,0 +1,129 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from tutor_lib.config import CosmosConfig
+from tutor_lib.cosmos import CosmosCRUD
+from tutor_lib.cosmos.emulator import InMemoryCosmosAccount, create_in_memory_pool
+from tutor_lib.metrics import InMemoryMetricsSink
+from tutor_lib.resilience import (
+    Bulkhead,
+    BulkheadFullError,
+    RetryPolicy,
+    configure_load_shedding,
+    get_bulkhead,
+    reset_bulkheads,
+)
+
+
+async def _no_sleep(_seconds: float) -> None:
+    return None
+
+
+@pytest.mark.asyncio
+async def test_bulkhead_caps_concurrency_and_queues_in_order():
+    bulkhead = Bulkhead("foundry", "gpt", max_concurrent=2, max_queue=8)
+    running, peak, order = 0, 0, []
+
+    async def _call(index: int) -> int:
+        nonlocal running, peak
+        async with bulkhead:
+            running += 1
+            peak = max(peak, running)
+            order.append(index)
+            await asyncio.sleep(0)
+            running -= 1
+        return index
+
+    assert await asyncio.gather(*(_call(index) for index in range(6))) == list(range(6))
+    assert peak == 2
+    assert order == list(range(6))
+    assert (bulkhead.active, bulkhead.queued) == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_bulkhead_sheds_when_queue_is_full_or_wait_times_out():
+    sink = InMemoryMetricsSink()
+    bulkhead = Bulkhead(
+        "cosmos", "acct", max_concurrent=1, max_queue=1, queue_timeout=0.01, metrics_sink=sink
+    )
+    gate = asyncio.Event()
+
+    async def _hold() -> None:
+        async with bulkhead:
+            await gate.wait()
+
+    holder = asyncio.create_task(_hold())
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(bulkhead.run(lambda: asyncio.sleep(0)))
+    await asyncio.sleep(0)
+
+    with pytest.raises(BulkheadFullError) as full:
+        await bulkhead.acquire()
+    assert full.value.reason == "queue_full"
+    with pytest.raises(BulkheadFullError):
+        await waiter
+    assert (
+        sink.counter(
+            "bulkhead.rejected", dependency="cosmos", partition="acct", reason="queue_timeout"
+        )
+        == 1
+    )
+
+    gate.set()
+    await holder
+    assert (bulkhead.active, bulkhead.queued) == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_leak_a_slot():
+    bulkhead = Bulkhead("service_bus", max_concurrent=1, max_queue=4)
+    await bulkhead.acquire()
+    waiter = asyncio.create_task(bulkhead.acquire())
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    bulkhead.release()
+    assert bulkhead.active == 0
+    await asyncio.wait_for(bulkhead.acquire(), 1)
+
+
+@pytest.mark.asyncio
+async def test_crud_attempts_run_inside_the_bulkhead_and_rejections_are_not_retried():
+    account = InMemoryCosmosAccount()
+    bulkhead = Bulkhead("cosmos", "memory://", max_concurrent=1)
+    crud = CosmosCRUD(
+        "graders",
+        CosmosConfig(COSMOS_ENDPOINT="memory://"),
+        pool=create_in_memory_pool(account),
+        retry_policy=RetryPolicy(sleep=_no_sleep),
+        bulkhead=bulkhead,
+    )
+    await crud.create_item({"id": "g1"})
+    await bulkhead.acquire()
+    with pytest.raises(BulkheadFullError):
+        await crud.read_item("g1")
+    bulkhead.release()
+    assert (await crud.read_item("g1"))["id"] == "g1"
+
+
+def test_shed_requests_get_503_with_retry_after():
+    reset_bulkheads()
+    bulkhead = get_bulkhead("foundry", "gpt-5")
+    assert get_bulkhead("foundry", "gpt-5") is bulkhead
+    assert get_bulkhead("foundry", "gpt-5-nano") is not bulkhead
+
+    app = FastAPI()
+    configure_load_shedding(app)
+
+    @app.get("/grade")
+    async def grade() -> None:
+        raise BulkheadFullError("foundry", "gpt-5", "queue_full", retry_after=1.5)
+
+    response = TestClient(app).get("/grade")
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "2"
+    assert response.json()["detail"] == {"dependency": "foundry", "reason": "queue_full"}
+    reset_bulkheads()
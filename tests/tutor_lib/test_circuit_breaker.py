@@ -0,0 +1,124 @@
+from types import SimpleNamespace
+
+import pytest
+from azure.core.exceptions import HttpResponseError, ServiceResponseError
+from tutor_lib.agents import FoundryAgentService, ProjectClientPool
+from tutor_lib.metrics import InMemoryMetricsSink
+from tutor_lib.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    CircuitState,
+    RetryPolicy,
+    circuit_breaker_readiness,
+)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def _fail() -> None:
+    raise ServiceResponseError("connection reset")
+
+
+async def _succeed() -> str:
+    return "ok"
+
+
+@pytest.mark.asyncio
+async def test_consecutive_failures_open_then_a_probe_closes_the_circuit():
+    clock, sink = _Clock(), InMemoryMetricsSink()
+    breaker = CircuitBreaker(
+        "foundry", "gpt-5", failure_threshold=2, reset_timeout=30, metrics_sink=sink, clock=clock
+    )
+
+    for _ in range(2):
+        with pytest.raises(ServiceResponseError):
+            await breaker.call(_fail)
+    assert breaker.state is CircuitState.OPEN
+    with pytest.raises(CircuitOpenError) as rejected:
+        await breaker.call(_succeed)
+    assert rejected.value.retry_after == 30
+
+    clock.now = 30
+    assert breaker.state is CircuitState.HALF_OPEN
+    assert await breaker.call(_succeed) == "ok"
+    assert breaker.state is CircuitState.CLOSED
+    assert sink.counter("circuit.rejected", partition="gpt-5") == 1
+    assert sink.counter("circuit.transitions", state="half_open") == 1
+
+
+@pytest.mark.asyncio
+async def test_failure_rate_opens_and_failed_probe_reopens():
+    clock = _Clock()
+    breaker = CircuitBreaker(
+        "foundry",
+        failure_threshold=10,
+        failure_rate=0.5,
+        window_size=4,
+        minimum_calls=4,
+        reset_timeout=5,
+        clock=clock,
+    )
+    for callback in (_fail, _succeed, _fail, _succeed):
+        try:
+            await breaker.call(callback)
+        except ServiceResponseError:
+            pass
+    assert breaker.state is CircuitState.OPEN
+
+    clock.now = 5
+    with pytest.raises(ServiceResponseError):
+        await breaker.call(_fail)
+    assert breaker.snapshot()["state"] == "open"
+
+
+@pytest.mark.asyncio
+async def test_errors_outside_is_failure_do_not_count():
+    breaker = CircuitBreaker("foundry", failure_threshold=1)
+
+    async def _bad_request() -> None:
+        raise ValueError("bad prompt")
+
+    with pytest.raises(ValueError):
+        await breaker.call(_bad_request, is_failure=lambda exc: not isinstance(exc, ValueError))
+    assert breaker.state is CircuitState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_skips_foundry_and_reports_degraded_readiness():
+    class _Threads:
+        calls = 0
+
+        async def create(self) -> SimpleNamespace:
+            _Threads.calls += 1
+            raise HttpResponseError(
+                message="unavailable",
+                response=SimpleNamespace(status_code=503, reason="", headers={}, text=lambda: ""),
+            )
+
+    agents = SimpleNamespace(threads=_Threads())
+    service = FoundryAgentService(
+        "https://project",
+        pool=ProjectClientPool(
+            credential_factory=object,
+            client_factory=lambda **_kwargs: SimpleNamespace(agents=agents),
+        ),
+        retry_policy=RetryPolicy(max_attempts=1),
+        evaluation_cache=None,
+    )
+
+    for _ in range(5):
+        with pytest.raises(HttpResponseError):
+            await service.run_agent("grader", "grade", deployment="gpt-5", cache=False)
+    with pytest.raises(CircuitOpenError):
+        await service.run_agent("grader", "grade", deployment="gpt-5", cache=False)
+
+    assert _Threads.calls == 5
+    readiness = circuit_breaker_readiness("foundry")
+    assert readiness["status"] == "degraded"
+    assert readiness["circuits"]["foundry:gpt-5"]["state"] == "open"
@@ -0,0 +1,179 @@
+import pytest
+from tutor_lib.config import CosmosConfig
+from tutor_lib.cosmos import (
+    ChangeBatch,
+    ChangeFeedProcessor,
+    CosmosChangeFeedSource,
+    CosmosCRUD,
+    CosmosLeaseStore,
+    InMemoryLeaseStore,
+    LeaseLostError,
+)
+from tutor_lib.cosmos.emulator import InMemoryCosmosAccount, create_in_memory_pool
+from tutor_lib.metrics import InMemoryMetricsSink
+from tutor_lib.resilience import RetryPolicy
+
+CONFIG = CosmosConfig(COSMOS_ENDPOINT="memory://", COSMOS_DATABASE="tutor")
+
+
+async def _no_sleep(_seconds: float) -> None:
+    return None
+
+
+def _crud(account: InMemoryCosmosAccount, container: str) -> CosmosCRUD:
+    return CosmosCRUD(
+        container,
+        CONFIG,
+        pool=create_in_memory_pool(account),
+        retry_policy=RetryPolicy(sleep=_no_sleep),
+    )
+
+
+def _source(account: InMemoryCosmosAccount, **kwargs) -> CosmosChangeFeedSource:
+    return CosmosChangeFeedSource(
+        "insights_reports", CONFIG, pool=create_in_memory_pool(account), **kwargs
+    )
+
+
+class _Recorder:
+    def __init__(self, fail_times: int = 0) -> None:
+        self.batches: list[list[str]] = []
+        self.fail_times = fail_times
+
+    async def __call__(self, changes: list[dict]) -> None:
+        if self.fail_times:
+            self.fail_times -= 1
+            raise RuntimeError("projection unavailable")
+        self.batches.append([change["id"] for change in changes])
+
+
+@pytest.mark.asyncio
+async def test_processor_delivers_latest_versions_in_batches_and_resumes_from_checkpoint():
+    account = InMemoryCosmosAccount()
+    reports = _crud(account, "insights_reports")
+    for index in range(5):
+        await reports.create_item({"id": f"r{index}", "school_id": "s1", "feedback_count": 0})
+    leases = InMemoryLeaseStore()
+    recorder = _Recorder()
+    sink = InMemoryMetricsSink()
+    processor = ChangeFeedProcessor(
+        "pilot-metrics", _source(account), leases, recorder, max_batch_size=2, metrics_sink=sink
+    )
+
+    assert await processor.drain() == 5
+    assert recorder.batches == [["r0", "r1"], ["r2", "r3"], ["r4"]]
+    assert sink.counter("changefeed.documents", processor="pilot-metrics") == 5
+
+    await reports.patch_item(
+        "r1", [{"op": "incr", "path": "/feedback_count", "value": 1}], partition_key="s1"
+    )
+    await reports.create_item({"id": "r0", "school_id": "s1", "feedback_count": 3})
+    await processor.stop()
+
+    successor = ChangeFeedProcessor("pilot-metrics", _source(account), leases, recorder)
+    assert await successor.drain() == 2
+    assert recorder.batches[-1] == ["r1", "r0"]
+
+
+@pytest.mark.asyncio
+async def test_failed_batches_are_redelivered_and_start_now_skips_history():
+    account = InMemoryCosmosAccount()
+    reports = _crud(account, "insights_reports")
+    await reports.create_item({"id": "old", "school_id": "s1"})
+    recorder = _Recorder(fail_times=1)
+    processor = ChangeFeedProcessor(
+        "alerts",
+        _source(account, start_from_beginning=False),
+        InMemoryLeaseStore(),
+        recorder,
+        metrics_sink=InMemoryMetricsSink(),
+    )
+
+    assert await processor.drain() == 0
+    await reports.create_item({"id": "new", "school_id": "s1"})
+
+    assert await processor.run_once() == 0
+    assert await processor.drain() == 1
+    assert recorder.batches == [["new"]]
+
+
+@pytest.mark.asyncio
+async def test_source_continuations_resume_the_same_feed_range():
+    account = InMemoryCosmosAccount()
+    reports = _crud(account, "insights_reports")
+    for index in range(3):
+        await reports.create_item({"id": f"r{index}", "school_id": "s1"})
+    source = _source(account)
+    (feed_range,) = await source.feed_ranges()
+
+    batch = await source.read(feed_range, None, 2)
+    assert [item["id"] for item in batch.items] == ["r0", "r1"]
+    assert batch.continuation is not None and not batch.continuation.isdigit()
+
+    await reports.create_item({"id": "r3", "school_id": "s1"})
+    resumed = await source.read(feed_range, batch.continuation, 10)
+    assert [item["id"] for item in resumed.items] == ["r2", "r3"]
+
+    idle = await source.read(feed_range, resumed.continuation, 10)
+    assert (idle.items, idle.continuation) == ([], resumed.continuation)
+
+
+class _RangesSource:
+    def __init__(self, count: int) -> None:
+        self.ranges = [
+            {"Range": {"min": str(index), "max": str(index + 1)}} for index in range(count)
+        ]
+
+    async def feed_ranges(self) -> list:
+        return self.ranges
+
+    async def read(self, feed_range, continuation, max_items) -> ChangeBatch:
+        return ChangeBatch(items=[], continuation=continuation)
+
+
+async def _noop(_changes: list[dict]) -> None:
+    return None
+
+
+@pytest.mark.asyncio
+async def test_instances_split_leases_and_take_over_released_or_expired_ones():
+    source, leases, clock = _RangesSource(4), InMemoryLeaseStore(), [1000.0]
+
+    def _processor(owner: str) -> ChangeFeedProcessor:
+        return ChangeFeedProcessor(
+            "p", source, leases, _noop, owner=owner, lease_ttl=60, clock=lambda: clock[0]
+        )
+
+    first, second = _processor("a"), _processor("b")
+    await first.run_once()
+    assert len(first.owned_leases) == 4
+
+    await second.run_once()
+    await first.run_once()
+    assert len(first.owned_leases) == len(second.owned_leases) == 2
+
+    await first.stop()
+    await second.run_once()
+    assert len(second.owned_leases) == 4
+
+    clock[0] += 120
+    third = _processor("c")
+    await third.run_once()
+    assert len(third.owned_leases) == 4
+
+
+@pytest.mark.asyncio
+async def test_cosmos_lease_store_guards_writes_with_etags():
+    store = CosmosLeaseStore("leases", CONFIG, crud=_crud(InMemoryCosmosAccount(), "leases"))
+    lease = await store.ensure("p", "t1", {"Range": {}})
+    assert await store.ensure("p", "t1", {"Range": {}}) == lease
+
+    owned = await store.acquire(lease, "a", 100.0)
+    assert owned is not None and owned.owner == "a"
+    assert await store.acquire(lease, "b", 100.0) is None
+
+    checkpointed = await store.checkpoint(owned, "42", 200.0)
+    assert (checkpointed.continuation, checkpointed.expires_at) == ("42", 200.0)
+    with pytest.raises(LeaseLostError):
+        await store.checkpoint(owned, "43", 200.0)
+    assert [entry.continuation for entry in await store.list_leases("p")] == ["42"]
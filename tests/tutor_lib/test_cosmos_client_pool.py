@@ -0,0 +1,124 @@
+import asyncio
+import importlib
+import sys
+
+import pytest
+import tutor_lib.agents
+from fastapi import FastAPI
+from tutor_lib.config import CosmosConfig, lifespan
+from tutor_lib.cosmos import CosmosClientPool, CosmosCRUD
+
+
+class _StubContainer:
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    async def read_item(self, item, partition_key, **_kwargs):
+        return {"id": item, "pk": partition_key, "container": self.name}
+
+
+class _StubDatabase:
+    def get_container_client(self, name: str) -> _StubContainer:
+        return _StubContainer(name)
+
+
+class _StubCosmosClient:
+    instances: list["_StubCosmosClient"] = []
+
+    def __init__(self, endpoint: str, credential) -> None:
+        self.endpoint = endpoint
+        self.credential = credential
+        self.closed = False
+        _StubCosmosClient.instances.append(self)
+
+    def get_database_client(self, _name: str) -> _StubDatabase:
+        return _StubDatabase()
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class _StubCredential:
+    def __init__(self) -> None:
+        self.closed = False
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture
+def pool() -> CosmosClientPool:
+    _StubCosmosClient.instances = []
+    return CosmosClientPool(credential_factory=_StubCredential, client_factory=_StubCosmosClient)
+
+
+@pytest.mark.asyncio
+async def test_pool_shares_one_client_per_endpoint_and_caches_containers(pool: CosmosClientPool):
+    first = await pool.container("https://a", "db", "essays")
+    second = await pool.container("https://a", "db", "essays")
+    other = await pool.container("https://a", "db", "resources")
+    await pool.container("https://b", "db", "essays")
+
+    assert first is second
+    assert other is not first
+    assert [client.endpoint for client in _StubCosmosClient.instances] == ["https://a", "https://b"]
+    assert _StubCosmosClient.instances[0].credential is _StubCosmosClient.instances[1].credential
+
+
+@pytest.mark.asyncio
+async def test_pool_close_releases_clients_and_credential(pool: CosmosClientPool):
+    await pool.container("https://a", "db", "essays")
+    client = _StubCosmosClient.instances[0]
+    credential = client.credential
+
+    await pool.close()
+
+    assert client.closed
+    assert credential.closed
+    await pool.container("https://a", "db", "essays")
+    assert len(_StubCosmosClient.instances) == 2
+
+
+@pytest.mark.asyncio
+async def test_crud_operations_reuse_pooled_client(pool: CosmosClientPool):
+    config = CosmosConfig(COSMOS_ENDPOINT="https://a", COSMOS_DATABASE="db")
+    crud = CosmosCRUD("essays", config, pool=pool)
+
+    await crud.read_item("essay-1")
+    item = await crud.read_item("essay-2", partition_key="student-1")
+
+    assert item == {"id": "essay-2", "pk": "student-1", "container": "essays"}
+    assert len(_StubCosmosClient.instances) == 1
+
+
+def test_a_lookup_from_a_new_event_loop_closes_the_stale_client(pool: CosmosClientPool):
+    asyncio.run(pool.container("https://a", "db", "essays"))
+    asyncio.run(pool.container("https://a", "db", "essays"))
+
+    stale, fresh = _StubCosmosClient.instances
+    assert (stale.closed, fresh.closed) == (True, False)
+
+
+@pytest.mark.asyncio
+async def test_shutdown_runs_every_teardown_step_when_one_fails(monkeypatch):
+    closed: list[str] = []
+
+    async def _failing() -> None:
+        raise RuntimeError("network down")
+
+    async def _project_clients() -> None:
+        closed.append("projects")
+
+    # Service tests may leave a stub ``tutor_lib.agents`` behind; shutdown imports the real one.
+    monkeypatch.setitem(sys.modules, "tutor_lib.agents", tutor_lib.agents)
+    monkeypatch.setattr(
+        importlib.import_module("tutor_lib.cosmos"), "close_cosmos_clients", _failing
+    )
+    monkeypatch.setattr(
+        importlib.import_module("tutor_lib.agents.pool"), "close_project_clients", _project_clients
+    )
+
+    async with lifespan(FastAPI()):
+        pass
+
+    assert closed == ["projects"]
@@ -0,0 +1,239 @@
+import pytest
+from azure.cosmos import exceptions as cosmos_exceptions
+from fastapi import HTTPException
+from tutor_lib.config import CosmosConfig
+from tutor_lib.cosmos import CosmosCRUD, projection_query
+from tutor_lib.cosmos import crud as crud_module
+from tutor_lib.cosmos.crud import normalize_document
+from tutor_lib.schemas import InvalidContinuationError, PageQuery, paged_success_response
+
+
+async def _aiter(values):
+    for value in values:
+        yield value
+
+
+class _PagedQuery:
+    def __init__(self, container: "_PagedContainer", page_size: int) -> None:
+        self._container = container
+        self._page_size = page_size
+        self.continuation_token: str | None = None
+        self._offset = 0
+
+    def by_page(self, continuation_token: str | None = None) -> "_PagedQuery":
+        self._offset = int(continuation_token or 0)
+        return self
+
+    def __aiter__(self) -> "_PagedQuery":
+        return self
+
+    async def __anext__(self):
+        if self._container.fail_at == self._offset:
+            self._container.fail_at = None
+            raise cosmos_exceptions.CosmosHttpResponseError(status_code=429, message="throttled")
+        if self._offset >= len(self._container.documents):
+            raise StopAsyncIteration
+        page = self._container.documents[self._offset : self._offset + self._page_size]
+        self._offset += len(page)
+        self.continuation_token = (
+            str(self._offset) if self._offset < len(self._container.documents) else None
+        )
+        self._container.page_requests.append(len(page))
+        return _aiter(page)
+
+
+class _PagedContainer:
+    def __init__(self, documents: list[dict]) -> None:
+        self.documents = documents
+        self.fail_at: int | None = None
+        self.page_requests: list[int] = []
+        self.query_kwargs: list[dict] = []
+
+    def query_items(self, **kwargs) -> _PagedQuery:
+        self.query_kwargs.append(kwargs)
+        return _PagedQuery(self, kwargs.get("max_item_count") or len(self.documents) or 1)
+
+
+class _StubPool:
+    def __init__(self, container: _PagedContainer) -> None:
+        self._container = container
+
+    async def container(self, *_args) -> _PagedContainer:
+        return self._container
+
+
+@pytest.fixture
+def no_sleep(monkeypatch):
+    async def _instant(_seconds: float) -> None:
+        return None
+
+    monkeypatch.setattr(crud_module.asyncio, "sleep", _instant)
+
+
+def _crud(container: _PagedContainer) -> CosmosCRUD:
+    config = CosmosConfig(COSMOS_ENDPOINT="https://a", COSMOS_DATABASE="db")
+    return CosmosCRUD("essays", config, pool=_StubPool(container))
+
+
+@pytest.mark.asyncio
+async def test_iter_items_streams_pages_and_forwards_partition_key():
+    container = _PagedContainer([{"id": str(index)} for index in range(5)])
+
+    items = [
+        item async for item in _crud(container).iter_items(partition_key="student-1", page_size=2)
+    ]
+
+    assert [item["id"] for item in items] == ["0", "1", "2", "3", "4"]
+    assert container.page_requests == [2, 2, 1]
+    assert all(kwargs["partition_key"] == "student-1" for kwargs in container.query_kwargs)
+    assert all(kwargs["max_item_count"] == 2 for kwargs in container.query_kwargs)
+
+
+@pytest.mark.asyncio
+async def test_iter_items_retries_a_page_from_its_continuation(no_sleep):
+    container = _PagedContainer([{"id": str(index)} for index in range(4)])
+    container.fail_at = 2
+
+    items = [item async for item in _crud(container).iter_items(page_size=2)]
+
+    assert [item["id"] for item in items] == ["0", "1", "2", "3"]
+    assert container.page_requests == [2, 2]
+
+
+@pytest.mark.asyncio
+async def test_query_page_returns_bounded_page_and_resume_token():
+    container = _PagedContainer([{"id": str(index)} for index in range(3)])
+    crud = _crud(container)
+
+    first = await crud.query_page(page_size=2)
+    second = await crud.query_page(page_size=2, continuation=first.continuation)
+
+    assert [item["id"] for item in first.items] == ["0", "1"]
+    assert first.continuation == "2"
+    assert [item["id"] for item in second.items] == ["2"]
+    assert second.continuation is None
+
+
+@pytest.mark.asyncio
+async def test_query_page_rejects_continuations_it_did_not_issue():
+    crud = _crud(_PagedContainer([{"id": "0"}]))
+
+    with pytest.raises(InvalidContinuationError):
+        await crud.query_page(page_size=2, continuation="not-a-token")
+    with pytest.raises(HTTPException) as rejected:
+        await paged_success_response(
+            "Essays", "Essays listed", crud, PageQuery(page_size=2, continuation="not-a-token")
+        )
+    assert rejected.value.status_code == 400
+
+
+def test_normalize_document_reuses_plain_json_and_converts_only_what_changes():
+    from types import MappingProxyType
+
+    plain = {"id": "1", "evaluations": [{"score": 4, "notes": ["ok"]}], "meta": {"a": 1}}
+    assert normalize_document(plain) is plain
+
+    mixed = {
+        "id": "2",
+        "tags": ("a", "b"),
+        "meta": {"a": 1},
+        "nested": MappingProxyType({"x": (1,)}),
+    }
+    normalized = normalize_document(mixed)
+    assert normalized == {"id": "2", "tags": ["a", "b"], "meta": {"a": 1}, "nested": {"x": [1]}}
+    assert normalized is not mixed
+    assert normalized["meta"] is mixed["meta"]
+    assert mixed["tags"] == ("a", "b")
+
+
+def test_projection_query_selects_only_requested_fields():
+    assert (
+        projection_query(
+            "SELECT * FROM c WHERE c.docType = @t ORDER BY c.at DESC", ["id", "title", "id"]
+        )
+        == "SELECT c.id, c.title FROM c WHERE c.docType = @t ORDER BY c.at DESC"
+    )
+    assert projection_query("select * from root", ["id"]) == "SELECT root.id FROM root"
+    with pytest.raises(ValueError):
+        projection_query("SELECT c.id FROM c", ["id"])
+    with pytest.raises(ValueError):
+        projection_query("SELECT * FROM c", ["id; DROP"])
+
+
+@pytest.mark.asyncio
+async def test_fields_are_projected_by_list_and_iter_queries():
+    container = _PagedContainer([{"id": "0"}])
+    crud = _crud(container)
+
+    await crud.list_items(
+        "SELECT * FROM c WHERE c.x = @x", [{"name": "@x", "value": 1}], fields=["id", "topic"]
+    )
+    [item async for item in crud.iter_items(fields=("id",), page_size=1)]
+
+    assert [kwargs["query"] for kwargs in container.query_kwargs] == [
+        "SELECT c.id, c.topic FROM c WHERE c.x = @x",
+        "SELECT c.id FROM c",
+    ]
+
+
+class _WriteContainer:
+    def __init__(self, fail_ids: set[str] | None = None) -> None:
+        self.fail_ids = fail_ids or set()
+        self.upserted: list[str] = []
+        self.batches: list[tuple[str, list[str]]] = []
+
+    async def upsert_item(self, item, **_kwargs):
+        if item["id"] in self.fail_ids:
+            raise cosmos_exceptions.CosmosHttpResponseError(status_code=400, message="bad document")
+        self.upserted.append(item["id"])
+        return item
+
+    async def execute_item_batch(self, batch_operations, partition_key, **_kwargs):
+        ids = [operation[1][0]["id"] for operation in batch_operations]
+        for offset, item_id in enumerate(ids):
+            if item_id in self.fail_ids:
+                raise cosmos_exceptions.CosmosBatchOperationError(
+                    error_index=offset,
+                    headers={},
+                    status_code=409,
+                    message="conflict",
+                    operation_responses=[],
+                )
+        self.batches.append((partition_key, ids))
+        return []
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_reports_each_item():
+    container = _WriteContainer(fail_ids={"b"})
+    result = await _crud(container).bulk_upsert(
+        [{"id": "a"}, {"id": "b"}, {"id": "c"}], concurrency=2
+    )
+
+    assert result.succeeded == 2
+    assert sorted(container.upserted) == ["a", "c"]
+    assert [
+        (failure.index, failure.item_id, failure.status_code) for failure in result.failures
+    ] == [(1, "b", 400)]
+
+
+@pytest.mark.asyncio
+async def test_batch_upsert_groups_by_partition_and_rolls_back_failed_batches(monkeypatch):
+    monkeypatch.setattr(CosmosCRUD, "TRANSACTIONAL_BATCH_LIMIT", 2)
+    container = _WriteContainer(fail_ids={"x2"})
+    items = [
+        {"id": "s1", "class_id": "class-1"},
+        {"id": "s2", "class_id": "class-1"},
+        {"id": "s3", "class_id": "class-1"},
+        {"id": "x1", "class_id": "class-2"},
+        {"id": "x2", "class_id": "class-2"},
+    ]
+
+    result = await _crud(container).batch_upsert(items, partition_key="class_id")
+
+    assert sorted(container.batches) == [("class-1", ["s1", "s2"]), ("class-1", ["s3"])]
+    assert result.succeeded == 3
+    assert [(failure.item_id, failure.status_code) for failure in result.failures] == [
+        ("x1", 424),
+        ("x2", 409),
+    ]
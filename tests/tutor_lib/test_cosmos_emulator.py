@@ -0,0 +1,148 @@
+import pytest
+from azure.cosmos import exceptions as cosmos_exceptions
+from tutor_lib.config import CosmosConfig
+from tutor_lib.cosmos import CosmosCRUD
+from tutor_lib.cosmos.emulator import (
+    InMemoryCosmosAccount,
+    QuerySyntaxError,
+    compile_query,
+    create_in_memory_pool,
+)
+from tutor_lib.metrics import InMemoryMetricsSink
+from tutor_lib.resilience import RetryPolicy
+
+REPORTS = [
+    {"id": "r1", "school_id": "s1", "generated_at": "2024-01-01", "tags": ["math"]},
+    {"id": "r2", "school_id": "s2", "generated_at": "2024-03-01", "tags": ["art", "math"]},
+    {"id": "r3", "school_id": "s3", "generated_at": "2024-02-01"},
+]
+
+
+async def _no_sleep(_seconds: float) -> None:
+    return None
+
+
+def _crud(account: InMemoryCosmosAccount, container: str, sink=None) -> CosmosCRUD:
+    config = CosmosConfig(COSMOS_ENDPOINT="memory://", COSMOS_DATABASE="tutor")
+    return CosmosCRUD(
+        container,
+        config,
+        pool=create_in_memory_pool(account),
+        retry_policy=RetryPolicy(sleep=_no_sleep),
+        metrics_sink=sink,
+    )
+
+
+def test_compiled_query_filters_orders_and_projects():
+    query = compile_query(
+        "SELECT c.id, c.school_id FROM c WHERE ARRAY_CONTAINS(@schools, c.school_id) "
+        "ORDER BY c.generated_at DESC"
+    )
+
+    rows = query.execute(REPORTS, {"@schools": ["s1", "s2"]})
+
+    assert rows == [{"id": "r2", "school_id": "s2"}, {"id": "r1", "school_id": "s1"}]
+
+
+def test_compiled_query_treats_missing_properties_as_undefined():
+    assert compile_query("SELECT VALUE COUNT(1) FROM c WHERE IS_DEFINED(c.tags)").execute(
+        REPORTS, {}
+    ) == [2]
+    assert [
+        row["id"]
+        for row in compile_query(
+            "SELECT * FROM c WHERE ARRAY_CONTAINS(c.tags, 'math') AND NOT IS_DEFINED(c.missing)"
+        ).execute(REPORTS, {})
+    ] == ["r1", "r2"]
+    with pytest.raises(QuerySyntaxError):
+        compile_query("SELECT * FROM c WHERE")
+
+
+@pytest.mark.asyncio
+async def test_point_reads_honour_partition_keys_and_conflicts():
+    account = InMemoryCosmosAccount()
+    crud = _crud(account, "insights_reports")
+    await crud.create_item(REPORTS[0])
+
+    assert (await crud.read_item("r1", partition_key="s1"))["school_id"] == "s1"
+    with pytest.raises(cosmos_exceptions.CosmosResourceNotFoundError):
+        await crud.read_item("r1", partition_key="s2")
+
+    result = await crud.create_item_strict(
+        {**REPORTS[0], "generated_at": "later"}, partition_key="s1"
+    )
+    assert result.created is False
+    assert (await crud.read_item("r1", partition_key="s1"))["generated_at"] == "2024-01-01"
+
+    await crud.delete_item("r1", partition_key="s1")
+    with pytest.raises(cosmos_exceptions.CosmosResourceNotFoundError):
+        await crud.delete_item("r1", partition_key="s1")
+
+
+@pytest.mark.asyncio
+async def test_queries_page_through_continuation_tokens():
+    account = InMemoryCosmosAccount()
+    crud = _crud(account, "insights_reports")
+    for report in REPORTS:
+        await crud.create_item(report)
+    query = "SELECT * FROM c ORDER BY c.generated_at"
+
+    first = await crud.query_page(query, page_size=2)
+    second = await crud.query_page(query, page_size=2, continuation=first.continuation)
+
+    assert [item["id"] for item in first.items] == ["r1", "r3"]
+    assert [item["id"] for item in second.items] == ["r2"]
+    assert second.continuation is None
+    assert [item["id"] async for item in crud.iter_items(query, page_size=1)] == ["r1", "r3", "r2"]
+    assert [
+        item["id"]
+        for item in await crud.list_items(
+            "SELECT * FROM c WHERE c.school_id = @school",
+            [{"name": "@school", "value": "s3"}],
+            partition_key="s3",
+        )
+    ] == ["r3"]
+
+
+@pytest.mark.asyncio
+async def test_injected_throttles_are_retried_and_charged():
+    account = InMemoryCosmosAccount()
+    sink = InMemoryMetricsSink()
+    crud = _crud(account, "essays", sink)
+    await crud.create_item({"id": "e1", "student_id": "st1", "content": "essay"})
+
+    account.throttle_next(2)
+    item = await crud.read_item("e1", partition_key="st1")
+
+    assert item["content"] == "essay"
+    assert account.throttled == 2
+    assert sink.counter("cosmos.retries", operation="read_item") == 2
+    assert sink.histogram("cosmos.request_charge", operation="read_item").total == pytest.approx(
+        1.0
+    )
+    assert sink.histogram("cosmos.request_charge", operation="create_item").total > 5.0
+
+
+@pytest.mark.asyncio
+async def test_transactional_batch_rolls_back_on_conflict():
+    account = InMemoryCosmosAccount()
+    crud = _crud(account, "essays")
+    container = account.container("tutor", "essays")
+    await container.create_item({"id": "e1", "student_id": "st1"})
+
+    with pytest.raises(cosmos_exceptions.CosmosBatchOperationError) as excinfo:
+        await container.execute_item_batch(
+            [
+                ("create", ({"id": "e2", "student_id": "st1"},)),
+                ("create", ({"id": "e1", "student_id": "st1"},)),
+            ],
+            partition_key="st1",
+        )
+
+    assert excinfo.value.error_index == 1
+    assert [doc["id"] for doc in container.documents()] == ["e1"]
+    result = await crud.batch_upsert(
+        [{"id": "e2", "student_id": "st1"}, {"id": "e3", "student_id": "st1"}],
+        partition_key=lambda doc: doc["student_id"],
+    )
+    assert result.succeeded == 2
@@ -0,0 +1,108 @@
+import asyncio
+
+import pytest
+from azure.cosmos import exceptions as cosmos_exceptions
+from tutor_lib.config import CosmosConfig
+from tutor_lib.cosmos import (
+    CosmosCRUD,
+    PatchError,
+    apply_patch_operations,
+    patch_add,
+    patch_fields,
+    patch_incr,
+    patch_remove,
+    patch_set,
+)
+from tutor_lib.cosmos.emulator import InMemoryCosmosAccount, create_in_memory_pool
+from tutor_lib.resilience import RetryPolicy
+
+
+async def _no_sleep(_seconds: float) -> None:
+    return None
+
+
+def _crud(account: InMemoryCosmosAccount) -> CosmosCRUD:
+    config = CosmosConfig(COSMOS_ENDPOINT="memory://", COSMOS_DATABASE="tutor")
+    return CosmosCRUD(
+        "groups",
+        config,
+        pool=create_in_memory_pool(account),
+        retry_policy=RetryPolicy(sleep=_no_sleep),
+    )
+
+
+def test_apply_patch_operations_returns_patched_copy():
+    document = {"id": "g1", "count": 1, "tags": ["a"], "meta": {"owner": "x"}}
+
+    patched = apply_patch_operations(
+        document,
+        [
+            patch_incr("/count", 2),
+            patch_add("/tags/-", "b"),
+            patch_set("/meta/owner", "y"),
+            patch_remove("/meta"),
+        ],
+    )
+
+    assert patched == {"id": "g1", "count": 3, "tags": ["a", "b"]}
+    assert document["meta"] == {"owner": "x"}
+    assert patch_fields({"id": "g1", "name": "n"}) == [patch_set("/name", "n")]
+    with pytest.raises(PatchError):
+        apply_patch_operations(document, [patch_set("/id", "other")])
+    with pytest.raises(PatchError):
+        apply_patch_operations(document, [patch_incr("/tags")])
+
+
+@pytest.mark.asyncio
+async def test_patch_item_applies_server_side_with_single_round_trip():
+    account = InMemoryCosmosAccount()
+    crud = _crud(account)
+    await crud.create_item({"id": "g1", "name": "Group", "feedback_count": 0})
+    before = account.requests
+
+    patched = await crud.patch_item(
+        "g1", [patch_set("/name", "Renamed"), patch_incr("/feedback_count")]
+    )
+
+    assert patched["name"] == "Renamed"
+    assert patched["feedback_count"] == 1
+    assert account.requests == before + 1
+    assert (await crud.read_item("g1"))["feedback_count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_increments_do_not_lose_updates():
+    crud = _crud(InMemoryCosmosAccount())
+    await crud.create_item({"id": "g1", "feedback_count": 0})
+
+    await asyncio.gather(
+        *(crud.patch_item("g1", [patch_incr("/feedback_count")]) for _ in range(20))
+    )
+
+    assert (await crud.read_item("g1"))["feedback_count"] == 20
+
+
+@pytest.mark.asyncio
+async def test_patch_item_honours_if_match_and_missing_documents():
+    crud = _crud(InMemoryCosmosAccount())
+    created = await crud.create_item({"id": "g1", "name": "Group"})
+    await crud.patch_item("g1", [patch_set("/name", "First")], if_match=created["_etag"])
+
+    with pytest.raises(cosmos_exceptions.CosmosAccessConditionFailedError):
+        await crud.patch_item("g1", [patch_set("/name", "Stale")], if_match=created["_etag"])
+    with pytest.raises(cosmos_exceptions.CosmosResourceNotFoundError):
+        await crud.patch_item("missing", [patch_set("/name", "x")])
+    assert (await crud.read_item("g1"))["name"] == "First"
+
+
+@pytest.mark.asyncio
+async def test_patch_item_batches_more_operations_than_one_request_accepts():
+    crud = _crud(InMemoryCosmosAccount())
+    created = await crud.create_item({"id": "g1"})
+    operations = [patch_set(f"/field_{index}", index) for index in range(25)]
+
+    patched = await crud.patch_item("g1", operations, if_match=created["_etag"])
+
+    assert all(patched[f"field_{index}"] == index for index in range(25))
+    with pytest.raises(cosmos_exceptions.CosmosAccessConditionFailedError):
+        await crud.patch_item("g1", operations, if_match=created["_etag"])
@@ -0,0 +1,94 @@
+import pytest
+from tutor_lib.config import CosmosConfig
+from tutor_lib.cosmos import CosmosCRUD, QueryCache, reset_shared_query_cache, shared_query_cache
+from tutor_lib.cosmos.emulator import InMemoryCosmosAccount, create_in_memory_pool
+from tutor_lib.metrics import InMemoryMetricsSink
+from tutor_lib.resilience import RetryPolicy
+
+CONFIG = CosmosConfig(COSMOS_ENDPOINT="memory://", COSMOS_DATABASE="tutor")
+QUERY = "SELECT * FROM c WHERE c.kind = @kind"
+PARAMS = [{"name": "@kind", "value": "rubric"}]
+
+
+async def _no_sleep(_seconds: float) -> None:
+    return None
+
+
+def _crud(account: InMemoryCosmosAccount, cache: QueryCache | None, sink=None) -> CosmosCRUD:
+    return CosmosCRUD(
+        "graders",
+        CONFIG,
+        pool=create_in_memory_pool(account),
+        retry_policy=RetryPolicy(sleep=_no_sleep),
+        metrics_sink=sink or InMemoryMetricsSink(),
+        cache=cache,
+    )
+
+
+@pytest.mark.asyncio
+async def test_repeated_reads_are_served_from_cache_until_the_ttl_expires():
+    account, clock, sink = InMemoryCosmosAccount(), [0.0], InMemoryMetricsSink()
+    cache = QueryCache(ttl=30, clock=lambda: clock[0])
+    crud = _crud(account, cache, sink)
+    await crud.create_item({"id": "g1", "kind": "rubric"})
+    baseline = account.requests
+
+    first = await crud.list_items(QUERY, PARAMS)
+    first[0]["kind"] = "mutated"
+    assert [item["kind"] for item in await crud.list_items(QUERY, PARAMS)] == ["rubric"]
+    (await crud.read_item("g1"))["kind"] = "mutated"
+    assert (await crud.read_item("g1"))["kind"] == "rubric"
+    assert account.requests - baseline == 2
+    assert sink.counter("cosmos.cache.hits", container="graders", operation="list_items") == 1
+    assert sink.counter("cosmos.cache.misses", container="graders", operation="read_item") == 1
+
+    clock[0] += 31
+    await crud.list_items(QUERY, PARAMS)
+    assert account.requests - baseline == 3
+    assert (cache.stats().hits, cache.stats().misses) == (2, 3)
+
+
+@pytest.mark.asyncio
+async def test_writes_through_any_instance_sharing_the_cache_invalidate_the_container():
+    account, cache = InMemoryCosmosAccount(), QueryCache()
+    reader, writer = _crud(account, cache), _crud(account, cache)
+    await writer.create_item({"id": "g1", "kind": "rubric"})
+    assert [item["id"] for item in await reader.list_items(QUERY, PARAMS)] == ["g1"]
+
+    await writer.create_item({"id": "g2", "kind": "rubric"})
+    assert [item["id"] for item in await reader.list_items(QUERY, PARAMS)] == ["g1", "g2"]
+
+    await writer.patch_item("g1", [{"op": "set", "path": "/kind", "value": "retired"}])
+    await writer.delete_item("g2")
+    assert await reader.list_items(QUERY, PARAMS) == []
+    assert cache.stats().invalidations == 4
+
+
+def test_cache_evicts_least_recently_used_entries_and_skips_stale_generations():
+    cache = QueryCache(maxsize=2)
+    keys = [cache.key("graders", name) for name in ("a", "b", "c")]
+    cache.put(keys[0], 1, cache.generation("graders"))
+    cache.put(keys[1], 2, cache.generation("graders"))
+    assert cache.get(keys[0]) == (True, 1)
+    cache.put(keys[2], 3, cache.generation("graders"))
+    assert cache.get(keys[1]) == (False, None)
+    assert cache.stats().evictions == 1
+
+    generation = cache.generation("graders")
+    cache.invalidate("graders")
+    cache.put(keys[1], 2, generation)
+    assert len(cache) == 0
+
+
+def test_shared_cache_is_disabled_unless_a_ttl_is_configured():
+    reset_shared_query_cache()
+    assert shared_query_cache(CONFIG) is None
+    enabled = CosmosConfig(
+        COSMOS_ENDPOINT="memory://", COSMOS_QUERY_CACHE_TTL_SECONDS=5, COSMOS_QUERY_CACHE_SIZE=8
+    )
+    try:
+        cache = shared_query_cache(enabled)
+        assert cache is shared_query_cache(enabled)
+        assert cache is not None and cache.stats().size == 0
+    finally:
+        reset_shared_query_cache()
@@ -0,0 +1,130 @@
+import pytest
+from azure.cosmos import exceptions as cosmos_exceptions
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from tutor_lib.config import CosmosConfig
+from tutor_lib.cosmos import CosmosCRUD
+from tutor_lib.metrics import (
+    InMemoryMetricsSink,
+    OpenTelemetryMetricsSink,
+    get_in_memory_sink,
+    instrument_app,
+)
+from tutor_lib.resilience import RetryPolicy
+
+
+class _ChargingContainer:
+    def __init__(self, throttle_first: bool = False) -> None:
+        self._throttle_first = throttle_first
+
+    async def read_item(self, item, partition_key, response_hook=None):
+        if self._throttle_first:
+            self._throttle_first = False
+            response_hook({"x-ms-request-charge": "0.5"}, None)
+            raise cosmos_exceptions.CosmosHttpResponseError(status_code=429, message="throttled")
+        response_hook({"x-ms-request-charge": "1.25"}, None)
+        return {"id": item, "pk": partition_key}
+
+    def query_items(self, **kwargs):
+        hook = kwargs["response_hook"]
+
+        async def _rows():
+            hook({"x-ms-request-charge": "3.5"}, None)
+            for index in range(3):
+                yield {"id": str(index)}
+
+        return _rows()
+
+
+class _StubPool:
+    def __init__(self, container) -> None:
+        self._container = container
+
+    async def container(self, *_args):
+        return self._container
+
+
+async def _no_sleep(_seconds: float) -> None:
+    return None
+
+
+def _crud(container, sink) -> CosmosCRUD:
+    config = CosmosConfig(COSMOS_ENDPOINT="https://a", COSMOS_DATABASE="db")
+    return CosmosCRUD(
+        "essays",
+        config,
+        pool=_StubPool(container),
+        retry_policy=RetryPolicy(sleep=_no_sleep),
+        metrics_sink=sink,
+    )
+
+
+@pytest.mark.asyncio
+async def test_crud_records_request_charge_latency_items_and_retries():
+    sink = InMemoryMetricsSink()
+    crud = _crud(_ChargingContainer(throttle_first=True), sink)
+
+    await crud.read_item("essay-1", partition_key="student-1")
+    await crud.list_items()
+
+    read = {"container": "essays", "operation": "read_item", "route": "background"}
+    assert sink.histogram("cosmos.request_charge", **read).total == pytest.approx(1.75)
+    assert sink.counter("cosmos.retries", **read) == 1
+    assert sink.histogram("cosmos.latency_ms", **read).count == 1
+    assert sink.histogram("cosmos.item_count", operation="list_items").total == 3
+    assert sink.histogram("cosmos.request_charge", operation="list_items").total == pytest.approx(
+        3.5
+    )
+    assert sink.counter("cosmos.operations", container="essays") == 2
+
+
+def test_metrics_endpoint_groups_samples_by_route():
+    sink = get_in_memory_sink()
+    sink.reset()
+    crud = _crud(_ChargingContainer(), None)
+    app = FastAPI()
+    instrument_app(app)
+
+    @app.get("/essays/{essay_id}")
+    async def read_essay(essay_id: str):
+        return await crud.read_item(essay_id)
+
+    client = TestClient(app)
+    assert client.get("/essays/essay-1").status_code == 200
+    assert client.get("/essays/essay-2").status_code == 200
+
+    body = client.get("/metrics").json()
+    route = body["routes"]["GET /essays/{essay_id}"]
+    assert route["cosmos.operations"] == 2
+    assert route["cosmos.request_charge"]["sum"] == pytest.approx(2.5)
+    sink.reset()
+
+
+def test_open_telemetry_sink_forwards_to_meter_instruments():
+    recorded: list[tuple[str, float, dict]] = []
+
+    class _Instrument:
+        def __init__(self, name: str) -> None:
+            self._name = name
+
+        def add(self, value, attributes):
+            recorded.append((self._name, value, attributes))
+
+        def record(self, value, attributes):
+            recorded.append((self._name, value, attributes))
+
+    class _Meter:
+        def create_counter(self, name):
+            return _Instrument(name)
+
+        def create_histogram(self, name):
+            return _Instrument(name)
+
+    sink = OpenTelemetryMetricsSink(meter=_Meter())
+    sink.increment("cosmos.operations", 1, {"container": "essays"})
+    sink.observe("cosmos.request_charge", 2.5, {"container": "essays"})
+
+    assert recorded == [
+        ("cosmos.operations", 1, {"container": "essays"}),
+        ("cosmos.request_charge", 2.5, {"container": "essays"}),
+    ]
@@ -0,0 +1,54 @@
+from typing import ClassVar
+
+import jinja2
+import pytest
+from pydantic import BaseModel
+from tutor_lib.prompts import PromptComposer, shared_prompt_composer
+
+
+class _Question(BaseModel):
+    topic: str
+
+    dumps: ClassVar[int] = 0
+
+    def model_dump(self, **kwargs):
+        type(self).dumps += 1
+        return super().model_dump(**kwargs)
+
+
+@pytest.fixture
+def template_dir(tmp_path):
+    (tmp_path / "correct.jinja").write_text("{{ question.topic }} / {{ dimension }}")
+    (tmp_path / "notes.txt").write_text("not a template")
+    return tmp_path
+
+
+def test_one_context_renders_every_dimension_with_a_single_dump(template_dir):
+    composer = PromptComposer(template_dir)
+    _Question.dumps = 0
+    context = composer.context(question=_Question(topic="Fractions"))
+
+    prompts = [
+        composer.render("correct.jinja", context, dimension=dimension)
+        for dimension in ("accuracy", "clarity", "depth")
+    ]
+
+    assert prompts == ["Fractions / accuracy", "Fractions / clarity", "Fractions / depth"]
+    assert _Question.dumps == 1
+    assert composer.template_names == ["correct.jinja"]
+    with pytest.raises(jinja2.TemplateNotFound):
+        composer.render("notes.txt", context)
+
+
+def test_templates_are_compiled_once_and_versioned_by_source(template_dir):
+    composer = shared_prompt_composer(template_dir)
+    assert shared_prompt_composer(template_dir) is composer
+    version = composer.template_version("correct.jinja")
+
+    (template_dir / "correct.jinja").write_text("{{ dimension }}")
+    rendered = composer.render("correct.jinja", question={"topic": "Fractions"}, dimension="depth")
+    assert rendered == "Fractions / depth"
+
+    edited = PromptComposer(template_dir)
+    assert edited.template_version("correct.jinja") != version
+    assert edited.version != composer.version
@@ -0,0 +1,122 @@
+import random
+
+import pytest
+from azure.cosmos import exceptions as cosmos_exceptions
+from tutor_lib.resilience import RetryPolicy, retry_after_seconds
+
+
+class _Throttled(Exception):
+    def __init__(self, headers: dict[str, str] | None = None) -> None:
+        super().__init__("throttled")
+        self.status_code = 429
+        self.headers = headers or {}
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _policy(clock: _Clock, **overrides) -> RetryPolicy:
+    options = {
+        "max_attempts": 4,
+        "base_delay": 0.5,
+        "max_delay": 8.0,
+        "deadline": 60.0,
+        "is_retryable": lambda exc: isinstance(exc, _Throttled),
+        "sleep": clock.sleep,
+        "clock": clock,
+        "rng": random.Random(7),
+    }
+    options.update(overrides)
+    return RetryPolicy(**options)
+
+
+def _failing(times: int, error_factory=_Throttled):
+    calls = {"count": 0}
+
+    async def _callback():
+        calls["count"] += 1
+        if calls["count"] <= times:
+            raise error_factory()
+        return "ok"
+
+    return _callback, calls
+
+
+def test_retry_after_reads_cosmos_and_http_headers():
+    assert retry_after_seconds(_Throttled({"x-ms-retry-after-ms": "250"})) == 0.25
+    assert retry_after_seconds(_Throttled({"Retry-After": "2"})) == 2.0
+    assert retry_after_seconds(_Throttled()) is None
+
+    error = cosmos_exceptions.CosmosHttpResponseError(status_code=429, message="throttled")
+    error.headers = {"x-ms-retry-after-ms": "1500"}
+    assert retry_after_seconds(error) == 1.5
+
+
+@pytest.mark.asyncio
+async def test_jittered_delays_stay_within_decorrelated_bounds():
+    clock = _Clock()
+    policy = _policy(clock)
+    callback, calls = _failing(3)
+
+    assert await policy.run("read_item", callback) == "ok"
+
+    assert calls["count"] == 4
+    previous = policy.base_delay
+    for delay in clock.sleeps:
+        assert policy.base_delay <= delay <= min(policy.max_delay, previous * 3)
+        previous = delay
+    assert len(set(clock.sleeps)) > 1
+    assert policy.metrics.snapshot()["read_item"] == {
+        "attempts": 4,
+        "throttled": 3,
+        "retries": 3,
+        "successes": 1,
+    }
+
+
+@pytest.mark.asyncio
+async def test_server_hint_overrides_jitter():
+    clock = _Clock()
+    policy = _policy(clock)
+    callback, _ = _failing(1, lambda: _Throttled({"x-ms-retry-after-ms": "1200"}))
+
+    await policy.run("query", callback)
+
+    assert clock.sleeps == [1.2]
+
+
+@pytest.mark.asyncio
+async def test_deadline_budget_stops_retrying():
+    clock = _Clock()
+    policy = _policy(clock, deadline=1.0)
+    callback, calls = _failing(5, lambda: _Throttled({"x-ms-retry-after-ms": "800"}))
+
+    with pytest.raises(_Throttled):
+        await policy.run("upsert", callback)
+
+    assert calls["count"] == 2
+    assert clock.sleeps == [0.8]
+    assert policy.metrics.get("upsert", "budget_exhausted") == 1
+
+
+@pytest.mark.asyncio
+async def test_non_retryable_errors_propagate_immediately():
+    clock = _Clock()
+    policy = _policy(clock)
+    callback, calls = _failing(1, lambda: ValueError("bad payload"))
+
+    with pytest.raises(ValueError):
+        await policy.run("create", callback)
+
+    assert calls["count"] == 1
+    assert clock.sleeps == []
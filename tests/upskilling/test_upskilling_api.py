@@ -94,6 +94,16 @@ def test_list_plans_returns_created_plans(api_client):
     assert len(plans) == 2
 
 
+def test_list_plans_summary_view_omits_plan_content(api_client):
+    api_client.post("/plans", json=_PLAN_PAYLOAD, headers=_auth_headers())
+    r = api_client.get("/plans", params={"view": "summary"}, headers=_auth_headers())
+    assert r.status_code == 200
+    plans = _content(r)
+    assert plans[0]["title"] == _PLAN_PAYLOAD["title"]
+    assert plans[0]["paragraphs"] == []
+    assert plans[0]["performance_history"] == []
+
+
 def test_get_plan_by_id(api_client):
     created = _content(api_client.post("/plans", json=_PLAN_PAYLOAD, headers=_auth_headers()))
     plan_id = created["id"]
@@ -152,3 +162,38 @@ def test_evaluate_persisted_plan(api_client):
 def test_create_plan_without_auth_returns_401(api_client):
     r = api_client.post("/plans", json=_PLAN_PAYLOAD)
     assert r.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_cosmos_repository_point_reads_plans_by_professor(api_client, monkeypatch):
+    monkeypatch.setenv("COSMOS_EMULATOR", "memory")
+    from tutor_lib.config import CosmosConfig
+    from tutor_lib.cosmos.emulator import get_in_memory_account
+
+    account = get_in_memory_account()
+    account.reset()
+    store = importlib.import_module("app.store")
+    config = CosmosConfig(COSMOS_ENDPOINT="memory://", COSMOS_DATABASE="unit-test-db")
+    plan = store.PlanRecord(
+        id="plan-1",
+        professor_id="prof-1",
+        title="Plan",
+        timeframe="week",
+        topic="Physics",
+        class_id="class-1",
+        status="draft",
+    )
+    await store.CosmosUpskillingRepository("upskilling_plans", config).create_plan(plan)
+
+    repository = store.CosmosUpskillingRepository("upskilling_plans", config)
+    before = account.requests
+    assert (await repository.get_plan("plan-1", professor_id="prof-1")).title == "Plan"
+    assert account.requests - before == 1
+
+    admin_view = store.CosmosUpskillingRepository("upskilling_plans", config)
+    assert (await admin_view.get_plan("plan-1", professor_id="admin-1")).professor_id == "prof-1"
+    assert await admin_view.get_plan("missing", professor_id="prof-1") is None
+
+    await admin_view.delete_plan("plan-1", "prof-1")
+    assert await repository.get_plan("plan-1", professor_id="prof-1") is None
+    account.reset()